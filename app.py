@@ -6,17 +6,23 @@ handling routing, database initialization checks, and CSS loading.
 """
 
 import sys
+from contextlib import AbstractContextManager, nullcontext
 from pathlib import Path
+from uuid import uuid4
 
 import streamlit as st
 
+from src.config import PROFILE_DIR, PROFILE_DUMP_INTERVAL, PROFILE_ENABLED
 from src.database.init import ensure_database_initialized
 from src.database.seed import seed_demo_contacts
 from src.ui.add_contact import render_add_contact
+from src.ui.debug_panel import is_debug_enabled, render_debug_panel
 from src.ui.edit_contact import render_edit_contact
 from src.ui.home import render_home
 from src.ui.router import init_router
 from src.ui.show_contact import render_show_contact
+from src.ui.stats import render_stats
+from src.utils.profiling import Profiler, profile_action, track_rerun
 
 st.set_page_config(page_title="Contact Book", page_icon="📒", layout="wide")
 
@@ -36,6 +42,26 @@ def load_css(file_name: str) -> None:
         st.warning(f"⚠️ CSS file not found: {file_name}")
 
 
+def get_profiler() -> Profiler | None:
+    """
+    Return the profiler of this browser session when profiling is enabled.
+
+    Each session accumulates and writes its own reports; the reruns of
+    concurrent sessions are profiled one at a time (see ``Profiler.session``).
+
+    :return: The profiler, or None if ``CONTACT_BOOK_PROFILE`` is not set
+    """
+    if not PROFILE_ENABLED:
+        return None
+    if "profiler" not in st.session_state:
+        st.session_state.profiler = Profiler(
+            PROFILE_DIR,
+            name=f"streamlit-{uuid4().hex[:8]}",
+            dump_interval=PROFILE_DUMP_INTERVAL,
+        )
+    return st.session_state.profiler
+
+
 # Check if the database is properly initialized by verifying the contacts table exists.
 # if not initializing the database
 ensure_database_initialized()
@@ -60,6 +86,25 @@ def main() -> None:
     # Load the CSS file
     load_css("src/styles/main.css")
 
+    # Profile the rerun when enabled and collect its timing breakdown; the
+    # engine-wide SQL timing listeners are only installed when either is on
+    profiler = get_profiler()
+    debug = is_debug_enabled()
+    if not (debug or profiler):
+        render_page()
+        return
+
+    session: AbstractContextManager = profiler.session() if profiler else nullcontext()
+    action = profile_action(profiler, f"rerun: {st.session_state.page}")
+    with session, action, track_rerun() as timings:
+        render_page()
+
+    if debug:
+        render_debug_panel(timings)
+
+
+def render_page() -> None:
+    """Render the page selected in the session state."""
     # Main application container with glass morphism styling
     with st.container(key="center"):
         with st.container(key="glass-container"):
@@ -77,6 +122,9 @@ def main() -> None:
                     elif st.session_state.page == "show":
                         render_show_contact()
 
+                    elif st.session_state.page == "stats":
+                        render_stats()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,7 @@
+"""
+Contact Book Benchmarks
+Standalone performance scripts, run from the project root with
+``python -m benchmarks.<module>``.
+"""
+
+__version__ = "1.0.0"
@@ -0,0 +1,142 @@
+"""
+Load test: local HTTP API.
+
+Starts the API (``python -m src.api``) in a separate process on a
+populated file database and drives it from local ``httpx`` clients for a
+fixed duration. Reports throughput and
+latency percentiles per request type; the ``revalidate`` requests send
+``If-None-Match`` and are answered with ``304 Not Modified``.
+
+Usage::
+
+    python -m benchmarks.bench_api [--rows 10000] [--clients 16] [--seconds 10]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+
+from benchmarks.common import populated_engine
+
+
+def free_port() -> int:
+    """Return a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(database_url: str, port: int) -> subprocess.Popen:
+    """Start the API process and wait until it accepts requests."""
+    server = subprocess.Popen(  # pylint: disable=consider-using-with
+        [sys.executable, "-m", "src.api", "--port", str(port)],
+        env={**os.environ, "DATABASE_URL": database_url},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/contacts", params={"limit": 1})
+            return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("API server did not start")
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Return the ``pct`` percentile of the values."""
+    return statistics.quantiles(values, n=100, method="inclusive")[int(pct) - 1]
+
+
+async def drive(base_url: str, rows: int, clients: int, seconds: float) -> dict:
+    """Run the request mix from ``clients`` concurrent clients."""
+    latencies: dict[str, list[float]] = defaultdict(list)
+    deadline = time.perf_counter() + seconds
+
+    async with httpx.AsyncClient(
+        base_url=base_url, headers={"Accept-Encoding": "gzip"}
+    ) as client:
+        etag = (await client.get("/contacts")).headers["etag"]
+
+        def request_mix(rng: random.Random):
+            page = rng.randrange(rows // 50)
+            ids = [rng.randrange(1, rows + 1) for _ in range(20)]
+            return [
+                ("page", lambda: client.get("/contacts", params={"offset": page * 50})),
+                (
+                    "search",
+                    lambda: client.get("/contacts/search", params={"q": "müll"}),
+                ),
+                (
+                    "batch_get",
+                    lambda: client.get("/contacts/batch", params={"ids": ids}),
+                ),
+                (
+                    "revalidate",
+                    lambda: client.get("/contacts", headers={"If-None-Match": etag}),
+                ),
+            ]
+
+        async def worker(seed: int):
+            rng = random.Random(seed)
+            while time.perf_counter() < deadline:
+                name, send = rng.choice(request_mix(rng))
+                start = time.perf_counter()
+                response = await send()
+                latencies[name].append(time.perf_counter() - start)
+                assert response.status_code in (200, 304), response.text
+
+        await asyncio.gather(*(worker(seed) for seed in range(clients)))
+    return latencies
+
+
+def main() -> None:
+    """Run the load test and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    database_url = f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}"
+    populated_engine(args.rows, database_url).dispose()
+    port = free_port()
+    server = start_server(database_url, port)
+
+    try:
+        latencies = asyncio.run(
+            drive(f"http://127.0.0.1:{port}", args.rows, args.clients, args.seconds)
+        )
+    finally:
+        server.terminate()
+        server.wait()
+
+    total = sum(len(values) for values in latencies.values())
+    print(
+        f"{args.rows} contacts, {args.clients} clients, {args.seconds:.0f} s: "
+        f"{total / args.seconds:.0f} requests/s"
+    )
+    print(f"  {'request':<12} {'count':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, values in sorted(latencies.items()):
+        millis = [value * 1e3 for value in values]
+        print(
+            f"  {name:<12} {len(values):>7} {statistics.median(millis):8.1f} "
+            f"{percentile(millis, 95):8.1f} {percentile(millis, 99):8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
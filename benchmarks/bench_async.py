@@ -0,0 +1,89 @@
+"""
+Benchmark: sync service in a thread pool vs. native async service.
+
+Serves batches of concurrent phone lookups against a file database, once
+through the synchronous ``contact_service`` wrapped in ``asyncio.to_thread``
+and once through ``async_contact_service`` on an aiosqlite engine. Every
+request uses its own session, as an HTTP front end would.
+
+Usage::
+
+    python -m benchmarks.bench_async [--rows 10000] [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import populated_engine
+from src.crud import async_contacts
+from src.crud import contacts as contact_crud
+
+
+async def run_batches(handler, phones: list[str], concurrency: int) -> float:
+    """Serve all lookups with ``concurrency`` in flight; return requests/s."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def request(phone):
+        async with semaphore:
+            await handler(phone)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(request(phone) for phone in phones))
+    return len(phones) / (time.perf_counter() - start)
+
+
+async def main_async(args) -> None:
+    """Run both variants for every concurrency level."""
+    path = Path(tempfile.mkdtemp()) / "bench.db"
+    url = f"sqlite:///{path}"
+    sync_engine = populated_engine(args.rows, url)
+    async_engine = create_async_engine(
+        url.replace("sqlite://", "sqlite+aiosqlite://", 1),
+        pool_size=args.max_concurrency,
+    )
+    sync_session = sessionmaker(bind=sync_engine)
+    async_session = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    rng = random.Random(7)
+    phones = [f"+49151{rng.randrange(args.rows):07d}" for _ in range(args.requests)]
+
+    def sync_lookup(phone):
+        with sync_session() as db:
+            return contact_crud.get_by_phone(db, phone)
+
+    async def threaded(phone):
+        return await asyncio.to_thread(sync_lookup, phone)
+
+    async def native(phone):
+        async with async_session() as db:
+            return await async_contacts.get_by_phone(db, phone)
+
+    print(f"{args.rows} contacts, {args.requests} phone lookups (requests/s)")
+    print(f"  {'concurrency':>11} {'threadpool':>12} {'async':>12}")
+    for concurrency in (1, 8, 32, args.max_concurrency):
+        sync_rps = await run_batches(threaded, phones, concurrency)
+        async_rps = await run_batches(native, phones, concurrency)
+        print(f"  {concurrency:>11} {sync_rps:12.0f} {async_rps:12.0f}")
+
+    await async_engine.dispose()
+    sync_engine.dispose()
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--max-concurrency", type=int, default=64)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
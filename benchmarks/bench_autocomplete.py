@@ -0,0 +1,72 @@
+"""
+Benchmark: as-you-type autocomplete.
+
+Fills a database with ``--contacts`` generated contacts, builds the
+autocomplete index and times completions of one- to four-character name
+prefixes and of phone prefixes, then ``suggest`` end to end (which checks
+the data revision first) and service writes that update the index in place.
+
+Usage::
+
+    python -m benchmarks.bench_autocomplete [--contacts 1000000] [--queries 5000]
+"""
+
+import argparse
+import random
+import time
+from functools import partial
+
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import FIRST_NAMES, LAST_NAMES, populated_engine, time_per_call
+from src.services.autocomplete import get_autocomplete
+from src.services.contact_service import suggest, update_contact
+from src.utils.similarity import fold
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--contacts", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    engine = populated_engine(args.contacts)
+    names = [fold(name) for name in FIRST_NAMES + LAST_NAMES]
+
+    with sessionmaker(bind=engine)() as db:
+        index = get_autocomplete(db)
+        start = time.perf_counter()
+        index.refresh(db)
+        build = time.perf_counter() - start
+        print(
+            f"{args.contacts} contacts, {len(index)} tokens "
+            f"({index.dropped} dropped): build {build:.1f} s"
+        )
+
+        for length in (1, 2, 4):
+            prefixes = [rng.choice(names)[:length] for _ in range(args.queries)]
+            completions = map(partial(index.complete, k=8), prefixes)
+            per_call = time_per_call(partial(next, completions), args.queries)
+            print(f"  complete, {length}-letter name prefix: {per_call:.1f} us")
+        phones = iter(f"+49151{rng.randrange(10**4):04d}" for _ in range(args.queries))
+        per_call = time_per_call(lambda: index.complete(next(phones), 8), args.queries)
+        print(f"  complete, phone prefix: {per_call:.1f} us")
+
+        per_call = time_per_call(lambda: suggest(db, "mu"), 200)
+        print(f"  suggest (revision check + complete): {per_call / 1000:.2f} ms")
+
+        ids = iter(rng.sample(range(1, args.contacts + 1), 200))
+        per_call = time_per_call(
+            lambda: update_contact(db, next(ids), {"first_name": "Zoë"}), 200
+        )
+        print(
+            f"  update_contact with index maintenance: {per_call / 1000:.2f} ms, "
+            f"{index.rebuilds} build(s) in total"
+        )
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark: scalar vs. column-wise phone and email validation.
+
+Normalizes and validates the phone and email columns of generated rows,
+once with the scalar functions per row and once with ``check_phones`` /
+``check_emails`` on a list and on a pyarrow array.
+
+Usage::
+
+    python -m benchmarks.bench_batch_validation [--rows 1000000]
+"""
+
+import argparse
+import time
+
+import pyarrow as pa
+
+from benchmarks.common import generate_rows
+from src.utils.batch_validation import check_emails, check_phones
+from src.utils.validation import (
+    normalize_email,
+    normalize_phone,
+    validate_email,
+    validate_phone,
+)
+
+
+def scalar(phones: list, emails: list) -> None:
+    """Validate both columns row by row."""
+    for phone in phones:
+        normalize_phone(phone)
+        validate_phone(phone)
+    for email in emails:
+        normalize_email(email)
+        validate_email(email)
+
+
+def columnar(phones, emails) -> None:
+    """Validate both columns at once, building the messages of failures."""
+    for check in (check_phones(phones), check_emails(emails)):
+        for _ in check.failures():
+            pass
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rows = generate_rows(args.rows)
+    phones = [row["phone"] for row in rows]
+    emails = [row["email"] for row in rows]
+    # Some separators and failures, as in real files
+    for i in range(0, args.rows, 7):
+        phones[i] = f"+49 (151) {phones[i][6:]}"
+    for i in range(0, args.rows, 50):
+        phones[i] = "n/a"
+
+    print(f"{args.rows} phones + emails")
+    for label, run, column in (
+        ("scalar per row", scalar, list),
+        ("column (list)", columnar, list),
+        ("column (pyarrow)", columnar, lambda v: pa.array(v, type=pa.string())),
+    ):
+        phone_column, email_column = column(phones), column(emails)
+        start = time.perf_counter()
+        run(phone_column, email_column)
+        elapsed = time.perf_counter() - start
+        print(
+            f"  {label:<18} {elapsed * 1000:8.0f} ms {args.rows / elapsed:12.0f} rows/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: bulk import with and without Bloom-filter duplicate pre-checks.
+
+Imports mostly new rows (``--duplicates`` of them already exist) into a
+file database of ``--existing`` contacts, once with one IN lookup per
+chunk for every key and once with ``bloom=True``. Each run starts from a
+copy of the same database.
+
+Usage::
+
+    python -m benchmarks.bench_bloom_import [--existing 1000000] [--rows 200000]
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import generate_rows, populated_engine
+from src.services.import_service import KeyFilter, import_contacts
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--existing", type=int, default=1_000_000)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--duplicates", type=float, default=0.02)
+    args = parser.parse_args()
+
+    directory = Path(tempfile.mkdtemp())
+    source = directory / "source.db"
+    populated_engine(args.existing, f"sqlite:///{source}").dispose()
+    generated = generate_rows(args.existing + args.rows)
+    step = round(1 / args.duplicates) if args.duplicates else 0
+    rows = [
+        generated[i] if step and i % step == 0 else generated[args.existing + i]
+        for i in range(args.rows)
+    ]
+    print(f"{args.rows} rows into {args.existing} contacts")
+
+    for bloom in (False, True):
+        target = directory / f"bloom-{bloom}.db"
+        shutil.copy(source, target)
+        engine = create_engine(f"sqlite:///{target}")
+        with sessionmaker(bind=engine)() as db:
+            if bloom:
+                start = time.perf_counter()
+                KeyFilter.from_database(db)
+                build = time.perf_counter() - start
+                print(f"  filter build: {build * 1000:.0f} ms")
+            start = time.perf_counter()
+            summary = import_contacts(db, rows, workers=1, bloom=bloom)
+            elapsed = time.perf_counter() - start
+        engine.dispose()
+        print(
+            f"  bloom={str(bloom):<5} {elapsed * 1000:8.0f} ms "
+            f"{args.rows / elapsed:10.0f} rows/s  created {summary.created}, "
+            f"probed {summary.keys_probed} of {summary.keys_checked} keys, "
+            f"filters {summary.filter_bytes / 1024:.0f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: text categories vs. the categories lookup table.
+
+Fills a database with ``--contacts`` generated contacts, then copies them
+into a table laid out as before the categories table (the name of the
+category in an indexed text column). Prints the size of both tables and
+of their category indexes, and times the contacts per category and a
+page of one category in name order on both.
+
+Usage::
+
+    python -m benchmarks.bench_categories [--contacts 1000000] [--repeat 10]
+"""
+
+import argparse
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import populated_engine, time_per_call
+from src.crud import contacts as contact_crud
+from src.database.models import category_ids
+
+_TEXT_TABLE = [
+    "CREATE TABLE contacts_text AS SELECT contacts.*, categories.name AS category"
+    " FROM contacts LEFT JOIN categories ON categories.id = contacts.category_id",
+    "ALTER TABLE contacts_text DROP COLUMN category_id",
+    "CREATE INDEX ix_contacts_text_category ON contacts_text (category)",
+    "ANALYZE",
+]
+_TEXT_COUNTS = text("SELECT category, count(*) FROM contacts_text GROUP BY category")
+_TEXT_PAGE = text(
+    "SELECT id, first_name, last_name, phone, email, category FROM contacts_text"
+    " WHERE category = 'Work' ORDER BY lower(first_name), lower(last_name)"
+    " LIMIT 50 OFFSET 1000"
+)
+_SIZES = text("SELECT name, sum(pgsize) FROM dbstat GROUP BY name")
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--contacts", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    engine = populated_engine(args.contacts)
+    with engine.begin() as conn:
+        for statement in _TEXT_TABLE:
+            conn.exec_driver_sql(statement)
+        sizes = dict(conn.execute(_SIZES).tuples().all())
+    print(f"{args.contacts} contacts")
+    for label, table, index in [
+        ("text column", "contacts_text", "ix_contacts_text_category"),
+        ("category_id", "contacts", "ix_contacts_category_name_sort"),
+    ]:
+        print(
+            f"  {label}: table {sizes[table] / 2**20:.1f} MiB, "
+            f"category index {sizes[index] / 2**20:.1f} MiB"
+        )
+
+    with sessionmaker(bind=engine)() as db:
+        work = category_ids(db, ["Work"])["Work"]
+        for label, before, after in [
+            (
+                "counts per category",
+                lambda: db.execute(_TEXT_COUNTS).all(),
+                lambda: contact_crud.category_counts(db),
+            ),
+            (
+                "page of a category",
+                lambda: db.execute(_TEXT_PAGE).all(),
+                lambda: contact_crud.list_category_records(db, work, 1000, 50),
+            ),
+        ]:
+            text_ms = time_per_call(before, args.repeat) / 1000
+            id_ms = time_per_call(after, args.repeat) / 1000
+            print(f"  {label}: text {text_ms:.2f} ms, category_id {id_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark: full dumps vs. the change feed, and the cost of its triggers.
+
+Fills a database with ``--contacts`` generated contacts, then inserts,
+updates and deletes ``--changes`` contacts in total. Times what a mirror
+had to read before (every contact) against ``changes_since`` the sequence
+number taken before the changes. Then times a bulk insert of
+``--contacts`` rows with and without the change feed triggers.
+
+Usage::
+
+    python -m benchmarks.bench_changes [--contacts 1000000] [--changes 1000]
+"""
+
+import argparse
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import generate_rows, populated_engine, time_per_call
+from src.crud import contacts as contact_crud
+from src.database.db import Base
+from src.database.models import Contact
+from src.services import contact_service
+
+_DROP_TRIGGERS = [
+    "DROP TRIGGER contacts_change_insert",
+    "DROP TRIGGER contacts_change_update",
+    "DROP TRIGGER contacts_change_delete",
+]
+
+
+def make_changes(engine, count: int) -> None:
+    """Insert, update and delete ``count`` contacts in total (1:8:1)."""
+    inserts, deletes = count // 10, count // 10
+    rows = generate_rows(inserts, seed=7)
+    for i, row in enumerate(rows):
+        row["phone"] = f"+49160{i:07d}"
+        row["email"] = None
+    with engine.begin() as conn:
+        conn.execute(insert(Contact), contact_crud.with_category_ids(conn, rows))
+        conn.execute(
+            contact_crud.CONTACTS_UPDATE,
+            [
+                {"contact_id": i * 97 + 1, "first_name": "Changed"}
+                for i in range(count - inserts - deletes)
+            ],
+        )
+        conn.execute(
+            contact_crud.CONTACTS_DELETE, {"ids": [i * 89 + 2 for i in range(deletes)]}
+        )
+
+
+def time_bulk_insert(count: int, triggers: bool) -> float:
+    """Seconds to bulk insert ``count`` rows into an empty database."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    if not triggers:
+        with engine.begin() as conn:
+            for statement in _DROP_TRIGGERS:
+                conn.exec_driver_sql(statement)
+    rows = generate_rows(count)
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        conn.execute(insert(Contact), contact_crud.with_category_ids(conn, rows))
+    elapsed = time.perf_counter() - start
+    engine.dispose()
+    return elapsed
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--contacts", type=int, default=1_000_000)
+    parser.add_argument("--changes", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = populated_engine(args.contacts)
+    with sessionmaker(bind=engine)() as db:
+        since = contact_service.get_change_seq(db)
+    make_changes(engine, args.changes)
+    print(f"{args.contacts} contacts, {args.changes} changed")
+
+    with sessionmaker(bind=engine)() as db:
+        dump_ms = time_per_call(lambda: contact_crud.list_records(db), 1) / 1000
+        changes = contact_service.changes_since(db, since, args.contacts)
+        feed_ms = (
+            time_per_call(
+                lambda: list(contact_service.iter_changes(db, since)), args.repeat
+            )
+            / 1000
+        )
+    print(
+        f"  full dump: {dump_ms:.0f} ms, "
+        f"changes since {since}: {len(changes)} in {feed_ms:.2f} ms"
+    )
+
+    without = time_bulk_insert(args.contacts, triggers=False)
+    with_triggers = time_bulk_insert(args.contacts, triggers=True)
+    print(
+        f"  bulk insert: {without:.1f} s without triggers, "
+        f"{with_triggers:.1f} s with (+{with_triggers / without - 1:.0%})"
+    )
+
+
+if __name__ == "__main__":
+    main()
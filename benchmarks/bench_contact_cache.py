@@ -0,0 +1,70 @@
+"""
+Benchmark: contact cache hit path vs. direct query.
+
+Compares the per-call latency of ``crud.get_by_id`` / ``crud.get_by_phone``
+with the read-through cache in ``contact_service`` once the hot rows are
+cached.
+
+Usage::
+
+    python -m benchmarks.bench_contact_cache [--rows 10000] [--lookups 20000]
+"""
+
+import argparse
+import random
+
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import populated_engine, time_per_call
+from src.crud import contacts as contact_crud
+from src.services.contact_service import _find_by_phone, get_cache_stats, get_contact
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    parser.add_argument("--hot", type=int, default=500, help="number of hot rows")
+    args = parser.parse_args()
+
+    engine = populated_engine(args.rows)
+    db = sessionmaker(bind=engine)()
+    rng = random.Random(7)
+    hot_ids = rng.sample(range(1, args.rows + 1), args.hot)
+    hot_phones = [f"+49151{i - 1:07d}" for i in hot_ids]
+
+    def pick(seq):
+        return seq[rng.randrange(len(seq))]
+
+    # Warm the cache
+    for contact_id in hot_ids:
+        get_contact(db, contact_id)
+
+    results = {
+        "crud.get_by_id (direct)": time_per_call(
+            lambda: contact_crud.get_by_id(db, pick(hot_ids)), args.lookups
+        ),
+        "get_contact (cache hit)": time_per_call(
+            lambda: get_contact(db, pick(hot_ids)), args.lookups
+        ),
+        "crud.get_by_phone (direct)": time_per_call(
+            lambda: contact_crud.get_by_phone(db, pick(hot_phones)), args.lookups
+        ),
+        "phone lookup (cache hit)": time_per_call(
+            lambda: _find_by_phone(db, pick(hot_phones)), args.lookups
+        ),
+    }
+
+    print(f"{args.rows} contacts, {args.hot} hot rows, {args.lookups} lookups")
+    for name, micros in results.items():
+        print(f"  {name:<28} {micros:8.1f} µs/call")
+    stats = get_cache_stats(db)
+    print(f"  cache hit ratio: {stats.hit_ratio:.1%} ({stats.hits} hits)")
+
+    db.close()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
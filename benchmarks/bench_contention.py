@@ -0,0 +1,124 @@
+"""
+Contention harness: several processes writing to one database file.
+
+Every worker process opens its own engine on the same SQLite file and, for
+a fixed duration, adds contacts and updates random existing ones through
+``contact_service``. The run is repeated without retries (each lock error
+is a failed operation) and with the lock retry policy. Reports completed
+operations per second and the failure rate.
+
+Usage::
+
+    python -m benchmarks.bench_contention [--processes 2 4 8] [--seconds 3]
+        [--busy-timeout 0.05]
+"""
+
+import argparse
+import multiprocessing
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import populated_engine
+from src.database.retry import (
+    RetryPolicy,
+    is_lock_error,
+    reset_retry_stats,
+    retry_stats,
+    set_retry_policy,
+)
+from src.services import contact_service
+from src.services.contact_service import ContactServiceError
+
+
+def worker(
+    url: str, worker_id: int, args: argparse.Namespace, retry: bool, results
+) -> None:
+    """Write until the deadline and report (done, failed, retries)."""
+    engine = create_engine(url, connect_args={"timeout": args.busy_timeout})
+    session_local = sessionmaker(autoflush=False, bind=engine)
+    set_retry_policy(RetryPolicy() if retry else RetryPolicy(max_attempts=1))
+    reset_retry_stats()
+    rng = random.Random(worker_id)
+    done = failed = 0
+    deadline = time.monotonic() + args.seconds
+    i = 0
+    while time.monotonic() < deadline:
+        i += 1
+        with session_local() as db:
+            try:
+                if rng.random() < 0.7:
+                    contact_service.add_contact(
+                        db,
+                        {
+                            "first_name": "Worker",
+                            "last_name": f"No{worker_id}",
+                            "phone": f"+4917{worker_id:02d}{i:07d}",
+                        },
+                    )
+                else:
+                    contact_service.update_contact(
+                        db,
+                        rng.randrange(1, args.rows + 1),
+                        {"category": rng.choice(["Family", "Work"])},
+                    )
+                done += 1
+            except OperationalError as exc:
+                if not is_lock_error(exc):
+                    raise
+                failed += 1
+            except ContactServiceError:
+                done += 1
+    engine.dispose()
+    results.put((done, failed, retry_stats().retries))
+
+
+def run(args: argparse.Namespace, processes: int, retry: bool) -> tuple:
+    """Run one contention round; return (ops/s, failure rate, retries)."""
+    url = f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}"
+    populated_engine(args.rows, url).dispose()
+
+    results: multiprocessing.Queue = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(target=worker, args=(url, n, args, retry, results))
+        for n in range(processes)
+    ]
+    for process in workers:
+        process.start()
+    totals = [results.get() for _ in workers]
+    for process in workers:
+        process.join()
+
+    done = sum(total[0] for total in totals)
+    failed = sum(total[1] for total in totals)
+    retries = sum(total[2] for total in totals)
+    return done / args.seconds, failed / max(done + failed, 1), retries
+
+
+def main() -> None:
+    """Parse the arguments and run the harness."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--processes", type=int, nargs="+", default=[2, 4, 8])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--rows", type=int, default=1_000)
+    parser.add_argument("--busy-timeout", type=float, default=0.05)
+    args = parser.parse_args()
+
+    print(f"{args.seconds:g}s of writes per round, busy timeout {args.busy_timeout:g}s")
+    print(f"  {'procs':>5} {'retry':>6} {'ops/s':>8} {'failed':>8} {'retries':>8}")
+    for processes in args.processes:
+        for retry in (False, True):
+            rate, failure_rate, retries = run(args, processes, retry)
+            print(
+                f"  {processes:>5} {'on' if retry else 'off':>6} {rate:8.0f} "
+                f"{failure_rate:8.1%} {retries:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: fuzzy duplicate detection time and recall, and merge throughput.
+
+Generates ``--rows`` contacts plus 1% near-duplicates of random ones
+(a letter dropped from the first name, the phone reformatted to a national
+number, the email on another domain) and runs ``find_duplicates``. Recall
+is the share of injected duplicates found in the cluster of their original.
+The clusters found are then merged with ``merge_contacts``.
+
+Usage::
+
+    python -m benchmarks.bench_duplicates [--rows 1000000] [--workers 1 4]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import generate_rows, populated_engine
+from src.crud.contacts import with_category_ids
+from src.database.models import Contact
+from src.services.duplicate_service import find_duplicates, merge_contacts
+
+
+def near_duplicate(row: dict, rng: random.Random) -> dict:
+    """A slightly different copy of a generated row."""
+    first = row["first_name"]
+    cut = rng.randrange(1, len(first)) if len(first) > 2 else len(first)
+    email = row["email"]
+    return {
+        **row,
+        "first_name": first[:cut] + first[cut + 1 :],
+        "phone": "0" + row["phone"][3:],
+        "email": email.replace("@", "@alt.") if email else None,
+    }
+
+
+def recall(clusters: list, expected: set[tuple[int, int]]) -> float:
+    """Share of the expected pairs that ended up in the same cluster."""
+    cluster_of = {i: cluster for cluster in clusters for i in cluster.ids}
+    found = sum(
+        1 for a, b in expected if a in cluster_of and cluster_of[a] is cluster_of.get(b)
+    )
+    return found / len(expected)
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=sorted({1, os.cpu_count() or 1})
+    )
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    url = f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}"
+    engine = populated_engine(args.rows, url)
+    rows = generate_rows(args.rows)
+    originals = rng.sample(range(args.rows), args.rows // 100)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Contact),
+            with_category_ids(conn, [near_duplicate(rows[i], rng) for i in originals]),
+        )
+    # IDs are assigned in insertion order
+    expected = {(i + 1, args.rows + n + 1) for n, i in enumerate(originals)}
+    print(f"{args.rows} contacts + {len(originals)} near-duplicates")
+
+    for workers in args.workers:
+        with sessionmaker(bind=engine)() as db:
+            start = time.perf_counter()
+            clusters = find_duplicates(db, workers=workers)
+            elapsed = time.perf_counter() - start
+        print(
+            f"  workers={workers:<3} {elapsed:8.1f} s  {len(clusters)} clusters, "
+            f"recall {recall(clusters, expected):.1%}"
+        )
+
+    with sessionmaker(bind=engine)() as db:
+        start = time.perf_counter()
+        summary = merge_contacts(db, clusters)
+        elapsed = time.perf_counter() - start
+    print(
+        f"  merge: {len(summary.survivors)} clusters in {elapsed * 1000:.0f} ms "
+        f"({len(summary.survivors) / elapsed:.0f} clusters/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark: contacts by email domain and domain counts.
+
+Fills a database with ``--contacts`` generated contacts and compares the
+email scans that answered "who is at acme.com?" before (a ``LIKE`` over
+every email, and a GROUP BY over an expression of the email) with the
+queries over the indexed ``email_domain`` column. Then drops the column
+values and times the batched backfill that fills them in again.
+
+Usage::
+
+    python -m benchmarks.bench_email_domains [--contacts 1000000] [--repeat 20]
+"""
+
+import argparse
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import populated_engine, time_per_call
+from src.crud import contacts as contact_crud
+from src.database.migrations import backfill_email_domains
+from src.database.models import Contact
+
+_SCAN_FILTER = Contact.email.like("%@acme.com")
+_SCAN_COUNT = select(func.count()).where(_SCAN_FILTER)
+_SCAN_PAGE = select(Contact.id).where(_SCAN_FILTER).order_by(Contact.id).limit(50)
+_DOMAIN = func.substr(Contact.email, func.instr(Contact.email, "@") + 1)
+_SCAN_COUNTS = (
+    select(_DOMAIN, func.count()).where(Contact.email.is_not(None)).group_by(_DOMAIN)
+)
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--contacts", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = populated_engine(args.contacts)
+    print(f"{args.contacts} contacts")
+    with sessionmaker(bind=engine)() as db:
+        for label, scan, indexed in [
+            (
+                "count",
+                lambda: db.scalar(_SCAN_COUNT),
+                lambda: contact_crud.count_domain(db, "acme.com"),
+            ),
+            (
+                "first page",
+                lambda: db.scalars(_SCAN_PAGE).all(),
+                lambda: contact_crud.list_domain_records(db, "acme.com", 0, 50),
+            ),
+            (
+                "counts per domain",
+                lambda: db.execute(_SCAN_COUNTS).all(),
+                lambda: contact_crud.domain_counts(db),
+            ),
+        ]:
+            before = time_per_call(scan, args.repeat) / 1000
+            after = time_per_call(indexed, args.repeat) / 1000
+            print(f"  {label}: scan {before:.2f} ms, email_domain {after:.2f} ms")
+
+    with engine.begin() as conn:
+        conn.execute(Contact.__table__.update().values(email_domain=None))
+    start = time.perf_counter()
+    scanned = backfill_email_domains(engine, batch_size=10_000)
+    print(f"  backfill of {scanned} contacts: {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
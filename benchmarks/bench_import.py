@@ -0,0 +1,87 @@
+"""
+Benchmark: bulk import throughput by number of validation processes.
+
+Imports generated rows (about 2% invalid) into a fresh file database,
+once per worker count, and compares with calling ``add_contact`` per row.
+Validation alone is timed as well, since it is the part that scales with
+cores; the database writer stays in the main process.
+
+Usage::
+
+    python -m benchmarks.bench_import [--rows 200000] [--workers 1 2 4]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import generate_rows
+from src.database.db import Base
+from src.services import contact_service
+from src.services.contact_service import ContactServiceError
+from src.services.import_service import import_contacts, iter_checked_chunks
+
+
+def make_rows(count: int) -> list[dict]:
+    """Generated rows with every 50th phone made invalid."""
+    rows = generate_rows(count)
+    for row in rows[::50]:
+        row["phone"] = "n/a"
+    return rows
+
+
+def fresh_session():
+    """Session on a new, empty file database."""
+    url = f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autoflush=False, bind=engine)()
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=sorted({1, 2, os.cpu_count() or 1})
+    )
+    parser.add_argument(
+        "--per-row", type=int, default=10_000, help="rows of the add_contact baseline"
+    )
+    args = parser.parse_args()
+    rows = make_rows(args.rows)
+    print(f"{args.rows} rows, {os.cpu_count()} CPU(s) (rows/s)")
+
+    baseline = rows[: args.per_row]
+    with fresh_session() as db:
+        start = time.perf_counter()
+        for row in baseline:
+            try:
+                contact_service.add_contact(db, row)
+            except ContactServiceError:
+                pass
+        rate = len(baseline) / (time.perf_counter() - start)
+    print(f"  add_contact per row ({len(baseline)} rows): {rate:10.0f}")
+
+    print(f"  {'workers':>7} {'validate':>10} {'import':>10}")
+    for workers in args.workers:
+        start = time.perf_counter()
+        for _ in iter_checked_chunks(rows, workers):
+            pass
+        validate_rate = args.rows / (time.perf_counter() - start)
+
+        with fresh_session() as db:
+            start = time.perf_counter()
+            summary = import_contacts(db, rows, workers)
+            import_rate = args.rows / (time.perf_counter() - start)
+        assert summary.total == args.rows
+        print(f"  {workers:>7} {validate_rate:10.0f} {import_rate:10.0f}")
+
+
+if __name__ == "__main__":
+    main()
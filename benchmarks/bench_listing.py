@@ -0,0 +1,75 @@
+"""
+Benchmark: ORM listing vs. read-only record listing.
+
+Compares ``crud.get_all`` (tracked ORM ``Contact`` instances) with
+``crud.list_records`` (slotted ``ContactRecord`` snapshots) on hydration
+time and peak Python memory, as reported by ``tracemalloc``.
+
+Usage::
+
+    python -m benchmarks.bench_listing [--rows 100000] [--repeat 3]
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from collections.abc import Callable
+
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import populated_engine
+from src.crud import contacts as contact_crud
+
+
+def measure(make_session, func: Callable, repeat: int) -> tuple[float, float]:
+    """
+    Return the best wall time (ms) and the peak traced memory (MiB) of a listing.
+
+    Every run uses a fresh session so the identity map starts empty.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        db = make_session()
+        start = time.perf_counter()
+        func(db)
+        best = min(best, time.perf_counter() - start)
+        db.close()
+
+    gc.collect()
+    db = make_session()
+    tracemalloc.start()
+    rows = func(db)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del rows
+    db.close()
+    return best * 1e3, peak / 2**20
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = populated_engine(args.rows)
+    make_session = sessionmaker(bind=engine)
+
+    results = {
+        "crud.get_all (ORM)": measure(make_session, contact_crud.get_all, args.repeat),
+        "crud.list_records": measure(
+            make_session, contact_crud.list_records, args.repeat
+        ),
+    }
+
+    print(f"Listing {args.rows} contacts (best of {args.repeat})")
+    for name, (millis, mib) in results.items():
+        print(f"  {name:<20} {millis:9.1f} ms  {mib:8.1f} MiB peak")
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
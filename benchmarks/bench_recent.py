@@ -0,0 +1,86 @@
+"""
+Benchmark: recently added contacts by OFFSET, by sort, and by keyset.
+
+Fills a database with ``--contacts`` generated contacts created over three
+years, then times the first page of the most recently added contacts
+without the ``created_at`` index (a sort of the whole table) and with it,
+and a page ``--depth`` contacts deep by LIMIT/OFFSET and by continuing
+from the cursor of the previous page (``list_recent_contacts``).
+
+Usage::
+
+    python -m benchmarks.bench_recent [--contacts 1000000] [--depth 100000]
+"""
+
+import argparse
+
+from sqlalchemy import Integer, bindparam
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import populated_engine, spread_created_at, time_per_call
+from src.crud import contacts as contact_crud
+from src.database.models import Contact
+from src.services import contact_service
+
+_OFFSET_PAGE = contact_crud.RECENT_RECORDS["created", False].offset(
+    bindparam("offset", type_=Integer)
+)
+_PAGE = 20
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--contacts", type=int, default=1_000_000)
+    parser.add_argument("--depth", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = populated_engine(args.contacts)
+    spread_created_at(engine)
+    index = next(i for i in Contact.__table__.indexes if i.name.endswith("created_at"))
+    print(f"{args.contacts} contacts")
+
+    with sessionmaker(bind=engine)() as db:
+
+        def first_page():
+            return contact_service.list_recent_contacts(db, "created", _PAGE)
+
+        index.drop(bind=db.connection())
+        sort_ms = time_per_call(first_page, 3) / 1000
+        index.create(bind=db.connection())
+        db.commit()
+        first_ms = time_per_call(first_page, args.repeat) / 1000
+        print(
+            f"  first page: sort {sort_ms:.1f} ms, created_at index {first_ms:.2f} ms"
+        )
+
+        # The cursor of the page before the deep one
+        rows = contact_crud.list_recent_records(db, "created", args.depth)
+        cursor = (rows[-1][0], rows[-1][1].id)
+        offset_ms = (
+            time_per_call(
+                lambda: db.execute(
+                    _OFFSET_PAGE, {"limit": _PAGE, "offset": args.depth}
+                ).all(),
+                args.repeat,
+            )
+            / 1000
+        )
+        keyset_ms = (
+            time_per_call(
+                lambda: contact_service.list_recent_contacts(
+                    db, "created", _PAGE, cursor
+                ),
+                args.repeat,
+            )
+            / 1000
+        )
+        print(
+            f"  page at {args.depth}: OFFSET {offset_ms:.2f} ms, "
+            f"keyset {keyset_ms:.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark: prebuilt statements vs. per-call ``db.query`` construction.
+
+Compares the per-call overhead of the crud lookups and search with the
+equivalent legacy ``Query`` objects that are rebuilt on every call, and
+prints the compiled statement cache hit ratio of the run.
+
+Usage::
+
+    python -m benchmarks.bench_statements [--rows 10000] [--calls 5000]
+"""
+
+import argparse
+import random
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import populated_engine, time_per_call
+from src.crud import contacts as contact_crud
+from src.database.models import Contact
+from src.utils.profiling import install_statement_cache_counter, statement_cache_stats
+
+
+def query_by_id(db, contact_id):
+    """Legacy primary-key lookup through ``db.query``."""
+    return db.query(Contact).filter(Contact.id == contact_id).first()
+
+
+def query_by_phone(db, phone):
+    """Legacy phone lookup through ``db.query``."""
+    return db.query(Contact).filter(Contact.phone == phone).first()
+
+
+def query_search(db, query, categories):
+    """Legacy search building its filters on every call."""
+    pattern = f"%{query}%"
+    return (
+        db.query(Contact)
+        .filter(
+            and_(
+                or_(
+                    Contact.first_name.ilike(pattern),
+                    Contact.last_name.ilike(pattern),
+                    Contact.phone.ilike(pattern),
+                    Contact.email.ilike(pattern),
+                ),
+                Contact.category.in_(categories),
+            )
+        )
+        .all()
+    )
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--calls", type=int, default=5_000)
+    args = parser.parse_args()
+
+    install_statement_cache_counter()
+    engine = populated_engine(args.rows)
+    db = sessionmaker(bind=engine)()
+    rng = random.Random(7)
+
+    def pick_id():
+        return rng.randrange(1, args.rows + 1)
+
+    def pick_phone():
+        return f"+49151{rng.randrange(args.rows):07d}"
+
+    # Keep the identity map warm for the primary-key lookups (it holds
+    # weak references, so the loaded contacts must stay referenced)
+    loaded = contact_crud.get_all(db)
+
+    pairs = {
+        "lookup by id": (
+            lambda: query_by_id(db, pick_id()),
+            lambda: contact_crud.get_by_id(db, pick_id()),
+        ),
+        "lookup by phone": (
+            lambda: query_by_phone(db, pick_phone()),
+            lambda: contact_crud.get_by_phone(db, pick_phone()),
+        ),
+        "search (no match)": (
+            lambda: query_search(db, "zzz", ["Work"]),
+            lambda: contact_crud.search(db, "zzz", ["Work"]),
+        ),
+    }
+
+    print(f"{args.rows} contacts, {args.calls} calls per query")
+    print(f"  {'':<20} {'db.query':>12} {'prebuilt':>12}")
+    for name, (before, after) in pairs.items():
+        before_us = time_per_call(before, args.calls)
+        after_us = time_per_call(after, args.calls)
+        print(f"  {name:<20} {before_us:9.1f} µs {after_us:9.1f} µs")
+
+    stats = statement_cache_stats(engine)
+    print(
+        f"  compiled cache hit ratio: {stats.hit_ratio:.1%} "
+        f"({stats.hits} hits, {stats.misses} misses)"
+    )
+
+    del loaded
+    db.close()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
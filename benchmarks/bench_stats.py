@@ -0,0 +1,86 @@
+"""
+Benchmark: contact statistics from indexed aggregates and the stats cache.
+
+Fills a database with ``--contacts`` generated contacts created over three
+years, then compares counting in Python over every contact (what a page
+without the aggregates had to do) with each indexed aggregate, and times
+``get_contact_stats`` on the first load and on a load at an unchanged
+data revision.
+
+Usage::
+
+    python -m benchmarks.bench_stats [--contacts 1000000] [--repeat 5]
+"""
+
+import argparse
+import time
+from collections import Counter
+from functools import partial
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import populated_engine, spread_created_at, time_per_call
+from src.crud import contacts as contact_crud
+from src.database.models import Contact
+from src.services import contact_service
+
+_ALL_FIELDS = select(
+    Contact.first_name,
+    Contact.last_name,
+    Contact.email,
+    Contact.email_domain,
+    Contact.category_id,
+    Contact.created_at,
+)
+
+
+def count_in_python(db) -> Counter:
+    """Count categories, domains, days and missing fields over every contact."""
+    counts: Counter = Counter()
+    for first, last, email, domain, category_id, created_at in db.execute(_ALL_FIELDS):
+        counts[("category", category_id)] += 1
+        counts[("domain", domain)] += 1
+        counts[("day", created_at.date())] += 1
+        counts["no email"] += email is None
+        counts["no first name"] += not first
+        counts["no last name"] += not last
+    return counts
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--contacts", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = populated_engine(args.contacts)
+    spread_created_at(engine)
+    print(f"{args.contacts} contacts")
+
+    with sessionmaker(bind=engine)() as db:
+        scan_ms = time_per_call(lambda: count_in_python(db), 1) / 1000
+        print(f"  all counts in Python over every contact: {scan_ms:.1f} ms")
+        for label, aggregate in [
+            ("total", contact_crud.count),
+            ("per category", contact_crud.category_counts),
+            ("per domain", contact_crud.domain_counts),
+            ("created per day", contact_crud.created_per_day),
+            ("missing fields", contact_crud.missing_field_counts),
+        ]:
+            ms = time_per_call(partial(aggregate, db), args.repeat) / 1000
+            print(f"  {label}: {ms:.2f} ms")
+
+        start = time.perf_counter()
+        contact_service.get_contact_stats(db)
+        print(f"  stats, first load: {(time.perf_counter() - start) * 1000:.1f} ms")
+        cached_ms = (
+            time_per_call(lambda: contact_service.get_contact_stats(db), args.repeat)
+            / 1000
+        )
+        print(f"  stats, unchanged revision: {cached_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
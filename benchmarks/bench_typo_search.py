@@ -0,0 +1,142 @@
+"""
+Benchmark: typo-tolerant name search.
+
+Fills a database with ``--contacts`` contacts whose names are drawn from
+a large generated vocabulary, builds the SymSpell name index and times
+lookups of words with one and two typos, then the fallback alone and
+``search_contacts`` end to end (whose exact search scans the phones and
+emails for the substring before falling back).
+
+Usage::
+
+    python -m benchmarks.bench_typo_search [--contacts 1000000] [--queries 2000]
+"""
+
+import argparse
+import random
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.database.db import Base
+from src.database.models import Contact
+from src.services.contact_service import search_contacts
+from src.services.name_index import get_name_index, typo_search
+
+CONSONANTS = "bcdfghjklmnprstvwz"
+VOWELS = "aeiouy"
+
+
+def make_names(count: int, rng: random.Random) -> list[str]:
+    """Generate distinct, pronounceable names of two to four syllables."""
+    names: set[str] = set()
+    while len(names) < count:
+        syllables = rng.randint(2, 4)
+        name = "".join(
+            rng.choice(CONSONANTS) + rng.choice(VOWELS) for _ in range(syllables)
+        )
+        if rng.random() < 0.5:
+            name += rng.choice(CONSONANTS)
+        names.add(name.title())
+    return sorted(names)
+
+
+def typo(word: str, edits: int, rng: random.Random) -> str:
+    """Apply random substitutions, deletions, insertions or transpositions."""
+    for _ in range(edits):
+        i = rng.randrange(len(word) - 1)
+        kind = rng.randrange(4)
+        letter = rng.choice("abcdefghijklmnopqrstuvwxyz")
+        if kind == 0:
+            word = word[:i] + letter + word[i + 1 :]
+        elif kind == 1:
+            word = word[:i] + word[i + 1 :]
+        elif kind == 2:
+            word = word[:i] + letter + word[i:]
+        else:
+            word = word[:i] + word[i + 1] + word[i] + word[i + 2 :]
+    return word
+
+
+def percentile(values: list[float], share: float) -> float:
+    """Value below which ``share`` of the sorted values fall."""
+    return sorted(values)[min(int(len(values) * share), len(values) - 1)]
+
+
+def fill_database(engine, contacts: int, rng: random.Random) -> list[str]:
+    """Insert contacts with generated names; return the last names."""
+    first_names, last_names = make_names(5_000, rng), make_names(50_000, rng)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Contact),
+            [
+                {
+                    "first_name": rng.choice(first_names),
+                    "last_name": rng.choice(last_names),
+                    "phone": f"+49151{i:07d}",
+                }
+                for i in range(contacts)
+            ],
+        )
+        conn.exec_driver_sql("ANALYZE")
+    return last_names
+
+
+def time_lookups(index, names: list[str], queries: int, rng: random.Random) -> None:
+    """Time lookups of names with one and two typos."""
+    for edits in (1, 2):
+        times, hits = [], 0
+        for _ in range(queries):
+            name = rng.choice(names).lower()
+            word = typo(name, edits, rng)
+            start = time.perf_counter()
+            suggestions = index.lookup(word)
+            times.append((time.perf_counter() - start) * 1e6)
+            hits += any(s.term == name for s in suggestions)
+        print(
+            f"  lookup, {edits} typo(s): mean {sum(times) / len(times):.0f} us, "
+            f"p99 {percentile(times, 0.99):.0f} us, "
+            f"{hits / queries:.0%} find the name"
+        )
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--contacts", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    last_names = fill_database(engine, args.contacts, rng)
+
+    with sessionmaker(bind=engine)() as db:
+        index = get_name_index(db)
+        start = time.perf_counter()
+        index.refresh(db)
+        build = time.perf_counter() - start
+        print(
+            f"{args.contacts} contacts, {len(index.words)} words, "
+            f"{len(index.words.deletes)} deletes: build {build:.1f} s"
+        )
+        time_lookups(index, last_names, args.queries, rng)
+
+        queries = [typo(rng.choice(last_names), 1, rng) for _ in range(100)]
+        for label, search in (
+            ("typo_search fallback", lambda q: typo_search(db, q, [])),
+            ("search_contacts (exact + fallback)", lambda q: search_contacts(db, q)),
+        ):
+            start = time.perf_counter()
+            for query in queries:
+                search(query)
+            elapsed = (time.perf_counter() - start) / len(queries)
+            print(f"  {label}: {elapsed * 1000:.1f} ms per query")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
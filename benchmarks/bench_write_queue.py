@@ -0,0 +1,99 @@
+"""
+Benchmark: per-write commits vs. the single-writer queue (group commit).
+
+Concurrent writer threads add contacts to a file database, once each
+committing its own transaction on its own session (the default) and once
+through a ``WriteCoordinator`` that commits everything pending together.
+Reports writes/s, "database is locked" failures and the mean batch size.
+
+Usage::
+
+    python -m benchmarks.bench_write_queue [--writes 2000] [--timeout 5]
+"""
+
+import argparse
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import populated_engine
+from src.services import contact_service
+from src.services.write_coordinator import WriteCoordinator
+
+
+def contact_data(i: int) -> dict:
+    """Valid data of a new contact that does not collide with the seed rows."""
+    return {"first_name": "Writer", "last_name": f"No{i}", "phone": f"+49170{i:07d}"}
+
+
+def run_direct(session_factory, writes: int, threads: int) -> tuple[float, int, float]:
+    """Every write commits on its own session; return (writes/s, locked, 1.0)."""
+    locked = 0
+
+    def write(i):
+        nonlocal locked
+        with session_factory() as db:
+            try:
+                contact_service.add_contact(db, contact_data(i))
+            except OperationalError:
+                locked += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(write, range(writes)))
+    return writes / (time.perf_counter() - start), locked, 1.0
+
+
+def run_queued(session_factory, writes: int, threads: int) -> tuple[float, int, float]:
+    """Writes go through one coordinator; return (writes/s, locked, mean batch)."""
+    coordinator = WriteCoordinator(session_factory)
+    locked = 0
+
+    def write(i):
+        nonlocal locked
+        try:
+            coordinator.submit(contact_service.add_contact, contact_data(i)).result()
+        except OperationalError:
+            locked += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(write, range(writes)))
+    elapsed = time.perf_counter() - start
+    coordinator.close()
+    return writes / elapsed, locked, coordinator.stats().mean_batch_size
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000)
+    parser.add_argument("--writes", type=int, default=2_000)
+    parser.add_argument(
+        "--timeout", type=float, default=5.0, help="sqlite busy timeout (s)"
+    )
+    args = parser.parse_args()
+
+    print(f"{args.writes} inserts per run (writes/s, locked errors, mean batch)")
+    print(f"  {'threads':>7} {'mode':>8} {'writes/s':>10} {'locked':>7} {'batch':>7}")
+    for threads in (1, 8, 32):
+        for mode, run in (("direct", run_direct), ("queued", run_queued)):
+            url = f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}"
+            populated_engine(args.rows, url).dispose()
+            engine = create_engine(
+                url,
+                connect_args={"check_same_thread": False, "timeout": args.timeout},
+            )
+            session_factory = sessionmaker(autoflush=False, bind=engine)
+            rate, locked, batch = run(session_factory, args.writes, threads)
+            print(f"  {threads:>7} {mode:>8} {rate:10.0f} {locked:>7} {batch:7.1f}")
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Shared helpers for the benchmark scripts.
+"""
+
+import random
+import time
+from collections.abc import Callable
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import StaticPool
+
+from src.crud.contacts import with_category_ids
+from src.database.db import Base
+from src.database.models import Contact
+
+FIRST_NAMES = ["Alice", "Bob", "José", "Jürgen", "Li", "Maria", "Noah", "Zoë"]
+LAST_NAMES = ["Müller", "Smith", "García", "Nguyen", "Schmidt", "Doe", "Brown"]
+DOMAINS = ["example.com", "acme.com", "mail.de", "corp.io"]
+CATEGORIES = ["Family", "Friends", "Work", "Other"]
+
+
+def generate_rows(count: int, seed: int = 42) -> list[dict]:
+    """Generate deterministic contact rows with unique phones and emails."""
+    rng = random.Random(seed)
+    return [
+        {
+            "first_name": rng.choice(FIRST_NAMES),
+            "last_name": rng.choice(LAST_NAMES),
+            "phone": f"+49151{i:07d}",
+            "email": f"user{i}@{rng.choice(DOMAINS)}" if rng.random() < 0.8 else None,
+            "category": rng.choice(CATEGORIES),
+        }
+        for i in range(count)
+    ]
+
+
+def populated_engine(count: int, url: str = "sqlite://") -> Engine:
+    """Create a database with ``count`` generated contacts."""
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool if url == "sqlite://" else None,
+    )
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Contact), with_category_ids(conn, generate_rows(count)))
+        conn.exec_driver_sql("ANALYZE")
+    return engine
+
+
+def spread_created_at(engine: Engine, days: int = 1096) -> None:
+    """Spread creation and update times over ``days`` days from 2023, by id."""
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "UPDATE contacts SET created_at = datetime('2023-01-01',"
+            f" '+' || (id * {int(days)} / (SELECT max(id) + 1 FROM contacts))"
+            " || ' days', '+' || (id % 86400) || ' seconds')"
+        )
+        conn.exec_driver_sql("UPDATE contacts SET updated_at = created_at")
+        conn.exec_driver_sql("ANALYZE")
+
+
+def time_per_call(func: Callable[[], object], repeat: int) -> float:
+    """Return the mean wall time of ``func`` in microseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
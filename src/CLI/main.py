@@ -4,8 +4,19 @@ Main CLI module for Contact Book application.
 This module provides a command-line interface for managing contacts
 with features like adding, deleting, updating, searching, and listing contacts.
 Uses Rich library for enhanced terminal output.
+
+Run with ``--profile`` (or ``CONTACT_BOOK_PROFILE=1``) to write a cProfile,
+collapsed-stack and allocation report for the session, with
+``--import-csv FILE`` to bulk-import contacts, with ``--find-duplicates``
+to list probable duplicate contacts, or with ``--changes-since SEQ`` to
+print the change feed as JSON lines instead of opening the menu.
 """
 
+import argparse
+import itertools
+import json
+from dataclasses import asdict
+
 from rich.console import Console
 from rich.prompt import Confirm, IntPrompt, Prompt
 from rich.table import Table
@@ -13,16 +24,37 @@ from sqlalchemy import inspect
 from sqlalchemy.orm import Session
 
 # pylint: disable=wrong-import-position
+from src.config import DEDUP_THRESHOLD, PROFILE_DIR, PROFILE_ENABLED
 from src.database.db import SessionLocal, engine
+from src.database.init import ensure_database_initialized
 from src.services.contact_service import (
     ContactServiceError,
     add_contact,
     delete_contact,
     get_contact,
+    get_contacts,
+    iter_changes,
+    list_categories,
     list_contacts,
     search_contacts,
     update_contact,
 )
+from src.services.duplicate_service import (
+    MergeStrategy,
+    find_duplicates,
+    merge_contacts,
+)
+from src.services.import_service import import_csv
+from src.utils.profiling import Profiler, profile_action
+
+# Labels used for the per-action sections of the allocation report
+MENU_ACTIONS = {
+    1: "List all contacts",
+    2: "Add new contact",
+    3: "Search contacts",
+    4: "Edit contact",
+    5: "Delete contact",
+}
 
 
 def check_database_initialized() -> bool:
@@ -82,9 +114,7 @@ def add_new_contact(db: Session) -> None:
     last_name = Prompt.ask("Last name", default="")
     phone = Prompt.ask("Phone")
     email = Prompt.ask("Email", default="")
-    category = Prompt.ask(
-        "Category", choices=["Family", "Friends", "Work", "Other"], default="Other"
-    )
+    category = Prompt.ask("Category", choices=list_categories(db), default="Other")
 
     try:
         add_contact(
@@ -184,7 +214,7 @@ def edit_contact_prompt(db: Session) -> None:
     email = Prompt.ask("Email", default=contact.email or "")
     category = Prompt.ask(
         "Category",
-        choices=["Family", "Friends", "Work", "Other"],
+        choices=list_categories(db),
         default=contact.category or "Other",
         case_sensitive=False,
     )
@@ -227,31 +257,244 @@ def main_menu() -> int:
     return IntPrompt.ask("Choose an option", choices=["1", "2", "3", "4", "5", "6"])
 
 
-def main() -> None:
+def main(profiler: Profiler | None = None) -> None:
     """
     Main function to run the Contact Book CLI application.
+
+    :param profiler: Optional profiler recording allocations per menu action
+    :type profiler: Profiler | None
     """
     db = SessionLocal()
 
     while True:
         choice = main_menu()
 
-        if choice == 1:
-            show_contacts(db)
-        elif choice == 2:
-            add_new_contact(db)
-        elif choice == 3:
-            search_contact(db)
-        elif choice == 4:
-            edit_contact_prompt(db)
-        elif choice == 5:
-            delete_contact_prompt(db)
-        elif choice == 6:
+        if choice == 6:
             console.print("[bold green]👋 Goodbye![/bold green]")
             break
 
+        with profile_action(profiler, MENU_ACTIONS[choice]):
+            if choice == 1:
+                show_contacts(db)
+            elif choice == 2:
+                add_new_contact(db)
+            elif choice == 3:
+                search_contact(db)
+            elif choice == 4:
+                edit_contact_prompt(db)
+            elif choice == 5:
+                delete_contact_prompt(db)
+
+
+def import_file(path: str, workers: int | None = None, bloom: bool = False) -> None:
+    """
+    Import contacts from a CSV file and print a summary.
+
+    :param path: CSV file with a header line (first_name, last_name, phone,
+                 email, category)
+    :type path: str
+    :param workers: Number of validation processes (default: automatic)
+    :type workers: int | None
+    :param bloom: Pre-check duplicates with Bloom filters
+    :type bloom: bool
+    """
+    with SessionLocal() as db:
+        summary = import_csv(db, path, workers, bloom)
+
+    console.print(
+        f"[bold green]✅ Imported {summary.created} of {summary.total} "
+        "contact(s).[/bold green]"
+    )
+    for row in summary.rejected[:20]:
+        # Line numbers count the header line
+        console.print(f"[red]❌ Line {row.index + 2}: {' '.join(row.errors)}[/red]")
+    if len(summary.rejected) > 20:
+        console.print(f"[red]… and {len(summary.rejected) - 20} more.[/red]")
+    if bloom:
+        console.print(
+            f"[dim]Duplicate checks: {summary.keys_probed} of "
+            f"{summary.keys_checked} key(s) looked up "
+            f"({summary.probe_reduction:.0%} skipped), "
+            f"Bloom filters {summary.filter_bytes / 1024:.0f} KiB[/dim]"
+        )
+
+
+def show_duplicates(
+    threshold: float = DEDUP_THRESHOLD,
+    workers: int | None = None,
+    limit: int = 50,
+    merge: MergeStrategy | None = None,
+) -> None:
+    """
+    Find probable duplicate contacts and print one table per cluster;
+    optionally merge the printed clusters, each into one contact, after
+    asking for confirmation.
+
+    :param threshold: Minimum similarity score of a duplicate pair (0 to 1)
+    :type threshold: float
+    :param workers: Number of scoring processes (default: automatic)
+    :type workers: int | None
+    :param limit: Maximum number of clusters printed (and merged)
+    :type limit: int
+    :param merge: Survivorship rule to merge the clusters with (no merge
+                  if None)
+    :type merge: MergeStrategy | None
+    """
+    with SessionLocal() as db:
+        clusters = find_duplicates(db, threshold, workers)
+        if not clusters:
+            console.print("[green]No duplicate contacts found.[/green]")
+            return
+        shown = clusters[:limit]
+        records = {c.id: c for c in get_contacts(db, [i for k in shown for i in k.ids])}
+
+        for number, cluster in enumerate(shown, start=1):
+            table = Table(
+                title=f"Cluster {number} ({cluster.confidence:.0%} confidence)"
+            )
+            table.add_column("ID", style="cyan", justify="right")
+            table.add_column("Name", style="bold")
+            table.add_column("Phone", style="green")
+            table.add_column("Email")
+            for contact_id in cluster.ids:
+                c = records[contact_id]
+                table.add_row(
+                    str(c.id), f"{c.first_name} {c.last_name}", c.phone, c.email or "-"
+                )
+            console.print(table)
+        console.print(
+            f"[bold yellow]{len(clusters)} cluster(s) of probable duplicates."
+            "[/bold yellow]"
+        )
+        if len(clusters) > limit:
+            console.print(f"[yellow]… only the first {limit} are shown.[/yellow]")
+
+        # Only the clusters the user has seen are merged
+        if not merge or not shown:
+            return
+        losers = sum(len(cluster.ids) - 1 for cluster in shown)
+        if not Confirm.ask(
+            f"Merge the {len(shown)} cluster(s) shown, deleting {losers} contact(s)?"
+        ):
+            console.print("[yellow]Nothing merged.[/yellow]")
+            return
+        summary = merge_contacts(db, shown, merge)
+
+    console.print(
+        f"[bold green]✅ Merged {len(summary.survivors)} cluster(s): "
+        f"{summary.deleted} contact(s) deleted, {summary.updated} "
+        "updated.[/bold green]"
+    )
+
+
+def print_changes(since: int, limit: int | None = None) -> None:
+    """
+    Print the contacts inserted, updated or deleted after a sequence number,
+    one JSON object per line in sequence order (``seq``, ``op``,
+    ``contact_id`` and ``contact``, null for a deletion).
+
+    :param since: Sequence number of the last change already applied
+    :type since: int
+    :param limit: Maximum number of changes printed (default: all)
+    :type limit: int | None
+    """
+    with SessionLocal() as db:
+        for change in itertools.islice(iter_changes(db, since), limit):
+            print(json.dumps(asdict(change), ensure_ascii=False))
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """
+    Parse the command-line arguments of the CLI.
+
+    :param argv: Argument list (defaults to ``sys.argv[1:]``)
+    :return: Parsed arguments
+    :rtype: argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(description="Contact Book CLI")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        default=PROFILE_ENABLED,
+        help="profile the session (also enabled by CONTACT_BOOK_PROFILE=1)",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default=PROFILE_DIR,
+        help="directory for the pstats, flamegraph and allocation reports",
+    )
+    parser.add_argument(
+        "--import-csv",
+        metavar="FILE",
+        help="import contacts from a CSV file and exit",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="processes of --import-csv / --find-duplicates (default: automatic)",
+    )
+    parser.add_argument(
+        "--bloom",
+        action="store_true",
+        help="pre-check duplicates of --import-csv with Bloom filters",
+    )
+    parser.add_argument(
+        "--find-duplicates",
+        action="store_true",
+        help="list probable duplicate contacts and exit",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEDUP_THRESHOLD,
+        help="minimum similarity (0-1) of --find-duplicates pairs",
+    )
+    parser.add_argument(
+        "--merge",
+        type=MergeStrategy,
+        choices=list(MergeStrategy),
+        metavar="{" + ",".join(strategy.value for strategy in MergeStrategy) + "}",
+        help="merge the --find-duplicates clusters shown (after confirmation), "
+        "keeping the oldest, newest or most complete contact",
+    )
+    parser.add_argument(
+        "--changes-since",
+        type=int,
+        metavar="SEQ",
+        help="print the changes after sequence number SEQ as JSON lines and exit",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="maximum number of --changes-since changes (default: all)",
+    )
+    return parser.parse_args(argv)
+
+
+def run_profiled(profile_dir: str) -> None:
+    """
+    Run the CLI session under the profiler and report the written files.
+
+    :param profile_dir: Directory where the reports are written
+    :type profile_dir: str
+    """
+    profiler = Profiler(profile_dir, name="cli")
+    with profiler.session():
+        main(profiler)
+
+    console.print("[dim]Profile written to:[/dim]")
+    for path in (
+        profiler.pstats_path,
+        profiler.collapsed_path,
+        profiler.allocations_path,
+    ):
+        console.print(f"[dim] • {path}[/dim]")
+
 
 if __name__ == "__main__":
+    args = parse_args()
     if not check_database_initialized():
         print(
             """
@@ -260,6 +503,16 @@ if __name__ == "__main__":
             `python -m src.init_db`
             """
         )
-
     else:
-        main()
+        # Bring a database of an earlier version up to the current schema
+        ensure_database_initialized()
+        if args.import_csv:
+            import_file(args.import_csv, args.workers, args.bloom)
+        elif args.changes_since is not None:
+            print_changes(args.changes_since, args.limit)
+        elif args.find_duplicates:
+            show_duplicates(args.threshold, args.workers, merge=args.merge)
+        elif args.profile:
+            run_profiled(args.profile_dir)
+        else:
+            main()
@@ -0,0 +1,4 @@
+"""Contact Book API Package
+Contains the local HTTP JSON API over the contact service."""
+
+__version__ = "1.0.0"
@@ -0,0 +1,35 @@
+"""
+Run the local HTTP API with uvicorn.
+
+Usage::
+
+    python -m src.api [--host 127.0.0.1] [--port 8000]
+"""
+
+import argparse
+
+import uvicorn
+
+from src.api.app import create_app
+from src.config import API_HOST, API_PORT
+from src.database.init import ensure_database_initialized
+from src.services.write_coordinator import get_write_coordinator
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Parse the arguments, make sure the database exists and serve the API."""
+    parser = argparse.ArgumentParser(description="Contact Book HTTP API")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    args = parser.parse_args(argv)
+
+    ensure_database_initialized()
+    uvicorn.run(
+        create_app(write_coordinator=get_write_coordinator()),
+        host=args.host,
+        port=args.port,
+    )
+
+
+if __name__ == "__main__":
+    main()
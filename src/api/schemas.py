@@ -0,0 +1,147 @@
+"""
+API Schemas Module
+
+Pydantic request and response models of the HTTP API. Contacts are
+returned as ``ContactRecord`` dataclasses, which pydantic serializes
+directly.
+"""
+
+from pydantic import BaseModel, Field
+
+from src.config import API_MAX_BATCH
+from src.database.models import ContactRecord
+
+
+class ContactIn(BaseModel):
+    """Fields of a new contact."""
+
+    first_name: str = ""
+    last_name: str = ""
+    phone: str = ""
+    email: str | None = None
+    category: str | None = None
+
+
+class ContactUpdate(BaseModel):
+    """Changed fields of a contact; omitted fields stay unchanged."""
+
+    first_name: str | None = None
+    last_name: str | None = None
+    phone: str | None = None
+    email: str | None = None
+    category: str | None = None
+
+
+class ContactList(BaseModel):
+    """A list of contacts."""
+
+    items: list[ContactRecord]
+
+
+class ContactPage(ContactList):
+    """One page of the contact list."""
+
+    total: int
+    offset: int
+    limit: int
+
+
+class DomainCount(BaseModel):
+    """Number of contacts at one email domain."""
+
+    domain: str
+    count: int
+
+
+class DomainCounts(BaseModel):
+    """Email domains with the most contacts."""
+
+    items: list[DomainCount]
+
+
+class CategoryCount(BaseModel):
+    """Number of contacts in one category."""
+
+    category: str
+    count: int
+
+
+class CategoryCounts(BaseModel):
+    """Every category with its number of contacts."""
+
+    items: list[CategoryCount]
+
+
+class ChangeItem(BaseModel):
+    """A contact inserted, updated or deleted after the requested number."""
+
+    seq: int
+    op: str
+    contact_id: int
+    contact: ContactRecord | None
+
+
+class ChangeFeed(BaseModel):
+    """Changes in sequence order, and the ``since`` of the next request."""
+
+    items: list[ChangeItem]
+    next_since: int
+
+
+class BatchGetResult(ContactList):
+    """Contacts found by a batch get, plus the ids that do not exist."""
+
+    missing: list[int]
+
+
+class ContactChanges(BaseModel):
+    """
+    Changes to apply to one contact; with the version they were made against
+    they are rejected if the contact has a newer version.
+    """
+
+    id: int
+    changes: ContactUpdate
+    version: int | None = None
+
+
+class BatchCreateRequest(BaseModel):
+    """Contacts to create."""
+
+    items: list[ContactIn] = Field(max_length=API_MAX_BATCH)
+
+
+class BatchUpdateRequest(BaseModel):
+    """Contacts to update."""
+
+    items: list[ContactChanges] = Field(max_length=API_MAX_BATCH)
+
+
+class BatchDeleteRequest(BaseModel):
+    """Ids of the contacts to delete."""
+
+    ids: list[int] = Field(max_length=API_MAX_BATCH)
+
+
+class ItemError(BaseModel):
+    """Errors of one rejected batch item, by its index in the request."""
+
+    index: int
+    errors: list[str]
+
+
+class BatchWriteResult(ContactList):
+    """Contacts written by a batch create/update, and the rejected items."""
+
+    errors: list[ItemError]
+
+
+class BatchDeleteResult(BaseModel):
+    """
+    Ids deleted by a batch delete, the ids that did not exist, and the ids of
+    contacts another writer changed while they were being deleted.
+    """
+
+    deleted: list[int]
+    missing: list[int]
+    conflicts: list[int] = []
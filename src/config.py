@@ -20,3 +20,100 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATABASE_URL = os.getenv(
     "DATABASE_URL", f"sqlite:///{os.path.join(BASE_DIR, 'database/contacts.db')}"
 )
+
+# Async (aiosqlite) variant of DATABASE_URL, used by the asyncio stack.
+ASYNC_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL", DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+)
+
+# Rows per transaction of the data backfills of schema migrations.
+MIGRATION_BATCH_SIZE = int(os.getenv("CONTACT_BOOK_MIGRATION_BATCH_SIZE", "5000"))
+
+# SQLite busy timeout (seconds): how long a connection waits for another
+# writer's lock before failing with "database is locked".
+SQLITE_BUSY_TIMEOUT = float(os.getenv("CONTACT_BOOK_BUSY_TIMEOUT", "5"))
+
+# Retry policy of service writes that still fail on a locked database
+# (jittered exponential backoff, bounded by attempts and a deadline).
+RETRY_MAX_ATTEMPTS = int(os.getenv("CONTACT_BOOK_RETRY_ATTEMPTS", "5"))
+RETRY_BASE_DELAY = float(os.getenv("CONTACT_BOOK_RETRY_BASE_DELAY", "0.05"))
+RETRY_MAX_DELAY = float(os.getenv("CONTACT_BOOK_RETRY_MAX_DELAY", "1"))
+RETRY_DEADLINE = float(os.getenv("CONTACT_BOOK_RETRY_DEADLINE", "15"))
+
+# Profiling mode.
+# CONTACT_BOOK_PROFILE=1 profiles every CLI session / Streamlit rerun
+# (same as ``--profile`` on the CLI) and writes the reports to PROFILE_DIR.
+PROFILE_ENABLED = os.getenv("CONTACT_BOOK_PROFILE", "0").lower() in {"1", "true"}
+PROFILE_DIR = os.getenv("CONTACT_BOOK_PROFILE_DIR", "profiles")
+# Minimum seconds between two dumps of a Streamlit session's reports
+PROFILE_DUMP_INTERVAL = float(os.getenv("CONTACT_BOOK_PROFILE_DUMP_INTERVAL", "10"))
+
+# Hidden Streamlit debug panel with the timing breakdown of the last rerun.
+# It can also be opened per browser session with the ``?debug=1`` query param.
+DEBUG_PANEL_ENABLED = os.getenv("CONTACT_BOOK_DEBUG", "0").lower() in {"1", "true"}
+
+# Maximum number of contact snapshots kept by the in-process read-through cache.
+CONTACT_CACHE_SIZE = int(os.getenv("CONTACT_CACHE_SIZE", "1024"))
+
+# Local HTTP API (``python -m src.api``); bound to localhost by default.
+API_HOST = os.getenv("CONTACT_BOOK_API_HOST", "127.0.0.1")
+API_PORT = int(os.getenv("CONTACT_BOOK_API_PORT", "8000"))
+# Maximum number of items per page / batch request.
+API_MAX_BATCH = int(os.getenv("CONTACT_BOOK_API_MAX_BATCH", "500"))
+
+# Write coordinator: service writes of the UI and the API are queued to one
+# writer thread that commits everything pending in a single transaction.
+WRITE_QUEUE_ENABLED = os.getenv("CONTACT_BOOK_WRITE_QUEUE", "0").lower() in {
+    "1",
+    "true",
+}
+# Maximum number of writes committed together.
+WRITE_QUEUE_MAX_BATCH = int(os.getenv("CONTACT_BOOK_WRITE_QUEUE_MAX_BATCH", "256"))
+
+# Bulk import: rows are validated in chunks; from IMPORT_PARALLEL_THRESHOLD
+# rows on, the chunks are validated by IMPORT_WORKERS processes.
+IMPORT_CHUNK_SIZE = int(os.getenv("CONTACT_BOOK_IMPORT_CHUNK_SIZE", "5000"))
+IMPORT_PARALLEL_THRESHOLD = int(
+    os.getenv("CONTACT_BOOK_IMPORT_PARALLEL_THRESHOLD", "50000")
+)
+IMPORT_WORKERS = int(os.getenv("CONTACT_BOOK_IMPORT_WORKERS", str(os.cpu_count() or 1)))
+# False-positive rate of the Bloom filters of ``import_contacts(bloom=True)``
+IMPORT_BLOOM_ERROR_RATE = float(
+    os.getenv("CONTACT_BOOK_IMPORT_BLOOM_ERROR_RATE", "0.01")
+)
+
+# Duplicate detection: pairs scoring at least DEDUP_THRESHOLD (0-1) are
+# duplicates. Blocks of more than DEDUP_MAX_BLOCK contacts only compare each
+# contact with the next DEDUP_WINDOW ones in name order. From
+# DEDUP_PARALLEL_THRESHOLD contacts on, blocks are scored by DEDUP_WORKERS
+# processes.
+DEDUP_THRESHOLD = float(os.getenv("CONTACT_BOOK_DEDUP_THRESHOLD", "0.85"))
+DEDUP_MAX_BLOCK = int(os.getenv("CONTACT_BOOK_DEDUP_MAX_BLOCK", "200"))
+DEDUP_WINDOW = int(os.getenv("CONTACT_BOOK_DEDUP_WINDOW", "10"))
+DEDUP_PARALLEL_THRESHOLD = int(
+    os.getenv("CONTACT_BOOK_DEDUP_PARALLEL_THRESHOLD", "50000")
+)
+DEDUP_WORKERS = int(os.getenv("CONTACT_BOOK_DEDUP_WORKERS", str(os.cpu_count() or 1)))
+
+# Typo-tolerant search: when a search finds nothing, query words are
+# corrected to indexed name words within TYPO_MAX_DISTANCE edits, and up
+# to TYPO_MAX_CANDIDATES corrected queries are run. The in-memory index
+# is rebuilt once TYPO_REBUILD_FRACTION of its words may be stale.
+TYPO_MAX_DISTANCE = int(os.getenv("CONTACT_BOOK_TYPO_MAX_DISTANCE", "2"))
+TYPO_MAX_CANDIDATES = int(os.getenv("CONTACT_BOOK_TYPO_MAX_CANDIDATES", "5"))
+TYPO_REBUILD_FRACTION = float(os.getenv("CONTACT_BOOK_TYPO_REBUILD_FRACTION", "0.1"))
+
+# Autocomplete: an in-memory index of at most AUTOCOMPLETE_MAX_TOKENS name,
+# email and phone tokens with up to AUTOCOMPLETE_MAX_IDS contact ids each.
+# Completions are the AUTOCOMPLETE_K most frequent of the first
+# AUTOCOMPLETE_SCAN tokens starting with the typed prefix.
+AUTOCOMPLETE_MAX_TOKENS = int(
+    os.getenv("CONTACT_BOOK_AUTOCOMPLETE_MAX_TOKENS", "500000")
+)
+AUTOCOMPLETE_MAX_IDS = int(os.getenv("CONTACT_BOOK_AUTOCOMPLETE_MAX_IDS", "16"))
+AUTOCOMPLETE_SCAN = int(os.getenv("CONTACT_BOOK_AUTOCOMPLETE_SCAN", "256"))
+AUTOCOMPLETE_K = int(os.getenv("CONTACT_BOOK_AUTOCOMPLETE_K", "8"))
+
+# Change feed: number of changes read per query by ``iter_changes`` (the
+# CLI's --changes-since), and returned per page by default.
+CHANGE_FEED_BATCH = int(os.getenv("CONTACT_BOOK_CHANGE_FEED_BATCH", "1000"))
@@ -0,0 +1,172 @@
+"""
+Async Contact Repository Module
+
+This module mirrors ``src.crud.contacts`` for ``AsyncSession`` callers.
+It executes the same prebuilt statements, so both stacks share their
+query shapes and SQLAlchemy's compiled cache.
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from src.crud.contacts import (
+    ALL_CONTACTS,
+    ALL_RECORDS,
+    BY_EMAIL,
+    BY_PHONE,
+    SEARCH,
+    SEARCH_RECORDS,
+    search_params,
+)
+from src.crud.query_compiler import compile_query
+from src.database.models import Contact, ContactRecord
+from src.utils.search_query import SearchQuery
+
+
+async def create(db: AsyncSession, contact: Contact) -> Contact:
+    """
+    Create a new contact in the database.
+
+    :param db: SQLAlchemy async session object.
+    :param contact: Contact instance to be added.
+    :return: The persisted Contact object.
+    """
+    db.add(contact)
+    await db.commit()
+    await db.refresh(contact)
+    return contact
+
+
+async def get_all(db: AsyncSession) -> list[Contact]:
+    """
+    Retrieve all contacts from the database, ordered by name.
+
+    :param db: SQLAlchemy async session object.
+    :return: List of Contact objects.
+    """
+    return list(await db.scalars(ALL_CONTACTS))
+
+
+async def list_records(db: AsyncSession) -> list[ContactRecord]:
+    """
+    Retrieve all contacts as read-only records, ordered by name.
+
+    :param db: SQLAlchemy async session object.
+    :return: List of ContactRecord objects.
+    """
+    return [ContactRecord(*row) for row in await db.execute(ALL_RECORDS)]
+
+
+async def get_by_id(db: AsyncSession, contact_id: int) -> Contact | None:
+    """
+    Retrieve a contact by its ID, consulting the identity map first.
+
+    :param db: SQLAlchemy async session object.
+    :param contact_id: Unique identifier of the contact.
+    :return: Contact object if found, otherwise None.
+    """
+    return await db.get(Contact, contact_id)
+
+
+async def get_by_phone(db: AsyncSession, phone: str) -> Contact | None:
+    """
+    Retrieve a contact by its phone number.
+
+    :param db: SQLAlchemy async session object.
+    :param phone: Phone number of the contact.
+    :return: Contact object if found, otherwise None.
+    """
+    return (await db.scalars(BY_PHONE, {"phone": phone})).first()
+
+
+async def get_by_email(db: AsyncSession, email: str) -> Contact | None:
+    """
+    Retrieve a contact by its email address.
+
+    :param db: SQLAlchemy async session object.
+    :param email: Email address of the contact.
+    :return: Contact object if found, otherwise None.
+    """
+    return (await db.scalars(BY_EMAIL, {"email": email})).first()
+
+
+async def update(
+    db: AsyncSession, contact: Contact, expected_version: int | None = None
+) -> Contact:
+    """
+    Update an existing contact in the database (see ``contacts.update``).
+
+    :param db: SQLAlchemy async session object.
+    :param contact: Contact instance with updated fields.
+    :param expected_version: Version the changes were made against.
+    :raises StaleDataError: If the contact was changed or deleted since.
+    :return: The updated Contact object.
+    """
+    if expected_version is not None:
+        set_committed_value(contact, "version", expected_version)
+    await db.commit()
+    await db.refresh(contact)
+    return contact
+
+
+async def delete(db: AsyncSession, contact: Contact) -> None:
+    """
+    Delete a contact from the database.
+
+    :param db: SQLAlchemy async session object.
+    :param contact: Contact instance to be removed.
+    :return: None
+    """
+    await db.delete(contact)
+    await db.commit()
+
+
+async def search(
+    db: AsyncSession, query: str, categories: list[str], phonetic: bool = False
+) -> list[Contact]:
+    """
+    Search contacts by free-text query and optional category filters.
+
+    :param db: SQLAlchemy async session object.
+    :param query: Free-text search query (matched against first name, last name,
+                phone, and email).
+    :param categories: List of category names to filter contacts.
+                    If empty, no category filter is applied.
+    :param phonetic: Match names that sound like the query words instead
+                     (see ``src.crud.contacts.search``).
+    :return: List of Contact objects matching the search criteria.
+    """
+    shape, params = search_params(query, categories, phonetic)
+    return list(await db.scalars(SEARCH[shape], params))
+
+
+async def search_records(
+    db: AsyncSession, query: str, categories: list[str], phonetic: bool = False
+) -> list[ContactRecord]:
+    """
+    Search contacts like ``search`` and return read-only records.
+
+    :param db: SQLAlchemy async session object.
+    :param query: Free-text search query.
+    :param categories: List of category names to filter contacts.
+    :param phonetic: Match names that sound like the query words instead.
+    :return: List of ContactRecord objects matching the search criteria.
+    """
+    shape, params = search_params(query, categories, phonetic)
+    rows = await db.execute(SEARCH_RECORDS[shape], params)
+    return [ContactRecord(*row) for row in rows]
+
+
+async def search_query_records(
+    db: AsyncSession, query: SearchQuery, categories: list[str]
+) -> list[ContactRecord]:
+    """
+    Search contacts with a parsed query and return read-only records.
+
+    :param db: SQLAlchemy async session object.
+    :param query: Parsed search query.
+    :param categories: Categories to filter by in addition to ``cat:`` terms.
+    :return: List of ContactRecord objects matching every term.
+    """
+    rows = await db.execute(compile_query(query, categories).statement)
+    return [ContactRecord(*row) for row in rows]
@@ -0,0 +1,36 @@
+"""
+Category Repository Module
+
+Read operations on the ``categories`` lookup table. Categories are added
+on demand when a contact is written with a new name (``category_ids``)
+and never renamed or deleted, so the largest id is a revision of the
+whole table.
+"""
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.database.models import Category
+
+CATEGORIES = select(Category.id, Category.name).order_by(Category.id)
+REVISION = select(func.max(Category.id))
+
+
+def list_all(db: Session) -> list[tuple[int, str]]:
+    """
+    Retrieve every category, in the order they were added.
+
+    :param db: SQLAlchemy session object.
+    :return: ``(id, name)`` pairs.
+    """
+    return [tuple(row) for row in db.execute(CATEGORIES)]
+
+
+def revision(db: Session) -> int:
+    """
+    Return a number that changes whenever a category is added.
+
+    :param db: SQLAlchemy session object.
+    :return: Largest category id (0 without categories).
+    """
+    return db.execute(REVISION).scalar() or 0
@@ -0,0 +1,71 @@
+"""
+Change Feed Repository Module
+
+Read operations of the change feed: the contacts inserted or updated after
+a sequence number (``contacts.change_seq``) and the contacts deleted after
+it (``contact_tombstones``), each in sequence order from its
+``change_seq`` index. The numbers are given out by the triggers of
+``src.database.models``, so the feed covers every write, ORM or Core.
+"""
+
+from sqlalchemy import Integer, bindparam, select
+from sqlalchemy.orm import Session
+
+from src.crud.contacts import RECORD_COLUMNS
+from src.database.models import ChangeSequence, Contact, ContactRecord, ContactTombstone
+
+_SINCE = bindparam("since", type_=Integer)
+_LIMIT = bindparam("limit", type_=Integer)
+CHANGED_RECORDS = (
+    select(Contact.change_seq, Contact.created_seq, *RECORD_COLUMNS)
+    .where(Contact.change_seq > _SINCE)
+    .order_by(Contact.change_seq)
+    .limit(_LIMIT)
+)
+DELETED = (
+    select(ContactTombstone.change_seq, ContactTombstone.contact_id)
+    .where(ContactTombstone.change_seq > _SINCE)
+    .order_by(ContactTombstone.change_seq)
+    .limit(_LIMIT)
+)
+LATEST = select(ChangeSequence.seq)
+
+
+def list_changed_records(
+    db: Session, since: int, limit: int
+) -> list[tuple[int, int, ContactRecord]]:
+    """
+    Retrieve the contacts inserted or updated after a sequence number.
+
+    :param db: SQLAlchemy session object.
+    :param since: Sequence number of the last change already seen.
+    :param limit: Maximum number of contacts to return.
+    :return: ``(change_seq, created_seq, record)`` triples in sequence order.
+    """
+    params = {"since": since, "limit": limit}
+    return [
+        (row[0], row[1], ContactRecord(*row[2:]))
+        for row in db.execute(CHANGED_RECORDS, params)
+    ]
+
+
+def list_deleted(db: Session, since: int, limit: int) -> list[tuple[int, int]]:
+    """
+    Retrieve the ids of the contacts deleted after a sequence number.
+
+    :param db: SQLAlchemy session object.
+    :param since: Sequence number of the last change already seen.
+    :param limit: Maximum number of ids to return.
+    :return: ``(change_seq, contact_id)`` pairs in sequence order.
+    """
+    return [tuple(row) for row in db.execute(DELETED, {"since": since, "limit": limit})]
+
+
+def latest(db: Session) -> int:
+    """
+    Return the sequence number of the last change.
+
+    :param db: SQLAlchemy session object.
+    :return: Last sequence number given out (0 before the first change).
+    """
+    return db.execute(LATEST).scalar() or 0
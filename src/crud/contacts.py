@@ -6,12 +6,306 @@ for the Contact model using SQLAlchemy ORM.
 It abstracts database
 interactions and ensures a clean separation between business logic
 and persistence layer.
+
+Listings return immutable ``ContactRecord`` rows from prebuilt statements;
+ORM ``Contact`` objects are reserved for edits. In a group-commit batch
+(``db.info["defer_commit"]``) writes only flush.
 """
 
-from sqlalchemy import and_, func, or_
+from collections.abc import Callable, Iterator
+from datetime import datetime
+from itertools import islice, product
+
+from sqlalchemy import (
+    DateTime,
+    Integer,
+    Select,
+    String,
+    bindparam,
+    func,
+    insert,
+    select,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from src.database.models import (
+    Category,
+    ChangeSequence,
+    Contact,
+    ContactRecord,
+    category_ids,
+    name_keys,
+)
+from src.utils.similarity import double_metaphone, fold
+from src.utils.validation import email_domain
+
+# Columns of ``ContactRecord``, in field order
+RECORD_COLUMNS = (
+    Contact.id,
+    Contact.first_name,
+    Contact.last_name,
+    Contact.phone,
+    Contact.email,
+    Contact.category,
+    Contact.version,
+)
+
+# Case-insensitive name ordering (served by ix_contacts_name_sort)
+NAME_ORDER = (func.lower(Contact.first_name), func.lower(Contact.last_name))
+
+# ------------------------------------------------------------
+# Prebuilt statements (shared with ``async_contacts``)
+# ------------------------------------------------------------
+ALL_CONTACTS = select(Contact).order_by(*NAME_ORDER)
+ALL_RECORDS = select(*RECORD_COLUMNS).order_by(*NAME_ORDER)
+PAGE_RECORDS = ALL_RECORDS.limit(bindparam("limit", type_=Integer)).offset(
+    bindparam("offset", type_=Integer)
+)
+RECORDS_BY_IDS = select(*RECORD_COLUMNS).where(
+    Contact.id.in_(bindparam("ids", expanding=True))
+)
+COUNT = select(func.count()).select_from(Contact)
+# The change sequence: taken by the triggers of every insert, update and
+# delete, ORM or Core (one row, read by its primary key)
+REVISION = select(ChangeSequence.seq).where(ChangeSequence.id == 1)
+CONTACTS_INSERT = insert(Contact.__table__)
+# Merges: executemany UPDATE (SET columns come from the parameter keys,
+# and a new version, so open edits of the contacts conflict) and set-based
+# DELETE
+CONTACTS_UPDATE = (
+    Contact.__table__.update()
+    .where(Contact.id == bindparam("contact_id"))
+    .values(version=Contact.__table__.c.version + 1)
+)
+CONTACTS_DELETE = Contact.__table__.delete().where(
+    Contact.id.in_(bindparam("ids", expanding=True))
+)
+RECORDS_WITH_UPDATED_AT = select(*RECORD_COLUMNS, Contact.updated_at).where(
+    Contact.id.in_(bindparam("ids", expanding=True))
+)
+# IDs per IN list, well below SQLite's limit of bound parameters
+ID_CHUNK_SIZE = 10_000
+PHONES_IN = select(Contact.phone).where(
+    Contact.phone.in_(bindparam("phones", expanding=True))
+)
+EMAILS_IN = select(Contact.email).where(
+    Contact.email.in_(bindparam("emails", expanding=True))
+)
+KEYS = select(Contact.phone, Contact.email)
+ALL_RECORDS_UNORDERED = select(*RECORD_COLUMNS)
+NAME_KEYS = select(
+    Contact.id, Contact.search_key, Contact.change_seq, Contact.created_seq
+)
+# Served by ix_contacts_change_seq
+NAME_KEYS_SINCE = NAME_KEYS.where(Contact.change_seq > bindparam("since"))
+# Contacts at a domain, in id order (both served by ix_contacts_email_domain,
+# whose entries end with the rowid), and contacts per domain in domain order
+_DOMAIN = bindparam("domain", type_=String)
+DOMAIN_PAGE = (
+    select(*RECORD_COLUMNS)
+    .where(Contact.email_domain == _DOMAIN)
+    .order_by(Contact.id)
+    .limit(bindparam("limit", type_=Integer))
+    .offset(bindparam("offset", type_=Integer))
+)
+DOMAIN_COUNT = select(func.count()).where(Contact.email_domain == _DOMAIN)
+DOMAIN_COUNTS = (
+    select(Contact.email_domain, func.count())
+    .where(Contact.email_domain.is_not(None))
+    .group_by(Contact.email_domain)
+)
+# Contacts of a category in name order, and contacts per category (both
+# served by ix_contacts_category_name_sort, the counts without the table)
+_CATEGORY_ID = bindparam("category_id", type_=Integer)
+CATEGORY_PAGE = (
+    select(*RECORD_COLUMNS)
+    .where(Contact.category_id == _CATEGORY_ID)
+    .order_by(*NAME_ORDER)
+    .limit(bindparam("limit", type_=Integer))
+    .offset(bindparam("offset", type_=Integer))
+)
+CATEGORY_COUNT = select(func.count()).where(Contact.category_id == _CATEGORY_ID)
+CATEGORY_COUNTS = (
+    select(Contact.category_id, func.count())
+    .where(Contact.category_id.is_not(None))
+    .group_by(Contact.category_id)
+)
+# Contacts created per day, in day order (ix_contacts_created_day)
+CREATED_DAY = func.date(Contact.created_at)
+CREATED_PER_DAY = (
+    select(CREATED_DAY, func.count())
+    .where(CREATED_DAY.is_not(None))
+    .group_by(CREATED_DAY)
+)
+# Contacts without each optional field: one equality count per field,
+# each a range of the field's index
+MISSING_FIELDS = ("email", "first_name", "last_name", "category")
+MISSING_COUNTS = select(
+    select(func.count()).where(Contact.email.is_(None)).scalar_subquery(),
+    select(func.count()).where(Contact.first_name == "").scalar_subquery(),
+    select(func.count()).where(Contact.last_name == "").scalar_subquery(),
+    select(func.count()).where(Contact.category_id.is_(None)).scalar_subquery(),
+)
+# Contacts by recency, newest first, and contacts changed since a time,
+# oldest first. A page continues from the (timestamp, id) of the last row
+# of the previous one; the entries of the created_at and updated_at
+# indexes end with the id, so every page is one index range.
+RECENCY_COLUMNS = {"created": Contact.created_at, "updated": Contact.updated_at}
+_CURSOR = tuple_(
+    bindparam("cursor_at", type_=DateTime), bindparam("cursor_id", type_=Integer)
+)
+_LIMIT = bindparam("limit", type_=Integer)
+
+
+def _recent_records(column, after_cursor: bool) -> Select:
+    stmt = (
+        select(column, *RECORD_COLUMNS)
+        .where(column.is_not(None))
+        .order_by(column.desc(), Contact.id.desc())
+        .limit(_LIMIT)
+    )
+    return stmt.where(tuple_(column, Contact.id) < _CURSOR) if after_cursor else stmt
+
+
+RECENT_RECORDS = {
+    (by, after_cursor): _recent_records(column, after_cursor)
+    for by, column in RECENCY_COLUMNS.items()
+    for after_cursor in (False, True)
+}
+CHANGED_SINCE = (
+    select(Contact.updated_at, *RECORD_COLUMNS)
+    .where(tuple_(Contact.updated_at, Contact.id) > _CURSOR)
+    .order_by(Contact.updated_at, Contact.id)
+    .limit(_LIMIT)
+)
+BY_PHONE = select(Contact).where(Contact.phone == bindparam("phone")).limit(1)
+BY_EMAIL = select(Contact).where(Contact.email == bindparam("email")).limit(1)
+
+_PATTERN = bindparam("pattern", type_=String)
+_NAME_PATTERN = bindparam("name_pattern", type_=String)
+# Greater than any string that starts with the prefix
+_MAX_CHAR = "\U0010ffff"
+# Folded names containing the folded query, in "first last" or "last first"
+# order. A substring cannot use an index range, so each branch scans its
+# covering index instead of the table; UNION ALL because IN ignores
+# duplicate IDs anyway
+_NAME_BRANCHES = (
+    select(Contact.id).where(Contact.search_key.like(_NAME_PATTERN)),
+    select(Contact.id).where(Contact.search_key_reversed.like(_NAME_PATTERN)),
+)
+_QUERY_MATCH = Contact.id.in_(
+    union_all(
+        *_NAME_BRANCHES,
+        select(Contact.id).where(Contact.phone.ilike(_PATTERN)),
+        select(Contact.id).where(Contact.email.ilike(_PATTERN)),
+    )
+)
+_NAME_MATCH = Contact.id.in_(union_all(*_NAME_BRANCHES))
+
+
+def in_categories(stmt: Select, names) -> Select:
+    """
+    Restrict a statement to the contacts in any of the named categories.
+
+    A join rather than ``category_id IN (SELECT id ...)``: SQLite cannot
+    tell how many ids such a subquery returns and prefers a table scan,
+    while the join looks up the names first and then each id in
+    ``ix_contacts_category_name_sort``.
+    """
+    return stmt.join(Category, Category.id == Contact.category_id).where(
+        Category.name.in_(names)
+    )
+
+
+_CATEGORY_NAMES = bindparam("categories", type_=String, expanding=True)
+
+# Query words looked up by a phonetic search (first, middle, last name)
+PHONETIC_MAX_WORDS = 3
+PHONETIC_COLUMNS = (
+    Contact.first_name_phonetic,
+    Contact.first_name_phonetic_alt,
+    Contact.last_name_phonetic,
+    Contact.last_name_phonetic_alt,
+)
+
+
+def _phonetic_match(word: int):
+    """Contacts whose first or last name sounds like query word ``word``."""
+    codes = bindparam(f"codes_{word}", type_=String, expanding=True)
+    return Contact.id.in_(
+        union_all(
+            *(
+                select(Contact.id).where(column.in_(codes))
+                for column in PHONETIC_COLUMNS
+            )
+        )
+    )
 
-from src.database.models import Contact
+
+def _with_search_filters(
+    stmt: Select, has_query: bool, phonetic_words: int, has_categories: bool
+):
+    """Add the free-text, phonetic and/or category filters to a statement."""
+    if has_query:
+        stmt = stmt.where(_QUERY_MATCH)
+    for word in range(phonetic_words):
+        stmt = stmt.where(_phonetic_match(word))
+    if has_categories:
+        stmt = in_categories(stmt, _CATEGORY_NAMES)
+    return stmt
+
+
+# One statement per filter combination, keyed by
+# (has_query, phonetic_words, has_categories)
+SEARCH_SHAPES = [
+    (has_query, words, has_categories)
+    for has_query, words, has_categories in product(
+        (False, True), range(PHONETIC_MAX_WORDS + 1), (False, True)
+    )
+    if not (has_query and words)
+]
+SEARCH = {
+    shape: _with_search_filters(select(Contact), *shape) for shape in SEARCH_SHAPES
+}
+SEARCH_RECORDS = {
+    shape: _with_search_filters(select(*RECORD_COLUMNS), *shape)
+    for shape in SEARCH_SHAPES
+}
+# Name-only search, keyed by has_categories
+SEARCH_NAME_RECORDS = {
+    False: select(*RECORD_COLUMNS).where(_NAME_MATCH),
+    True: in_categories(select(*RECORD_COLUMNS).where(_NAME_MATCH), _CATEGORY_NAMES),
+}
+
+
+def _commit(db: Session) -> None:
+    """Commit, or only flush if the session's owner commits (group commit)."""
+    if db.info.get("defer_commit") is True:
+        db.flush()
+    else:
+        db.commit()
+
+
+def on_commit(db: Session, callback: Callable[[], object]) -> None:
+    """
+    Run a callback once the session's last write is committed.
+
+    In a group-commit batch the callback is queued in
+    ``db.info["after_commit"]`` for the owner of the session, which runs it
+    after the batch commits and drops it if the write or the batch is
+    rolled back; otherwise the write is already committed and it runs now.
+
+    :param db: SQLAlchemy session object.
+    :param callback: Function without arguments, e.g. a cache invalidation.
+    """
+    if db.info.get("defer_commit") is True:
+        db.info.setdefault("after_commit", []).append(callback)
+    else:
+        callback()
 
 
 def create(db: Session, contact: Contact) -> Contact:
@@ -23,7 +317,7 @@ def create(db: Session, contact: Contact) -> Contact:
     :return: The persisted Contact object.
     """
     db.add(contact)
-    db.commit()
+    _commit(db)
     db.refresh(contact)
     return contact
 
@@ -35,25 +329,394 @@ def get_all(db: Session) -> list[Contact]:
     :param db: SQLAlchemy session object.
     :return: List of Contact objects ordered by creation date (descending).
     """
-    return (
-        db.query(Contact)
-        .order_by(
-            func.lower(Contact.first_name),
-            func.lower(Contact.last_name),
-        )
-        .all()
+    return list(db.scalars(ALL_CONTACTS))
+
+
+def list_records(db: Session) -> list[ContactRecord]:
+    """
+    Retrieve all contacts as read-only records, ordered by name.
+
+    :param db: SQLAlchemy session object.
+    :return: List of ContactRecord objects.
+    """
+    return [ContactRecord(*row) for row in db.execute(ALL_RECORDS)]
+
+
+def list_records_page(db: Session, offset: int, limit: int) -> list[ContactRecord]:
+    """
+    Retrieve one page of read-only records, ordered by name.
+
+    :param db: SQLAlchemy session object.
+    :param offset: Number of contacts to skip.
+    :param limit: Maximum number of contacts to return.
+    :return: List of ContactRecord objects.
+    """
+    rows = db.execute(PAGE_RECORDS, {"offset": offset, "limit": limit})
+    return [ContactRecord(*row) for row in rows]
+
+
+def get_records_by_ids(db: Session, ids: list[int]) -> list[ContactRecord]:
+    """
+    Retrieve the contacts with the given IDs as read-only records.
+
+    :param db: SQLAlchemy session object.
+    :param ids: Unique identifiers of the contacts.
+    :return: List of ContactRecord objects, in no particular order.
+    """
+    if not ids:
+        return []
+    return [ContactRecord(*row) for row in db.execute(RECORDS_BY_IDS, {"ids": ids})]
+
+
+def count(db: Session) -> int:
+    """
+    Count all contacts.
+
+    :param db: SQLAlchemy session object.
+    :return: Number of contacts.
+    """
+    return db.execute(COUNT).scalar_one()
+
+
+def data_revision(db: Session) -> str:
+    """
+    Return a token that changes whenever the contacts table changes.
+
+    This is the number of the last change (``change_sequence.seq``), so it
+    also changes when a delete and an insert leave the count and the
+    largest id as they were, or when edits share a timestamp.
+
+    :param db: SQLAlchemy session object.
+    :return: Opaque revision string.
+    """
+    return str(db.execute(REVISION).scalar() or 0)
+
+
+def bulk_create(db: Session, rows: list[dict]) -> None:
+    """
+    Insert many contacts with one executemany, without loading ORM objects.
+
+    A Core insert on the table is used: the ORM bulk path splits the rows
+    into one statement per run of rows with the same NULL columns.
+
+    :param db: SQLAlchemy session object.
+    :param rows: Column values of the new contacts.
+    :return: None
+    """
+    if rows:
+        db.execute(CONTACTS_INSERT, with_category_ids(db, rows))
+    _commit(db)
+
+
+def with_category_ids(db: Session | Connection, rows: list[dict]) -> list[dict]:
+    """
+    Replace the ``category`` name of rows by its ``category_id``, adding
+    new categories, for Core statements on the contacts table (which
+    silently ignore a ``category`` key).
+
+    :param db: SQLAlchemy session object or connection.
+    :param rows: Column values, plus a ``category`` name.
+    :return: The rows with ``category_id`` instead (new dicts), or the
+             given rows if they have no ``category``.
+    """
+    if not rows or "category" not in rows[0]:
+        return rows
+    ids = category_ids(db, {row["category"] for row in rows})
+    return [
+        {
+            **{name: value for name, value in row.items() if name != "category"},
+            "category_id": ids.get(row["category"]),
+        }
+        for row in rows
+    ]
+
+
+def _id_chunks(ids: list[int]) -> Iterator[list[int]]:
+    iterator = iter(ids)
+    while chunk := list(islice(iterator, ID_CHUNK_SIZE)):
+        yield chunk
+
+
+def get_records_with_updated_at(
+    db: Session, ids: list[int]
+) -> list[tuple[ContactRecord, datetime | None]]:
+    """
+    Retrieve contacts as read-only records with their last update time.
+
+    :param db: SQLAlchemy session object.
+    :param ids: Unique identifiers of the contacts (any number).
+    :return: ``(record, updated_at)`` of the existing contacts, in no
+             particular order.
+    """
+    return [
+        (ContactRecord(*row[:-1]), row[-1])
+        for chunk in _id_chunks(ids)
+        for row in db.execute(RECORDS_WITH_UPDATED_AT, {"ids": chunk})
+    ]
+
+
+def merge(db: Session, delete_ids: list[int], updates: list[dict]) -> None:
+    """
+    Delete and rewrite contacts in one transaction, set-based.
+
+    The deletes run first, so an update may take over a phone or email of a
+    deleted contact without violating the unique constraints.
+
+    :param db: SQLAlchemy session object.
+    :param delete_ids: Unique identifiers of the contacts to delete.
+    :param updates: New column values per contact, with its id under
+                    ``contact_id``; all dicts must have the same keys.
+                    The name keys (email domain) are added if the names
+                    (email) are updated, and a ``category`` name is
+                    replaced by its ``category_id``.
+    :return: None
+    """
+    for chunk in _id_chunks(delete_ids):
+        db.execute(CONTACTS_DELETE, {"ids": chunk})
+    if updates and "first_name" in updates[0]:
+        updates = [
+            {**row, **name_keys(row["first_name"], row["last_name"])} for row in updates
+        ]
+    if updates and "email" in updates[0]:
+        updates = [
+            {**row, "email_domain": email_domain(row["email"])} for row in updates
+        ]
+    if updates:
+        db.execute(CONTACTS_UPDATE, with_category_ids(db, updates))
+    _commit(db)
+
+
+def list_domain_records(
+    db: Session, domain: str, offset: int, limit: int
+) -> list[ContactRecord]:
+    """
+    Retrieve one page of the contacts at an email domain, in id order.
+
+    :param db: SQLAlchemy session object.
+    :param domain: Normalized email domain ("acme.com").
+    :param offset: Number of contacts to skip.
+    :param limit: Maximum number of contacts to return.
+    :return: List of ContactRecord objects.
+    """
+    params = {"domain": domain, "offset": offset, "limit": limit}
+    return [ContactRecord(*row) for row in db.execute(DOMAIN_PAGE, params)]
+
+
+def count_domain(db: Session, domain: str) -> int:
+    """
+    Count the contacts at an email domain.
+
+    :param db: SQLAlchemy session object.
+    :param domain: Normalized email domain.
+    :return: Number of contacts.
+    """
+    return db.execute(DOMAIN_COUNT, {"domain": domain}).scalar_one()
+
+
+def domain_counts(db: Session) -> list[tuple[str, int]]:
+    """
+    Count the contacts of every email domain, in one pass over the
+    ``email_domain`` index (no sort).
+
+    :param db: SQLAlchemy session object.
+    :return: ``(domain, count)`` pairs in domain order.
+    """
+    return [tuple(row) for row in db.execute(DOMAIN_COUNTS)]
+
+
+def list_category_records(
+    db: Session, category_id: int, offset: int, limit: int
+) -> list[ContactRecord]:
+    """
+    Retrieve one page of the contacts of a category, ordered by name.
+
+    :param db: SQLAlchemy session object.
+    :param category_id: Id of the category.
+    :param offset: Number of contacts to skip.
+    :param limit: Maximum number of contacts to return.
+    :return: List of ContactRecord objects.
+    """
+    params = {"category_id": category_id, "offset": offset, "limit": limit}
+    return [ContactRecord(*row) for row in db.execute(CATEGORY_PAGE, params)]
+
+
+def count_category(db: Session, category_id: int) -> int:
+    """
+    Count the contacts of a category.
+
+    :param db: SQLAlchemy session object.
+    :param category_id: Id of the category.
+    :return: Number of contacts.
+    """
+    return db.execute(CATEGORY_COUNT, {"category_id": category_id}).scalar_one()
+
+
+def category_counts(db: Session) -> list[tuple[int, int]]:
+    """
+    Count the contacts of every category, in one pass over the
+    ``(category_id, name)`` index without reading the table.
+
+    :param db: SQLAlchemy session object.
+    :return: ``(category_id, count)`` pairs of the categories in use.
+    """
+    return [tuple(row) for row in db.execute(CATEGORY_COUNTS)]
+
+
+def created_per_day(db: Session) -> list[tuple[str, int]]:
+    """
+    Count the contacts created on each day, in one pass over the
+    ``date(created_at)`` index (no sort).
+
+    :param db: SQLAlchemy session object.
+    :return: ``(YYYY-MM-DD, count)`` pairs in day order, days without
+             new contacts omitted.
+    """
+    return [tuple(row) for row in db.execute(CREATED_PER_DAY)]
+
+
+def missing_field_counts(db: Session) -> dict[str, int]:
+    """
+    Count the contacts without each optional field.
+
+    :param db: SQLAlchemy session object.
+    :return: Number of contacts per field of ``MISSING_FIELDS``.
+    """
+    return dict(zip(MISSING_FIELDS, db.execute(MISSING_COUNTS).one()))
+
+
+def list_recent_records(
+    db: Session,
+    by: str,
+    limit: int,
+    before: tuple[datetime, int] | None = None,
+) -> list[tuple[datetime, ContactRecord]]:
+    """
+    Retrieve one page of contacts, most recently added or edited first.
+
+    :param db: SQLAlchemy session object.
+    :param by: "created" or "updated" (a key of ``RECENCY_COLUMNS``).
+    :param limit: Maximum number of contacts to return.
+    :param before: ``(timestamp, id)`` of the last contact of the previous
+                   page, None for the first page.
+    :return: ``(timestamp, record)`` pairs, newest first.
+    """
+    params: dict[str, object] = {"limit": limit}
+    if before is not None:
+        params["cursor_at"], params["cursor_id"] = before
+    stmt = RECENT_RECORDS[by, before is not None]
+    return [(row[0], ContactRecord(*row[1:])) for row in db.execute(stmt, params)]
+
+
+def list_changed_since(
+    db: Session, after: tuple[datetime, int], limit: int
+) -> list[tuple[datetime, ContactRecord]]:
+    """
+    Retrieve one page of the contacts updated at or after a point in time.
+
+    :param db: SQLAlchemy session object.
+    :param after: ``(updated_at, id)`` to continue after: the last contact
+                  of the previous page, or ``(since, 0)`` for the first one.
+    :param limit: Maximum number of contacts to return.
+    :return: ``(updated_at, record)`` pairs, oldest change first.
+    """
+    params = {"cursor_at": after[0], "cursor_id": after[1], "limit": limit}
+    return [
+        (row[0], ContactRecord(*row[1:])) for row in db.execute(CHANGED_SINCE, params)
+    ]
+
+
+def existing_keys(
+    db: Session, phones: list[str], emails: list[str]
+) -> tuple[set[str], set[str]]:
+    """
+    Find which of the given phones and emails are already taken.
+
+    :param db: SQLAlchemy session object.
+    :param phones: Normalized phone numbers to look up.
+    :param emails: Normalized email addresses to look up.
+    :return: The taken phones and the taken emails.
+    """
+    taken_phones = set(db.scalars(PHONES_IN, {"phones": phones})) if phones else set()
+    taken_emails = set(db.scalars(EMAILS_IN, {"emails": emails})) if emails else set()
+    return taken_phones, taken_emails
+
+
+def iter_keys(
+    db: Session, batch_size: int = 50_000
+) -> Iterator[tuple[list[str], list[str]]]:
+    """
+    Stream the phones and emails of all contacts in batches.
+
+    Rows are fetched ``batch_size`` at a time, so memory stays bounded
+    whatever the size of the table. The query runs on the session's Core
+    connection: the ORM result layer would add several microseconds per
+    row to a full-table scan.
+
+    :param db: SQLAlchemy session object.
+    :param batch_size: Number of contacts per batch.
+    :return: Iterator over ``(phones, emails)`` batches; contacts without
+             an email are left out of ``emails``.
+    """
+    result = db.connection().execute(KEYS.execution_options(yield_per=batch_size))
+    for rows in result.partitions():
+        phones, emails = zip(*rows)
+        yield list(phones), [email for email in emails if email]
+
+
+def iter_records(
+    db: Session, batch_size: int = 50_000
+) -> Iterator[list[ContactRecord]]:
+    """
+    Stream all contacts as read-only records, in batches and in no
+    particular order (see ``iter_keys`` for why the Core connection is used).
+
+    :param db: SQLAlchemy session object.
+    :param batch_size: Number of contacts per batch.
+    :return: Iterator over lists of ContactRecord objects.
+    """
+    result = db.connection().execute(
+        ALL_RECORDS_UNORDERED.execution_options(yield_per=batch_size)
+    )
+    for rows in result.partitions():
+        yield [ContactRecord(*row) for row in rows]
+
+
+def iter_name_keys(
+    db: Session, since: int | None = None, batch_size: int = 50_000
+) -> Iterator[list[tuple[int, str, int | None, int | None]]]:
+    """
+    Stream the folded names (``search_key``) of contacts in batches, in no
+    particular order (see ``iter_keys`` for why the Core connection is used).
+
+    :param db: SQLAlchemy session object.
+    :param since: Only contacts created or updated after this change
+                  sequence number.
+    :param batch_size: Number of contacts per batch.
+    :return: Iterator over lists of
+             ``(id, search_key, change_seq, created_seq)``.
+    """
+    stmt, params = (
+        (NAME_KEYS, {}) if since is None else (NAME_KEYS_SINCE, {"since": since})
     )
+    result = db.connection().execute(
+        stmt.execution_options(yield_per=batch_size), params
+    )
+    for rows in result.partitions():
+        yield [tuple(row) for row in rows]
 
 
 def get_by_id(db: Session, contact_id: int) -> Contact | None:
     """
     Retrieve a contact by its ID.
 
+    The session's identity map is consulted first, so a contact that is
+    already loaded is returned without a query.
+
     :param db: SQLAlchemy session object.
     :param contact_id: Unique identifier of the contact.
     :return: Contact object if found, otherwise None.
     """
-    return db.query(Contact).filter(Contact.id == contact_id).first()
+    return db.get(Contact, contact_id)
 
 
 def get_by_phone(db: Session, phone: str) -> Contact | None:
@@ -64,7 +727,7 @@ def get_by_phone(db: Session, phone: str) -> Contact | None:
     :param phone: Phone number of the contact.
     :return: Contact object if found, otherwise None.
     """
-    return db.query(Contact).filter(Contact.phone == phone).first()
+    return db.scalars(BY_PHONE, {"phone": phone}).first()
 
 
 def get_by_email(db: Session, email: str) -> Contact | None:
@@ -75,66 +738,140 @@ def get_by_email(db: Session, email: str) -> Contact | None:
     :param email: Email address of the contact.
     :return: Contact object if found, otherwise None.
     """
-    return db.query(Contact).filter(Contact.email == email).first()
+    return db.scalars(BY_EMAIL, {"email": email}).first()
 
 
-def update(db: Session, contact: Contact) -> Contact:
+def update(
+    db: Session, contact: Contact, expected_version: int | None = None
+) -> Contact:
     """
     Update an existing contact in the database.
 
+    The UPDATE is a compare-and-swap on the version column: it only matches
+    the row while its version is still ``expected_version`` (by default the
+    version loaded with the contact), so no row is read to check it.
+
     :param db: SQLAlchemy session object.
     :param contact: Contact instance with updated fields.
+    :param expected_version: Version the changes were made against.
+    :raises StaleDataError: If the contact was changed or deleted since.
     :return: The updated Contact object.
     """
-    db.commit()
+    if expected_version is not None:
+        set_committed_value(contact, "version", expected_version)
+    _commit(db)
     db.refresh(contact)
     return contact
 
 
-def delete(db: Session, contact: Contact) -> None:
+def delete(db: Session, contact: Contact, expected_version: int | None = None) -> None:
     """
     Delete a contact from the database.
 
+    Like ``update``, the DELETE only matches the row while its version is
+    still ``expected_version`` (by default the version loaded with the
+    contact).
+
     :param db: SQLAlchemy session object.
     :param contact: Contact instance to be removed.
+    :param expected_version: Version the deletion was confirmed against.
+    :raises StaleDataError: If the contact was changed or deleted since.
     :return: None
     """
+    if expected_version is not None:
+        set_committed_value(contact, "version", expected_version)
     db.delete(contact)
-    db.commit()
+    _commit(db)
 
 
-def search(db: Session, query: str, categories: list[str]) -> Contact:
+def search(
+    db: Session, query: str, categories: list[str], phonetic: bool = False
+) -> list[Contact]:
     """
     Search contacts in the database by free-text query and optional category filters.
 
-    The function builds dynamic SQLAlchemy filters based on the provided query string
-    and list of categories. It performs case-insensitive matching on first name,
-    last name, phone, and email fields, and applies category filtering if specified.
+    The function picks the prebuilt statement matching the given filters and
+    binds the query string and categories as parameters. A contact matches
+    if its folded "first last" or "last first" name contains the folded
+    query (accents stripped, casefolded), or if its phone or email contains
+    the query (case-insensitive for ASCII). With ``phonetic``, a contact
+    matches if every query word (up to ``PHONETIC_MAX_WORDS``) sounds like
+    its first or last name, i.e. shares a Double Metaphone code with it;
+    phones and emails are not searched then. Category filtering is applied
+    if specified.
 
     :param db: SQLAlchemy session object used to access the database.
-    :param query: Free-text search query (matched against first name, last name,
-                phone, and email).
+    :param query: Free-text search query (matched against the names, the
+                phone and the email by substring).
     :param categories: List of category names to filter contacts.
                     If empty, no category filter is applied.
+    :param phonetic: Match names that sound like the query words instead.
     :return: List of Contact objects matching the search criteria.
     """
-    filters = []
-    if query:
-        pattern = f"%{query}%"
-        filters.append(
-            or_(
-                Contact.first_name.ilike(pattern),
-                Contact.last_name.ilike(pattern),
-                Contact.phone.ilike(pattern),
-                Contact.email.ilike(pattern),
-            )
-        )
+    shape, params = search_params(query, categories, phonetic)
+    return list(db.scalars(SEARCH[shape], params))
+
+
+def search_records(
+    db: Session, query: str, categories: list[str], phonetic: bool = False
+) -> list[ContactRecord]:
+    """
+    Search contacts like ``search`` and return read-only records.
 
+    :param db: SQLAlchemy session object used to access the database.
+    :param query: Free-text search query.
+    :param categories: List of category names to filter contacts.
+    :param phonetic: Match names that sound like the query words instead.
+    :return: List of ContactRecord objects matching the search criteria.
+    """
+    shape, params = search_params(query, categories, phonetic)
+    return [ContactRecord(*row) for row in db.execute(SEARCH_RECORDS[shape], params)]
+
+
+def search_name_records(
+    db: Session, query: str, categories: list[str]
+) -> list[ContactRecord]:
+    """
+    Search contacts by name only: the folded "first last" or "last first"
+    name contains the folded query (the name branch of ``search``).
+
+    :param db: SQLAlchemy session object used to access the database.
+    :param query: Name or part of a name.
+    :param categories: List of category names to filter contacts.
+    :return: List of ContactRecord objects matching the search criteria.
+    """
+    params: dict[str, object] = _name_params(query)
     if categories:
-        filters.append(Contact.category.in_(categories))
+        params["categories"] = list(categories)
+    stmt = SEARCH_NAME_RECORDS[bool(categories)]
+    return [ContactRecord(*row) for row in db.execute(stmt, params)]
 
-    q = db.query(Contact)
-    if filters:
-        q = q.filter(and_(*filters))
 
-    return q.all()  # type: ignore[return-value]
+def _name_params(query: str) -> dict[str, object]:
+    """Bound parameters of the name branches of a search."""
+    folded = fold(query)
+    # An empty pattern (query of spaces) matches no name
+    return {"name_pattern": f"%{folded}%" if folded else ""}
+
+
+def search_params(
+    query: str, categories: list[str], phonetic: bool = False
+) -> tuple[tuple[bool, int, bool], dict[str, object]]:
+    """Return the statement key and bound parameters of a search."""
+    params: dict[str, object] = {}
+    phonetic_words = 0
+    if query and phonetic:
+        codes: list[tuple[str, ...]] = [
+            c for c in map(double_metaphone, query.split()) if c[0]
+        ]
+        # A query without letters has no code and matches no contact
+        codes = codes[:PHONETIC_MAX_WORDS] or [()]
+        for word, word_codes in enumerate(codes):
+            params[f"codes_{word}"] = sorted(set(word_codes))
+        phonetic_words = len(codes)
+    elif query:
+        params["pattern"] = f"%{query}%"
+        params.update(_name_params(query))
+    if categories:
+        params["categories"] = list(categories)
+    return (bool(query) and not phonetic, phonetic_words, bool(categories)), params
@@ -0,0 +1,180 @@
+"""
+Query Compiler Module
+
+Compiles a parsed ``SearchQuery`` (``src.utils.search_query``) into one
+SELECT of ``ContactRecord`` columns, choosing for every term a predicate
+an index can serve:
+
+- names: ranges on the folded ``search_key`` / ``search_key_reversed``
+  columns instead of ``LIKE '%x%'`` (free text matches names by
+  substring, as a plain search)
+- categories: one ``IN`` list of names for all of them, joined to their
+  ids (``ix_contacts_category_name_sort``)
+- email and phone prefixes: ranges on their unique indexes; full email
+  addresses: an equality lookup
+- email domains: an equality lookup on ``email_domain``
+
+Substrings cannot use an index and fall back to ``LIKE`` (a scan of the
+covering index); the compiled query lists them in ``unindexed``. Negated
+terms are ``NOT`` of the same predicates and keep contacts whose field is
+empty.
+"""
+
+from dataclasses import dataclass, field
+
+from sqlalchemy import Select, false, not_, or_, select, union_all
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from src.crud.contacts import _MAX_CHAR, RECORD_COLUMNS, in_categories
+from src.database.models import Category, Contact, ContactRecord
+from src.utils.search_query import (
+    DOMAIN,
+    EXACT,
+    PREFIX,
+    SearchQuery,
+    Term,
+)
+from src.utils.similarity import fold
+
+
+@dataclass
+class CompiledQuery:
+    """
+    SELECT of a parsed query.
+
+    :param statement: SELECT of the ``ContactRecord`` columns.
+    :param unindexed: Terms (as typed) that no index can serve.
+    """
+
+    statement: Select
+    unindexed: list[str] = field(default_factory=list)
+
+
+def _range(column, prefix: str) -> ColumnElement[bool]:
+    """Values of an indexed column starting with a prefix (an index range)."""
+    if not prefix:
+        return false()
+    return (column >= prefix) & (column < prefix + _MAX_CHAR)
+
+
+def _contains(column, folded: str) -> ColumnElement[bool]:
+    """Folded names containing a folded value (a scan of the column's index)."""
+    if not folded:
+        return false()
+    return column.like(f"%{folded}%")
+
+
+def _name_branches(value: str) -> list[Select]:
+    """Ids of contacts whose folded "first last" or "last first" name
+    starts with a value."""
+    prefix = fold(value)
+    return [
+        select(Contact.id).where(_range(Contact.search_key, prefix)),
+        select(Contact.id).where(_range(Contact.search_key_reversed, prefix)),
+    ]
+
+
+def _free_text(value: str) -> ColumnElement[bool]:
+    """Name, phone or email substring (as a plain search)."""
+    pattern = f"%{value}%"
+    folded = fold(value)
+    return Contact.id.in_(
+        union_all(
+            *(
+                select(Contact.id).where(_contains(column, folded))
+                for column in (Contact.search_key, Contact.search_key_reversed)
+            ),
+            select(Contact.id).where(Contact.phone.ilike(pattern)),
+            select(Contact.id).where(Contact.email.ilike(pattern)),
+        )
+    )
+
+
+def _keyed(column, term: Term) -> tuple[ColumnElement[bool], bool]:
+    """Predicate of an email or phone term, and whether it is indexed."""
+    if term.match == PREFIX:
+        return _range(column, term.value), True
+    if term.match == EXACT:
+        return column == term.value, True
+    if term.match == DOMAIN:
+        return Contact.email_domain == term.value, True
+    return column.ilike(f"%{term.value}%"), False
+
+
+def _predicate(term: Term) -> tuple[ColumnElement[bool], bool]:
+    """Predicate of a term other than a category, and whether it is indexed."""
+    if term.field == "first":
+        return _range(Contact.search_key, fold(term.value)), True
+    if term.field == "last":
+        return _range(Contact.search_key_reversed, fold(term.value)), True
+    if term.field == "name":
+        return Contact.id.in_(union_all(*_name_branches(term.value))), True
+    if term.field == "email":
+        return _keyed(Contact.email, term)
+    if term.field == "phone":
+        return _keyed(Contact.phone, term)
+    # Free text also scans phones and emails for the substring
+    return _free_text(term.value), False
+
+
+def _categories(values: list[str]) -> list[str]:
+    """Category values as typed and capitalized ("work" finds "Work")."""
+    return list(dict.fromkeys(v for value in values for v in (value, value.title())))
+
+
+def compile_query(query: SearchQuery, categories: list[str]) -> CompiledQuery:
+    """
+    Compile a parsed query into a SELECT of ``ContactRecord`` columns.
+
+    :param query: Parsed search query.
+    :param categories: Categories to filter by in addition to ``cat:`` terms.
+    :return: The statement and the terms it cannot serve from an index.
+    """
+    compiled = CompiledQuery(select(*RECORD_COLUMNS))
+    included = list(categories)
+    excluded: list[str] = []
+    for term in query.terms:
+        if term.field == "category":
+            if term.negated:
+                excluded.append(term.value)
+                compiled.unindexed.append(term.text)
+            else:
+                included.append(term.value)
+            continue
+        predicate, indexed = _predicate(term)
+        if term.negated:
+            predicate = not_(predicate)
+            if term.field == "email":
+                predicate = or_(Contact.email.is_(None), predicate)
+        if not indexed or term.negated:
+            compiled.unindexed.append(term.text)
+        compiled.statement = compiled.statement.where(predicate)
+    if included:
+        compiled.statement = in_categories(compiled.statement, _categories(included))
+    if excluded:
+        excluded_ids = select(Category.id).where(
+            Category.name.in_(_categories(excluded))
+        )
+        compiled.statement = compiled.statement.where(
+            or_(
+                Contact.category_id.is_(None),
+                Contact.category_id.not_in(excluded_ids),
+            )
+        )
+    return compiled
+
+
+def search_query_records(
+    db: Session, query: SearchQuery, categories: list[str]
+) -> list[ContactRecord]:
+    """
+    Search contacts with a parsed query and return read-only records.
+
+    :param db: SQLAlchemy session object.
+    :param query: Parsed search query.
+    :param categories: Categories to filter by in addition to ``cat:`` terms.
+    :return: List of ContactRecord objects matching every term.
+    """
+    statement = compile_query(query, categories).statement
+    return [ContactRecord(*row) for row in db.execute(statement)]
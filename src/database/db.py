@@ -8,16 +8,21 @@ The design is intentionally test-friendly:
 - Lazy initialization
 - Singleton pattern for shared components
 - SQLite StaticPool support for reliable testing
+
+An asynchronous engine (aiosqlite) and ``async_get_db`` are provided for
+asyncio callers; they are created lazily on first use.
 """
 
 import atexit
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from src.config import DATABASE_URL
+from src.config import ASYNC_DATABASE_URL, DATABASE_URL, SQLITE_BUSY_TIMEOUT
+from src.utils.profiling import install_statement_cache_counter
 
 
 # ------------------------------------------------------------
@@ -26,19 +31,34 @@ from src.config import DATABASE_URL
 # Creates and configures the SQLAlchemy engine.
 # Engine creation is separated to allow customization and
 # easier testing (e.g., swapping DATABASE_URL).
+def _is_sqlite_memory(url: str) -> bool:
+    """Check whether a URL points to an in-memory SQLite database."""
+    if not url.startswith("sqlite"):
+        return False
+    return ":memory:" in url or url.split("://", 1)[1] in ("", "/")
+
+
 def create_database_engine():
     """Create and configure the database engine."""
     engine_args = {
         "connect_args": {"check_same_thread": False},
         "echo": False,  # Enable SQL query logging for debugging if needed
     }
+    if DATABASE_URL.startswith("sqlite"):
+        # Wait for a concurrent writer's lock instead of failing at once
+        engine_args["connect_args"]["timeout"] = SQLITE_BUSY_TIMEOUT
 
     # SQLite requires StaticPool to keep the same connection alive.
     # This is critical for in-memory databases during testing,
     # otherwise each session would see a fresh empty database.
-    if DATABASE_URL.startswith("sqlite"):
+    # File databases keep the default pool, so concurrent sessions
+    # (e.g. API worker threads) never share one connection.
+    if _is_sqlite_memory(DATABASE_URL):
         engine_args["poolclass"] = StaticPool
 
+    # Count compiled-cache hits so they can be shown in the debug panel
+    install_statement_cache_counter()
+
     return create_engine(DATABASE_URL, **engine_args)
 
 
@@ -57,6 +77,8 @@ def create_database_engine():
 _engine = None
 _SessionLocal = None
 _Base = None
+_async_engine: AsyncEngine | None = None
+_AsyncSessionLocal: async_sessionmaker | None = None
 
 
 # ------------------------------------------------------------
@@ -115,6 +137,47 @@ SessionLocal = get_session_local()
 Base = get_base()
 
 
+# ------------------------------------------------------------
+# Async engine and session factory (singletons)
+# ------------------------------------------------------------
+# The async stack talks to the same database through aiosqlite.
+# It is only created when first requested, so synchronous callers
+# never pay for it.
+def create_async_database_engine() -> AsyncEngine:
+    """Create and configure the async database engine."""
+    engine_args: dict = {"echo": False}
+    if ASYNC_DATABASE_URL.startswith("sqlite"):
+        engine_args["connect_args"] = {"timeout": SQLITE_BUSY_TIMEOUT}
+
+    # In-memory databases only exist per connection, see create_database_engine
+    if _is_sqlite_memory(ASYNC_DATABASE_URL):
+        engine_args["poolclass"] = StaticPool
+
+    install_statement_cache_counter()
+
+    return create_async_engine(ASYNC_DATABASE_URL, **engine_args)
+
+
+def get_async_engine() -> AsyncEngine:
+    """Get or create the async database engine (singleton)."""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_database_engine()
+    return _async_engine
+
+
+def get_async_session_local() -> async_sessionmaker:
+    """Get or create the async sessionmaker (singleton)."""
+    global _AsyncSessionLocal
+    if _AsyncSessionLocal is None:
+        # Attributes must stay loaded after commit: an expired attribute
+        # would need implicit IO, which is not possible from async code.
+        _AsyncSessionLocal = async_sessionmaker(
+            autoflush=False, expire_on_commit=False, bind=get_async_engine()
+        )
+    return _AsyncSessionLocal
+
+
 # ------------------------------------------------------------
 # Cleanup logic
 # ------------------------------------------------------------
@@ -123,7 +186,11 @@ Base = get_base()
 # and repeated test runs.
 def cleanup_database():
     """Clean up database connections."""
-    global _engine
+    global _engine, _async_engine, _AsyncSessionLocal
+    # Async connections can only be closed on an event loop, see
+    # dispose_async_engine; here the singletons are just forgotten.
+    _async_engine = None
+    _AsyncSessionLocal = None
     if _engine:
         _engine.dispose()
         _engine = None
@@ -150,5 +217,21 @@ def get_db():
         db.close()
 
 
+async def dispose_async_engine() -> None:
+    """Close the async engine's connections; call before the event loop ends."""
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _AsyncSessionLocal = None
+
+
+@asynccontextmanager
+async def async_get_db():
+    """Async counterpart of ``get_db`` yielding an ``AsyncSession``."""
+    async with get_async_session_local()() as db:
+        yield db
+
+
 # Register cleanup to run automatically on program exit
 atexit.register(cleanup_database)
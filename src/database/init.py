@@ -1,19 +1,38 @@
 """
 This module ensures the database is initialized before use.
 It checks for the existence of required tables and creates them if absent.
+Existing databases are migrated (``src.database.migrations``), and indexes
+added to the models after a database was created are created on them as
+well.
 """
 
 from sqlalchemy import inspect
+from sqlalchemy.schema import CreateIndex
 
+# pylint: disable=unused-import
+from src.database import models  # noqa: F401
 from src.database.db import Base, engine
+from src.database.migrations import migrate, stamp
 
 
 def ensure_database_initialized() -> None:
     """
     Ensure the database is initialized by creating necessary tables
-    if they do not exist.
+    if they do not exist, and any indexes missing from existing tables.
     """
     inspector = inspect(engine)
 
     if not inspector.has_table("contacts"):
         Base.metadata.create_all(bind=engine)
+        stamp(engine)
+        return
+
+    # Before the indexes: new indexed columns are backfilled first
+    migrate(engine)
+
+    # IF NOT EXISTS instead of checkfirst: SQLAlchemy cannot reflect
+    # expression-based indexes, so checkfirst would try to recreate them.
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                conn.execute(CreateIndex(index, if_not_exists=True))
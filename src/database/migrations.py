@@ -0,0 +1,325 @@
+"""
+Schema Migrations Module
+
+Brings databases created by earlier versions up to the current models.
+Each migration runs once, in order; the number of the last migration
+applied is kept in SQLite's ``PRAGMA user_version``. New databases are
+created from the models and stamped with the latest number (``stamp``).
+
+Derived columns (the name keys, ``email_domain``, ``category_id``, the
+change sequence numbers) are added empty and then backfilled in batches of
+``MIGRATION_BATCH_SIZE`` rows, one short transaction per batch, so other
+writers are not locked out for the whole backfill.
+"""
+
+from collections.abc import Callable
+
+from sqlalchemy import bindparam, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from src.config import MIGRATION_BATCH_SIZE
+from src.database.models import (
+    CHANGE_FEED_TRIGGERS,
+    Category,
+    ChangeSequence,
+    Contact,
+    ContactTombstone,
+    name_keys,
+)
+from src.utils.validation import email_domain
+
+_TABLE = Contact.__table__
+# Sets the name keys and keeps updated_at (a backfill is not an edit)
+_SET_NAME_KEYS = (
+    _TABLE.update()
+    .where(_TABLE.c.id == bindparam("contact_id"))
+    .values(updated_at=_TABLE.c.updated_at)
+)
+_SET_EMAIL_DOMAIN = (
+    _TABLE.update()
+    .where(_TABLE.c.id == bindparam("contact_id"))
+    .values(email_domain=bindparam("domain"), updated_at=_TABLE.c.updated_at)
+)
+_EMAILS_AFTER = (
+    select(Contact.id, Contact.email)
+    .where(Contact.id > bindparam("after"))
+    .order_by(Contact.id)
+    .limit(bindparam("limit"))
+)
+# The text category column replaced by category_id (not in the models)
+_CATEGORY_NAMES = text(
+    "INSERT OR IGNORE INTO categories (name) SELECT category FROM contacts"
+    " WHERE category != '' GROUP BY category ORDER BY min(id)"
+)
+_BATCH_END = text(
+    "SELECT max(id) FROM (SELECT id FROM contacts WHERE id > :after"
+    " ORDER BY id LIMIT :limit)"
+)
+_SET_CATEGORY_IDS = text(
+    "UPDATE contacts SET category_id = (SELECT id FROM categories"
+    " WHERE name = contacts.category) WHERE id > :after AND id <= :end"
+)
+# Numbers the existing contacts in id order, as if inserted in that order
+_SET_CHANGE_SEQS = text(
+    "UPDATE contacts SET change_seq = id, created_seq = id"
+    " WHERE id > :after AND id <= :end"
+)
+_START_CHANGE_SEQUENCE = text(
+    "UPDATE change_sequence SET seq = (SELECT coalesce(max(id), 0) FROM contacts)"
+)
+_NAMES_AFTER = (
+    select(Contact.id, Contact.first_name, Contact.last_name)
+    .where(Contact.id > bindparam("after"))
+    .order_by(Contact.id)
+    .limit(bindparam("limit"))
+)
+
+
+def get_version(conn: Connection) -> int:
+    """Number of the last migration applied to the database."""
+    return conn.exec_driver_sql("PRAGMA user_version").scalar() or 0
+
+
+def _set_version(conn: Connection, version: int) -> None:
+    # PRAGMA arguments cannot be bound parameters
+    conn.exec_driver_sql(f"PRAGMA user_version = {int(version)}")
+
+
+def add_columns(
+    conn: Connection, names: tuple[str, ...], nullable: bool = False
+) -> list[str]:
+    """
+    Add model columns that are missing from the contacts table.
+
+    Columns are added as ``NOT NULL DEFAULT ''`` strings (or as NULL
+    strings if ``nullable``), to be backfilled.
+
+    :param conn: Connection in a transaction.
+    :param names: Names of ``Contact`` string columns.
+    :param nullable: Add the columns without a NOT NULL constraint.
+    :return: Names of the columns that were added.
+    """
+    existing = {column["name"] for column in inspect(conn).get_columns("contacts")}
+    added = [name for name in names if name not in existing]
+    column_type = "VARCHAR" if nullable else "VARCHAR NOT NULL DEFAULT ''"
+    for name in added:
+        conn.exec_driver_sql(f"ALTER TABLE contacts ADD COLUMN {name} {column_type}")
+    return added
+
+
+def backfill_name_keys(
+    engine: Engine, columns: tuple[str, ...], batch_size: int = MIGRATION_BATCH_SIZE
+) -> int:
+    """
+    Recompute name-derived columns of every contact, batch by batch.
+
+    :param engine: Engine of the database.
+    :param columns: Columns to compute (keys of ``name_keys``).
+    :param batch_size: Number of contacts per transaction.
+    :return: Number of contacts updated.
+    """
+    after, total = 0, 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(_NAMES_AFTER, {"after": after, "limit": batch_size})
+            updates = []
+            for row in rows:
+                keys = name_keys(row.first_name, row.last_name)
+                updates.append(
+                    {"contact_id": row.id, **{name: keys[name] for name in columns}}
+                )
+            if not updates:
+                return total
+            conn.execute(_SET_NAME_KEYS, updates)
+        after = updates[-1]["contact_id"]
+        total += len(updates)
+
+
+def backfill_email_domains(
+    engine: Engine, batch_size: int = MIGRATION_BATCH_SIZE
+) -> int:
+    """
+    Compute ``email_domain`` of every contact, batch by batch.
+
+    :param engine: Engine of the database.
+    :param batch_size: Number of contacts per transaction.
+    :return: Number of contacts scanned.
+    """
+    after, total = 0, 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(_EMAILS_AFTER, {"after": after, "limit": batch_size})
+            batch = [(row.id, email_domain(row.email)) for row in rows]
+            if not batch:
+                return total
+            updates = [
+                {"contact_id": contact_id, "domain": domain}
+                for contact_id, domain in batch
+                if domain is not None
+            ]
+            if updates:
+                conn.execute(_SET_EMAIL_DOMAIN, updates)
+        after = batch[-1][0]
+        total += len(batch)
+
+
+def backfill_category_ids(
+    engine: Engine, batch_size: int = MIGRATION_BATCH_SIZE
+) -> int:
+    """
+    Set ``category_id`` from the text ``category`` column, batch by batch.
+
+    :param engine: Engine of a database with both columns.
+    :param batch_size: Number of contacts per transaction.
+    :return: Number of contacts scanned.
+    """
+    after, total = 0, 0
+    while True:
+        with engine.begin() as conn:
+            params = {"after": after, "limit": batch_size}
+            end = conn.execute(_BATCH_END, params).scalar()
+            if end is None:
+                return total
+            result = conn.execute(_SET_CATEGORY_IDS, {"after": after, "end": end})
+        after = end
+        total += result.rowcount
+
+
+def backfill_change_seqs(engine: Engine, batch_size: int = MIGRATION_BATCH_SIZE) -> int:
+    """
+    Number the existing contacts of the change feed by id, batch by batch.
+
+    :param engine: Engine of the database.
+    :param batch_size: Number of contacts per transaction.
+    :return: Number of contacts numbered.
+    """
+    after, total = 0, 0
+    while True:
+        with engine.begin() as conn:
+            params = {"after": after, "limit": batch_size}
+            end = conn.execute(_BATCH_END, params).scalar()
+            if end is None:
+                return total
+            result = conn.execute(_SET_CHANGE_SEQS, {"after": after, "end": end})
+        after = end
+        total += result.rowcount
+
+
+def _add_change_feed(engine: Engine) -> None:
+    """
+    Migration adding the change feed: the sequence numbers of the contacts,
+    the tombstones of deleted contacts and the triggers maintaining both.
+
+    The existing contacts are numbered by id; the sequence continues from
+    the largest id, and the triggers are created last.
+    """
+    with engine.begin() as conn:
+        existing = {column["name"] for column in inspect(conn).get_columns("contacts")}
+        for name in ("change_seq", "created_seq"):
+            if name not in existing:
+                conn.exec_driver_sql(f"ALTER TABLE contacts ADD COLUMN {name} INTEGER")
+        ContactTombstone.__table__.create(conn, checkfirst=True)
+        ChangeSequence.__table__.create(conn, checkfirst=True)
+    backfill_change_seqs(engine)
+    with engine.begin() as conn:
+        conn.execute(_START_CHANGE_SEQUENCE)
+        for trigger in CHANGE_FEED_TRIGGERS:
+            conn.exec_driver_sql(trigger)
+
+
+def _add_version(engine: Engine) -> None:
+    """Migration adding the version column; existing contacts are at 1."""
+    with engine.begin() as conn:
+        existing = {column["name"] for column in inspect(conn).get_columns("contacts")}
+        if "version" not in existing:
+            conn.exec_driver_sql(
+                "ALTER TABLE contacts ADD COLUMN version INTEGER NOT NULL DEFAULT 1"
+            )
+
+
+def _add_categories(engine: Engine) -> None:
+    """
+    Migration moving the category names to the categories table.
+
+    The text column and its index are dropped at the end; the rows of the
+    table are rewritten once, without the names.
+    """
+    with engine.begin() as conn:
+        Category.__table__.create(conn, checkfirst=True)
+        existing = {column["name"] for column in inspect(conn).get_columns("contacts")}
+        if "category_id" not in existing:
+            conn.exec_driver_sql(
+                "ALTER TABLE contacts ADD COLUMN category_id INTEGER"
+                " REFERENCES categories (id)"
+            )
+        if "category" not in existing:
+            return
+        conn.execute(_CATEGORY_NAMES)
+    backfill_category_ids(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX IF EXISTS ix_contacts_category")
+        conn.exec_driver_sql("ALTER TABLE contacts DROP COLUMN category")
+
+
+def _add_email_domain(engine: Engine) -> None:
+    """Migration adding and backfilling ``email_domain``."""
+    with engine.begin() as conn:
+        add_columns(conn, ("email_domain",), nullable=True)
+    backfill_email_domains(engine)
+
+
+def _add_name_keys(columns: tuple[str, ...]) -> Callable[[Engine], None]:
+    """Migration adding and backfilling name-derived columns."""
+
+    def migration(engine: Engine) -> None:
+        with engine.begin() as conn:
+            add_columns(conn, columns)
+        backfill_name_keys(engine, columns)
+
+    return migration
+
+
+# Migrations in order; migration N brings a database to version N
+MIGRATIONS: list[Callable[[Engine], None]] = [
+    _add_name_keys(("search_key", "search_key_reversed")),
+    _add_name_keys(
+        (
+            "first_name_phonetic",
+            "first_name_phonetic_alt",
+            "last_name_phonetic",
+            "last_name_phonetic_alt",
+        )
+    ),
+    _add_email_domain,
+    _add_categories,
+    _add_change_feed,
+    _add_version,
+]
+
+
+def migrate(engine: Engine) -> list[int]:
+    """
+    Apply the migrations a database has not had yet.
+
+    :param engine: Engine of an existing database.
+    :return: Numbers of the migrations applied.
+    """
+    with engine.connect() as conn:
+        version = get_version(conn)
+    applied = []
+    for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        migration(engine)
+        with engine.begin() as conn:
+            _set_version(conn, number)
+        applied.append(number)
+    return applied
+
+
+def stamp(engine: Engine) -> None:
+    """
+    Mark a database created from the current models as fully migrated.
+
+    :param engine: Engine of the database.
+    """
+    with engine.begin() as conn:
+        _set_version(conn, len(MIGRATIONS))
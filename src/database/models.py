@@ -1,12 +1,189 @@
 """Contact Book Models Module
-This module defines the database models using SQLAlchemy ORM.
+This module defines the database models using SQLAlchemy ORM,
+and the immutable ``ContactRecord`` used for read-only paths.
+
+The ``NAME_KEY_COLUMNS`` (folded search keys and Double Metaphone codes)
+are derived from the first and last name (``name_keys``), and
+``email_domain`` from the email (``email_domain``). They are filled in by
+column defaults on every insert, ORM or Core, and recomputed by a
+``before_update`` hook whenever an ORM update changes a name or the email;
+Core UPDATEs that change them must set them too.
+
+Categories are rows of their own table (``Category``), referenced by a
+small integer ``Contact.category_id``. ``Contact.category`` reads the name
+with the contact, and assigning a name to it sets ``category_id`` on flush,
+adding the category if it is new; Core inserts and updates pass
+``category_id`` (see ``category_ids``).
+
+Every insert, update and delete of a contact, ORM or Core, takes the next
+number of the one-row ``change_sequence`` table in a trigger
+(``CHANGE_FEED_TRIGGERS``): inserted and updated contacts store it as
+``change_seq`` (and inserted ones as ``created_seq`` too), deleted ones
+leave a ``ContactTombstone`` with it. Reading both in sequence order is
+the change feed of ``contact_service.changes_since``.
 """
 
+from collections.abc import Iterable
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 
-from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    bindparam,
+    event,
+    func,
+    inspect,
+    select,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import column_property
 
 from src.database.db import Base
+from src.utils.similarity import double_metaphone, fold
+from src.utils.validation import email_domain
+
+# Names repeat a lot, in bulk imports especially
+_fold_name = lru_cache(maxsize=1 << 16)(fold)
+_metaphone = lru_cache(maxsize=1 << 16)(double_metaphone)
+
+NAME_KEY_COLUMNS = (
+    "search_key",
+    "search_key_reversed",
+    "first_name_phonetic",
+    "first_name_phonetic_alt",
+    "last_name_phonetic",
+    "last_name_phonetic_alt",
+)
+
+
+# Every column default of an insert asks for the same pair
+@lru_cache(maxsize=1 << 10)
+def _name_key_values(first_name: str | None, last_name: str | None) -> tuple:
+    first, last = _fold_name(first_name or ""), _fold_name(last_name or "")
+    return (
+        f"{first} {last}".strip(),
+        f"{last} {first}".strip(),
+        *_metaphone(first),
+        *_metaphone(last),
+    )
+
+
+def name_keys(first_name: str | None, last_name: str | None) -> dict[str, str]:
+    """
+    Values of the name-derived search columns.
+
+    ``search_key`` is "first last" and ``search_key_reversed`` "last first",
+    both folded (``fold``: accents stripped, casefolded), so that a prefix
+    of either name, or of the full name in either order, is an index range.
+    The ``*_phonetic`` and ``*_phonetic_alt`` columns hold the primary and
+    secondary Double Metaphone code of each name, for sound-alike search.
+
+    :param first_name: First name.
+    :param last_name: Last name.
+    :return: Column values by column name.
+    """
+    return dict(zip(NAME_KEY_COLUMNS, _name_key_values(first_name, last_name)))
+
+
+def _name_key_default(column: str):
+    """Column default computing a name key from the inserted names."""
+    index = NAME_KEY_COLUMNS.index(column)
+
+    def default(context) -> str:
+        params = context.get_current_parameters()
+        values = _name_key_values(params.get("first_name"), params.get("last_name"))
+        return values[index]
+
+    return default
+
+
+def _email_domain_default(context) -> str | None:
+    """Column default deriving ``email_domain`` from the inserted email."""
+    return email_domain(context.get_current_parameters().get("email"))
+
+
+# Categories of a new database, in the order they are offered
+DEFAULT_CATEGORIES = ("Family", "Friends", "Work", "Other")
+
+
+class Category(Base):
+    """Category ORM model: one row per category name."""
+
+    __tablename__ = "categories"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, unique=True, nullable=False)
+
+    def __repr__(self):
+        return f"<Category(id={self.id}, name='{self.name}')>"
+
+
+@event.listens_for(Category.__table__, "after_create")
+def _insert_default_categories(table, connection, **_kw) -> None:
+    """Fill a new categories table with ``DEFAULT_CATEGORIES``."""
+    connection.execute(table.insert(), [{"name": name} for name in DEFAULT_CATEGORIES])
+
+
+_CATEGORY_IDS = select(Category.name, Category.id).where(
+    Category.name.in_(bindparam("names", expanding=True))
+)
+_INSERT_CATEGORIES = sqlite_insert(Category.__table__).on_conflict_do_nothing()
+
+
+def category_ids(connection, names: Iterable[str | None]) -> dict[str, int]:
+    """
+    Ids of categories by name, adding the categories that do not exist yet.
+
+    :param connection: Connection or session to run the statements on.
+    :param names: Category names; empty names and None are skipped.
+    :return: Category id by name.
+    """
+    wanted = {name for name in names if name}
+    if not wanted:
+        return {}
+    ids = dict(connection.execute(_CATEGORY_IDS, {"names": list(wanted)}).all())
+    missing = sorted(wanted - ids.keys())
+    if missing:
+        connection.execute(_INSERT_CATEGORIES, [{"name": name} for name in missing])
+        ids.update(connection.execute(_CATEGORY_IDS, {"names": missing}).all())
+    return ids
+
+
+class ChangeSequence(Base):
+    """The last number given out to a change of the contacts (one row)."""
+
+    __tablename__ = "change_sequence"
+
+    id = Column(Integer, primary_key=True)
+    seq = Column(Integer, nullable=False)
+
+
+@event.listens_for(ChangeSequence.__table__, "after_create")
+def _insert_change_sequence(table, connection, **_kw) -> None:
+    """Start the change sequence of a new database at 0."""
+    connection.execute(table.insert(), {"id": 1, "seq": 0})
+
+
+class ContactTombstone(Base):
+    """A deleted contact, with the sequence number of its deletion."""
+
+    __tablename__ = "contact_tombstones"
+
+    contact_id = Column(Integer, primary_key=True)
+    # Serves the deletions since a sequence number, in order
+    change_seq = Column(Integer, nullable=False, index=True)
+
+    def __repr__(self):
+        return (
+            f"<ContactTombstone(contact_id={self.contact_id}, "
+            f"change_seq={self.change_seq})>"
+        )
 
 
 class Contact(Base):
@@ -19,13 +196,96 @@ class Contact(Base):
     last_name = Column(String, index=True, nullable=False)
     email = Column(String, unique=True, index=True, nullable=True)
     phone = Column(String, unique=True, index=True, nullable=False)
-    category = Column(String, index=True, nullable=True)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
+    # Name of the category (see the module docstring); never correlated to
+    # a categories table joined by the enclosing query
+    category = column_property(
+        select(Category.name)
+        .where(Category.id == category_id)
+        .correlate_except(Category)
+        .scalar_subquery()
+    )
+    # Accent- and case-insensitive name search (see ``name_keys``)
+    search_key = Column(
+        String, index=True, nullable=False, default=_name_key_default("search_key")
+    )
+    search_key_reversed = Column(
+        String,
+        index=True,
+        nullable=False,
+        default=_name_key_default("search_key_reversed"),
+    )
+    # Sound-alike name search (Double Metaphone, see ``name_keys``)
+    first_name_phonetic = Column(
+        String,
+        index=True,
+        nullable=False,
+        default=_name_key_default("first_name_phonetic"),
+    )
+    first_name_phonetic_alt = Column(
+        String,
+        index=True,
+        nullable=False,
+        default=_name_key_default("first_name_phonetic_alt"),
+    )
+    last_name_phonetic = Column(
+        String,
+        index=True,
+        nullable=False,
+        default=_name_key_default("last_name_phonetic"),
+    )
+    last_name_phonetic_alt = Column(
+        String,
+        index=True,
+        nullable=False,
+        default=_name_key_default("last_name_phonetic_alt"),
+    )
+    # Contacts by domain and domain counts (see ``email_domain``)
+    email_domain = Column(
+        String, index=True, nullable=True, default=_email_domain_default
+    )
+    # Set by CHANGE_FEED_TRIGGERS: the sequence number of the last insert or
+    # update (indexed for the changes since a number) and of the insert
+    change_seq = Column(Integer, index=True)
+    created_seq = Column(Integer)
+    # Optimistic concurrency control (see ``__mapper_args__``); Core inserts
+    # start at 1 and the merge UPDATE increments it too
+    version = Column(Integer, nullable=False, server_default="1")
+    created_at = Column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        # Serves the recently added contacts, newest first
+        index=True,
+    )
     updated_at = Column(
         DateTime,
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
+        # Serves the recently edited contacts and the contacts changed
+        # since a time
+        index=True,
+    )
+
+    __table_args__ = (
+        # Serves the case-insensitive name ordering of the contact list
+        # without a temporary B-tree sort.
+        Index("ix_contacts_name_sort", func.lower(first_name), func.lower(last_name)),
+        # Serves the contacts of a category in name order, and the contacts
+        # per category as an index-only scan
+        Index(
+            "ix_contacts_category_name_sort",
+            category_id,
+            func.lower(first_name),
+            func.lower(last_name),
+        ),
+        # Serves the contacts created per day of the statistics in day
+        # order, without a temporary B-tree for the GROUP BY
+        Index("ix_contacts_created_day", func.date(created_at)),
     )
+    # Every ORM update and delete matches the version loaded with the
+    # contact (``UPDATE ... WHERE id = ? AND version = ?``) and increments
+    # it; a contact changed by another session since raises StaleDataError
+    __mapper_args__ = {"version_id_col": version}
 
     def __repr__(self):
         return f"""<Contact(id={self.id},
@@ -34,3 +294,101 @@ class Contact(Base):
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.phone})"
+
+
+# The update trigger skips the updates that set change_seq: its own, the
+# insert trigger's and the migration's. A reinserted id (SQLite reuses the
+# largest one after a delete) is no longer deleted.
+CHANGE_FEED_TRIGGERS = (
+    """CREATE TRIGGER IF NOT EXISTS contacts_change_insert
+    AFTER INSERT ON contacts
+    BEGIN
+        UPDATE change_sequence SET seq = seq + 1;
+        UPDATE contacts
+        SET change_seq = (SELECT seq FROM change_sequence),
+            created_seq = (SELECT seq FROM change_sequence)
+        WHERE id = NEW.id;
+        DELETE FROM contact_tombstones WHERE contact_id = NEW.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS contacts_change_update
+    AFTER UPDATE ON contacts
+    WHEN NEW.change_seq IS OLD.change_seq
+    BEGIN
+        UPDATE change_sequence SET seq = seq + 1;
+        UPDATE contacts SET change_seq = (SELECT seq FROM change_sequence)
+        WHERE id = NEW.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS contacts_change_delete
+    AFTER DELETE ON contacts
+    BEGIN
+        UPDATE change_sequence SET seq = seq + 1;
+        INSERT OR REPLACE INTO contact_tombstones (contact_id, change_seq)
+        VALUES (OLD.id, (SELECT seq FROM change_sequence));
+    END""",
+)
+
+
+@event.listens_for(Contact.__table__, "after_create")
+def _create_change_feed_triggers(_table, connection, **_kw) -> None:
+    """Create the triggers numbering the changes of a new contacts table."""
+    for trigger in CHANGE_FEED_TRIGGERS:
+        connection.exec_driver_sql(trigger)
+
+
+@event.listens_for(Contact, "before_update")
+def _update_derived_keys(_mapper, connection, contact: Contact) -> None:
+    """Recompute the keys derived from the names, email or category of an ORM update."""
+    attrs = inspect(contact).attrs  # type: ignore[var-annotated]
+    if attrs.first_name.history.has_changes() or attrs.last_name.history.has_changes():
+        keys = name_keys(
+            contact.first_name, contact.last_name  # type: ignore[arg-type]
+        )
+        for column, value in keys.items():
+            setattr(contact, column, value)
+    if attrs.email.history.has_changes():
+        contact.email_domain = email_domain(contact.email)  # type: ignore[assignment,arg-type]
+    _set_category_id(connection, contact)
+
+
+@event.listens_for(Contact, "before_insert")
+def _insert_category_id(_mapper, connection, contact: Contact) -> None:
+    """Resolve the category name of an ORM insert to its id."""
+    _set_category_id(connection, contact)
+
+
+def _set_category_id(connection, contact: Contact) -> None:
+    """Set ``category_id`` from a category name assigned to the contact."""
+    if inspect(contact).attrs.category.history.has_changes():
+        name = contact.category
+        contact.category_id = category_ids(connection, [name]).get(name)  # type: ignore[assignment,arg-type]
+
+
+@dataclass(frozen=True, slots=True)
+class ContactRecord:
+    """
+    Immutable, session-independent snapshot of a contact.
+
+    Used for read-only paths (caching, listing) where ORM instrumentation
+    and identity-map tracking are not needed.
+    """
+
+    id: int
+    first_name: str
+    last_name: str
+    phone: str
+    email: str | None
+    category: str | None
+    version: int = 1
+
+    @classmethod
+    def from_contact(cls, contact: Contact) -> "ContactRecord":
+        """Create a snapshot of an ORM ``Contact``."""
+        return cls(
+            id=contact.id,  # type: ignore[arg-type]
+            first_name=contact.first_name,  # type: ignore[arg-type]
+            last_name=contact.last_name,  # type: ignore[arg-type]
+            phone=contact.phone,  # type: ignore[arg-type]
+            email=contact.email,  # type: ignore[arg-type]
+            category=contact.category,  # type: ignore[arg-type]
+            version=contact.version,  # type: ignore[arg-type]
+        )
@@ -0,0 +1,221 @@
+"""
+Lock Retry Module
+
+This module retries transactional calls that fail because another
+connection holds the SQLite write lock ("database is locked").
+
+The busy timeout (``SQLITE_BUSY_TIMEOUT``) already makes a connection wait
+for the lock, but SQLite gives up immediately when waiting could deadlock
+(a read transaction that wants to upgrade to a write) and after the
+timeout under sustained contention. Such calls are rolled back and run
+again after a jittered exponential backoff, until they succeed, run out
+of attempts or would exceed the deadline.
+
+``retry_on_lock`` applies the shared policy to service functions taking
+the session as first argument; ``retry_stats`` reports how often and how
+long calls waited.
+"""
+
+import asyncio
+import functools
+import inspect
+import random
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from typing import Any
+
+from sqlalchemy.exc import OperationalError
+
+from src.config import (
+    RETRY_BASE_DELAY,
+    RETRY_DEADLINE,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_MAX_DELAY,
+)
+
+LOCK_MESSAGES = ("database is locked", "database table is locked", "database is busy")
+
+
+def is_lock_error(exc: BaseException) -> bool:
+    """Check whether an exception is SQLite's "database is locked" error."""
+    if not isinstance(exc, OperationalError):
+        return False
+    message = str(exc.orig).lower()
+    return any(text in message for text in LOCK_MESSAGES)
+
+
+@dataclass(frozen=True)
+class RetryStats:
+    """Counters of the calls run under a retry policy."""
+
+    calls: int = 0
+    retries: int = 0
+    failures: int = 0
+    wait_seconds: float = 0.0
+
+
+_stats = RetryStats()
+_stats_lock = threading.Lock()
+
+
+def _record(**deltas: float) -> None:
+    global _stats  # pylint: disable=global-statement
+    with _stats_lock:
+        _stats = replace(
+            _stats,
+            **{name: getattr(_stats, name) + delta for name, delta in deltas.items()},
+        )
+
+
+def retry_stats() -> RetryStats:
+    """Return the retry counters collected since start (or the last reset)."""
+    return _stats
+
+
+def reset_retry_stats() -> None:
+    """Reset the retry counters."""
+    global _stats  # pylint: disable=global-statement
+    with _stats_lock:
+        _stats = RetryStats()
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Jittered exponential backoff for lock errors.
+
+    :param max_attempts: Maximum number of runs, the first one included.
+    :param base_delay: Backoff cap of the first retry, in seconds.
+    :param max_delay: Upper bound of the backoff cap, in seconds.
+    :param deadline: Give up instead of sleeping past this many seconds
+                     after the first run started.
+    """
+
+    max_attempts: int = RETRY_MAX_ATTEMPTS
+    base_delay: float = RETRY_BASE_DELAY
+    max_delay: float = RETRY_MAX_DELAY
+    deadline: float = RETRY_DEADLINE
+
+    def backoff(self, retry: int) -> float:
+        """
+        Delay before the given retry ("full jitter").
+
+        The delay is drawn uniformly from ``[0, cap]`` where the cap doubles
+        with every retry, so colliding writers spread out instead of waking
+        up together.
+
+        :param retry: Number of the retry, starting at 0.
+        :return: Delay in seconds.
+        """
+        cap = min(self.max_delay, self.base_delay * 2**retry)
+        return random.uniform(0, cap)
+
+    def _next_delay(self, exc: Exception, attempt: int, started: float) -> float:
+        """Return the delay before the next attempt, or re-raise ``exc``."""
+        if not is_lock_error(exc):
+            raise exc
+        delay = self.backoff(attempt)
+        elapsed = time.monotonic() - started
+        if attempt + 1 >= self.max_attempts or elapsed + delay > self.deadline:
+            _record(failures=1)
+            raise exc
+        _record(retries=1, wait_seconds=delay)
+        return delay
+
+    def run(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        on_retry: Callable[[], Any] | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Call ``func`` and retry it on lock errors.
+
+        :param func: Function to call.
+        :param on_retry: Called before every retry, e.g. ``db.rollback``.
+        :return: The function's result.
+        :raises OperationalError: If the lock is still held when the policy
+                                  gives up; other errors are not retried.
+        """
+        _record(calls=1)
+        started = time.monotonic()
+        for attempt in range(self.max_attempts):
+            try:
+                return func(*args, **kwargs)
+            except OperationalError as exc:
+                delay = self._next_delay(exc, attempt, started)
+            if on_retry is not None:
+                on_retry()
+            time.sleep(delay)
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    async def run_async(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        on_retry: Callable[[], Any] | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Async variant of ``run`` (``func`` and ``on_retry`` are awaited)."""
+        _record(calls=1)
+        started = time.monotonic()
+        for attempt in range(self.max_attempts):
+            try:
+                return await func(*args, **kwargs)
+            except OperationalError as exc:
+                delay = self._next_delay(exc, attempt, started)
+            if on_retry is not None:
+                await on_retry()
+            await asyncio.sleep(delay)
+        raise AssertionError("unreachable")  # pragma: no cover
+
+
+# ------------------------------------------------------------
+# Shared policy of the service layer
+# ------------------------------------------------------------
+# pylint: disable=invalid-name
+_policy = RetryPolicy()
+
+
+def get_retry_policy() -> RetryPolicy:
+    """Return the policy used by ``retry_on_lock``."""
+    return _policy
+
+
+def set_retry_policy(policy: RetryPolicy) -> None:
+    """Replace the policy used by ``retry_on_lock``."""
+    global _policy  # pylint: disable=global-statement
+    _policy = policy
+
+
+def retry_on_lock(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Retry a service write on lock errors with the shared policy.
+
+    The decorated function takes the session as first argument; the session
+    is rolled back before every retry, so the whole transaction runs again.
+    Sessions of a group-commit batch (``db.info["defer_commit"]``) are not
+    retried here: a rollback would discard the rest of the batch, and the
+    ``WriteCoordinator`` retries the batch's lock acquisition instead.
+    Works for both sync and async (``AsyncSession``) service functions.
+    """
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(db, *args, **kwargs):
+            return await get_retry_policy().run_async(
+                func, db, *args, on_retry=db.rollback, **kwargs
+            )
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(db, *args, **kwargs):
+        if db.info.get("defer_commit") is True:
+            return func(db, *args, **kwargs)
+        return get_retry_policy().run(func, db, *args, on_retry=db.rollback, **kwargs)
+
+    return wrapper
@@ -3,30 +3,28 @@ Database Initialization Module
 ==============================
 
 This module is responsible for initializing the application's database.
-It imports the SQLAlchemy ``Base`` metadata and engine, loads all model
-definitions, and ensures that the required tables are created before the
-application starts.
+It creates the required tables before the application starts, or brings
+a database created by an earlier version up to the current schema.
 
 The module is typically executed at the beginning of a CLI command
 to guarantee that the database schema exists.
 """
 
-# pylint: disable=unused-import
-from src.database import models  # noqa: F401
-from src.database.db import Base, engine
+from src.database.init import ensure_database_initialized
 
 
 def init_db():
     """
     Initialize the database by creating all tables defined in the metadata.
 
-    This function calls ``Base.metadata.create_all`` using the configured
-    SQLAlchemy engine. If the tables already exist, the operation is skipped.
+    A new database is created from the models and marked as fully
+    migrated; an existing one is migrated to the current schema (see
+    ``ensure_database_initialized``).
 
     :return: None
     :rtype: None
     """
-    Base.metadata.create_all(bind=engine)
+    ensure_database_initialized()
     print("Database initialized with all tables successfully.")
 
 
@@ -0,0 +1,190 @@
+"""
+Async Contact Service Module
+
+This module provides asyncio versions of the ``contact_service`` functions
+on top of ``src.crud.async_contacts``. Validation is shared with the
+synchronous service, so both stacks accept and reject exactly the same
+data and raise the same ``ContactServiceError``.
+
+The in-process ``ContactCache`` is not used here: the async engine uses
+its own connections, and reads go through the session's identity map.
+Commits made by either stack are still detected by the synchronous
+cache through ``PRAGMA data_version``. Writes do update the autocomplete
+index of the database (through ``run_sync``), like the synchronous ones.
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+
+from src.crud import async_contacts as contact_crud
+from src.database.models import Contact, ContactRecord
+from src.database.retry import retry_on_lock
+from src.services.autocomplete import Autocomplete, get_autocomplete
+from src.services.contact_service import (
+    ContactConflictError,
+    ContactServiceError,
+    apply_contact_changes,
+    check_new_contact,
+)
+from src.services.name_index import typo_search
+from src.utils.search_query import parse_query
+
+
+async def _autocomplete(db: AsyncSession) -> tuple[Autocomplete, str | None]:
+    """Autocomplete index of the database and its revision before a write."""
+    autocomplete = await db.run_sync(get_autocomplete)
+    return autocomplete, await db.run_sync(autocomplete.expected_revision)
+
+
+async def get_contact(db: AsyncSession, contact_id: int) -> ContactRecord:
+    """
+    Getting contact by id
+
+    :param db: SQLAlchemy async session object.
+    :param contact_id: Unique identifier of the contact.
+    :raises ContactServiceError: If contact not found.
+    :return: Read-only snapshot of the contact.
+    """
+    contact = await contact_crud.get_by_id(db, contact_id)
+    if not contact:
+        raise ContactServiceError(["Contact not found"])
+    return ContactRecord.from_contact(contact)
+
+
+@retry_on_lock
+async def add_contact(db: AsyncSession, data: dict) -> Contact:
+    """
+    Validate and add a new contact to the database.
+
+    :param db: SQLAlchemy async session object.
+    :param data: Dictionary containing contact fields
+    (first_name, last_name, phone, email, category).
+    :raises ContactServiceError: If validation fails or duplicate phone/email exists.
+    :return: The persisted Contact object.
+    """
+    check = check_new_contact(data)
+    phone, email = check.lookup_phone, check.lookup_email
+    errors = check.errors(
+        phone_taken=phone is not None
+        and await contact_crud.get_by_phone(db, phone) is not None,
+        email_taken=email is not None
+        and await contact_crud.get_by_email(db, email) is not None,
+    )
+    if errors:
+        raise ContactServiceError(errors)
+
+    autocomplete, expected = await _autocomplete(db)
+    contact = await contact_crud.create(db, check.build())
+    await db.run_sync(
+        autocomplete.apply, expected, added=ContactRecord.from_contact(contact)
+    )
+    return contact
+
+
+async def list_contacts(db: AsyncSession) -> list[ContactRecord]:
+    """
+    Retrieve all contacts from the database as read-only records.
+
+    :param db: SQLAlchemy async session object.
+    :return: List of ContactRecord objects.
+    """
+    return await contact_crud.list_records(db)
+
+
+@retry_on_lock
+async def update_contact(
+    db: AsyncSession, contact_id: int, data: dict, expected_version: int | None = None
+) -> Contact:
+    """
+    Update an existing contact in the database.
+
+    :param db: SQLAlchemy async session object.
+    :param contact_id: Unique identifier of the contact to update.
+    :param data: Dictionary of fields to update (first_name, last_name,
+                phone, email, category).
+    :param expected_version: Version of the contact the changes were made
+                against; None updates the current version.
+    :raises ContactConflictError: If the contact is no longer at
+                ``expected_version``.
+    :raises ContactServiceError: If contact not found or validation fails.
+    :return: The updated Contact object.
+    """
+    contact = await contact_crud.get_by_id(db, contact_id)
+    if not contact:
+        raise ContactServiceError(["Contact not found"])
+
+    before = ContactRecord.from_contact(contact)
+    errors = apply_contact_changes(contact, data)
+    if errors:
+        # Discard the partially applied changes; a plain expire would make
+        # the next attribute access need implicit IO
+        await db.refresh(contact)
+        raise ContactServiceError(errors)
+
+    autocomplete, expected = await _autocomplete(db)
+    try:
+        contact = await contact_crud.update(db, contact, expected_version)
+    except StaleDataError as exc:
+        await db.rollback()
+        raise ContactConflictError(contact_id, expected_version) from exc
+    await db.run_sync(
+        autocomplete.apply, expected, before, ContactRecord.from_contact(contact)
+    )
+    return contact
+
+
+@retry_on_lock
+async def delete_contact(db: AsyncSession, contact_id: int) -> None:
+    """
+    Delete a contact from the database.
+
+    :param db: SQLAlchemy async session object.
+    :param contact_id: Unique identifier of the contact to delete.
+    :raises ContactConflictError: If the contact was changed by another
+                writer after it was loaded.
+    :raises ContactServiceError: If contact not found.
+    :return: None
+    """
+    contact = await contact_crud.get_by_id(db, contact_id)
+    if not contact:
+        raise ContactServiceError(["Contact not found"])
+
+    before = ContactRecord.from_contact(contact)
+    autocomplete, expected = await _autocomplete(db)
+    try:
+        await contact_crud.delete(db, contact)
+    except StaleDataError as exc:
+        await db.rollback()
+        raise ContactConflictError(contact_id, before.version) from exc
+    await db.run_sync(autocomplete.apply, expected, removed=before)
+
+
+async def search_contacts(
+    db: AsyncSession,
+    query: str = "",
+    categories: list[str] | None = None,
+    phonetic: bool = False,
+) -> list[ContactRecord]:
+    """
+    Search contacts in the database by query string and optional categories.
+
+    :param db: SQLAlchemy async session object.
+    :param query: Free-text search query (e.g., part of a name, phone, or
+                  email), or a structured query (``src.utils.search_query``).
+    :param categories: Optional list of category names to filter contacts.
+    :param phonetic: Match names that sound like the query words instead.
+    :return: List of ContactRecord objects matching the search criteria.
+             If a text query finds nothing, the contacts found with its
+             names corrected for typos (``typo_search``).
+    """
+    query = query.strip()
+    categories = categories or []
+    parsed = parse_query(query)
+    if parsed.structured and not phonetic:
+        return await contact_crud.search_query_records(db, parsed, categories)
+    records = await contact_crud.search_records(
+        db=db, query=query, categories=categories, phonetic=phonetic
+    )
+    if records or phonetic or not query:
+        return records
+    return await db.run_sync(typo_search, query, categories)
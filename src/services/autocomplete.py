@@ -0,0 +1,335 @@
+"""
+Autocomplete Module
+
+As-you-type completions: an in-memory, sorted array of the tokens of all
+contacts (folded name words, emails and phone digits), each with the
+number of contacts using it and the ids of some of them. A prefix is
+found by binary search; the matching tokens are contiguous, and the most
+frequent of the first ``AUTOCOMPLETE_SCAN`` are returned.
+
+Memory is bounded: at most ``AUTOCOMPLETE_MAX_TOKENS`` tokens are kept
+(the most frequent ones, names before emails before phones) with at most
+``AUTOCOMPLETE_MAX_IDS`` contact ids each.
+
+One index exists per database (the sync and async engines of a database
+file share it). It is built on first use and rebuilt whenever the data
+revision differs from the one it was built at; a rebuild runs outside the
+index lock and swaps the new arrays in, so completions are served from the
+previous index meanwhile. Writes of both service layers update it in place
+(``expected_revision`` then ``apply``), so creating, editing or deleting a
+contact does not cause a rebuild; bulk imports, merges and other processes
+do.
+"""
+
+import heapq
+import os
+import threading
+import weakref
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+
+from sqlalchemy.orm import Session
+
+from src.config import (
+    AUTOCOMPLETE_MAX_IDS,
+    AUTOCOMPLETE_MAX_TOKENS,
+    AUTOCOMPLETE_SCAN,
+)
+from src.crud import contacts as contact_crud
+from src.database.models import ContactRecord
+from src.utils.similarity import fold
+
+# Characters ignored in a prefix that otherwise looks like a phone number
+_PHONE_SEPARATORS = str.maketrans("", "", "+-() ")
+# Rank of each kind of token when the index is full (lower is kept first)
+_NAME, _EMAIL, _PHONE = 0, 1, 2
+
+
+@dataclass(frozen=True, slots=True)
+class Completion:
+    """
+    One completion of a prefix.
+
+    :param text: The completed token.
+    :param count: Number of contacts using the token.
+    :param contact_ids: Ids of (at most ``AUTOCOMPLETE_MAX_IDS`` of) them.
+    """
+
+    text: str
+    count: int
+    contact_ids: tuple[int, ...]
+
+
+@lru_cache(maxsize=1 << 12)
+def _name_words(first_name: str, last_name: str) -> tuple[str, ...]:
+    return tuple(fold(f"{first_name} {last_name}").split())
+
+
+def contact_tokens(record: ContactRecord) -> dict[str, int]:
+    """
+    Tokens of a contact, with their kind.
+
+    :param record: Contact snapshot.
+    :return: Folded name words, the email and the phone digits.
+    """
+    tokens = dict.fromkeys(_name_words(record.first_name, record.last_name), _NAME)
+    email = record.email
+    if email:
+        # Folding only changes ASCII text by lowercasing it
+        tokens.setdefault(email.lower() if email.isascii() else fold(email), _EMAIL)
+    digits = record.phone.translate(_PHONE_SEPARATORS)
+    if digits:
+        tokens.setdefault(digits, _PHONE)
+    return tokens
+
+
+def prefix_key(prefix: str) -> str:
+    """
+    Token prefix of typed text: its digits if it looks like a phone
+    number ("+49 151" -> "49151"), else its last folded word.
+
+    :param prefix: Text typed so far.
+    :return: The prefix to complete ("" if there is nothing to complete).
+    """
+    digits = prefix.translate(_PHONE_SEPARATORS)
+    if digits.isdigit():
+        return digits
+    words = fold(prefix).split()
+    return words[-1] if words else ""
+
+
+class Autocomplete:
+    """
+    Sorted token array of the contacts of one database.
+
+    :param max_tokens: Maximum number of tokens kept.
+    :param max_ids: Maximum number of contact ids kept per token.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = AUTOCOMPLETE_MAX_TOKENS,
+        max_ids: int = AUTOCOMPLETE_MAX_IDS,
+    ):
+        self.max_tokens = max_tokens
+        self.max_ids = max_ids
+        self.tokens: list[str] = []
+        self.counts: list[int] = []
+        self.postings: list[list[int]] = []
+        self.revision: str | None = None
+        self.dropped = 0
+        self.rebuilds = 0
+        # Guards the arrays; a rebuild only holds it to swap them in
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def refresh(self, db: Session) -> None:
+        """
+        Rebuild the index if the data changed since it was built or updated.
+
+        Only the first build is waited for: while another thread rebuilds
+        the index, the previous one keeps being served.
+
+        :param db: SQLAlchemy session object.
+        """
+        revision = contact_crud.data_revision(db)
+        if revision == self.revision:
+            return
+        if not self._build_lock.acquire(blocking=self.revision is None):
+            return
+        try:
+            if revision != self.revision:
+                self._rebuild(db, revision)
+        finally:
+            self._build_lock.release()
+
+    def _rebuild(self, db: Session, revision: str) -> None:
+        kinds: dict[str, int] = {}
+        counts: Counter[str] = Counter()
+        postings: dict[str, list[int]] = {}
+        for records in contact_crud.iter_records(db):
+            for record in records:
+                tokens = contact_tokens(record)
+                kinds.update(tokens)
+                counts.update(tokens.keys())
+                for token in tokens:
+                    ids = postings.get(token)
+                    if ids is None:
+                        postings[token] = [record.id]
+                    elif len(ids) < self.max_ids:
+                        ids.append(record.id)
+        kept = sorted(postings)
+        if len(kept) > self.max_tokens:
+            kept = sorted(
+                heapq.nsmallest(
+                    self.max_tokens,
+                    kept,
+                    key=lambda token: (kinds[token], -counts[token], token),
+                )
+            )
+        token_counts = [counts[token] for token in kept]
+        token_postings = [postings[token] for token in kept]
+        # Writes applied to the previous index meanwhile changed the data
+        # revision, so the next refresh rebuilds again
+        with self._lock:
+            self.tokens = kept
+            self.counts = token_counts
+            self.postings = token_postings
+            self.dropped = len(postings) - len(kept)
+            self.revision = revision
+            self.rebuilds += 1
+
+    def complete(self, prefix: str, k: int) -> list[Completion]:
+        """
+        Most frequent tokens starting with a prefix.
+
+        :param prefix: Text typed so far (see ``prefix_key``).
+        :param k: Maximum number of completions.
+        :return: Completions by decreasing count, then alphabetically.
+        """
+        key = prefix_key(prefix)
+        if not key or k <= 0:
+            return []
+        with self._lock:
+            tokens = self.tokens
+            start = bisect_left(tokens, key)
+            end = min(start + AUTOCOMPLETE_SCAN, len(tokens))
+            matches = []
+            for index in range(start, end):
+                if not tokens[index].startswith(key):
+                    break
+                matches.append(index)
+            best = heapq.nsmallest(
+                k, matches, key=lambda i: (-self.counts[i], tokens[i])
+            )
+            return [
+                Completion(tokens[i], self.counts[i], tuple(self.postings[i]))
+                for i in best
+            ]
+
+    # ---- incremental maintenance ----
+    def expected_revision(self, db: Session) -> str | None:
+        """
+        Data revision to check before a write that ``apply`` will mirror.
+
+        :param db: SQLAlchemy session object.
+        :return: The current revision, or None if the index was never built
+                 (there is nothing to maintain).
+        """
+        if self.revision is None:
+            return None
+        return contact_crud.data_revision(db)
+
+    def apply(
+        self,
+        db: Session,
+        expected: str | None,
+        removed: ContactRecord | None = None,
+        added: ContactRecord | None = None,
+    ) -> None:
+        """
+        Mirror one contact write in the index.
+
+        The write is only applied if the index was up to date before it
+        (``expected``); otherwise the index is left for ``refresh`` to
+        rebuild. In a group-commit batch it is applied once the batch
+        commits (``contact_crud.on_commit``).
+
+        :param db: Session the write was made in.
+        :param expected: ``expected_revision`` taken before the write.
+        :param removed: The contact as it was before the write, if any.
+        :param added: The contact as it is after the write, if any.
+        """
+        if expected is None:
+            return
+        revision = contact_crud.data_revision(db)
+        contact_crud.on_commit(
+            db, lambda: self._apply(expected, revision, removed, added)
+        )
+
+    def _apply(
+        self,
+        expected: str,
+        revision: str,
+        removed: ContactRecord | None,
+        added: ContactRecord | None,
+    ) -> None:
+        with self._lock:
+            if expected != self.revision:
+                return
+            if removed is not None:
+                for token in contact_tokens(removed):
+                    self._remove(token, removed.id)
+            if added is not None:
+                for token in contact_tokens(added):
+                    self._add(token, added.id)
+            self.revision = revision
+
+    def _add(self, token: str, contact_id: int) -> None:
+        index = bisect_left(self.tokens, token)
+        if index < len(self.tokens) and self.tokens[index] == token:
+            self.counts[index] += 1
+            if len(self.postings[index]) < self.max_ids:
+                self.postings[index].append(contact_id)
+        elif len(self.tokens) < self.max_tokens:
+            self.tokens.insert(index, token)
+            self.counts.insert(index, 1)
+            self.postings.insert(index, [contact_id])
+        else:
+            self.dropped += 1
+
+    def _remove(self, token: str, contact_id: int) -> None:
+        index = bisect_left(self.tokens, token)
+        if index == len(self.tokens) or self.tokens[index] != token:
+            return
+        if self.counts[index] <= 1:
+            del self.tokens[index], self.counts[index], self.postings[index]
+            return
+        self.counts[index] -= 1
+        if contact_id in self.postings[index]:
+            self.postings[index].remove(contact_id)
+
+
+# One index per database file (shared by the sync and async engines), and
+# per engine for in-memory databases, so separate databases never share
+# tokens
+_file_indexes: dict[str, Autocomplete] = {}
+_indexes: "weakref.WeakKeyDictionary[object, Autocomplete]" = (
+    weakref.WeakKeyDictionary()
+)
+_indexes_lock = threading.Lock()
+
+
+def _database_file(bind) -> str | None:
+    """Absolute path of the database file of an engine, None if in memory."""
+    database = bind.url.database
+    if not database or database == ":memory:" or database.startswith("file:"):
+        return None
+    return os.path.abspath(database)
+
+
+def get_autocomplete(db: Session) -> Autocomplete:
+    """
+    Return the autocomplete index of the database a session is bound to.
+
+    :param db: SQLAlchemy session object (the sync session of ``run_sync``
+               for an ``AsyncSession``).
+    :return: The database's ``Autocomplete`` (refresh it before use).
+    """
+    bind = db.get_bind()
+    path = _database_file(bind)
+    with _indexes_lock:
+        if path is None:
+            index = _indexes.get(bind)
+            if index is None:
+                index = _indexes[bind] = Autocomplete()
+        else:
+            index = _file_indexes.get(path)
+            if index is None:
+                index = _file_indexes[path] = Autocomplete()
+        return index
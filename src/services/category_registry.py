@@ -0,0 +1,76 @@
+"""
+Category Registry Module
+
+The names and ids of the categories of one database, kept in memory: the
+choices offered by the UI and the CLI, and the translation between names
+and the ``category_id`` stored with each contact.
+
+Categories are only ever added, so the registry is current as long as the
+largest category id has not changed; ``refresh`` checks that (one indexed
+``max(id)``) and reloads the table, a handful of rows, when it has.
+"""
+
+import threading
+import weakref
+
+from sqlalchemy.orm import Session
+
+from src.crud import categories as category_crud
+
+
+class CategoryRegistry:
+    """Category names in the order they were added, and their ids."""
+
+    def __init__(self) -> None:
+        self.names: tuple[str, ...] = ()
+        self._ids: dict[str, int] = {}
+        self._names_by_id: dict[int, str] = {}
+        self._revision: int | None = None
+        self._lock = threading.Lock()
+
+    def refresh(self, db: Session) -> "CategoryRegistry":
+        """
+        Reload the categories if any were added since the last load.
+
+        :param db: SQLAlchemy session object.
+        :return: The registry itself.
+        """
+        revision = category_crud.revision(db)
+        if revision != self._revision:
+            rows = category_crud.list_all(db)
+            with self._lock:
+                self._ids = {name: category_id for category_id, name in rows}
+                self._names_by_id = dict(rows)
+                self.names = tuple(name for _, name in rows)
+                self._revision = revision
+        return self
+
+    def id_of(self, name: str) -> int | None:
+        """Id of a category, None if there is no category of that name."""
+        return self._ids.get(name)
+
+    def name_of(self, category_id: int) -> str | None:
+        """Name of a category, None for an unknown id."""
+        return self._names_by_id.get(category_id)
+
+
+# One registry per engine, so separate databases never share ids
+_registries: "weakref.WeakKeyDictionary[object, CategoryRegistry]" = (
+    weakref.WeakKeyDictionary()
+)
+_registries_lock = threading.Lock()
+
+
+def get_category_registry(db: Session) -> CategoryRegistry:
+    """
+    Return the category registry of the engine a session is bound to.
+
+    :param db: SQLAlchemy session object.
+    :return: The engine's ``CategoryRegistry``, refreshed.
+    """
+    bind = db.get_bind()
+    with _registries_lock:
+        registry = _registries.get(bind)
+        if registry is None:
+            registry = _registries[bind] = CategoryRegistry()
+    return registry.refresh(db)
@@ -0,0 +1,245 @@
+"""
+Contact Cache Module
+
+This module provides a bounded, in-process read-through cache of
+immutable ``ContactRecord`` snapshots, indexed by id, normalized phone
+and normalized email.
+
+One cache exists per database engine. The service layer invalidates
+entries precisely on create, update and delete; commits made by other
+connections or processes are detected with ``PRAGMA data_version``,
+which flushes the whole cache. Read-through callers pass the
+``generation`` taken before their read to ``put``, so a row read before
+an invalidation is not cached after it.
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy.orm import Session
+
+from src.config import CONTACT_CACHE_SIZE
+from src.database.models import ContactRecord
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Counters of a ``ContactCache``."""
+
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+    flushes: int
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ContactCache:
+    """
+    Bounded LRU cache of contact snapshots.
+
+    :param maxsize: Maximum number of contacts kept in the cache.
+    """
+
+    def __init__(self, maxsize: int = CONTACT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
+        # Incremented by every invalidation (see ``put``)
+        self.generation = 0
+        self._by_id: OrderedDict[int, ContactRecord] = OrderedDict()
+        self._by_phone: dict[str, int] = {}
+        self._by_email: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    # ---- lookups ----
+    def get(self, db: Session, contact_id: int) -> ContactRecord | None:
+        """
+        Return the cached snapshot of a contact.
+
+        :param db: Session used to detect commits from other connections.
+        :param contact_id: Unique identifier of the contact.
+        :return: The snapshot, or None on a cache miss.
+        """
+        self.check_data_version(db)
+        with self._lock:
+            return self._lookup(contact_id)
+
+    def get_many(self, db: Session, contact_ids: list[int]) -> dict[int, ContactRecord]:
+        """
+        Return the cached snapshots of several contacts.
+
+        :param db: Session used to detect commits from other connections.
+        :param contact_ids: Unique identifiers of the contacts.
+        :return: Snapshots by id; ids that were not cached are missing.
+        """
+        self.check_data_version(db)
+        with self._lock:
+            found = {}
+            for contact_id in contact_ids:
+                record = self._lookup(contact_id)
+                if record is not None:
+                    found[contact_id] = record
+            return found
+
+    def get_by_phone(self, db: Session, phone: str) -> ContactRecord | None:
+        """
+        Return the cached snapshot of the contact with a normalized phone.
+
+        :param db: Session used to detect commits from other connections.
+        :param phone: Normalized phone number.
+        :return: The snapshot, or None on a cache miss.
+        """
+        self.check_data_version(db)
+        with self._lock:
+            return self._lookup(self._by_phone.get(phone))
+
+    def get_by_email(self, db: Session, email: str) -> ContactRecord | None:
+        """
+        Return the cached snapshot of the contact with a normalized email.
+
+        :param db: Session used to detect commits from other connections.
+        :param email: Normalized email address.
+        :return: The snapshot, or None on a cache miss.
+        """
+        self.check_data_version(db)
+        with self._lock:
+            return self._lookup(self._by_email.get(email))
+
+    def _lookup(self, contact_id: int | None) -> ContactRecord | None:
+        record = self._by_id.get(contact_id) if contact_id is not None else None
+        if record is None:
+            self.misses += 1
+            return None
+        self._by_id.move_to_end(contact_id)  # type: ignore[arg-type]
+        self.hits += 1
+        return record
+
+    # ---- maintenance ----
+    def put(
+        self, record: ContactRecord, generation: int | None = None
+    ) -> ContactRecord:
+        """
+        Store a snapshot, evicting the least recently used one if full.
+
+        :param record: Snapshot to cache.
+        :param generation: ``generation`` taken before the snapshot was read;
+                           if the cache was invalidated since, the snapshot
+                           may predate a write and is not stored.
+        :return: The snapshot.
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return record
+            self._remove(record.id)
+            self._by_id[record.id] = record
+            self._by_phone[record.phone] = record.id
+            if record.email:
+                self._by_email[record.email] = record.id
+            while len(self._by_id) > self.maxsize:
+                self._remove(next(iter(self._by_id)))
+        return record
+
+    def invalidate(self, contact_id: int) -> None:
+        """
+        Drop a contact and its phone/email keys from the cache.
+
+        :param contact_id: Unique identifier of the contact.
+        """
+        with self._lock:
+            self.generation += 1
+            self._remove(contact_id)
+
+    def invalidate_keys(self, phone: str | None, email: str | None) -> None:
+        """
+        Drop any contact cached under the given phone or email.
+
+        :param phone: Normalized phone number.
+        :param email: Normalized email address.
+        """
+        with self._lock:
+            self.generation += 1
+            for contact_id in (
+                self._by_phone.get(phone) if phone else None,
+                self._by_email.get(email) if email else None,
+            ):
+                if contact_id is not None:
+                    self._remove(contact_id)
+
+    def clear(self) -> None:
+        """Drop all cached contacts."""
+        with self._lock:
+            self.generation += 1
+            self._by_id.clear()
+            self._by_phone.clear()
+            self._by_email.clear()
+            self.flushes += 1
+
+    def _remove(self, contact_id: int) -> None:
+        record = self._by_id.pop(contact_id, None)
+        if record is None:
+            return
+        if self._by_phone.get(record.phone) == contact_id:
+            del self._by_phone[record.phone]
+        if record.email and self._by_email.get(record.email) == contact_id:
+            del self._by_email[record.email]
+
+    def check_data_version(self, db: Session) -> None:
+        """
+        Flush the cache if another connection committed since the last check.
+
+        ``PRAGMA data_version`` changes whenever a different connection
+        (including other processes) commits to the database file. The last
+        value seen is kept per DBAPI connection; the values of different
+        connections are not comparable, so a connection checked for the
+        first time also flushes the cache.
+
+        :param db: Session whose connection is checked.
+        """
+        conn = db.connection()
+        version = conn.exec_driver_sql("PRAGMA data_version").scalar()
+        previous = conn.info.get("contact_cache_data_version")
+        conn.info["contact_cache_data_version"] = version
+        if previous != version:
+            self.clear()
+
+    def stats(self) -> CacheStats:
+        """Return the hit/miss counters and the current size."""
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            size=len(self._by_id),
+            maxsize=self.maxsize,
+            flushes=self.flushes,
+        )
+
+
+# One cache per engine, so separate databases never share snapshots
+_caches: "weakref.WeakKeyDictionary[object, ContactCache]" = weakref.WeakKeyDictionary()
+_caches_lock = threading.Lock()
+
+
+def get_contact_cache(db: Session) -> ContactCache:
+    """
+    Return the contact cache of the engine a session is bound to.
+
+    :param db: SQLAlchemy session object.
+    :return: The engine's ``ContactCache``.
+    """
+    bind = db.get_bind()
+    with _caches_lock:
+        cache = _caches.get(bind)
+        if cache is None:
+            cache = _caches[bind] = ContactCache()
+        return cache
@@ -4,12 +4,35 @@ Contact Service Module
 This module provides higher-level service functions for managing contacts.
 It applies validation rules before delegating persistence operations to
 the CRUD layer. Errors are wrapped in a custom ``ContactServiceError``.
+
+Reads are served through the in-memory caches and indexes of
+``src.services`` (contacts, autocomplete, typo-tolerant names, categories,
+statistics), which every write keeps up to date.
 """
 
+import heapq
+import itertools
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 
+from src.config import AUTOCOMPLETE_K, CHANGE_FEED_BATCH
+from src.crud import changes as change_crud
 from src.crud import contacts as contact_crud
-from src.database.models import Contact
+from src.crud.query_compiler import search_query_records
+from src.database.models import Contact, ContactRecord
+from src.database.retry import retry_on_lock
+from src.services.autocomplete import Completion, get_autocomplete
+from src.services.category_registry import get_category_registry
+from src.services.contact_cache import CacheStats, get_contact_cache
+from src.services.name_index import typo_search
+from src.services.stats_cache import ContactStats, get_stats_cache
+from src.utils.search_query import parse_query
 from src.utils.validation import (
     normalize_email,
     normalize_phone,
@@ -18,6 +41,14 @@ from src.utils.validation import (
     validate_phone,
 )
 
+# Duplicate errors of new contacts (shared with import_service)
+PHONE_TAKEN = "📞 Phone number already exists."
+EMAIL_TAKEN = "📧 Email already exists."
+EDIT_CONFLICT = "✋ The contact was changed by someone else in the meantime."
+
+# Fields of a contact that an edit changes
+EDITABLE_FIELDS = ("first_name", "last_name", "phone", "email", "category")
+
 
 class ContactServiceError(Exception):
     """
@@ -32,112 +63,675 @@ class ContactServiceError(Exception):
         super().__init__("Contact service error")
 
 
-def get_contact(db: Session, contact_id: int) -> Contact:
+class ContactConflictError(ContactServiceError):
+    """
+    Exception raised when an update was made against a version of a contact
+    that another writer has changed (or deleted) since.
+
+    :param contact_id: Unique identifier of the contact.
+    :param expected_version: Version the update was made against.
+    """
+
+    def __init__(self, contact_id: int, expected_version: int | None):
+        super().__init__([EDIT_CONFLICT])
+        self.contact_id = contact_id
+        self.expected_version = expected_version
+
+
+def get_contact(db: Session, contact_id: int) -> ContactRecord:
     """
-    Getting contact by id from CRUD
+    Getting contact by id, served from the contact cache when possible
 
     :param db: QLAlchemy session object.
     :param contact_id: Unique identifier of the contact.
     :raises ContactServiceError: If contact not found.
-    :return: The Contact object.
+    :return: Read-only snapshot of the contact.
     """
+    cache = get_contact_cache(db)
+    record = cache.get(db, contact_id)
+    if record is not None:
+        return record
+
+    generation = cache.generation
     contact = contact_crud.get_by_id(db, contact_id)
     if not contact:
         raise ContactServiceError(["Contact not found"])
-    return contact
+    return cache.put(ContactRecord.from_contact(contact), generation)
 
 
-def add_contact(db: Session, data: dict) -> Contact:
+def get_contacts(db: Session, contact_ids: list[int]) -> list[ContactRecord]:
     """
-    Validate and add a new contact to the database.
+    Get several contacts by id; cache misses are loaded in one query.
+
+    :param db: SQLAlchemy session object.
+    :param contact_ids: Unique identifiers of the contacts.
+    :return: Snapshots of the existing contacts, in the order of the ids.
+    """
+    cache = get_contact_cache(db)
+    found = cache.get_many(db, contact_ids)
+    missing = [contact_id for contact_id in contact_ids if contact_id not in found]
+    generation = cache.generation
+    for record in contact_crud.get_records_by_ids(db, missing):
+        found[record.id] = cache.put(record, generation)
+    return [found[contact_id] for contact_id in contact_ids if contact_id in found]
+
+
+def _find_by_phone(db: Session, phone: str) -> ContactRecord | None:
+    """Read-through lookup of a contact by normalized phone."""
+    cache = get_contact_cache(db)
+    record = cache.get_by_phone(db, phone)
+    if record is None:
+        generation = cache.generation
+        contact = contact_crud.get_by_phone(db, phone)
+        if contact:
+            record = cache.put(ContactRecord.from_contact(contact), generation)
+    return record
+
+
+def _find_by_email(db: Session, email: str) -> ContactRecord | None:
+    """Read-through lookup of a contact by normalized email."""
+    cache = get_contact_cache(db)
+    record = cache.get_by_email(db, email)
+    if record is None:
+        generation = cache.generation
+        contact = contact_crud.get_by_email(db, email)
+        if contact:
+            record = cache.put(ContactRecord.from_contact(contact), generation)
+    return record
+
+
+def get_cache_stats(db: Session) -> CacheStats:
+    """
+    Return the hit/miss counters of the contact cache.
 
     :param db: SQLAlchemy session object.
+    :return: Cache statistics of the session's engine.
+    """
+    return get_contact_cache(db).stats()
+
+
+@dataclass(frozen=True)
+class NewContactCheck:
+    """
+    Outcome of the rules of ``add_contact`` that need no database access.
+
+    ``lookup_phone`` / ``lookup_email`` are the normalized values that
+    still have to be checked for duplicates (None if invalid or empty).
+    """
+
+    data: dict
+    phone: str | None
+    email: str | None
+    name_errors: list[str]
+    phone_errors: list[str]
+    email_errors: list[str]
+
+    @property
+    def lookup_phone(self) -> str | None:
+        """Normalized phone to check for duplicates."""
+        return self.phone if not self.phone_errors and self.phone else None
+
+    @property
+    def lookup_email(self) -> str | None:
+        """Normalized email to check for duplicates."""
+        return self.email if not self.email_errors and self.email else None
+
+    def errors(self, phone_taken: bool, email_taken: bool) -> list[str]:
+        """
+        Collect all error messages, in field order.
+
+        :param phone_taken: Whether another contact already has the phone.
+        :param email_taken: Whether another contact already has the email.
+        :return: List of error messages, empty if the contact is valid.
+        """
+        errors = [*self.name_errors, *self.phone_errors]
+        if phone_taken:
+            errors.append(PHONE_TAKEN)
+        errors.extend(self.email_errors)
+        if email_taken:
+            errors.append(EMAIL_TAKEN)
+        return errors
+
+    def values(self) -> dict:
+        """Column values of the new contact."""
+        return {
+            "first_name": self.data["first_name"].strip(),
+            "last_name": self.data["last_name"].strip(),
+            "phone": self.phone,
+            "email": self.email,
+            "category": self.data.get("category"),
+        }
+
+    def build(self) -> Contact:
+        """Create the (unsaved) Contact from the checked data."""
+        return Contact(**self.values())
+
+
+def check_new_contact(data: dict) -> NewContactCheck:
+    """
+    Apply the name, phone and email rules to the data of a new contact.
+
     :param data: Dictionary containing contact fields
     (first_name, last_name, phone, email, category).
-    :raises ContactServiceError: If validation fails or duplicate phone/email exists.
-    :return: The persisted Contact object.
+    :return: The normalized values and the error messages per field.
     """
-    errors = []
-
     # ---- Name rules ----
     valid, msg = validate_name_pair(data["first_name"], data["last_name"])
-    if not valid:
-        errors.append(msg)
+    name_errors = [] if valid else [msg]
 
     # ---- Phone rules ----
     phone_raw = data.get("phone", "")
     phone_valid, phone_error = validate_phone(phone_raw)
     phone = normalize_phone(phone_raw)
-    if not phone_valid:
-        errors.extend(phone_error)
-    elif phone and contact_crud.get_by_phone(db, phone):
-        errors.append("📞 Phone number already exists.")
+    phone_errors = [] if phone_valid else list(phone_error)
 
     # ---- Email rules ----
-    email_raw = data.get("email", "")
-    email = normalize_email(email_raw)
-    email_valid, email_error = validate_email(email)
-    if not email_valid:
-        errors.append(email_error)  # type: ignore[arg-type]
-    elif email and contact_crud.get_by_email(db, email):
-        errors.append("📧 Email already exists.")
+    email = normalize_email(data.get("email", ""))
+    _, email_error = validate_email(email)
+    email_errors = [] if email_error is None else [email_error]
+
+    return NewContactCheck(
+        data=data,
+        phone=phone,
+        email=email,
+        name_errors=name_errors,
+        phone_errors=phone_errors,
+        email_errors=email_errors,
+    )
+
 
+def _undo(db: Session) -> None:
+    """Roll back a failed write; a group-commit batch only its savepoint."""
+    if not db.info.get("defer_commit"):
+        db.rollback()
+
+
+@retry_on_lock
+def add_contact(db: Session, data: dict) -> Contact:
+    """
+    Validate and add a new contact to the database.
+
+    :param db: SQLAlchemy session object.
+    :param data: Dictionary containing contact fields
+    (first_name, last_name, phone, email, category).
+    :raises ContactServiceError: If validation fails or duplicate phone/email exists.
+    :raises IntegrityError: If another writer took the phone or email after
+                the check (the session is rolled back).
+    :return: The persisted Contact object.
+    """
+    check = check_new_contact(data)
+    phone, email = check.lookup_phone, check.lookup_email
+    errors = check.errors(
+        phone_taken=phone is not None and _find_by_phone(db, phone) is not None,
+        email_taken=email is not None and _find_by_email(db, email) is not None,
+    )
     if errors:
         raise ContactServiceError(errors)
 
-    contact = Contact(
-        first_name=data["first_name"].strip(),
-        last_name=data["last_name"].strip(),
-        phone=phone,
-        email=email,
-        category=data.get("category"),
+    autocomplete = get_autocomplete(db)
+    expected = autocomplete.expected_revision(db)
+    try:
+        contact = contact_crud.create(db, check.build())
+    except IntegrityError:
+        _undo(db)
+        raise
+    contact_crud.on_commit(
+        db, partial(get_contact_cache(db).invalidate_keys, check.phone, check.email)
     )
+    autocomplete.apply(db, expected, added=ContactRecord.from_contact(contact))
+    return contact
+
+
+def list_contacts(db: Session) -> list[ContactRecord]:
+    """
+    Retrieve all contacts from the database as read-only records.
+
+    :param db: SQLAlchemy session object.
+    :return: List of ContactRecord objects.
+    """
+    return contact_crud.list_records(db)
+
+
+def list_contacts_page(
+    db: Session, offset: int = 0, limit: int = 50
+) -> tuple[list[ContactRecord], int]:
+    """
+    Retrieve one page of contacts, ordered by name.
+
+    :param db: SQLAlchemy session object.
+    :param offset: Number of contacts to skip.
+    :param limit: Maximum number of contacts to return.
+    :return: The page of ContactRecord objects and the total number of contacts.
+    """
+    return contact_crud.list_records_page(db, offset, limit), contact_crud.count(db)
+
+
+# Continues a listing by recency: (timestamp, id) of the last contact shown
+RecencyCursor = tuple[datetime, int]
+
+
+def _page_with_cursor(
+    rows: list[tuple[datetime, ContactRecord]], limit: int
+) -> tuple[list[ContactRecord], RecencyCursor | None]:
+    """Split a page read with one extra row into records and the next cursor."""
+    if len(rows) <= limit:
+        return [record for _, record in rows], None
+    last_at, last = rows[limit - 1]
+    return [record for _, record in rows[:limit]], (last_at, last.id)
+
+
+def list_recent_contacts(
+    db: Session,
+    by: str = "updated",
+    limit: int = 20,
+    before: RecencyCursor | None = None,
+) -> tuple[list[ContactRecord], RecencyCursor | None]:
+    """
+    Retrieve one page of contacts, most recently added or edited first.
+
+    Every page is one range of the ``created_at`` / ``updated_at`` index
+    (keyset pagination), so it costs the same at any depth and book size.
 
-    return contact_crud.create(db, contact)
+    :param db: SQLAlchemy session object.
+    :param by: "created" for recently added, "updated" for recently edited.
+    :param limit: Maximum number of contacts to return.
+    :param before: Cursor returned with the previous page, None for the
+                   first page.
+    :return: The page of ContactRecord objects and the cursor of the next
+             page (None after the last page).
+    :raises ContactServiceError: If ``by`` is neither "created" nor "updated".
+    """
+    if by not in contact_crud.RECENCY_COLUMNS:
+        raise ContactServiceError([f"Unknown recency order: {by}"])
+    rows = contact_crud.list_recent_records(db, by, limit + 1, before)
+    return _page_with_cursor(rows, limit)
+
+
+def list_changed_since(
+    db: Session,
+    since: datetime,
+    limit: int = 1000,
+    after: RecencyCursor | None = None,
+) -> tuple[list[ContactRecord], RecencyCursor | None]:
+    """
+    Retrieve one page of the contacts added or edited at or after a time,
+    oldest change first, for incremental exports.
+
+    Deleted contacts are not listed; ``changes_since`` reports them.
+
+    :param db: SQLAlchemy session object.
+    :param since: Time of the last export (UTC).
+    :param limit: Maximum number of contacts to return.
+    :param after: Cursor returned with the previous page, None for the
+                  first page.
+    :return: The page of ContactRecord objects and the cursor of the next
+             page (None after the last page).
+    """
+    rows = contact_crud.list_changed_since(db, after or (since, 0), limit + 1)
+    return _page_with_cursor(rows, limit)
+
+
+def _normalize_domain(domain: str) -> str:
+    """Domain as stored in ``email_domain`` ("@ACME.com" -> "acme.com")."""
+    return domain.strip().lstrip("@").lower()
+
+
+def list_contacts_by_domain(
+    db: Session, domain: str, offset: int = 0, limit: int = 50
+) -> tuple[list[ContactRecord], int]:
+    """
+    Retrieve one page of the contacts whose email is at a domain.
+
+    :param db: SQLAlchemy session object.
+    :param domain: Email domain, e.g. "acme.com" (case and a leading "@"
+                   are ignored).
+    :param offset: Number of contacts to skip.
+    :param limit: Maximum number of contacts to return.
+    :return: The page of ContactRecord objects, in id order, and the
+             number of contacts at the domain.
+    """
+    domain = _normalize_domain(domain)
+    return (
+        contact_crud.list_domain_records(db, domain, offset, limit),
+        contact_crud.count_domain(db, domain),
+    )
+
+
+def top_domains(db: Session, limit: int = 10) -> list[tuple[str, int]]:
+    """
+    Return the email domains with the most contacts.
+
+    :param db: SQLAlchemy session object.
+    :param limit: Maximum number of domains to return.
+    :return: ``(domain, count)`` pairs, largest count first, then by domain.
+    """
+    return heapq.nsmallest(
+        limit, contact_crud.domain_counts(db), key=lambda pair: (-pair[1], pair[0])
+    )
 
 
-def list_contacts(db: Session) -> list[Contact]:
+def list_categories(db: Session) -> list[str]:
     """
-    Retrieve all contacts from the database.
+    Return the category names to choose from.
 
     :param db: SQLAlchemy session object.
-    :return: List of Contact objects.
+    :return: Category names, in the order they were added.
     """
-    return contact_crud.get_all(db)
+    return list(get_category_registry(db).names)
 
 
-def update_contact(db: Session, contact_id: int, data: dict) -> Contact:
+def category_counts(db: Session) -> list[tuple[str, int]]:
+    """
+    Count the contacts of every category.
+
+    :param db: SQLAlchemy session object.
+    :return: ``(category, count)`` pairs of all categories, unused ones
+             included, in the order of ``list_categories``.
+    """
+    registry = get_category_registry(db)
+    counts = dict(contact_crud.category_counts(db))
+    return [
+        (name, counts.get(registry.id_of(name), 0))  # type: ignore[arg-type]
+        for name in registry.names
+    ]
+
+
+def list_contacts_by_category(
+    db: Session, category: str, offset: int = 0, limit: int = 50
+) -> tuple[list[ContactRecord], int]:
+    """
+    Retrieve one page of the contacts of a category.
+
+    :param db: SQLAlchemy session object.
+    :param category: Category name.
+    :param offset: Number of contacts to skip.
+    :param limit: Maximum number of contacts to return.
+    :return: The page of ContactRecord objects, ordered by name, and the
+             number of contacts in the category (none for an unknown one).
+    """
+    category_id = get_category_registry(db).id_of(category)
+    if category_id is None:
+        return [], 0
+    return (
+        contact_crud.list_category_records(db, category_id, offset, limit),
+        contact_crud.count_category(db, category_id),
+    )
+
+
+def get_data_revision(db: Session) -> str:
+    """
+    Return a token that changes whenever any contact is added, changed or deleted.
+
+    :param db: SQLAlchemy session object.
+    :return: Opaque revision string, e.g. for HTTP ETags.
+    """
+    return contact_crud.data_revision(db)
+
+
+def _per_month(days: list[tuple[str, int]]) -> list[tuple[str, int]]:
+    """Sum day counts in day order to month counts ("2024-05-17" -> "2024-05")."""
+    return [
+        (month, sum(count for _, count in group))
+        for month, group in itertools.groupby(days, key=lambda pair: pair[0][:7])
+    ]
+
+
+def created_counts(db: Session, period: str = "day") -> list[tuple[str, int]]:
+    """
+    Count the contacts created per day or per month.
+
+    :param db: SQLAlchemy session object.
+    :param period: "day" or "month".
+    :return: ``(period, count)`` pairs in date order, e.g. ``("2024-05", 12)``,
+             periods without new contacts omitted.
+    :raises ContactServiceError: If the period is neither "day" nor "month".
+    """
+    if period not in ("day", "month"):
+        raise ContactServiceError([f"Unknown period: {period}"])
+    days = contact_crud.created_per_day(db)
+    return days if period == "day" else _per_month(days)
+
+
+def missing_field_counts(db: Session) -> dict[str, int]:
+    """
+    Count the contacts without an email, first name, last name or category.
+
+    :param db: SQLAlchemy session object.
+    :return: Number of contacts per missing field.
+    """
+    return contact_crud.missing_field_counts(db)
+
+
+def _compute_stats(db: Session, revision: str) -> ContactStats:
+    """Compute all statistics at the given data revision."""
+    days = contact_crud.created_per_day(db)
+    return ContactStats(
+        revision=revision,
+        total=contact_crud.count(db),
+        by_category=category_counts(db),
+        top_domains=top_domains(db),
+        created_per_day=days,
+        created_per_month=_per_month(days),
+        missing=contact_crud.missing_field_counts(db),
+    )
+
+
+def get_contact_stats(db: Session) -> ContactStats:
+    """
+    Return the statistics of all contacts, computed once per data revision.
+
+    :param db: SQLAlchemy session object.
+    :return: Counts per category, top email domains, contacts created per
+             day and month, and contacts without each optional field.
+    """
+    return get_stats_cache(db).get(db, _compute_stats)
+
+
+@dataclass(frozen=True)
+class Change:
+    """
+    One entry of the change feed.
+
+    ``op`` is "insert" for a contact inserted after the requested sequence
+    number, "update" for one updated after it, "delete" for one deleted
+    after it. ``contact`` is the contact as it is now (None if deleted);
+    a contact changed several times appears once, at its last change.
+    """
+
+    seq: int
+    op: str
+    contact_id: int
+    contact: ContactRecord | None
+
+
+def get_change_seq(db: Session) -> int:
+    """
+    Return the sequence number of the last change of the contacts.
+
+    A mirror that copies every contact first reads it before the copy and
+    then follows ``changes_since`` that number.
+
+    :param db: SQLAlchemy session object.
+    :return: Last sequence number (0 before the first change).
+    """
+    return change_crud.latest(db)
+
+
+def changes_since(
+    db: Session, since: int = 0, limit: int = CHANGE_FEED_BATCH
+) -> list[Change]:
+    """
+    Return the contacts inserted, updated or deleted after a sequence number.
+
+    Reads at most ``limit`` changed contacts and ``limit`` tombstones, each
+    from its ``change_seq`` index, and merges them in sequence order: the
+    cost follows the number of changes, not the number of contacts.
+
+    :param db: SQLAlchemy session object.
+    :param since: Sequence number of the last change already applied
+                  (0 for all contacts).
+    :param limit: Maximum number of changes to return.
+    :return: Changes in sequence order; the ``seq`` of the last one is the
+             ``since`` of the next call.
+    """
+    changed = [
+        Change(seq, "insert" if created_seq > since else "update", record.id, record)
+        for seq, created_seq, record in change_crud.list_changed_records(
+            db, since, limit
+        )
+    ]
+    deleted = [
+        Change(seq, "delete", contact_id, None)
+        for seq, contact_id in change_crud.list_deleted(db, since, limit)
+    ]
+    merged = heapq.merge(changed, deleted, key=lambda change: change.seq)
+    return list(itertools.islice(merged, limit))
+
+
+def iter_changes(
+    db: Session, since: int = 0, batch_size: int = CHANGE_FEED_BATCH
+) -> Iterator[Change]:
+    """
+    Yield every change after a sequence number, ``batch_size`` at a time.
+
+    :param db: SQLAlchemy session object.
+    :param since: Sequence number of the last change already applied.
+    :param batch_size: Number of changes read per query.
+    :return: Iterator of the changes in sequence order.
+    """
+    while batch := changes_since(db, since, batch_size):
+        yield from batch
+        since = batch[-1].seq
+
+
+def _conflict(
+    db: Session, contact_id: int, expected_version: int | None
+) -> ContactConflictError:
+    """Undo a write that failed its version check and describe the conflict."""
+    _undo(db)
+    get_contact_cache(db).invalidate(contact_id)
+    return ContactConflictError(contact_id, expected_version)
+
+
+@retry_on_lock
+def update_contact(
+    db: Session, contact_id: int, data: dict, expected_version: int | None = None
+) -> Contact:
     """
     Update an existing contact in the database.
 
+    With ``expected_version`` the update is optimistic: the UPDATE only
+    matches the row at that version, so an edit of a contact another writer
+    has changed since is rejected instead of overwriting their changes.
+
     :param db: SQLAlchemy session object.
     :param contact_id: Unique identifier of the contact to update.
     :param data: Dictionary of fields to update (first_name, last_name,
                 phone, email, category).
+    :param expected_version: Version of the contact the changes were made
+                against (``ContactRecord.version``); None updates the
+                current version.
+    :raises ContactConflictError: If the contact is no longer at
+                ``expected_version``.
     :raises ContactServiceError: If contact not found or validation fails.
+    :raises IntegrityError: If the new phone or email belongs to another
+                contact (the session is rolled back).
     :return: The updated Contact object.
     """
     contact = contact_crud.get_by_id(db, contact_id)
     if not contact:
         raise ContactServiceError(["Contact not found"])
 
+    # Read before the changes are applied: a query would autoflush them
+    before = ContactRecord.from_contact(contact)
+    autocomplete = get_autocomplete(db)
+    expected = autocomplete.expected_revision(db)
+    errors = apply_contact_changes(contact, data)
+    if errors:
+        # Discard the partially applied changes so a later commit on the
+        # same session cannot persist them. Expiring (not rolling back)
+        # keeps other writes of a group-commit batch intact.
+        db.expire(contact)
+        raise ContactServiceError(errors)
+
+    try:
+        contact = contact_crud.update(db, contact, expected_version)
+    except StaleDataError as exc:
+        raise _conflict(db, contact_id, expected_version) from exc
+    except IntegrityError:
+        _undo(db)
+        raise
+    contact_crud.on_commit(db, partial(get_contact_cache(db).invalidate, contact_id))
+    autocomplete.apply(db, expected, before, ContactRecord.from_contact(contact))
+    return contact
+
+
+def _same_value(left: str | None, right: str | None) -> bool:
+    """Compare field values as the edit form shows them (None as empty)."""
+    return (left or "").strip() == (right or "").strip()
+
+
+def merge_edits(
+    base: ContactRecord, current: ContactRecord, data: dict
+) -> tuple[dict, list[str]]:
+    """
+    Three-way merge of an edit with the changes another writer made since.
+
+    Compares the fields the edit was made against (``base``) with the
+    current contact and the edited values: the edit keeps the fields only
+    it changed, the other writer's changes are kept by leaving them out,
+    and the fields both changed to different values are conflicts.
+
+    :param base: Snapshot of the contact the edit was made against.
+    :param current: Snapshot of the contact as it is now.
+    :param data: Edited fields (first_name, last_name, phone, email,
+                category).
+    :return: The changes to apply to the current version and the names of
+             the conflicting fields (left out of the changes).
+    """
+    changes, conflicts = {}, []
+    for field in EDITABLE_FIELDS:
+        if field not in data:
+            continue
+        ours, old, theirs = data[field], getattr(base, field), getattr(current, field)
+        if _same_value(ours, old) or _same_value(ours, theirs):
+            continue
+        if _same_value(theirs, old):
+            changes[field] = ours
+        else:
+            conflicts.append(field)
+    return changes, conflicts
+
+
+def apply_contact_changes(contact: Contact, data: dict) -> list[str]:
+    """
+    Validate the changed fields and apply them to a loaded contact.
+
+    The category is only applied if all other fields are valid.
+
+    :param contact: Contact to modify.
+    :param data: Dictionary of fields to update (first_name, last_name,
+                phone, email, category); None clears a field.
+    :return: List of error messages, empty if the changes are valid.
+    """
     errors: list[str] = []
     # ---- name validation (pair) ----
-    first_name = data.get("first_name", contact.first_name)
-    last_name = data.get("last_name", contact.last_name)
+    first_name = data.get("first_name", contact.first_name) or ""
+    last_name = data.get("last_name", contact.last_name) or ""
 
     name_valid, name_error = validate_name_pair(first_name, last_name)
     if not name_valid:
         errors.append(name_error)
-    contact.first_name = first_name.strip()
-    contact.last_name = last_name.strip()
+    contact.first_name = first_name.strip()  # type: ignore[assignment]
+    contact.last_name = last_name.strip()  # type: ignore[assignment]
     # ---- phone ----
     if "phone" in data:
-        phone_valid, phone_error = validate_phone(data["phone"])
+        phone = data["phone"] or ""
+        phone_valid, phone_error = validate_phone(phone)
         if not phone_valid:
             errors.extend(phone_error)
 
-        contact.phone = normalize_phone(data["phone"])  # type: ignore[assignment]
+        contact.phone = normalize_phone(phone)  # type: ignore[assignment]
 
     # ---- email ----
     if "email" in data:
@@ -146,21 +740,27 @@ def update_contact(db: Session, contact_id: int, data: dict) -> Contact:
             errors.append(email_error)  # type: ignore[arg-type]
         contact.email = normalize_email(data["email"])  # type: ignore[assignment]
 
-    if errors:
-        raise ContactServiceError(errors)
-
-    if "category" in data:
+    if not errors and "category" in data:
         contact.category = data["category"]
 
-    return contact_crud.update(db, contact)
+    return errors
 
 
-def delete_contact(db: Session, contact_id: int) -> None:
+@retry_on_lock
+def delete_contact(
+    db: Session, contact_id: int, expected_version: int | None = None
+) -> None:
     """
     Delete a contact from the database.
 
     :param db: SQLAlchemy session object.
     :param contact_id: Unique identifier of the contact to delete.
+    :param expected_version: Version of the contact the deletion was
+                confirmed against (``ContactRecord.version``); None deletes
+                the current version.
+    :raises ContactConflictError: If the contact was changed by another
+                writer after it was loaded, or is no longer at
+                ``expected_version``.
     :raises ContactServiceError: If contact not found.
     :return: None
     """
@@ -168,12 +768,24 @@ def delete_contact(db: Session, contact_id: int) -> None:
     if not contact:
         raise ContactServiceError(["Contact not found"])
 
-    contact_crud.delete(db, contact)
+    before = ContactRecord.from_contact(contact)
+    autocomplete = get_autocomplete(db)
+    expected = autocomplete.expected_revision(db)
+    try:
+        contact_crud.delete(db, contact, expected_version)
+    except StaleDataError as exc:
+        version = before.version if expected_version is None else expected_version
+        raise _conflict(db, contact_id, version) from exc
+    contact_crud.on_commit(db, partial(get_contact_cache(db).invalidate, contact_id))
+    autocomplete.apply(db, expected, removed=before)
 
 
 def search_contacts(
-    db: Session, query: str = "", categories: list[str] | None = None
-) -> Contact:
+    db: Session,
+    query: str = "",
+    categories: list[str] | None = None,
+    phonetic: bool = False,
+) -> list[ContactRecord]:
     """
     Search contacts in the database by query string and optional categories.
 
@@ -182,10 +794,42 @@ def search_contacts(
     to the CRUD layer.
 
     :param db: SQLAlchemy session object used to access the database.
-    :param query: Free-text search query (e.g., part of a name, phone, or email).
+    :param query: Free-text search query (e.g., part of a name, phone, or
+                  email), or a structured query such as
+                  ``name:jo* cat:Work -email:@acme.com``
+                  (``src.utils.search_query``).
     :param categories: Optional list of category names to filter contacts.
-    :return: List of Contact objects matching the search criteria.
+    :param phonetic: Match names that sound like the query words ("Smyth"
+                     finds "Smith" and "Schmidt") instead of the text.
+    :return: List of ContactRecord objects matching the search criteria.
+             If a text query finds nothing, the contacts found with its
+             names corrected for typos (``typo_search``).
     """
     query = query.strip()
     categories = categories or []
-    return contact_crud.search(db=db, query=query, categories=categories)
+    parsed = parse_query(query)
+    if parsed.structured and not phonetic:
+        return search_query_records(db, parsed, categories)
+    records = contact_crud.search_records(
+        db=db, query=query, categories=categories, phonetic=phonetic
+    )
+    if records or phonetic or not query:
+        return records
+    return typo_search(db, query, categories)
+
+
+def suggest(db: Session, prefix: str, k: int = AUTOCOMPLETE_K) -> list[Completion]:
+    """
+    Complete a typed prefix with the name words, emails and phone numbers
+    of the contacts.
+
+    :param db: SQLAlchemy session object.
+    :param prefix: Text typed so far; its last word is completed, or its
+                   digits if it looks like a phone number.
+    :param k: Maximum number of completions.
+    :return: Completions with the ids of contacts using them, most
+             frequent first.
+    """
+    autocomplete = get_autocomplete(db)
+    autocomplete.refresh(db)
+    return autocomplete.complete(prefix, k)
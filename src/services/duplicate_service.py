@@ -0,0 +1,410 @@
+"""
+Duplicate Service Module
+
+This module finds near-duplicate contacts across the whole book, such as
+"Jon Doe, +49 151 1234567" and "John Doe, 0151 1234567", which the exact
+phone/email checks of ``add_contact`` let through.
+
+Comparing every pair of contacts is O(n²). Instead, every contact is put
+into up to three blocks, and only contacts sharing a block are compared:
+
+* ``p:`` the last ``PHONE_SUFFIX_DIGITS`` digits of the phone number,
+* ``e:`` the local part of the email, without ``+tag`` and dots,
+* ``n:`` the Soundex codes of the first and last name.
+
+Blocks of more than ``DEDUP_MAX_BLOCK`` contacts (very common names) are
+sorted by name and each contact is only compared with the next
+``DEDUP_WINDOW`` ones. Pairs scoring at least the threshold
+(``score_pair``) are joined into clusters with a union-find. Blocks are
+independent, so from ``DEDUP_PARALLEL_THRESHOLD`` contacts on they are
+scored in batches by a ``ProcessPoolExecutor``.
+
+``merge_contacts`` then collapses each cluster into one surviving contact,
+for any number of clusters in one transaction: one DELETE of all losers
+and one executemany UPDATE of all survivors.
+"""
+
+from collections import defaultdict, deque
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from functools import lru_cache
+from itertools import combinations
+from operator import attrgetter
+from typing import NamedTuple
+
+from sqlalchemy.orm import Session
+
+from src.config import (
+    DEDUP_MAX_BLOCK,
+    DEDUP_PARALLEL_THRESHOLD,
+    DEDUP_THRESHOLD,
+    DEDUP_WINDOW,
+    DEDUP_WORKERS,
+)
+from src.crud import contacts as contact_crud
+from src.database.models import ContactRecord
+from src.database.retry import retry_on_lock
+from src.services.contact_cache import get_contact_cache
+from src.services.contact_service import ContactServiceError
+from src.utils.similarity import fold, jaro_winkler, soundex
+
+PHONE_SUFFIX_DIGITS = 7
+# Weight of each signal in score_pair; emails only count if both have one
+NAME_WEIGHT = 0.5
+PHONE_WEIGHT = 0.3
+EMAIL_WEIGHT = 0.2
+# Approximate number of comparisons per batch of blocks
+_BATCH_COMPARISONS = 100_000
+
+# First and last names repeat a lot: encode each distinct one once
+_name_code = lru_cache(maxsize=1 << 16)(soundex)
+_fold_name = lru_cache(maxsize=1 << 16)(fold)
+
+
+@dataclass(frozen=True)
+class DuplicateCluster:
+    """
+    Contacts that are probably the same person.
+
+    :param ids: Contact IDs, ascending.
+    :param confidence: Lowest score of the pairs that joined the cluster.
+    """
+
+    ids: tuple[int, ...]
+    confidence: float
+
+
+class _Entry(NamedTuple):
+    """The parts of a contact that are compared (cheap to send to workers)."""
+
+    id: int
+    name: str
+    phone: str
+    email: str | None
+
+
+def _entry(record: ContactRecord) -> _Entry:
+    digits = "".join(c for c in record.phone if c.isdigit())
+    email = None
+    if record.email:
+        local = record.email.partition("@")[0].partition("+")[0].replace(".", "")
+        email = local or None
+    name = _fold_name(record.first_name) + " " + _fold_name(record.last_name)
+    return _Entry(record.id, name.strip(), digits[-PHONE_SUFFIX_DIGITS:], email)
+
+
+def _keys(record: ContactRecord, entry: _Entry) -> list[str]:
+    keys = [f"p:{entry.phone}"]
+    if entry.email:
+        keys.append(f"e:{entry.email}")
+    name_code = _name_code(record.first_name) + _name_code(record.last_name)
+    if name_code:
+        keys.append(f"n:{name_code}")
+    return keys
+
+
+def blocking_keys(record: ContactRecord) -> list[str]:
+    """
+    Blocks a contact belongs to; only contacts sharing one are compared.
+
+    :param record: The contact.
+    :return: Phone-suffix, email-local-part and name-sound keys.
+    """
+    return _keys(record, _entry(record))
+
+
+def _score(a: _Entry, b: _Entry, threshold: float = 0.0) -> float:
+    phone = PHONE_WEIGHT if a.phone == b.phone else 0.0
+    has_email = a.email is not None and b.email is not None
+    weight = NAME_WEIGHT + PHONE_WEIGHT + (EMAIL_WEIGHT if has_email else 0.0)
+    # Skip the string comparisons if even equal names and emails fall short
+    best = phone + NAME_WEIGHT + (EMAIL_WEIGHT if has_email else 0.0)
+    if best / weight < threshold:
+        return 0.0
+    total = phone + NAME_WEIGHT * jaro_winkler(a.name, b.name)
+    if has_email:
+        total += EMAIL_WEIGHT * jaro_winkler(a.email, b.email)  # type: ignore[arg-type]
+    return total / weight
+
+
+def score_pair(a: ContactRecord, b: ContactRecord) -> float:
+    """
+    Likelihood that two contacts are the same person.
+
+    The weighted mean of the Jaro-Winkler similarity of the folded names,
+    whether the phone numbers end with the same digits, and the
+    similarity of the email local parts (if both contacts have an email).
+
+    :param a: First contact.
+    :param b: Second contact.
+    :return: Score from 0 to 1.
+    """
+    return _score(_entry(a), _entry(b))
+
+
+def _block_pairs(block: list[_Entry], window: int, max_block: int) -> Iterator:
+    if len(block) <= max_block:
+        return combinations(block, 2)
+    block = sorted(block, key=attrgetter("name"))
+    return (
+        (block[i], block[j])
+        for i in range(len(block))
+        for j in range(i + 1, min(len(block), i + 1 + window))
+    )
+
+
+def _score_blocks(
+    blocks: list[list[_Entry]], threshold: float, window: int, max_block: int
+) -> list[tuple[int, int, float]]:
+    # Runs in the worker processes
+    pairs = []
+    for block in blocks:
+        for a, b in _block_pairs(block, window, max_block):
+            score = _score(a, b, threshold)
+            if score >= threshold:
+                pairs.append(
+                    (a.id, b.id, score) if a.id < b.id else (b.id, a.id, score)
+                )
+    return pairs
+
+
+def _comparisons(size: int, window: int, max_block: int) -> int:
+    return size * (size - 1) // 2 if size <= max_block else size * window
+
+
+def _batches(
+    blocks: list[list[_Entry]], window: int, max_block: int
+) -> Iterator[list[list[_Entry]]]:
+    batch: list[list[_Entry]] = []
+    cost = 0
+    for block in blocks:
+        batch.append(block)
+        cost += _comparisons(len(block), window, max_block)
+        if cost >= _BATCH_COMPARISONS:
+            yield batch
+            batch, cost = [], 0
+    if batch:
+        yield batch
+
+
+def _score_all(
+    blocks: list[list[_Entry]], threshold: float, workers: int
+) -> Iterator[tuple[int, int, float]]:
+    batches = _batches(blocks, DEDUP_WINDOW, DEDUP_MAX_BLOCK)
+    args = (threshold, DEDUP_WINDOW, DEDUP_MAX_BLOCK)
+    if workers <= 1:
+        for batch in batches:
+            yield from _score_blocks(batch, *args)
+        return
+
+    with ProcessPoolExecutor(workers) as pool:
+        pending: deque[Future] = deque()
+        for batch in batches:
+            pending.append(pool.submit(_score_blocks, batch, *args))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+class _UnionFind:
+    """Disjoint sets of contact IDs, with path compression."""
+
+    def __init__(self) -> None:
+        self.parent: dict[int, int] = {}
+
+    def find(self, node: int) -> int:
+        """Return the representative of the node's set."""
+        root = node
+        while (parent := self.parent.setdefault(root, root)) != root:
+            root = parent
+        while node != root:
+            self.parent[node], node = root, self.parent[node]
+        return root
+
+    def union(self, a: int, b: int) -> None:
+        """Merge the sets of two nodes."""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+def cluster_pairs(pairs: list[tuple[int, int, float]]) -> list[DuplicateCluster]:
+    """
+    Join scored duplicate pairs into clusters (transitively).
+
+    :param pairs: ``(id, id, score)`` of every duplicate pair.
+    :return: Clusters, most confident first.
+    """
+    sets = _UnionFind()
+    for a, b, _ in pairs:
+        sets.union(a, b)
+    confidence: dict[int, float] = {}
+    for a, _, score in pairs:
+        root = sets.find(a)
+        confidence[root] = min(confidence.get(root, 1.0), score)
+    members: dict[int, list[int]] = defaultdict(list)
+    for node in list(sets.parent):
+        members[sets.find(node)].append(node)
+
+    clusters = [
+        DuplicateCluster(tuple(sorted(ids)), confidence[root])
+        for root, ids in members.items()
+    ]
+    clusters.sort(key=lambda cluster: (-cluster.confidence, cluster.ids))
+    return clusters
+
+
+def find_duplicates(
+    db: Session, threshold: float = DEDUP_THRESHOLD, workers: int | None = None
+) -> list[DuplicateCluster]:
+    """
+    Find clusters of contacts that are probably the same person.
+
+    :param db: SQLAlchemy session object.
+    :param threshold: Minimum ``score_pair`` of a duplicate pair (0 to 1).
+    :param workers: Number of scoring processes. By default
+                    ``DEDUP_WORKERS`` from ``DEDUP_PARALLEL_THRESHOLD``
+                    contacts on, otherwise 1.
+    :return: Clusters of two or more contacts, most confident first.
+    """
+    blocks: dict[str, list[_Entry]] = defaultdict(list)
+    count = 0
+    for records in contact_crud.iter_records(db):
+        for record in records:
+            entry = _entry(record)
+            for key in _keys(record, entry):
+                blocks[key].append(entry)
+        count += len(records)
+
+    if workers is None:
+        workers = DEDUP_WORKERS if count >= DEDUP_PARALLEL_THRESHOLD else 1
+    shared = [block for block in blocks.values() if len(block) > 1]
+    del blocks
+    return cluster_pairs(list(_score_all(shared, threshold, workers)))
+
+
+# ------------------------------------------------------------
+# Merging
+# ------------------------------------------------------------
+# Fields filled from the other contacts of a cluster if the survivor has
+# none; the phone number is always the survivor's
+MERGED_FIELDS = ("first_name", "last_name", "email", "category")
+
+
+class MergeStrategy(str, Enum):
+    """Which contact of a cluster survives (and wins conflicting fields)."""
+
+    OLDEST = "oldest"  # lowest ID
+    NEWEST = "newest"  # most recently updated
+    MOST_COMPLETE = "most_complete"  # most filled fields, then oldest
+
+
+@dataclass
+class MergeSummary:
+    """Outcome of ``merge_contacts``."""
+
+    survivors: list[int] = field(default_factory=list)
+    deleted: int = 0
+    updated: int = 0
+
+
+def _priority(
+    members: list[tuple[ContactRecord, datetime | None]], strategy: MergeStrategy
+) -> list[ContactRecord]:
+    """Members ordered by survivorship: survivor first."""
+    if strategy is MergeStrategy.NEWEST:
+        members = sorted(
+            members, key=lambda m: (m[1] or datetime.min, -m[0].id), reverse=True
+        )
+    elif strategy is MergeStrategy.MOST_COMPLETE:
+        members = sorted(
+            members,
+            key=lambda m: (
+                -sum(bool(getattr(m[0], f)) for f in MERGED_FIELDS),
+                m[0].id,
+            ),
+        )
+    else:
+        members = sorted(members, key=lambda m: m[0].id)
+    return [record for record, _ in members]
+
+
+def _survivor_values(ordered: list[ContactRecord]) -> dict:
+    """Each field from the first contact that has a value for it."""
+    return {
+        name: next(
+            (getattr(r, name) for r in ordered if getattr(r, name)),
+            getattr(ordered[0], name),
+        )
+        for name in MERGED_FIELDS
+    }
+
+
+@retry_on_lock
+def merge_contacts(
+    db: Session,
+    clusters: Iterable[DuplicateCluster | Sequence[int]],
+    strategy: MergeStrategy = MergeStrategy.OLDEST,
+) -> MergeSummary:
+    """
+    Merge each cluster of duplicates into one contact, in one transaction.
+
+    The strategy picks the surviving contact; each of its empty fields
+    (``MERGED_FIELDS``) is filled from the first other contact that has a
+    value, in the same order. The other contacts are deleted before the
+    survivors are rewritten, so a survivor can take over their email
+    without violating the unique constraint.
+
+    :param db: SQLAlchemy session object.
+    :param clusters: Clusters (or sequences of contact IDs) to merge.
+                     IDs that do not exist are ignored; clusters with
+                     fewer than two existing contacts are left alone.
+    :param strategy: Survivorship rule.
+    :raises ContactServiceError: If a contact is in more than one cluster.
+    :return: The survivor of each merged cluster and the number of deleted
+             and rewritten contacts.
+    """
+    groups = [
+        tuple(cluster.ids if isinstance(cluster, DuplicateCluster) else cluster)
+        for cluster in clusters
+    ]
+    seen: set[int] = set()
+    for ids in groups:
+        overlap = seen.intersection(ids)
+        if overlap:
+            raise ContactServiceError(
+                [f"Contact {min(overlap)} is in more than one cluster."]
+            )
+        seen.update(ids)
+
+    found = {
+        record.id: (record, updated_at)
+        for record, updated_at in contact_crud.get_records_with_updated_at(
+            db, list(seen)
+        )
+    }
+    summary = MergeSummary()
+    delete_ids: list[int] = []
+    updates: list[dict] = []
+    for ids in groups:
+        members = [found[i] for i in dict.fromkeys(ids) if i in found]
+        if len(members) < 2:
+            continue
+        ordered = _priority(members, strategy)
+        survivor = ordered[0]
+        summary.survivors.append(survivor.id)
+        delete_ids.extend(record.id for record in ordered[1:])
+        values = _survivor_values(ordered)
+        if any(getattr(survivor, name) != value for name, value in values.items()):
+            updates.append({"contact_id": survivor.id, **values})
+
+    contact_crud.merge(db, delete_ids, updates)
+    cache = get_contact_cache(db)
+    for contact_id in (*delete_ids, *(row["contact_id"] for row in updates)):
+        cache.invalidate(contact_id)
+    summary.deleted, summary.updated = len(delete_ids), len(updates)
+    return summary
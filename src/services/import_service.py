@@ -0,0 +1,404 @@
+"""
+Import Service Module
+
+This module imports contacts in bulk, from a CSV file or any iterable of
+row dictionaries, with the same rules as ``contact_service.add_contact``.
+
+Rows are validated column-wise in chunks of ``IMPORT_CHUNK_SIZE``. From
+``IMPORT_PARALLEL_THRESHOLD`` rows on, the chunks are validated by a
+``ProcessPoolExecutor`` while the main process only does the work that
+needs the database: duplicate checks (one IN query per chunk, plus the
+phones and emails seen earlier in the same import) and one bulk INSERT
+per chunk. At most two chunks per worker are in flight, so memory stays
+bounded for inputs of any size.
+
+With ``bloom=True``, Bloom filters over the phones and emails already in
+the database are built first, in one streaming pass. Only the keys they
+might contain are then looked up, so imports of mostly new contacts skip
+almost all duplicate queries.
+"""
+
+import csv
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import chain, compress, islice
+from pathlib import Path
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.config import (
+    IMPORT_BLOOM_ERROR_RATE,
+    IMPORT_CHUNK_SIZE,
+    IMPORT_PARALLEL_THRESHOLD,
+    IMPORT_WORKERS,
+)
+from src.crud import contacts as contact_crud
+from src.database.retry import retry_on_lock
+from src.services.contact_service import EMAIL_TAKEN, PHONE_TAKEN
+from src.utils.batch_validation import ColumnCheck, check_emails, check_phones
+from src.utils.bloom import BloomFilter
+from src.utils.validation import NAME_MISSING
+
+CSV_FIELDS = ("first_name", "last_name", "phone", "email", "category")
+
+
+@dataclass(frozen=True)
+class RejectedRow:
+    """A row that was not imported, by its 0-based index in the input."""
+
+    index: int
+    errors: list[str]
+
+
+@dataclass
+class ImportSummary:
+    """
+    Outcome of an import.
+
+    ``keys_checked`` counts the well-formed phones and emails that had to be
+    checked against the database, ``keys_probed`` those actually looked up
+    (all of them without a Bloom filter). ``filter_bytes`` is the memory of
+    the Bloom filters, 0 without.
+    """
+
+    created: int = 0
+    rejected: list[RejectedRow] = field(default_factory=list)
+    keys_checked: int = 0
+    keys_probed: int = 0
+    filter_bytes: int = 0
+
+    @property
+    def total(self) -> int:
+        """Number of rows read."""
+        return self.created + len(self.rejected)
+
+    @property
+    def probe_reduction(self) -> float:
+        """Share of the checked keys that were not looked up (0 to 1)."""
+        if not self.keys_checked:
+            return 0.0
+        return 1 - self.keys_probed / self.keys_checked
+
+
+@dataclass(frozen=True)
+class CheckedChunk:
+    """
+    Column-wise outcome of the ``add_contact`` rules for a chunk of rows.
+
+    :param rows: Raw rows of the chunk.
+    :param phones: Normalized phones and their error codes.
+    :param emails: Normalized emails and their error codes.
+    :param named: Whether each row has a first or last name.
+    """
+
+    rows: list[dict]
+    phones: ColumnCheck
+    emails: ColumnCheck
+    named: list[bool]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def errors(self, index: int, phone_taken: bool, email_taken: bool) -> list[str]:
+        """Error messages of one row, as ``NewContactCheck.errors`` lists them."""
+        errors = [] if self.named[index] else [NAME_MISSING]
+        errors.extend(self.phones.errors(index))
+        if phone_taken:
+            errors.append(PHONE_TAKEN)
+        errors.extend(self.emails.errors(index))
+        if email_taken:
+            errors.append(EMAIL_TAKEN)
+        return errors
+
+    def values(self, index: int) -> dict:
+        """Column values of the contact of one (valid) row."""
+        row = self.rows[index]
+        return {
+            "first_name": row.get("first_name", "").strip(),
+            "last_name": row.get("last_name", "").strip(),
+            "phone": self.phones.normalized[index],
+            "email": self.emails.normalized[index],
+            "category": row.get("category"),
+        }
+
+
+def check_rows(rows: list[dict]) -> CheckedChunk:
+    """
+    Apply the rules of ``check_new_contact`` to a chunk of rows.
+
+    Phones and emails are checked column-wise (``batch_validation``); no
+    per-row objects or messages are built here. Missing fields count as
+    empty.
+
+    :param rows: Contact fields per row.
+    :return: The checked chunk.
+    """
+    return CheckedChunk(rows, *_check_columns(rows))
+
+
+def _check_columns(rows: list[dict]) -> tuple[ColumnCheck, ColumnCheck, list[bool]]:
+    # Runs in the worker processes; the rows themselves are not sent back
+    return (
+        check_phones([row.get("phone", "") for row in rows]),
+        check_emails([row.get("email", "") for row in rows]),
+        [
+            bool(row.get("first_name", "").strip() or row.get("last_name", "").strip())
+            for row in rows
+        ],
+    )
+
+
+def _chunked(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def iter_checked_chunks(
+    rows: Iterable[dict], workers: int = 1, chunk_size: int = IMPORT_CHUNK_SIZE
+) -> Iterator[CheckedChunk]:
+    """
+    Validate rows chunk by chunk, in input order.
+
+    :param rows: Contact fields per row.
+    :param workers: Number of validation processes; 1 validates in-process.
+    :param chunk_size: Number of rows per chunk.
+    :return: Iterator over the checked chunks.
+    """
+    chunks = _chunked(rows, chunk_size)
+    if workers <= 1:
+        yield from map(check_rows, chunks)
+        return
+
+    with ProcessPoolExecutor(workers) as pool:
+        pending: deque[tuple[list[dict], Future]] = deque()
+        for chunk in chunks:
+            pending.append((chunk, pool.submit(_check_columns, chunk)))
+            if len(pending) >= 2 * workers:
+                chunk, future = pending.popleft()
+                yield CheckedChunk(chunk, *future.result())
+        while pending:
+            chunk, future = pending.popleft()
+            yield CheckedChunk(chunk, *future.result())
+
+
+@retry_on_lock
+def _insert_rows(db: Session, rows: list[dict]) -> None:
+    contact_crud.bulk_create(db, rows)
+
+
+@dataclass(frozen=True)
+class KeyFilter:
+    """Bloom filters over the phones and emails in the database."""
+
+    phones: BloomFilter
+    emails: BloomFilter
+
+    @classmethod
+    def from_database(
+        cls, db: Session, error_rate: float = IMPORT_BLOOM_ERROR_RATE
+    ) -> "KeyFilter":
+        """
+        Build the filters in one streaming pass over the contacts table.
+
+        :param db: SQLAlchemy session object.
+        :param error_rate: Target false-positive rate of each filter.
+        :return: The filters.
+        """
+        # Sized for the current table; every contact has a phone, at most
+        # one email
+        capacity = contact_crud.count(db)
+        key_filter = cls(
+            BloomFilter(capacity, error_rate), BloomFilter(capacity, error_rate)
+        )
+        for phones, emails in contact_crud.iter_keys(db):
+            key_filter.phones.add_many(phones)
+            key_filter.emails.add_many(emails)
+        return key_filter
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by both filters."""
+        return self.phones.nbytes + self.emails.nbytes
+
+
+def _candidates(keys: list[str], bloom: BloomFilter | None) -> list[str]:
+    """The keys that may exist in the database."""
+    if bloom is None:
+        return keys
+    return list(compress(keys, bloom.contains_many(keys).tolist()))
+
+
+class _Deduplicator:
+    """Rejects rows whose phone/email exists in the database or earlier rows."""
+
+    def __init__(self, key_filter: KeyFilter | None = None) -> None:
+        self.key_filter = key_filter
+        self.phones: set[str] = set()
+        self.emails: set[str] = set()
+        self.checked = 0
+        self.probed = 0
+
+    def remember(self, valid: list[dict]) -> None:
+        """Record the keys of inserted rows for the next chunks."""
+        self.phones.update(row["phone"] for row in valid)
+        self.emails.update(row["email"] for row in valid if row["email"] is not None)
+
+    def split(
+        self, db: Session, chunk: CheckedChunk, offset: int, exact: bool = False
+    ) -> tuple[list[dict], list[RejectedRow]]:
+        """
+        Return the values of the valid rows and the rejected rows.
+
+        With ``exact=True`` every key is looked up, even with a filter.
+        """
+        phones, emails = chunk.phones.normalized, chunk.emails.normalized
+        # Only well-formed values are looked up, as in add_contact
+        lookup_phones = [
+            phone if not code else None
+            for phone, code in zip(phones, chunk.phones.codes.tolist())
+        ]
+        lookup_emails = [
+            email if not code and email else None
+            for email, code in zip(emails, chunk.emails.codes.tolist())
+        ]
+        phone_keys = [phone for phone in lookup_phones if phone]
+        email_keys = [email for email in lookup_emails if email]
+        self.checked += len(phone_keys) + len(email_keys)
+        if self.key_filter is not None and not exact:
+            phone_keys = _candidates(phone_keys, self.key_filter.phones)
+            email_keys = _candidates(email_keys, self.key_filter.emails)
+        self.probed += len(phone_keys) + len(email_keys)
+
+        # Keys of this chunk's lookups and accepted rows; the keys of earlier
+        # chunks are checked in place rather than copied in for every chunk
+        taken_phones, taken_emails = contact_crud.existing_keys(
+            db, phone_keys, email_keys
+        )
+
+        valid: list[dict] = []
+        rejected: list[RejectedRow] = []
+        valid_rows = chunk.phones.valid & chunk.emails.valid
+        for index, (ok, phone, email) in enumerate(
+            zip(valid_rows.tolist(), lookup_phones, lookup_emails)
+        ):
+            phone_taken = phone in taken_phones or phone in self.phones
+            email_taken = email is not None and (
+                email in taken_emails or email in self.emails
+            )
+            accepted = ok and chunk.named[index] and not phone_taken
+            if phone is not None and accepted and not email_taken:
+                taken_phones.add(phone)
+                if email is not None:
+                    taken_emails.add(email)
+                valid.append(chunk.values(index))
+            else:
+                errors = chunk.errors(index, phone_taken, email_taken)
+                rejected.append(RejectedRow(offset + index, errors))
+        return valid, rejected
+
+
+def import_contacts(
+    db: Session,
+    rows: Iterable[dict],
+    workers: int | None = None,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    bloom: bool = False,
+) -> ImportSummary:
+    """
+    Validate and insert contacts in bulk; invalid rows are reported, not raised.
+
+    Each chunk is committed on its own, so an interrupted import keeps the
+    chunks written so far.
+
+    :param db: SQLAlchemy session object.
+    :param rows: Contact fields per row (first_name, last_name, phone,
+                 email, category).
+    :param workers: Number of validation processes. By default
+                    ``IMPORT_WORKERS`` for inputs of at least
+                    ``IMPORT_PARALLEL_THRESHOLD`` rows, or of unknown
+                    size and longer than the first chunk, otherwise 1.
+    :param chunk_size: Number of rows validated and inserted together.
+    :param bloom: Build Bloom filters over the existing phones and emails
+                  first and only look up the keys they might contain.
+    :return: Number of created contacts, the rejected rows and the
+             duplicate-probe counts.
+    """
+    if workers is None:
+        if isinstance(rows, (list, tuple)):
+            parallel = len(rows) >= IMPORT_PARALLEL_THRESHOLD
+        else:
+            # Unknown size: an input that ends within the first chunk is
+            # validated in-process rather than starting a pool for it
+            iterator = iter(rows)
+            first = list(islice(iterator, chunk_size))
+            parallel = len(first) == chunk_size
+            rows = chain(first, iterator)
+        workers = IMPORT_WORKERS if parallel else 1
+
+    summary = ImportSummary()
+    key_filter = KeyFilter.from_database(db) if bloom else None
+    dedup = _Deduplicator(key_filter)
+    for chunk in iter_checked_chunks(rows, workers, chunk_size):
+        counts = dedup.checked, dedup.probed
+        valid, rejected = dedup.split(db, chunk, summary.total)
+        try:
+            _insert_rows(db, valid)
+        except IntegrityError:
+            db.rollback()
+            if key_filter is None:
+                raise
+            # A key written by another session after the filters were built;
+            # the chunk's keys are counted for the exact pass only
+            dedup.checked, dedup.probed = counts
+            valid, rejected = dedup.split(db, chunk, summary.total, exact=True)
+            _insert_rows(db, valid)
+        dedup.remember(valid)
+        summary.created += len(valid)
+        summary.rejected.extend(rejected)
+
+    summary.keys_checked, summary.keys_probed = dedup.checked, dedup.probed
+    summary.filter_bytes = key_filter.nbytes if key_filter else 0
+    return summary
+
+
+def read_csv_rows(path: str | Path) -> Iterator[dict]:
+    """
+    Read contact rows from a CSV file with a header line.
+
+    Only the ``CSV_FIELDS`` columns are used; empty email and category
+    cells are read as missing values.
+
+    :param path: Path of the CSV file.
+    :return: Iterator over the rows.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            values = {name: (row.get(name) or "").strip() for name in CSV_FIELDS}
+            values["email"] = values["email"] or None
+            values["category"] = values["category"] or None
+            yield values
+
+
+def import_csv(
+    db: Session, path: str | Path, workers: int | None = None, bloom: bool = False
+) -> ImportSummary:
+    """
+    Import a CSV file (see ``read_csv_rows`` and ``import_contacts``).
+
+    :param db: SQLAlchemy session object.
+    :param path: Path of the CSV file.
+    :param workers: Number of validation processes; by default chosen from
+                    the number of lines of the file.
+    :param bloom: Pre-check duplicates with Bloom filters (see
+                  ``import_contacts``).
+    :return: The ``ImportSummary``.
+    """
+    if workers is None:
+        with open(path, "rb") as f:
+            lines = sum(1 for _ in f)
+        workers = IMPORT_WORKERS if lines > IMPORT_PARALLEL_THRESHOLD else 1
+    return import_contacts(db, read_csv_rows(path), workers, bloom=bloom)
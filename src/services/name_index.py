@@ -0,0 +1,212 @@
+"""
+Name Index Module
+
+Typo-tolerant search: an in-memory SymSpell index (``src.utils.symspell``)
+of the words of all folded contact names, with the number of contacts
+using each word. When a search finds nothing, ``typo_search`` corrects
+its words to indexed words within a few edits and runs the corrected
+queries as name searches, closest and most frequent words first.
+
+One index exists per database engine. It follows the data revision:
+contacts created or updated since the last refresh are added by their
+``change_seq`` (``ix_contacts_change_seq``). Words of deleted contacts and
+previous names of updated ones stay in the index until the next full
+rebuild, which happens once ``TYPO_REBUILD_FRACTION`` of the contacts
+may be stale; corrections are always checked against the database, so a
+stale word can only cost a query. Rebuilds read the rows and build the new
+dictionary outside the index lock and swap it in, so typo searches keep
+using the previous words meanwhile.
+"""
+
+import threading
+import weakref
+from collections import Counter
+from itertools import islice, product
+
+from sqlalchemy.orm import Session
+
+from src.config import TYPO_MAX_CANDIDATES, TYPO_MAX_DISTANCE, TYPO_REBUILD_FRACTION
+from src.crud import contacts as contact_crud
+from src.database.models import ContactRecord
+from src.utils.similarity import fold
+from src.utils.symspell import Suggestion, SymSpell
+
+# One edit is allowed per this many characters of a word ("jhon": 1, "cathrine": 2)
+_CHARS_PER_EDIT = 3
+# Suggestions kept per query word when corrected queries are combined,
+# and words corrected per query (later words are kept as typed)
+_SUGGESTIONS_PER_WORD = 3
+_MAX_WORDS = 4
+
+
+class NameIndex:
+    """
+    SymSpell index of the name words of one database.
+
+    :param max_distance: Largest number of edits corrected per word.
+    """
+
+    def __init__(self, max_distance: int = TYPO_MAX_DISTANCE):
+        self.max_distance = max_distance
+        self.words = SymSpell(max_distance)
+        self.revision: str | None = None
+        self.since: int | None = None
+        self.total = 0
+        self.stale = 0
+        self.rebuilds = 0
+        # Guards the words; a refresh only holds it to add or swap them in
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def refresh(self, db: Session) -> None:
+        """
+        Bring the index up to the current data revision.
+
+        Only the first build is waited for: while another thread refreshes
+        the index, lookups keep using the current words.
+
+        :param db: SQLAlchemy session object.
+        """
+        revision = contact_crud.data_revision(db)
+        if revision == self.revision:
+            return
+        if not self._refresh_lock.acquire(blocking=self.revision is None):
+            return
+        try:
+            if revision != self.revision:
+                total = contact_crud.count(db)
+                stale = self.stale > TYPO_REBUILD_FRACTION * total
+                if self.revision is None or stale:
+                    self._rebuild(db, revision)
+                else:
+                    self._add_changes(db, revision, total)
+        finally:
+            self._refresh_lock.release()
+
+    def _rebuild(self, db: Session, revision: str) -> None:
+        # Built outside the lock and swapped in, lookups are not held up
+        words = SymSpell(self.max_distance)
+        counts, created, _, since = self._read_changes(db, None)
+        for word, count in counts.items():
+            words.add(word, count)
+        with self._lock:
+            self.words = words
+            self.since, self.total, self.stale = since, created, 0
+            self.revision = revision
+            self.rebuilds += 1
+
+    def _add_changes(self, db: Session, revision: str, total: int) -> None:
+        """Add the contacts changed since ``self.since``."""
+        counts, created, updated, since = self._read_changes(db, self.since)
+        deleted = max(self.total + created - total, 0)
+        with self._lock:
+            for word, count in counts.items():
+                self.words.add(word, count)
+            self.since, self.total = since, total
+            self.stale += updated + deleted
+            self.revision = revision
+
+    @staticmethod
+    def _read_changes(
+        db: Session, since: int | None
+    ) -> tuple[Counter[str], int, int, int]:
+        """
+        Count the name words of the contacts changed since a sequence number.
+
+        :return: Word counts, created and updated contacts, and the last
+                 change sequence number read.
+        """
+        counts: Counter[str] = Counter()
+        created = updated = 0
+        latest = since or 0
+        for rows in contact_crud.iter_name_keys(db, since):
+            for _, search_key, change_seq, created_seq in rows:
+                counts.update(set(search_key.split()))
+                if since is None or (created_seq or 0) > since:
+                    created += 1
+                else:
+                    updated += 1
+                latest = max(latest, change_seq or 0)
+        return counts, created, updated, latest
+
+    def lookup(self, word: str) -> list[Suggestion]:
+        """
+        Indexed words within the edit distance of a (folded) word.
+
+        Short words get fewer edits: two edits of a four-letter word would
+        match many unrelated names (and take the longest to look up).
+
+        :param word: Word to correct.
+        :return: Suggestions by distance, then by decreasing frequency.
+        """
+        max_distance = min(self.max_distance, len(word) // _CHARS_PER_EDIT)
+        with self._lock:
+            return self.words.lookup(word, max_distance)
+
+    def corrections(self, query: str, limit: int = TYPO_MAX_CANDIDATES) -> list[str]:
+        """
+        Corrected versions of a query, best first.
+
+        Every word is replaced by one of its closest indexed words; a word
+        without any is kept (it may be a prefix still being typed). The
+        combinations are ranked by total distance, then by the frequency
+        of their rarest word. The query itself is not returned.
+
+        :param query: Search query.
+        :param limit: Maximum number of corrected queries.
+        :return: Folded, corrected queries.
+        """
+        words = fold(query).split()
+        options = [
+            self.lookup(word)[:_SUGGESTIONS_PER_WORD] or [Suggestion(word, 0, 0)]
+            for word in words[:_MAX_WORDS]
+        ] + [[Suggestion(word, 0, 0)] for word in words[_MAX_WORDS:]]
+        combinations = sorted(
+            product(*options),
+            key=lambda combo: (
+                sum(s.distance for s in combo),
+                -min(s.count for s in combo),
+            ),
+        )
+        corrected = (" ".join(s.term for s in combo) for combo in combinations)
+        return list(
+            islice((text for text in corrected if text != " ".join(words)), limit)
+        )
+
+
+def typo_search(db: Session, query: str, categories: list[str]) -> list[ContactRecord]:
+    """
+    Search with the corrected versions of a query that found nothing.
+
+    :param db: SQLAlchemy session object.
+    :param query: Search query.
+    :param categories: List of category names to filter contacts.
+    :return: Contacts found by the corrected queries, best correction first.
+    """
+    index = get_name_index(db)
+    index.refresh(db)
+    found: dict[int, ContactRecord] = {}
+    for corrected in index.corrections(query):
+        for record in contact_crud.search_name_records(db, corrected, categories):
+            found.setdefault(record.id, record)
+    return list(found.values())
+
+
+# One index per engine, so separate databases never share words
+_indexes: "weakref.WeakKeyDictionary[object, NameIndex]" = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+
+def get_name_index(db: Session) -> NameIndex:
+    """
+    Return the name index of the engine a session is bound to.
+
+    :param db: SQLAlchemy session object.
+    :return: The engine's ``NameIndex`` (refresh it before use).
+    """
+    bind = db.get_bind()
+    with _indexes_lock:
+        index = _indexes.get(bind)
+        if index is None:
+            index = _indexes[bind] = NameIndex()
+        return index
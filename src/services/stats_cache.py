@@ -0,0 +1,79 @@
+"""
+Stats Cache Module
+
+The statistics of one database (contacts per category, per email domain,
+created per day and month, without each optional field), kept in memory.
+
+Every aggregate is an index-only GROUP BY or count, but together they
+still read every index entry of the contacts once. The cache holds the
+last result with the data revision it was computed at; ``get`` checks the
+revision (one primary key lookup) and recomputes only after a write.
+"""
+
+import threading
+import weakref
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from sqlalchemy.orm import Session
+
+from src.crud import contacts as contact_crud
+
+
+@dataclass(frozen=True)
+class ContactStats:
+    """Aggregates of all contacts at one data revision."""
+
+    revision: str
+    total: int
+    by_category: list[tuple[str, int]]
+    top_domains: list[tuple[str, int]]
+    created_per_day: list[tuple[str, int]]
+    created_per_month: list[tuple[str, int]]
+    missing: dict[str, int]
+
+
+class StatsCache:
+    """The last statistics computed for one engine."""
+
+    def __init__(self) -> None:
+        self._stats: ContactStats | None = None
+        self._lock = threading.Lock()
+
+    def get(
+        self, db: Session, compute: Callable[[Session, str], ContactStats]
+    ) -> ContactStats:
+        """
+        Return the statistics, recomputed if the data changed since.
+
+        :param db: SQLAlchemy session object.
+        :param compute: Computes the statistics at a given revision.
+        :return: Statistics of the current data revision.
+        """
+        revision = contact_crud.data_revision(db)
+        stats = self._stats
+        if stats is None or stats.revision != revision:
+            stats = compute(db, revision)
+            with self._lock:
+                self._stats = stats
+        return stats
+
+
+# One cache per engine, so separate databases never share statistics
+_caches: "weakref.WeakKeyDictionary[object, StatsCache]" = weakref.WeakKeyDictionary()
+_caches_lock = threading.Lock()
+
+
+def get_stats_cache(db: Session) -> StatsCache:
+    """
+    Return the statistics cache of the engine a session is bound to.
+
+    :param db: SQLAlchemy session object.
+    :return: The engine's ``StatsCache``.
+    """
+    bind = db.get_bind()
+    with _caches_lock:
+        cache = _caches.get(bind)
+        if cache is None:
+            cache = _caches[bind] = StatsCache()
+    return cache
@@ -0,0 +1,232 @@
+"""
+Write Coordinator Module
+
+This module provides an optional single-writer mode for service-layer
+writes (``CONTACT_BOOK_WRITE_QUEUE=1``).
+
+Writes are submitted to a queue and executed by one writer thread. The
+writer takes everything that is pending, runs each write in its own
+SAVEPOINT inside one transaction and commits the batch once (group
+commit): one lock acquisition and one fsync for many writes, and no
+"database is locked" errors between writers of the same process.
+
+Each submission returns a ``concurrent.futures.Future`` that resolves to
+the service function's result, or raises its ``ContactServiceError``
+(a rejected write only rolls back its own savepoint). Cache invalidations
+and autocomplete updates of the writes (``contact_crud.on_commit``) run
+once the batch is committed, so a rolled-back batch leaves no trace of its
+writes in memory. Writes submitted after ``close`` are refused.
+"""
+
+import queue
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from src.config import WRITE_QUEUE_ENABLED, WRITE_QUEUE_MAX_BATCH
+from src.database.db import SessionLocal
+from src.database.retry import get_retry_policy
+from src.services.contact_cache import get_contact_cache
+
+
+@dataclass
+class _WriteRequest:
+    func: Callable[..., Any]
+    args: tuple
+    future: Future = field(default_factory=Future)
+
+
+@dataclass(frozen=True)
+class WriteStats:
+    """Counters of a ``WriteCoordinator``."""
+
+    writes: int
+    batches: int
+
+    @property
+    def mean_batch_size(self) -> float:
+        """Average number of writes committed together."""
+        return self.writes / self.batches if self.batches else 0.0
+
+
+class WriteCoordinator:
+    """
+    Single writer thread with group commit.
+
+    :param session_factory: Factory of the writer's sessions.
+    :param max_batch: Maximum number of writes committed together.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_batch: int = WRITE_QUEUE_MAX_BATCH,
+    ):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.writes = 0
+        self.batches = 0
+        self._queue: queue.Queue[_WriteRequest | None] = queue.Queue()
+        self._closed = False
+        self._closed_lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name="contact-book-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> Future:
+        """
+        Queue a service write.
+
+        :param func: Service function taking the session as first argument,
+                     e.g. ``contact_service.add_contact``.
+        :param args: Remaining arguments of the function.
+        :raises RuntimeError: If the coordinator is closed.
+        :return: Future of the function's result.
+        """
+        request = _WriteRequest(func, args)
+        # Queued under the lock so no write can follow the stop marker
+        with self._closed_lock:
+            if self._closed:
+                raise RuntimeError("Write coordinator is closed")
+            self._queue.put(request)
+        return request.future
+
+    def close(self, timeout: float | None = None) -> None:
+        """Finish the pending writes and stop the writer thread."""
+        with self._closed_lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(None)
+        self._thread.join(timeout)
+
+    def stats(self) -> WriteStats:
+        """Return the number of writes and committed batches."""
+        return WriteStats(writes=self.writes, batches=self.batches)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while batch[-1] is not None and len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is None
+            requests = [request for request in batch if request is not None]
+            if requests:
+                self._commit_batch(requests)
+            if stop:
+                return
+
+    def _commit_batch(self, requests: list[_WriteRequest]) -> None:
+        db = self.session_factory()
+        db.info["defer_commit"] = True
+        callbacks: list[Callable[[], object]] = []
+        db.info["after_commit"] = callbacks
+        # Results are used after the session is closed
+        db.expire_on_commit = False
+        done = []
+        try:
+            if db.get_bind().dialect.name == "sqlite":
+                # Take the write lock up front; the driver would otherwise
+                # let the first SAVEPOINT act as (and RELEASE end) the
+                # transaction.
+                get_retry_policy().run(
+                    db.connection().exec_driver_sql, "BEGIN IMMEDIATE"
+                )
+            for request in requests:
+                if not request.future.set_running_or_notify_cancel():
+                    continue
+                queued = len(callbacks)
+                try:
+                    with db.begin_nested():
+                        result = request.func(db, *request.args)
+                except Exception as exc:  # pylint: disable=broad-exception-caught
+                    # The write's savepoint was rolled back
+                    del callbacks[queued:]
+                    request.future.set_exception(exc)
+                else:
+                    done.append((request, result))
+            db.commit()
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            db.rollback()
+            # The batch may have cached rows that were never committed
+            get_contact_cache(db).clear()
+            for request in requests:
+                if not request.future.done():
+                    request.future.set_exception(exc)
+        else:
+            for callback in callbacks:
+                callback()
+            for request, result in done:
+                request.future.set_result(result)
+        finally:
+            db.close()
+            self.writes += len(requests)
+            self.batches += 1
+
+
+# ------------------------------------------------------------
+# Shared coordinator (enabled by CONTACT_BOOK_WRITE_QUEUE=1)
+# ------------------------------------------------------------
+# pylint: disable=invalid-name
+_coordinator: WriteCoordinator | None = None
+_coordinator_lock = threading.Lock()
+
+
+# pylint: disable=global-statement
+def get_write_coordinator() -> WriteCoordinator | None:
+    """Return the shared coordinator, or None if the write queue is disabled."""
+    global _coordinator
+    if not WRITE_QUEUE_ENABLED:
+        return None
+    with _coordinator_lock:
+        if _coordinator is None:
+            _coordinator = WriteCoordinator()
+        return _coordinator
+
+
+def direct_write(db: Session, func: Callable[..., Any], *args: Any) -> Future:
+    """
+    Run a service write on ``db`` now and wrap its outcome in a done Future.
+
+    :param db: Session the write commits on.
+    :param func: Service function taking the session as first argument.
+    :param args: Remaining arguments of the function.
+    :return: Completed Future of the function's result or exception.
+    """
+    future: Future = Future()
+    try:
+        future.set_result(func(db, *args))
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        future.set_exception(exc)
+    return future
+
+
+def submit_write(db: Session, func: Callable[..., Any], *args: Any) -> Future:
+    """
+    Run a service write through the shared coordinator, or directly on ``db``.
+
+    :param db: Session used when the write queue is disabled.
+    :param func: Service function taking the session as first argument.
+    :param args: Remaining arguments of the function.
+    :return: Future of the function's result (already done in direct mode).
+    """
+    coordinator = get_write_coordinator()
+    if coordinator is not None:
+        return coordinator.submit(func, *args)
+    return direct_write(db, func, *args)
+
+
+def run_write(db: Session, func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a service write (see ``submit_write``) and wait for its result.
+
+    :raises ContactServiceError: If the service rejects the write.
+    """
+    return submit_write(db, func, *args).result()
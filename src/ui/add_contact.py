@@ -9,7 +9,12 @@ import streamlit as st
 from sqlalchemy.orm import Session
 
 from src.database.db import SessionLocal
-from src.services.contact_service import ContactServiceError, add_contact
+from src.services.contact_service import (
+    ContactServiceError,
+    add_contact,
+    list_categories,
+)
+from src.services.write_coordinator import run_write
 
 # Initialize database session
 db: Session = SessionLocal()
@@ -31,9 +36,7 @@ def render_add_contact() -> None:
             "last_name": st.text_input("Last Name", placeholder="Last Name"),
             "phone": st.text_input("Phone", placeholder="+1-123-456-789"),
             "email": st.text_input("Email", placeholder="example@email.com"),
-            "category": st.selectbox(
-                "Category", ["Family", "Friends", "Work", "Other"]
-            ),
+            "category": st.selectbox("Category", list_categories(db)),
         }
 
         # Submit button with glass morphism styling
@@ -43,7 +46,7 @@ def render_add_contact() -> None:
         if submitted:
             # Attempt to add contact to database
             try:
-                add_contact(db, data)
+                run_write(db, add_contact, data)
                 st.success("✅ Contact added successfully!")
                 st.session_state.page = "home"
                 st.rerun()
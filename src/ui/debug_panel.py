@@ -0,0 +1,59 @@
+"""
+Hidden Streamlit debug panel.
+
+This module renders the timing breakdown of the last rerun (SQL, ORM
+hydration and widget rendering), the compiled statement cache hit
+ratio and the lock retry counters in the sidebar. The panel is only shown
+when ``CONTACT_BOOK_DEBUG=1`` is set or the page is opened with
+``?debug=1``.
+"""
+
+import streamlit as st
+
+from src.config import DEBUG_PANEL_ENABLED
+from src.database.db import engine
+from src.database.retry import retry_stats
+from src.utils.profiling import RerunTimings, statement_cache_stats
+
+
+def is_debug_enabled() -> bool:
+    """
+    Check whether the debug panel should be shown for this session.
+
+    :return: True if enabled by environment or by the ``debug`` query param
+    """
+    return DEBUG_PANEL_ENABLED or st.query_params.get("debug") == "1"
+
+
+def render_debug_panel(timings: RerunTimings) -> None:
+    """
+    Render the timing breakdown of a rerun in the sidebar.
+
+    :param timings: Timings collected for the rerun
+    :type timings: RerunTimings
+    """
+    with st.sidebar.expander("⏱ Last rerun", expanded=True):
+        st.metric("Total", f"{timings.total * 1000:.1f} ms")
+        st.table(
+            {
+                "Phase": ["SQL", "ORM hydration", "Widget rendering"],
+                "ms": [
+                    round(timings.sql * 1000, 2),
+                    round(timings.orm * 1000, 2),
+                    round(timings.render * 1000, 2),
+                ],
+            }
+        )
+        st.caption(f"{timings.statements} SQL statement(s)")
+
+        cache = statement_cache_stats(engine)
+        st.caption(
+            f"Compiled cache: {cache.hit_ratio:.0%} hit ratio "
+            f"({cache.hits} hits, {cache.misses} misses)"
+        )
+
+        retries = retry_stats()
+        st.caption(
+            f"Lock retries: {retries.retries} for {retries.calls} write(s), "
+            f"{retries.wait_seconds:.2f}s waiting, {retries.failures} gave up"
+        )
@@ -3,37 +3,74 @@ Streamlit UI component for editing existing contacts.
 
 This module provides the user interface and logic for modifying
 existing contact information in the database.
+
+Edits are optimistic: the form keeps the version of the contact it was
+opened with, and the update only succeeds while the contact is still at
+that version. If someone else changed it in the meantime, a diff of both
+edits is shown to resolve the conflict.
 """
 
 import streamlit as st
 from sqlalchemy.orm import Session
 
 from src.database.db import SessionLocal
+from src.database.models import ContactRecord
 from src.services.contact_service import (
+    ContactConflictError,
     ContactServiceError,
     get_contact,
+    list_categories,
+    merge_edits,
     update_contact,
 )
+from src.services.write_coordinator import run_write
+from src.utils.profiling import track_data
 
 # Initialize database session
 db: Session = SessionLocal()
 
+FIELD_LABELS = {
+    "first_name": "First Name",
+    "last_name": "Last Name",
+    "phone": "Phone",
+    "email": "Email",
+    "category": "Category",
+}
+
+
+def leave_edit() -> None:
+    """Forget the edit in progress and return to the home page."""
+    st.session_state.edit_base = None
+    st.session_state.edit_conflict = None
+    st.session_state.page = "home"
+    st.rerun()
+
 
 def render_edit_contact() -> None:
     """
     Render the 'Edit Contact' page with a pre-filled form for editing contact details.
 
     Retrieves the contact based on session state contact_id and populates form fields
-    with current values. Handles form submission and contact updates.
+    with current values. Handles form submission and contact updates, and shows the
+    conflict view if the contact was changed by someone else since it was loaded.
     """
-    # Retrieve contact from database using session state contact_id
-    contact = get_contact(db, st.session_state.contact_id)
+    # The contact as loaded when the edit started: the version it is made against
+    base = st.session_state.get("edit_base")
+    if base is None or base.id != st.session_state.contact_id:
+        with track_data():
+            base = get_contact(db, st.session_state.contact_id)
+        st.session_state.edit_base = base
+        st.session_state.edit_conflict = None
+
+    if st.session_state.get("edit_conflict") is not None:
+        render_conflict(base, st.session_state.edit_conflict)
+        return
 
     # Define choices
-    category_options: list[str] = ["Family", "Friends", "Work", "Other"]
+    category_options: list[str] = list_categories(db)
 
     # Extracting the category value in a safe and typed manner
-    category_value: str = str(contact.category) if contact.category else "Other"
+    category_value: str = str(base.category) if base.category else "Other"
 
     index = (
         category_options.index(category_value)
@@ -45,10 +82,10 @@ def render_edit_contact() -> None:
     with st.form("add_contact"):
         # Form fields pre-filled with current contact information
         data = {
-            "first_name": st.text_input("First Name", value=contact.first_name),
-            "last_name": st.text_input("Last Name", value=contact.last_name),
-            "phone": st.text_input("Phone", value=contact.phone),
-            "email": st.text_input("Email", value=contact.email),
+            "first_name": st.text_input("First Name", value=base.first_name),
+            "last_name": st.text_input("Last Name", value=base.last_name),
+            "phone": st.text_input("Phone", value=base.phone),
+            "email": st.text_input("Email", value=base.email),
             "category": st.selectbox(
                 "Category",
                 options=category_options,
@@ -60,11 +97,14 @@ def render_edit_contact() -> None:
         )
         if submitted:
             try:
-                # Attempt to update contact in database
-                update_contact(db, st.session_state.contact_id, data)
+                # Attempt to update the version the form was opened with
+                run_write(db, update_contact, base.id, data, base.version)
                 st.success("✅ Contact added successfully!")
                 # Redirect to home page
-                st.session_state.page = "home"
+                leave_edit()
+            except ContactConflictError:
+                # Keep the edit and show it next to the current contact
+                st.session_state.edit_conflict = data
                 st.rerun()
             except ContactServiceError as e:
                 # Display validation errors
@@ -73,5 +113,78 @@ def render_edit_contact() -> None:
                     st.markdown(f" ❌ {error}")
     # Cancel button to return to home page
     if st.button("⬅ Cancel"):
-        st.session_state.page = "home"
-        st.rerun()
+        leave_edit()
+
+
+def render_conflict(base: ContactRecord, data: dict) -> None:
+    """
+    Render the conflict view of an edit made against an older version.
+
+    Shows the contact as loaded, as it is now and as edited side by side.
+    Changes made on one side only are merged; for fields changed on both
+    sides the user picks a value. Saving applies the merged changes to the
+    current version, discarding reloads the form with the current contact.
+
+    :param base: Snapshot of the contact the edit was made against.
+    :param data: Edited fields from the form.
+    """
+    st.header("⚠️ Edit Conflict")
+    try:
+        with track_data():
+            current = get_contact(db, base.id)
+    except ContactServiceError:
+        st.error("🗑️ This contact was deleted by someone else; your changes are lost.")
+        if st.button("⬅ Back", width="stretch"):
+            leave_edit()
+        return
+
+    st.warning(
+        "✋ Someone else changed this contact while you were editing it. "
+        "Review both changes before saving."
+    )
+    changes, conflicts = merge_edits(base, current, data)
+    st.table(
+        {
+            "Field": list(FIELD_LABELS.values()),
+            "When you opened it": [getattr(base, f) for f in FIELD_LABELS],
+            "Now": [getattr(current, f) for f in FIELD_LABELS],
+            "Your edit": [data.get(f) for f in FIELD_LABELS],
+        }
+    )
+
+    # Fields changed on both sides: theirs unless the user keeps their own
+    for field in conflicts:
+        options = [f"Theirs: {getattr(current, field)}", f"Mine: {data[field]}"]
+        choice = st.radio(
+            f"{FIELD_LABELS[field]} was changed by both of you. Keep:",
+            options,
+            horizontal=True,
+            key=f"conflict_{field}",
+        )
+        if choice == options[1]:
+            changes[field] = data[field]
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("💾 Save merged", width="stretch", key="save-merged"):
+            try:
+                run_write(db, update_contact, base.id, changes, current.version)
+                st.success("✅ Contact updated successfully!")
+                leave_edit()
+            except ContactConflictError:
+                # Changed again: compare the merged edit with the newest version
+                st.session_state.edit_base = current
+                st.session_state.edit_conflict = {
+                    **{field: getattr(current, field) for field in FIELD_LABELS},
+                    **changes,
+                }
+                st.rerun()
+            except ContactServiceError as e:
+                st.error("❌ Failed to update contact due to the following errors:")
+                for error in e.errors:
+                    st.markdown(f" ❌ {error}")
+    with col2:
+        if st.button("↩ Discard my changes", width="stretch"):
+            st.session_state.edit_base = None
+            st.session_state.edit_conflict = None
+            st.rerun()
@@ -2,67 +2,144 @@
 Streamlit UI component for the home page displaying contacts.
 
 This module provides the main interface showing all contacts with search,
-filtering, and CRUD operation buttons.
+filtering, and CRUD operation buttons, and a "Recent" view of the contacts
+added or edited last, one page at a time.
 """
 
 import streamlit as st
 from sqlalchemy.orm import Session
 
 from src.database.db import SessionLocal
-from src.services.contact_service import delete_contact, list_contacts, search_contacts
+from src.services.autocomplete import prefix_key
+from src.services.contact_service import (
+    ContactServiceError,
+    delete_contact,
+    list_categories,
+    list_contacts,
+    list_recent_contacts,
+    search_contacts,
+    suggest,
+)
+from src.services.write_coordinator import run_write
+from src.utils.profiling import track_data
 
 # Initialize database session
 db = SessionLocal()
 
+VIEWS = ["📇 All", "🕒 Recent"]
+RECENT_ORDERS = {"Recently edited": "updated", "Recently added": "created"}
+RECENT_PAGE_SIZE = 20
+
 
 @st.dialog("Delete the Contact")
-def delete_dialog(db_session: Session, contact_id: int) -> None:
+def delete_dialog(db_session: Session, contact_id: int, version: int) -> None:
     """
     Display a confirmation dialog for contact deletion.
 
     :param db: Database session
     :param contact_id: ID of the contact to delete
+    :param version: Version of the contact as listed; the deletion is
+                    rejected if it was changed since
     """
     with st.container(key="dialog"):
         st.write("Are you sure you want to delete this contact?")
         col1, col2 = st.columns(2)
         with col1:
             if st.button("✅ Yes", key=f"yes_{contact_id}"):
-                delete_contact(db_session, contact_id)
-                st.rerun()
+                try:
+                    run_write(db_session, delete_contact, contact_id, version)
+                except ContactServiceError as e:
+                    # Changed or deleted by someone else in the meantime
+                    st.error(" ".join(e.errors))
+                else:
+                    st.rerun()
         with col2:
             if st.button("❌ No", key=f"no_{contact_id}"):
                 st.rerun()
 
 
-def render_home() -> None:
+def complete_search_query() -> None:
     """
-    Render the home page with contact list, search functionality, and CRUD operations.
+    Replace the last word of the search query with the chosen suggestion.
 
-    Displays all contacts in a list with options to view, edit, or delete each contact.
-    Includes search and category filtering capabilities.
+    Runs as a widget callback, before the search box is drawn again.
     """
-    # Header with title and add button
-    col1, col2 = st.columns([5, 1])
+    choice = st.session_state.get("search_suggestion")
+    if not choice:
+        return
+    words = st.session_state.get("search_query", "").split()
+    # Phone numbers are completed whole, other text word by word
+    completed = [choice] if choice.isdigit() else words[:-1] + [choice]
+    st.session_state.search_query = " ".join(completed)
+    st.session_state.search_suggestion = None
+
+
+def render_header() -> None:
+    """Render the title with the statistics and add buttons."""
+    col1, col2, col3 = st.columns([4, 1, 1])
     with col1:
         st.title("📒 Contact Book")
     with col2:
+        if st.button("📊", help="Statistics", key="stats-button"):
+            st.session_state.page = "stats"
+            st.rerun()
+    with col3:
         if st.button("➕", help="Add New Contact", key="glass-button"):
             st.session_state.page = "add"
             st.rerun()
 
+
+def render_home() -> None:
+    """
+    Render the home page with contact list, search functionality, and CRUD operations.
+
+    Displays all contacts in a list with options to view, edit, or delete each contact.
+    Includes search and category filtering capabilities.
+    """
+    # Header with title, statistics and add buttons
+    render_header()
+
+    # Only the selected view is rendered (tabs would query both)
+    view = st.segmented_control(
+        "View", VIEWS, default=VIEWS[0], key="home_view", label_visibility="collapsed"
+    )
+    if view == VIEWS[1]:
+        render_recent()
+        return
+
     # Search and filter section
     with st.container(key="glass-section-upper"):
         col1, col2 = st.columns([2, 1])
 
         with col1:
             search = st.text_input(
-                "🔍 Search", placeholder="Name, Phone, Email ...", key="search_query"
+                "🔍 Search",
+                placeholder="Name, Phone, Email ...",
+                help=(
+                    "Narrow by field: name:jo* first: last: email:@acme.com "
+                    "phone:^+49 cat:Work, and exclude with -cat:Other"
+                ),
+                key="search_query",
             )
+            phonetic = st.checkbox(
+                "Sounds like",
+                help='Match names that sound alike ("Smyth" finds "Smith")',
+                key="search_phonetic",
+            )
+            if search.strip():
+                completions = [c.text for c in suggest(db, search)]
+                if completions and completions != [prefix_key(search)]:
+                    st.pills(
+                        "Suggestions",
+                        completions,
+                        key="search_suggestion",
+                        on_change=complete_search_query,
+                        label_visibility="collapsed",
+                    )
         with col2:
             categories = st.multiselect(
                 "Filter by category",
-                ["Family", "Friends", "Work", "Other"],
+                list_categories(db),
                 default=[],
                 key="search_categories",
             )
@@ -75,19 +152,73 @@ def render_home() -> None:
             if (
                 search != st.session_state.last_query
                 or categories != st.session_state.get("last_categories")
+                or phonetic != st.session_state.get("last_phonetic")
             ):
                 st.session_state.last_query = search
                 st.session_state.last_categories = categories
+                st.session_state.last_phonetic = phonetic
 
-                contacts = search_contacts(db, search, categories)
+                with track_data():
+                    contacts = search_contacts(db, search, categories, phonetic)
                 if not contacts:
                     st.info("No contact found")
             else:
-                contacts = list_contacts(db)  # type: ignore[assignment]
+                with track_data():
+                    contacts = list_contacts(db)
 
     st.divider()
 
-    # Contact list display section
+    render_contact_rows(contacts)
+
+
+def reset_recent_pages() -> None:
+    """Go back to the first page of the recent contacts (widget callback)."""
+    st.session_state.recent_pages = [None]
+
+
+def render_recent() -> None:
+    """
+    Render the contacts added or edited last, newest first.
+
+    Pages are read by keyset pagination; ``recent_pages`` holds the cursor
+    of every page up to the current one, so "Newer" goes back a page.
+    """
+    order = st.radio(
+        "Order",
+        list(RECENT_ORDERS),
+        horizontal=True,
+        key="recent_order",
+        on_change=reset_recent_pages,
+        label_visibility="collapsed",
+    )
+    pages = st.session_state.setdefault("recent_pages", [None])
+    with track_data():
+        contacts, next_page = list_recent_contacts(
+            db, RECENT_ORDERS[order], RECENT_PAGE_SIZE, pages[-1]
+        )
+    if not contacts:
+        st.info("No contact yet")
+
+    st.divider()
+    render_contact_rows(contacts)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("◀ Newer", disabled=len(pages) == 1, width="stretch"):
+            pages.pop()
+            st.rerun()
+    with col2:
+        if st.button("Older ▶", disabled=next_page is None, width="stretch"):
+            pages.append(next_page)
+            st.rerun()
+
+
+def render_contact_rows(contacts) -> None:
+    """
+    Render one row per contact with its show, edit and delete buttons.
+
+    :param contacts: Contacts to list, in display order.
+    """
     with st.container(key="glass-section-lower-upper", height=500):
         for contact in contacts:
             c1, c2, c3, c4 = st.columns([4, 1, 1, 1])
@@ -109,6 +240,6 @@ def render_home() -> None:
 
             # Delete button with confirmation dialog
             if c4.button("🗑️", help="Delete", key=f"delete_{contact.id}"):
-                delete_dialog(db, contact.id)
+                delete_dialog(db, contact.id, contact.version)
 
             st.divider()
@@ -9,6 +9,7 @@ import streamlit as st
 
 from src.database.db import SessionLocal
 from src.services.contact_service import get_contact  # ContactServiceError,
+from src.utils.profiling import track_data
 
 # Initialize database session
 db = SessionLocal()
@@ -22,7 +23,8 @@ def render_show_contact() -> None:
     in a formatted view with navigation options.
     """
     # Retrieve contact from database using session state contact_id
-    contact = get_contact(db, st.session_state.contact_id)
+    with track_data():
+        contact = get_contact(db, st.session_state.contact_id)
 
     st.header("👤 Contact Details")
     st.divider()
@@ -0,0 +1,70 @@
+"""
+Streamlit UI component for the contact statistics dashboard.
+
+This module renders the counts per category and email domain, the
+contacts created over time and the contacts with missing fields. The
+numbers come from ``get_contact_stats``, which only recomputes them after
+the contacts changed.
+"""
+
+import streamlit as st
+
+from src.database.db import SessionLocal
+from src.services.contact_service import get_contact_stats
+from src.utils.profiling import track_data
+
+# Initialize database session
+db = SessionLocal()
+
+MISSING_LABELS = {
+    "email": "📧 Without email",
+    "first_name": "👤 Without first name",
+    "last_name": "👤 Without last name",
+    "category": "👥 Without category",
+}
+
+
+def render_stats() -> None:
+    """
+    Render the 'Statistics' page with the aggregates of all contacts.
+
+    Shows the total and missing-field counts as metrics, and the counts
+    per category, top email domains and contacts created per day or month
+    as charts.
+    """
+    with track_data():
+        stats = get_contact_stats(db)
+
+    st.header("📊 Statistics")
+    st.divider()
+
+    # Totals and missing fields
+    columns = st.columns(len(MISSING_LABELS) + 1)
+    columns[0].metric("📒 Contacts", stats.total)
+    for column, (field, label) in zip(columns[1:], MISSING_LABELS.items()):
+        column.metric(label, stats.missing[field])
+
+    # Categories and email domains
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Contacts per category")
+        st.bar_chart({"contacts": dict(stats.by_category)}, horizontal=True)
+    with col2:
+        st.subheader("Top email domains")
+        if stats.top_domains:
+            st.bar_chart({"contacts": dict(stats.top_domains)}, horizontal=True)
+        else:
+            st.info("No contact has an email yet.")
+
+    # Growth over time
+    st.subheader("Contacts created")
+    period = st.radio("Per", ["month", "day"], horizontal=True, key="stats_period")
+    created = stats.created_per_month if period == "month" else stats.created_per_day
+    if created:
+        st.bar_chart({"contacts": dict(created)})
+    else:
+        st.info("No contacts yet.")
+
+    if st.button("⬅ Back", width="stretch"):
+        st.session_state.page = "home"
+        st.rerun()
@@ -0,0 +1,214 @@
+"""
+Batch Validation Utilities
+
+Column-wise equivalents of the phone and email functions of
+``src.utils.validation`` for bulk paths (imports, deduplication).
+
+A column is a list, a NumPy array (``object`` or ``str`` dtype) or a
+pyarrow string array. Instead of one ``(valid, messages)`` tuple per row,
+a check returns the normalized column, a ``uint8`` error code per row and
+a validity mask; messages are only built for the rows that are asked for.
+
+Rows made of ASCII characters only are processed with pyarrow compute
+kernels. Their rules are spelled out for ASCII: ``\\s`` and
+``str.isspace`` are the same ten characters there, and ``str.isdigit``
+is ``[0-9]``. Any other row is checked with the scalar functions, so the
+results are identical to the scalar functions for every input.
+"""
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+from enum import IntEnum
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.utils.validation import (
+    EMAIL_INVALID,
+    EMAIL_REGEX,
+    PHONE_LENGTH,
+    PHONE_MISSING,
+    PHONE_NOT_DIGITS,
+    PHONE_NOT_DIGITS_AFTER_PLUS,
+    normalize_email,
+    normalize_phone,
+    validate_email,
+    validate_phone,
+)
+
+# ASCII characters matched by ``\s`` / stripped by ``str.strip()``
+ASCII_SPACE = "".join(c for c in map(chr, range(128)) if c.isspace())
+_RE2_SPACE = "".join(f"\\x{{{ord(c):02x}}}" for c in ASCII_SPACE)
+_RE2_PHONE_SEPARATORS = f"[{_RE2_SPACE}\\-()]"
+
+
+class PhoneError(IntEnum):
+    """Error codes of ``check_phones``."""
+
+    OK = 0
+    MISSING = 1
+    NOT_DIGITS = 2
+    NOT_DIGITS_AFTER_PLUS = 3
+    LENGTH = 4
+
+
+class EmailError(IntEnum):
+    """Error codes of ``check_emails``."""
+
+    OK = 0
+    INVALID = 1
+
+
+# Message of every error code, indexed by code
+PHONE_MESSAGES = (
+    None,
+    PHONE_MISSING,
+    PHONE_NOT_DIGITS,
+    PHONE_NOT_DIGITS_AFTER_PLUS,
+    PHONE_LENGTH,
+)
+EMAIL_MESSAGES = (None, EMAIL_INVALID)
+_PHONE_CODES = {message: code for code, message in enumerate(PHONE_MESSAGES)}
+
+
+@dataclass(frozen=True)
+class ColumnCheck:
+    """
+    Outcome of a column-wise check.
+
+    :param normalized: Normalized value of every row.
+    :param codes: Error code of every row (0 if valid).
+    :param messages: Message of every error code, indexed by code.
+    """
+
+    normalized: list
+    codes: np.ndarray
+    messages: tuple[str | None, ...]
+
+    @property
+    def valid(self) -> np.ndarray:
+        """Boolean validity mask."""
+        return self.codes == 0
+
+    def errors(self, index: int) -> list[str]:
+        """
+        Error messages of one row, as the scalar function reports them.
+
+        :param index: Row index.
+        :return: The row's messages, empty if it is valid.
+        """
+        code = self.codes[index]
+        return [self.messages[code]] if code else []  # type: ignore[list-item]
+
+    def failures(self) -> Iterator[tuple[int, list[str]]]:
+        """Yield ``(index, messages)`` of every invalid row, in order."""
+        for index in np.flatnonzero(self.codes).tolist():
+            yield index, self.errors(index)
+
+
+def to_arrow(values) -> pa.Array:
+    """
+    Convert a column to a pyarrow array (no copy for pyarrow input).
+
+    :param values: List, NumPy array or pyarrow (chunked) array of strings
+                   or None.
+    :return: A pyarrow array.
+    """
+    if isinstance(values, pa.ChunkedArray):
+        return values.combine_chunks()
+    if isinstance(values, pa.Array):
+        return values
+    if isinstance(values, np.ndarray):
+        values = values.tolist()
+    return pa.array(values, type=pa.string())
+
+
+def _non_ascii_rows(arr: pa.Array) -> np.ndarray:
+    """Indices of the rows that contain a non-ASCII character."""
+    ascii_rows = pc.fill_null(pc.string_is_ascii(arr), True)
+    return np.flatnonzero(~ascii_rows.to_numpy(zero_copy_only=False))
+
+
+def _numpy(arr: pa.Array) -> np.ndarray:
+    return arr.to_numpy(zero_copy_only=False)
+
+
+def check_phones(values) -> ColumnCheck:
+    """
+    Column-wise ``normalize_phone`` + ``validate_phone``.
+
+    None counts as an empty string.
+
+    :param values: Column of raw phone numbers.
+    :return: Normalized phones and ``PhoneError`` codes.
+    """
+    arr = to_arrow(values)
+    normalized = pc.fill_null(
+        pc.replace_substring_regex(arr, pattern=_RE2_PHONE_SEPARATORS, replacement=""),
+        "",
+    )
+    plus = _numpy(pc.starts_with(normalized, "+"))
+    digits = pc.if_else(plus, pc.utf8_slice_codeunits(normalized, 1), normalized)
+    length = _numpy(pc.binary_length(digits))
+    all_digits = _numpy(pc.match_substring_regex(digits, "^[0-9]+$"))
+    empty = _numpy(pc.binary_length(normalized)) == 0
+
+    codes = np.where(
+        empty,
+        PhoneError.MISSING,
+        np.where(
+            ~all_digits,
+            np.where(plus, PhoneError.NOT_DIGITS_AFTER_PLUS, PhoneError.NOT_DIGITS),
+            np.where((length < 7) | (length > 15), PhoneError.LENGTH, PhoneError.OK),
+        ),
+    ).astype(np.uint8)
+    result = normalized.to_pylist()
+
+    raw = None
+    for index in _non_ascii_rows(arr):
+        raw = raw if raw is not None else arr.to_pylist()
+        value = raw[index]
+        result[index] = normalize_phone(value)
+        _, errors = validate_phone(value)
+        codes[index] = _PHONE_CODES[errors[0]] if errors else PhoneError.OK
+    return ColumnCheck(result, codes, PHONE_MESSAGES)
+
+
+def check_emails(values) -> ColumnCheck:
+    """
+    Column-wise ``normalize_email`` + ``validate_email``.
+
+    :param values: Column of raw email addresses (None for missing).
+    :return: Normalized emails (None for missing) and ``EmailError`` codes.
+    """
+    arr = to_arrow(values)
+    present = pc.fill_null(pc.not_equal(arr, ""), False)
+    trimmed = pc.ascii_lower(pc.ascii_trim(arr, characters=ASCII_SPACE))
+    normalized = pc.if_else(present, trimmed, pa.scalar(None, pa.string()))
+    matches = pc.fill_null(pc.match_substring_regex(normalized, EMAIL_REGEX), True)
+    checked = _numpy(pc.fill_null(pc.not_equal(normalized, ""), False))
+
+    codes = np.where(
+        checked & ~_numpy(matches), EmailError.INVALID, EmailError.OK
+    ).astype(np.uint8)
+    result = normalized.to_pylist()
+
+    raw = None
+    for index in _non_ascii_rows(arr):
+        raw = raw if raw is not None else arr.to_pylist()
+        value = raw[index]
+        result[index] = normalize_email(value)
+        valid, _ = validate_email(value)
+        codes[index] = EmailError.OK if valid else EmailError.INVALID
+    return ColumnCheck(result, codes, EMAIL_MESSAGES)
+
+
+def normalize_phones(values) -> list[str]:
+    """Column-wise ``normalize_phone`` (see ``check_phones``)."""
+    return check_phones(values).normalized
+
+
+def normalize_emails(values) -> list[str | None]:
+    """Column-wise ``normalize_email`` (see ``check_emails``)."""
+    return check_emails(values).normalized
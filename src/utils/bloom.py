@@ -0,0 +1,85 @@
+"""
+Bloom Filter Utilities
+
+A compact, vectorized Bloom filter for set-membership pre-checks: a
+negative answer is always right, a positive answer is right except for a
+configurable false-positive rate. Used by bulk imports to skip database
+probes for keys that certainly do not exist yet.
+
+Keys are hashed with Python's ``hash()``, which is salted per process:
+a filter is only meaningful in the process that built it.
+"""
+
+import math
+from collections.abc import Sequence
+
+import numpy as np
+
+# Odd 64-bit constant (golden ratio) deriving the second hash from the first
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+class BloomFilter:
+    """
+    Bloom filter over strings, sized for a number of keys and an error rate.
+
+    :param capacity: Expected number of keys.
+    :param error_rate: Target false-positive rate at ``capacity`` keys.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.size = max(
+            64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+        self.count = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the bit array."""
+        return self.bits.nbytes
+
+    def _positions(self, keys: Sequence[str]) -> np.ndarray:
+        """Bit positions of the keys, shape ``(hashes, len(keys))``."""
+        h1 = np.fromiter(map(hash, keys), dtype=np.int64, count=len(keys)).view(
+            np.uint64
+        )
+        # Double hashing (Kirsch-Mitzenmacher): h1 + i * h2, h2 odd
+        h2 = (h1 * _MIX) | np.uint64(1)
+        steps = np.arange(self.hashes, dtype=np.uint64)[:, None]
+        return (h1 + steps * h2) % np.uint64(self.size)
+
+    def add_many(self, keys: Sequence[str]) -> None:
+        """
+        Add keys to the filter.
+
+        :param keys: Keys to add.
+        """
+        if not keys:
+            return
+        positions = self._positions(keys).ravel()
+        masks = np.left_shift(1, positions & np.uint64(7)).astype(np.uint8)
+        np.bitwise_or.at(self.bits, positions >> np.uint64(3), masks)
+        self.count += len(keys)
+
+    def contains_many(self, keys: Sequence[str]) -> np.ndarray:
+        """
+        Check several keys at once.
+
+        :param keys: Keys to look up.
+        :return: Boolean array, False for keys that were certainly never added.
+        """
+        if not keys:
+            return np.zeros(0, dtype=bool)
+        positions = self._positions(keys)
+        masks = np.left_shift(1, positions & np.uint64(7)).astype(np.uint8)
+        hits = (self.bits[positions >> np.uint64(3)] & masks) != 0
+        return hits.all(axis=0)
+
+    def __contains__(self, key: str) -> bool:
+        return bool(self.contains_many([key])[0])
+
+    def __len__(self) -> int:
+        return self.count
@@ -0,0 +1,380 @@
+"""
+Profiling Utilities
+
+This module provides the building blocks for the built-in profiling mode
+of the CLI and the Streamlit app:
+
+- ``Profiler`` wraps a session in ``cProfile`` plus a lightweight stack
+  sampler and writes a ``.pstats`` file, a collapsed-stack file that can be
+  fed to ``flamegraph.pl``/speedscope, and a tracemalloc allocation report
+  with the top allocations of every tracked action (menu action or rerun).
+- ``RerunTimings`` and ``track_rerun`` collect a per-rerun timing breakdown
+  (SQL, ORM hydration and widget rendering) for the Streamlit debug panel.
+- ``statement_cache_stats`` reports how often SQLAlchemy's compiled
+  statement cache was hit for each engine.
+"""
+
+import cProfile
+import sys
+import threading
+import time
+import tracemalloc
+import weakref
+from collections import Counter, deque
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS, NO_CACHE_KEY
+
+
+class StackSampler:
+    """
+    Periodically sample the call stack of one thread.
+
+    Samples are aggregated as collapsed stacks (``root;caller;callee count``),
+    the input format of most flamegraph tools.
+
+    :param interval: Sampling interval in seconds.
+    :param thread_id: Identifier of the thread to sample (default: caller).
+    """
+
+    def __init__(self, interval: float = 0.005, thread_id: int | None = None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start sampling in a background daemon thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="contact-book-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the background thread to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            # pylint: disable=protected-access
+            frame = sys._current_frames().get(self.thread_id)
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(
+                    f"{code.co_name} ({Path(code.co_filename).name}:"
+                    f"{code.co_firstlineno})"
+                )
+                frame = frame.f_back
+            if frames:
+                self.stacks[";".join(reversed(frames))] += 1
+
+
+# cProfile and tracemalloc are process-wide (Python 3.12+ refuses a second
+# active profiler): profiled sessions of all profilers run one at a time
+_SESSION_LOCK = threading.Lock()
+
+
+class Profiler:  # pylint: disable=too-many-instance-attributes
+    """
+    Profile a CLI session or Streamlit reruns and write the reports to disk.
+
+    The profiler can be started and stopped repeatedly; statistics are
+    accumulated and the report files are rewritten on every ``dump``. The
+    stack and allocation reports keep at most ``max_stacks`` stacks (the
+    most sampled) and the last ``max_actions`` actions.
+
+    :param output_dir: Directory where the report files are written.
+    :param name: Prefix of the report file names (e.g. ``cli``).
+    :param interval: Sampling interval of the stack sampler in seconds.
+    :param top: Number of allocation sites reported per action.
+    :param max_stacks: Maximum number of distinct stacks kept.
+    :param max_actions: Maximum number of actions in the allocation report.
+    :param dump_interval: Minimum number of seconds between the dumps of
+                          ``session`` (0 dumps after every session).
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        output_dir: str | Path,
+        name: str = "contact-book",
+        interval: float = 0.005,
+        top: int = 10,
+        *,
+        max_stacks: int = 10_000,
+        max_actions: int = 100,
+        dump_interval: float = 0.0,
+    ):
+        self.output_dir = Path(output_dir)
+        self.interval = interval
+        self.top = top
+        self.max_stacks = max_stacks
+        self.dump_interval = dump_interval
+        self.stacks: Counter[str] = Counter()
+        self.allocations: deque[tuple[str, list[str]]] = deque(maxlen=max_actions)
+        self._profile = cProfile.Profile()
+        self._sampler: StackSampler | None = None
+        self._owns_tracemalloc = False
+        self._last_dump: float | None = None
+
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        base = self.output_dir / f"{name}-{stamp}"
+        self.pstats_path = base.with_suffix(".pstats")
+        self.collapsed_path = base.with_suffix(".collapsed")
+        self.allocations_path = base.with_suffix(".alloc.txt")
+
+    def start(self) -> None:
+        """Enable cProfile, the stack sampler and tracemalloc."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+        self._sampler = StackSampler(self.interval)
+        self._sampler.start()
+        self._profile.enable()
+
+    def stop(self) -> None:
+        """Disable profiling and merge the collected stack samples."""
+        self._profile.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+            self.stacks.update(self._sampler.stacks)
+            self._sampler = None
+            if len(self.stacks) > self.max_stacks:
+                self.stacks = Counter(dict(self.stacks.most_common(self.max_stacks)))
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    def dump(self) -> list[Path]:
+        """
+        Write the pstats, collapsed-stack and allocation reports.
+
+        :return: Paths of the written files.
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._profile.dump_stats(self.pstats_path)
+
+        with open(self.collapsed_path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        with open(self.allocations_path, "w", encoding="utf-8") as f:
+            for label, lines in self.allocations:
+                f.write(f"== {label}\n")
+                f.writelines(f"{line}\n" for line in lines)
+                f.write("\n")
+
+        return [self.pstats_path, self.collapsed_path, self.allocations_path]
+
+    @contextmanager
+    def session(self) -> Iterator["Profiler"]:
+        """
+        Profile the enclosed block and dump the reports afterwards (at most
+        every ``dump_interval`` seconds).
+
+        Waits for a session of any profiler running in another thread.
+        """
+        with _SESSION_LOCK:
+            self.start()
+            try:
+                yield self
+            finally:
+                self.stop()
+                now = time.monotonic()
+                if self._last_dump is None or now - self._last_dump >= (
+                    self.dump_interval
+                ):
+                    self.dump()
+                    self._last_dump = now
+
+    @contextmanager
+    def action(self, label: str) -> Iterator[None]:
+        """
+        Record the top memory allocations made while running an action.
+
+        :param label: Name of the action shown in the allocation report.
+        """
+        if not tracemalloc.is_tracing():
+            yield
+            return
+
+        before = tracemalloc.take_snapshot()
+        try:
+            yield
+        finally:
+            after = tracemalloc.take_snapshot()
+            diff = after.compare_to(before, "lineno")
+            self.allocations.append((label, [str(s) for s in diff[: self.top]]))
+
+
+def profile_action(
+    profiler: Profiler | None, label: str
+) -> AbstractContextManager[None]:
+    """
+    Return ``profiler.action(label)`` or a no-op context if profiling is off.
+
+    :param profiler: Active profiler, or ``None``.
+    :param label: Name of the action.
+    """
+    if profiler is None:
+        return nullcontext()
+    return profiler.action(label)
+
+
+# ------------------------------------------------------------
+# Per-rerun timing breakdown (Streamlit debug panel)
+# ------------------------------------------------------------
+@dataclass
+class RerunTimings:
+    """
+    Timing breakdown of one Streamlit rerun, in seconds.
+
+    ``data`` is the time spent inside service calls; it contains the SQL
+    time, the remainder is attributed to ORM hydration. Everything else is
+    widget rendering.
+    """
+
+    total: float = 0.0
+    sql: float = 0.0
+    data: float = 0.0
+    statements: int = 0
+
+    @property
+    def orm(self) -> float:
+        """Time spent hydrating ORM objects (data time minus SQL time)."""
+        return max(self.data - self.sql, 0.0)
+
+    @property
+    def render(self) -> float:
+        """Time spent outside service calls, i.e. rendering widgets."""
+        return max(self.total - self.data, 0.0)
+
+
+# pylint: disable=invalid-name
+_current_timings: ContextVar[RerunTimings | None] = ContextVar(
+    "current_timings", default=None
+)
+_sql_timer_installed = False
+
+
+def _before_cursor_execute(conn, *_args) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, *_args) -> None:
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.sql += elapsed
+        timings.statements += 1
+
+
+# pylint: disable=global-statement
+def install_sql_timer() -> None:
+    """Register engine-wide listeners that time every executed statement."""
+    global _sql_timer_installed
+    if _sql_timer_installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    _sql_timer_installed = True
+
+
+@contextmanager
+def track_rerun() -> Iterator[RerunTimings]:
+    """Collect the timing breakdown of the enclosed rerun."""
+    install_sql_timer()
+    timings = RerunTimings()
+    token = _current_timings.set(timings)
+    start = time.perf_counter()
+    try:
+        yield timings
+    finally:
+        timings.total = time.perf_counter() - start
+        _current_timings.reset(token)
+
+
+@contextmanager
+def track_data() -> Iterator[None]:
+    """Attribute the enclosed service calls to the data part of the rerun."""
+    timings = _current_timings.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings.data += time.perf_counter() - start
+
+
+# ------------------------------------------------------------
+# Compiled statement cache statistics
+# ------------------------------------------------------------
+@dataclass
+class StatementCacheStats:
+    """
+    Compiled-cache counters of one engine.
+
+    Only statements compiled by SQLAlchemy are counted; raw driver SQL
+    (``exec_driver_sql``) has no cache key.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    uncached: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of compiled statements served from the compiled cache."""
+        compiled = self.hits + self.misses + self.uncached
+        return self.hits / compiled if compiled else 0.0
+
+
+_statement_cache_stats: "weakref.WeakKeyDictionary[Engine, StatementCacheStats]" = (
+    weakref.WeakKeyDictionary()
+)
+_statement_cache_counter_installed = False
+
+
+def _count_statement_cache(conn, _cursor, _statement, _params, context, _many):
+    stats = _statement_cache_stats.get(conn.engine)
+    if stats is None:
+        stats = _statement_cache_stats[conn.engine] = StatementCacheStats()
+    cache_hit = context.cache_hit
+    if cache_hit == CACHE_HIT:
+        stats.hits += 1
+    elif cache_hit == CACHE_MISS:
+        stats.misses += 1
+    elif cache_hit != NO_CACHE_KEY:
+        stats.uncached += 1
+
+
+def install_statement_cache_counter() -> None:
+    """Register an engine-wide listener that counts compiled-cache hits."""
+    global _statement_cache_counter_installed
+    if _statement_cache_counter_installed:
+        return
+    event.listen(Engine, "after_cursor_execute", _count_statement_cache)
+    _statement_cache_counter_installed = True
+
+
+def statement_cache_stats(engine: Engine) -> StatementCacheStats:
+    """
+    Return the compiled-cache counters of an engine.
+
+    :param engine: Engine whose statements are counted.
+    :return: A copy of the counters collected since installation.
+    """
+    stats = _statement_cache_stats.get(engine) or StatementCacheStats()
+    return StatementCacheStats(stats.hits, stats.misses, stats.uncached)
@@ -0,0 +1,145 @@
+"""
+Search Query Utilities
+
+A small query syntax for contact searches, parsed into a list of terms
+that must all match (the AST of an AND):
+
+    name:jo* cat:Work email:@acme.com phone:^+49 -cat:Other
+
+- ``field:value`` restricts a term to one field: ``name``, ``first``,
+  ``last``, ``email``, ``phone`` or ``cat`` (``category``).
+- Names always match by prefix (``*`` is allowed but not needed).
+- ``^value`` or ``value*`` matches phones and emails by prefix;
+  ``@domain`` matches emails by domain; a full address matches one
+  email exactly; anything else matches by substring.
+- ``-`` in front of a term excludes the contacts it matches.
+- ``"..."`` quotes a value with spaces (``name:"de la cruz"``).
+- A word without a field is free text, as in a plain search.
+
+Unknown fields are not an error: the whole word is searched as free text
+and a warning is kept on the parsed query.
+"""
+
+import re
+from dataclasses import dataclass
+
+from src.utils.validation import normalize_email, normalize_phone
+
+# Field names accepted in front of a value, and the field they stand for
+FIELDS = {
+    "name": "name",
+    "first": "first",
+    "last": "last",
+    "email": "email",
+    "phone": "phone",
+    "cat": "category",
+    "category": "category",
+}
+
+# How a term matches its field
+TEXT = "text"
+PREFIX = "prefix"
+EXACT = "exact"
+DOMAIN = "domain"
+SUBSTRING = "substring"
+
+# Optional "-", optional "field:", then a quoted or a bare value. A "-"
+# before a digit is part of the value ("555 -0100" is a phone fragment).
+_TOKEN = re.compile(
+    r"(?P<neg>-(?![\d-]))?"
+    r"(?:(?P<field>[A-Za-z]+):)?"
+    r'(?:"(?P<quoted>[^"]*)"?|(?P<bare>\S*))'
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Term:
+    """
+    One condition of a search query.
+
+    :param field: Field matched (a value of ``FIELDS``), None for free text.
+    :param value: Value to match, normalized for the field.
+    :param match: How the value matches (``TEXT``, ``PREFIX``, ``EXACT``,
+                  ``DOMAIN`` or ``SUBSTRING``).
+    :param negated: Exclude the contacts the term matches.
+    :param text: The term as typed.
+    """
+
+    field: str | None
+    value: str
+    match: str
+    negated: bool = False
+    text: str = ""
+
+
+@dataclass(frozen=True)
+class SearchQuery:
+    """
+    A parsed search query: contacts must match every term.
+
+    :param terms: Conditions, in query order.
+    :param warnings: Parts of the query that were not understood as written.
+    """
+
+    terms: tuple[Term, ...]
+    warnings: tuple[str, ...] = ()
+
+    @property
+    def structured(self) -> bool:
+        """Whether the query uses fields or negation (not just free text)."""
+        return any(term.field or term.negated for term in self.terms)
+
+
+def _field_term(field: str, value: str, negated: bool, text: str) -> Term:
+    """Term of a ``field:value`` pair."""
+    # pylint: disable=too-many-return-statements
+    anchored = value.startswith("^")
+    value = value.removeprefix("^")
+    starred = value.endswith("*")
+    value = value.rstrip("*")
+    if field in ("name", "first", "last"):
+        return Term(field, value, PREFIX, negated, text)
+    if field == "category":
+        return Term(field, value, EXACT, negated, text)
+    if field == "phone":
+        match = PREFIX if anchored or starred else SUBSTRING
+        return Term(field, normalize_phone(value), match, negated, text)
+    value = value.strip().lower()
+    if anchored or starred:
+        return Term(field, value, PREFIX, negated, text)
+    if value.startswith("@"):
+        return Term(field, value[1:], DOMAIN, negated, text)
+    if "@" in value:
+        return Term(field, normalize_email(value) or "", EXACT, negated, text)
+    return Term(field, value, SUBSTRING, negated, text)
+
+
+def parse_query(text: str) -> SearchQuery:
+    """
+    Parse a search query.
+
+    :param text: Query typed by the user.
+    :return: The parsed query; free-text words are kept as ``TEXT`` terms.
+    """
+    terms: list[Term] = []
+    warnings: list[str] = []
+    for token in _TOKEN.finditer(text):
+        if not token.group(0).strip():
+            continue
+        negated = token.group("neg") is not None
+        name = token.group("field")
+        quoted = token.group("quoted")
+        value = quoted if quoted is not None else token.group("bare")
+        if name is not None and name.lower() not in FIELDS:
+            warnings.append(f'Unknown field "{name}", searched as text')
+            value = f"{name}:{value}"
+            name = None
+        if not value.strip():
+            warnings.append(f'"{token.group(0)}" has no value and was ignored')
+            continue
+        typed = token.group(0)
+        if name is None:
+            terms.append(Term(None, value, TEXT, negated, typed))
+        else:
+            terms.append(_field_term(FIELDS[name.lower()], value, negated, typed))
+    return SearchQuery(tuple(terms), tuple(warnings))
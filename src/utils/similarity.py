@@ -0,0 +1,582 @@
+"""
+String Similarity Utilities
+
+Name folding, phonetic keys (Soundex, Double Metaphone) and the
+Jaro-Winkler similarity, used to find near-duplicate contacts ("Jon Doe"
+vs "John Doe") and sound-alike names ("Smyth" vs "Schmidt").
+"""
+
+import unicodedata
+
+# Soundex digit of every consonant that has one
+_SOUNDEX_DIGITS = {
+    letter: digit
+    for letters, digit in (
+        ("BFPV", "1"),
+        ("CGJKQSXZ", "2"),
+        ("DT", "3"),
+        ("L", "4"),
+        ("MN", "5"),
+        ("R", "6"),
+    )
+    for letter in letters
+}
+
+
+def fold(text: str) -> str:
+    """
+    Fold a string for comparison: compatibility-decompose, drop accents,
+    casefold and collapse whitespace ("  José  MÜLLER" -> "jose muller").
+
+    :param text: String to fold.
+    :return: The folded string.
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+def soundex(name: str) -> str:
+    """
+    American Soundex code of a name ("Robert" and "Rupert" -> "R163").
+
+    Accents are folded first; characters other than A-Z are ignored.
+
+    :param name: Name to encode.
+    :return: Letter plus three digits, or "" if the name has no letters.
+    """
+    letters = [c for c in fold(name).upper() if "A" <= c <= "Z"]
+    if not letters:
+        return ""
+    code = letters[0]
+    previous = _SOUNDEX_DIGITS.get(code, "")
+    for letter in letters[1:]:
+        digit = _SOUNDEX_DIGITS.get(letter, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # H and W do not separate letters with the same digit; vowels do
+        if letter not in "HW":
+            previous = digit
+    return code.ljust(4, "0")
+
+
+def jaro(a: str, b: str) -> float:
+    """
+    Jaro similarity of two strings.
+
+    :param a: First string.
+    :param b: Second string.
+    :return: Similarity from 0 (nothing in common) to 1 (equal).
+    """
+    if a == b:
+        return 1.0
+    len_a, len_b = len(a), len(b)
+    if not len_a or not len_b:
+        return 0.0
+
+    window = max(max(len_a, len_b) // 2 - 1, 0)
+    used = [False] * len_b
+    matches_a = []
+    for i, char in enumerate(a):
+        for j in range(max(0, i - window), min(len_b, i + window + 1)):
+            if not used[j] and b[j] == char:
+                used[j] = True
+                matches_a.append(char)
+                break
+    matches = len(matches_a)
+    if not matches:
+        return 0.0
+
+    matches_b = [char for char, hit in zip(b, used) if hit]
+    transpositions = sum(x != y for x, y in zip(matches_a, matches_b)) // 2
+    return (
+        matches / len_a + matches / len_b + (matches - transpositions) / matches
+    ) / 3
+
+
+def jaro_winkler(a: str, b: str, prefix_scale: float = 0.1) -> float:
+    """
+    Jaro-Winkler similarity: Jaro, boosted for a common prefix (up to 4).
+
+    :param a: First string.
+    :param b: Second string.
+    :param prefix_scale: Boost per common prefix character (at most 0.25).
+    :return: Similarity from 0 to 1.
+    """
+    similarity = jaro(a, b)
+    prefix = 0
+    for x, y in zip(a[:4], b[:4]):
+        if x != y:
+            break
+        prefix += 1
+    return similarity + prefix * prefix_scale * (1 - similarity)
+
+
+# Double Metaphone -----------------------------------------------------------
+
+_VOWELS = frozenset("AEIOUY")
+# Padding after the word, so that look-aheads never run off its end
+_PAD = "     "
+
+
+class _Metaphone:
+    """State of one Double Metaphone encoding (see ``double_metaphone``)."""
+
+    def __init__(self, word: str):
+        self.word = word + _PAD
+        self.last = len(word) - 1
+        self.primary = ""
+        self.secondary = ""
+        self.slavo_germanic = any(s in word for s in ("W", "K", "CZ", "WITZ"))
+
+    def at(self, start: int, *options: str) -> bool:
+        """True if one of the options is found at ``start``."""
+        if start < 0:
+            return False
+        return any(
+            self.word[start : start + len(option)] == option for option in options
+        )
+
+    def vowel(self, index: int) -> bool:
+        return 0 <= index <= self.last and self.word[index] in _VOWELS
+
+    def add(self, primary: str, secondary: str | None = None) -> None:
+        self.primary += primary
+        self.secondary += primary if secondary is None else secondary
+
+    def double(self, index: int, letter: str) -> int:
+        """Step over a letter and its repetition."""
+        return 2 if self.word[index + 1] == letter else 1
+
+
+def _encode_c(m: _Metaphone, i: int) -> int:
+    # pylint: disable=too-many-return-statements,too-many-branches
+    # pylint: disable=too-many-boolean-expressions
+    # Germanic "ach" ("bacher", "macher")
+    if (
+        i > 1
+        and not m.vowel(i - 2)
+        and m.at(i - 1, "ACH")
+        and m.word[i + 2] != "I"
+        and (m.word[i + 2] != "E" or m.at(i - 2, "BACHER", "MACHER"))
+    ):
+        m.add("K")
+        return 2
+    if i == 0 and m.at(i, "CAESAR"):
+        m.add("S")
+        return 2
+    if m.at(i, "CHIA"):
+        m.add("K")
+        return 2
+    if m.at(i, "CH"):
+        return _encode_ch(m, i)
+    if m.at(i, "CZ") and not m.at(i - 2, "WICZ"):
+        m.add("S", "X")
+        return 2
+    if m.at(i + 1, "CIA"):
+        m.add("X")
+        return 3
+    # Double C, but not "McClellan"
+    if m.at(i, "CC") and not (i == 1 and m.word[0] == "M"):
+        if m.at(i + 2, "I", "E", "H") and not m.at(i + 2, "HU"):
+            # "accident", "succeed" vs Italian "bacci"
+            if (i == 1 and m.word[0] == "A") or m.at(i - 1, "UCCEE", "UCCES"):
+                m.add("KS")
+            else:
+                m.add("X")
+            return 3
+        m.add("K")
+        return 2
+    if m.at(i, "CK", "CG", "CQ"):
+        m.add("K")
+        return 2
+    if m.at(i, "CI", "CE", "CY"):
+        if m.at(i, "CIO", "CIE", "CIA"):
+            m.add("S", "X")
+        else:
+            m.add("S")
+        return 2
+    m.add("K")
+    # "mac caffrey", "mac gregor"
+    if m.at(i + 1, " C", " Q", " G"):
+        return 3
+    if m.at(i + 1, "C", "K", "Q") and not m.at(i + 1, "CE", "CI"):
+        return 2
+    return 1
+
+
+def _encode_ch(m: _Metaphone, i: int) -> int:
+    # pylint: disable=too-many-boolean-expressions
+    if i > 0 and m.at(i, "CHAE"):  # "michael"
+        m.add("K", "X")
+        return 2
+    # Greek roots ("chemistry", "chorus")
+    if (
+        i == 0
+        and (m.at(i + 1, "HARAC", "HARIS") or m.at(i + 1, "HOR", "HYM", "HIA", "HEM"))
+        and not m.at(0, "CHORE")
+    ):
+        m.add("K")
+        return 2
+    # Germanic, Greek or otherwise "kh" ("orchestra", "architect", "acht")
+    if (
+        m.at(0, "VAN ", "VON ", "SCH")
+        or m.at(i - 2, "ORCHES", "ARCHIT", "ORCHID")
+        or m.at(i + 2, "T", "S")
+        or (
+            (i == 0 or m.at(i - 1, "A", "O", "U", "E"))
+            and m.at(i + 2, "L", "R", "N", "M", "B", "H", "F", "V", "W", " ")
+        )
+    ):
+        m.add("K")
+    elif i == 0:
+        m.add("X")
+    elif m.at(0, "MC"):
+        m.add("K")
+    else:
+        m.add("X", "K")
+    return 2
+
+
+def _encode_g(m: _Metaphone, i: int) -> int:
+    # pylint: disable=too-many-return-statements,too-many-branches
+    following = m.word[i + 1]
+    if following == "H":
+        if i > 0 and not m.vowel(i - 1):
+            m.add("K")
+        elif i == 0:  # "ghislane", "ghiradelli"
+            m.add("J" if m.word[i + 2] == "I" else "K")
+        # Parker's rule: silent in "hugh", "bough", "broughton"
+        elif not (
+            (i > 1 and m.at(i - 2, "B", "H", "D"))
+            or (i > 2 and m.at(i - 3, "B", "H", "D"))
+            or (i > 3 and m.at(i - 4, "B", "H"))
+        ):
+            # "laugh", "McLaughlin", "cough", "rough"
+            if i > 2 and m.word[i - 1] == "U" and m.at(i - 3, "C", "G", "L", "R", "T"):
+                m.add("F")
+            elif m.word[i - 1] != "I":
+                m.add("K")
+        return 2
+    if following == "N":
+        if i == 1 and m.vowel(0) and not m.slavo_germanic:
+            m.add("KN", "N")
+        elif not m.at(i + 2, "EY") and not m.slavo_germanic:  # not "cagney"
+            m.add("N", "KN")
+        else:
+            m.add("KN")
+        return 2
+    if m.at(i + 1, "LI") and not m.slavo_germanic:  # "tagliaro"
+        m.add("KL", "L")
+        return 2
+    # -ges-, -gep-, -gel-, -gie- at the beginning
+    if i == 0 and (
+        following == "Y"
+        or m.at(i + 1, "ES", "EP", "EB", "EL", "EY", "IB", "IL", "IN", "IE", "EI", "ER")
+    ):
+        m.add("K", "J")
+        return 2
+    # -ger-, -gy-
+    if (
+        (m.at(i + 1, "ER") or following == "Y")
+        and not m.at(0, "DANGER", "RANGER", "MANGER")
+        and not m.at(i - 1, "E", "I")
+        and not m.at(i - 1, "RGY", "OGY")
+    ):
+        m.add("K", "J")
+        return 2
+    # Italian "biaggi"
+    if m.at(i + 1, "E", "I", "Y") or m.at(i - 1, "AGGI", "OGGI"):
+        if m.at(0, "VAN ", "VON ", "SCH") or m.at(i + 1, "ET"):
+            m.add("K")
+        elif m.at(i + 1, "IER "):  # French ending
+            m.add("J")
+        else:
+            m.add("J", "K")
+        return 2
+    m.add("K")
+    return m.double(i, "G")
+
+
+def _encode_j(m: _Metaphone, i: int) -> int:
+    # Spanish "jose", "san jacinto"
+    if m.at(i, "JOSE") or m.at(0, "SAN "):
+        if (i == 0 and m.word[i + 4] == " ") or m.at(0, "SAN "):
+            m.add("H")
+        else:
+            m.add("J", "H")
+        return 1
+    if i == 0:
+        m.add("J", "A")  # "Yankelovich" / "Jankelowicz"
+    elif (
+        m.vowel(i - 1) and not m.slavo_germanic and m.word[i + 1] in "AO"
+    ):  # Spanish "bajador"
+        m.add("J", "H")
+    elif i == m.last:
+        m.add("J", "")
+    elif not m.at(i + 1, "L", "T", "K", "S", "N", "M", "B", "Z") and not m.at(
+        i - 1, "S", "K", "L"
+    ):
+        m.add("J")
+    return m.double(i, "J")
+
+
+def _encode_s(m: _Metaphone, i: int) -> int:
+    # pylint: disable=too-many-return-statements,too-many-branches
+    if m.at(i - 1, "ISL", "YSL"):  # "island", "carlisle"
+        return 1
+    if i == 0 and m.at(i, "SUGAR"):
+        m.add("X", "S")
+        return 1
+    if m.at(i, "SH"):
+        m.add("S" if m.at(i + 1, "HEIM", "HOEK", "HOLM", "HOLZ") else "X")
+        return 2
+    if m.at(i, "SIO", "SIA") or m.at(i, "SIAN"):  # Italian and Armenian
+        m.add("S", "S" if m.slavo_germanic else "X")
+        return 3
+    # "smith" matches "schmidt", "snider" matches "schneider"
+    if (i == 0 and m.at(i + 1, "M", "N", "L", "W")) or m.at(i + 1, "Z"):
+        m.add("S", "X")
+        return 2 if m.at(i + 1, "Z") else 1
+    if m.at(i, "SC"):
+        if m.word[i + 2] == "H":
+            if m.at(i + 3, "OO", "ER", "EN", "UY", "ED", "EM"):  # Dutch "school"
+                if m.at(i + 3, "ER", "EN"):  # "schermerhorn", "schenker"
+                    m.add("X", "SK")
+                else:
+                    m.add("SK")
+            elif i == 0 and not m.vowel(3) and m.word[3] != "W":
+                m.add("X", "S")
+            else:
+                m.add("X")
+            return 3
+        m.add("S" if m.at(i + 2, "I", "E", "Y") else "SK")
+        return 3
+    if i == m.last and m.at(i - 2, "AI", "OI"):  # French "artois"
+        m.add("", "S")
+    else:
+        m.add("S")
+    return 2 if m.at(i + 1, "S", "Z") else 1
+
+
+def _encode_t(m: _Metaphone, i: int) -> int:
+    if m.at(i, "TION"):
+        m.add("X")
+        return 3
+    if m.at(i, "TIA", "TCH"):
+        m.add("X")
+        return 3
+    if m.at(i, "TH") or m.at(i, "TTH"):
+        # "thomas", "thames" or Germanic
+        if m.at(i + 2, "OM", "AM") or m.at(0, "VAN ", "VON ", "SCH"):
+            m.add("T")
+        else:
+            m.add("0", "T")
+        return 2
+    m.add("T")
+    return 2 if m.at(i + 1, "T", "D") else 1
+
+
+def _encode_w(m: _Metaphone, i: int) -> int:
+    if m.at(i, "WR"):
+        m.add("R")
+        return 2
+    if i == 0 and (m.vowel(i + 1) or m.at(i, "WH")):
+        # "Wasserman" matches "Vasserman", "Uomo" matches "Womo"
+        m.add("A", "F" if m.vowel(i + 1) else "A")
+    # "Arnow" matches "Arnoff"
+    if (
+        (i == m.last and m.vowel(i - 1))
+        or m.at(i - 1, "EWSKI", "EWSKY", "OWSKI", "OWSKY")
+        or m.at(0, "SCH")
+    ):
+        m.add("", "F")
+        return 1
+    if m.at(i, "WICZ", "WITZ"):  # Polish "filipowicz"
+        m.add("TS", "FX")
+        return 4
+    return 1
+
+
+def _encode_other(m: _Metaphone, i: int) -> int:
+    # pylint: disable=too-many-return-statements,too-many-branches
+    letter, following = m.word[i], m.word[i + 1]
+    if letter in _VOWELS:
+        if i == 0:
+            m.add("A")
+        return 1
+    if letter == "B":
+        m.add("P")
+        return m.double(i, "B")
+    if letter == "D":
+        if m.at(i, "DG"):
+            if m.at(i + 2, "I", "E", "Y"):  # "edge"
+                m.add("J")
+                return 3
+            m.add("TK")  # "edgar"
+            return 2
+        m.add("T")
+        return 2 if m.at(i, "DT", "DD") else 1
+    if letter == "H":
+        # Kept only first or between vowels and before a vowel
+        if (i == 0 or m.vowel(i - 1)) and m.vowel(i + 1):
+            m.add("H")
+            return 2
+        return 1
+    if letter == "L":
+        if following == "L":
+            # Spanish "cabrillo", "gallegos"
+            if (i == m.last - 2 and m.at(i - 1, "ILLO", "ILLA", "ALLE")) or (
+                (m.at(m.last - 1, "AS", "OS") or m.at(m.last, "A", "O"))
+                and m.at(i - 1, "ALLE")
+            ):
+                m.add("L", "")
+                return 2
+        m.add("L")
+        return m.double(i, "L")
+    if letter == "M":
+        m.add("M")
+        # "dumb", "thumbell"
+        if m.at(i - 1, "UMB") and (i + 1 == m.last or m.at(i + 2, "ER")):
+            return 2
+        return m.double(i, "M")
+    if letter == "P":
+        if following == "H":
+            m.add("F")
+            return 2
+        m.add("P")
+        return 2 if following in "PB" else 1  # "campbell", "raspberry"
+    if letter == "R":
+        # French "rogier", but not "hochmeier"
+        if (
+            i == m.last
+            and not m.slavo_germanic
+            and m.at(i - 2, "IE")
+            and not m.at(i - 4, "ME", "MA")
+        ):
+            m.add("", "R")
+        else:
+            m.add("R")
+        return m.double(i, "R")
+    if letter == "X":
+        # French "breaux"
+        if not (i == m.last and (m.at(i - 3, "IAU", "EAU") or m.at(i - 2, "AU", "OU"))):
+            m.add("KS")
+        return 2 if following in "CX" else 1
+    if letter == "Z":
+        if following == "H":  # Chinese "zhao"
+            m.add("J")
+            return 2
+        if m.at(i + 1, "ZO", "ZI", "ZA") or (
+            m.slavo_germanic and i > 0 and m.word[i - 1] != "T"
+        ):
+            m.add("S", "TS")
+        else:
+            m.add("S")
+        return m.double(i, "Z")
+    simple = _SIMPLE.get(letter)
+    if simple:
+        m.add(simple)
+        return m.double(i, letter)
+    return 1  # Not a letter
+
+
+# Letters with one sound, also when doubled
+_SIMPLE = {"F": "F", "K": "K", "N": "N", "Q": "K", "V": "F"}
+_ENCODERS = {
+    "C": _encode_c,
+    "G": _encode_g,
+    "J": _encode_j,
+    "S": _encode_s,
+    "T": _encode_t,
+    "W": _encode_w,
+}
+
+
+def double_metaphone(name: str, length: int = 4) -> tuple[str, str]:
+    """
+    Double Metaphone codes of a name (Lawrence Philips, 2000).
+
+    Names that sound alike share a code: "Smith" and "Smyth" encode as
+    ("SM0", "XMT"), "Schmidt" as ("XMT", "SMT"). The secondary code is an
+    alternative pronunciation (Germanic, Slavic, Spanish ...), equal to the
+    primary code when there is none. Accents are folded first.
+
+    :param name: Name to encode.
+    :param length: Maximum length of a code.
+    :return: ``(primary, secondary)``; empty strings if the name has no letters.
+    """
+    word = "".join(c for c in fold(name).upper() if "A" <= c <= "Z" or c == " ")
+    m = _Metaphone(word)
+    i = 0
+    # GN, KN, PN, WR, PS at the beginning: first letter silent
+    if m.at(0, "GN", "KN", "PN", "WR", "PS"):
+        i = 1
+    elif word.startswith("X"):  # "Xavier"
+        m.add("S")
+        i = 1
+    while i <= m.last and (len(m.primary) < length or len(m.secondary) < length):
+        encode = _ENCODERS.get(m.word[i], _encode_other)
+        i += encode(m, i)
+    return m.primary[:length], m.secondary[:length]
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int | None:
+    """
+    Restricted Damerau-Levenshtein distance (insertions, deletions,
+    substitutions and transpositions of adjacent characters), bounded.
+
+    Common prefixes and suffixes are skipped, and the rest is computed
+    with a bit-parallel algorithm (``_osa_distance``).
+
+    :param a: First string.
+    :param b: Second string.
+    :param max_distance: Largest distance of interest.
+    :return: The distance, or None if it is larger than ``max_distance``.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    start, end_a, end_b = 0, len(a), len(b)
+    while start < end_a and start < end_b and a[start] == b[start]:
+        start += 1
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a, end_b = end_a - 1, end_b - 1
+    a, b = a[start:end_a], b[start:end_b]
+    distance = _osa_distance(a, b) if a and b else max(len(a), len(b))
+    return distance if distance <= max_distance else None
+
+
+def _osa_distance(a: str, b: str) -> int:
+    """
+    Restricted Damerau-Levenshtein distance of two non-empty strings with
+    Hyyrö's bit-parallel algorithm (2003): a column of the distance matrix
+    is a pair of integers, updated with a dozen bitwise operations per
+    character of ``b`` instead of a loop over its cells.
+    """
+    # Bit i of matches[c] is set if a[i] == c
+    matches: dict[str, int] = {}
+    for i, char in enumerate(a):
+        matches[char] = matches.get(char, 0) | 1 << i
+    ones, last = (1 << len(a)) - 1, 1 << (len(a) - 1)
+    vp, vn, d0, previous_match = ones, 0, 0, 0
+    distance = len(a)
+    for char in b:
+        match = matches.get(char, 0)
+        # The last term is the transposition of a[i - 1 : i + 1]
+        d0 = (
+            (((match & vp) + vp) ^ vp)
+            | match
+            | vn
+            | (((~d0 & match) << 1) & previous_match)
+        ) & ones
+        hp = (vn | ~(d0 | vp)) & ones
+        hn = d0 & vp
+        distance += (hp & last != 0) - (hn & last != 0)
+        hp = (hp << 1 | 1) & ones
+        hn = (hn << 1) & ones
+        vp = (hn | ~(d0 | hp)) & ones
+        vn = hp & d0
+        previous_match = match
+    return distance
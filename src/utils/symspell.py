@@ -0,0 +1,117 @@
+"""
+Symmetric Delete Spelling Index
+
+SymSpell (Wolf Garbe): every term is stored under each string obtained by
+deleting up to ``max_distance`` of its characters. The deletes of a word
+are then looked up in that dictionary, so the terms within an edit
+distance of the word are found with a few dozen hash lookups instead of
+a comparison with every term, and only those candidates are verified
+with the edit distance.
+
+The deletes of a term are taken from its first ``prefix_length``
+characters, which bounds their number for long terms.
+"""
+
+from dataclasses import dataclass
+
+from src.utils.similarity import edit_distance
+
+
+@dataclass(frozen=True, slots=True)
+class Suggestion:
+    """
+    A term within the edit distance of a looked-up word.
+
+    :param term: The term.
+    :param distance: Edit distance from the word.
+    :param count: Frequency of the term.
+    """
+
+    term: str
+    distance: int
+    count: int
+
+
+class SymSpell:
+    """
+    Term dictionary with frequencies and a deletion index.
+
+    :param max_distance: Largest edit distance a lookup can ask for.
+    :param prefix_length: Characters of a term its deletes are taken from.
+    """
+
+    def __init__(self, max_distance: int = 2, prefix_length: int = 7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.counts: dict[str, int] = {}
+        self.deletes: dict[str, list[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def __contains__(self, term: str) -> bool:
+        return term in self.counts
+
+    def _deletes(self, word: str, max_distance: int) -> set[str]:
+        """The prefix of a word and all strings up to ``max_distance`` deletes away."""
+        found = frontier = {word[: self.prefix_length]}
+        for _ in range(max_distance):
+            frontier = {
+                edit[:i] + edit[i + 1 :] for edit in frontier for i in range(len(edit))
+            }
+            found = found | frontier
+        return found
+
+    def add(self, term: str, count: int = 1) -> None:
+        """
+        Add occurrences of a term.
+
+        :param term: Term to add.
+        :param count: Number of occurrences.
+        """
+        if term in self.counts:
+            self.counts[term] += count
+            return
+        self.counts[term] = count
+        for delete in self._deletes(term, self.max_distance):
+            self.deletes.setdefault(delete, []).append(term)
+
+    def remove(self, term: str, count: int = 1) -> None:
+        """
+        Remove occurrences of a term; the term goes when none is left.
+
+        :param term: Term to remove.
+        :param count: Number of occurrences.
+        """
+        left = self.counts.get(term, 0) - count
+        if left > 0:
+            self.counts[term] = left
+            return
+        if self.counts.pop(term, None) is None:
+            return
+        for delete in self._deletes(term, self.max_distance):
+            terms = self.deletes[delete]
+            terms.remove(term)
+            if not terms:
+                del self.deletes[delete]
+
+    def lookup(self, word: str, max_distance: int | None = None) -> list[Suggestion]:
+        """
+        Terms within an edit distance of a word.
+
+        :param word: Word to look up.
+        :param max_distance: Largest distance (at most the index's).
+        :return: Suggestions by distance, then by decreasing frequency.
+        """
+        limit = self.max_distance if max_distance is None else max_distance
+        limit = min(limit, self.max_distance)
+        candidates: set[str] = set()
+        for delete in self._deletes(word, limit):
+            candidates.update(self.deletes.get(delete, ()))
+        suggestions = []
+        for term in candidates:
+            distance = edit_distance(word, term, limit)
+            if distance is not None:
+                suggestions.append(Suggestion(term, distance, self.counts[term]))
+        suggestions.sort(key=lambda s: (s.distance, -s.count, s.term))
+        return suggestions
@@ -4,11 +4,26 @@ Validation Utilities
 This module provides helper functions for validating and normalizing
 user input fields such as names, phone numbers, and email addresses.
 It is used by the service layer before persisting data to the database.
+
+Patterns are compiled once at import time; the functions are called per
+row by bulk imports, where a lookup in ``re``'s pattern cache per call
+adds up.
 """
 
 import re
 
 EMAIL_REGEX = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
+EMAIL_PATTERN = re.compile(EMAIL_REGEX)
+# Separators allowed in phone input and removed by normalize_phone
+PHONE_SEPARATORS = re.compile(r"[\s\-\(\)]")
+
+# Error messages (shared with the column-wise checks of batch_validation)
+NAME_MISSING = "At least one of First Name or Last Name must be provided."
+PHONE_MISSING = "Please provide a phone number."
+PHONE_NOT_DIGITS = "Phone number must contain only digits."
+PHONE_NOT_DIGITS_AFTER_PLUS = "Phone number must contain only digits after '+' sign."
+PHONE_LENGTH = "Phone number must be between 7 and 15 digits long."
+EMAIL_INVALID = "Email format is invalid (example: name@email.com)"
 
 
 def validate_name_pair(first_name: str, last_name: str) -> tuple[bool, str]:
@@ -21,7 +36,7 @@ def validate_name_pair(first_name: str, last_name: str) -> tuple[bool, str]:
             and an error message if invalid.
     """
     if not first_name.strip() and not last_name.strip():
-        return (False, "At least one of First Name or Last Name must be provided.")
+        return (False, NAME_MISSING)
     return True, ""
 
 
@@ -32,7 +47,7 @@ def normalize_phone(phone: str) -> str:
     :param phone: Raw phone number input.
     :return: Normalized phone number containing only digits and optional leading '+'.
     """
-    return re.sub(r"[\s\-\(\)]", "", phone)
+    return PHONE_SEPARATORS.sub("", phone)
 
 
 def validate_phone(phone: str) -> tuple[bool, list[str]]:
@@ -48,7 +63,7 @@ def validate_phone(phone: str) -> tuple[bool, list[str]]:
     # 1. Required field
     if not phone:
         validate = False
-        return validate, ["Please provide a phone number."]
+        return validate, [PHONE_MISSING]
 
     errors = []
     # 2. Check if starts with +
@@ -61,9 +76,9 @@ def validate_phone(phone: str) -> tuple[bool, list[str]]:
     if not digits.isdigit():
         validate = False
         if has_plus:
-            errors.append("Phone number must contain only digits after '+' sign.")
+            errors.append(PHONE_NOT_DIGITS_AFTER_PLUS)
         else:
-            errors.append("Phone number must contain only digits.")
+            errors.append(PHONE_NOT_DIGITS)
 
     if errors:
         return validate, errors
@@ -71,7 +86,7 @@ def validate_phone(phone: str) -> tuple[bool, list[str]]:
     # 5. Validate length
     if len(digits) < 7 or len(digits) > 15:
         validate = False
-        errors.append("Phone number must be between 7 and 15 digits long.")
+        errors.append(PHONE_LENGTH)
 
     return validate, errors
 
@@ -91,6 +106,20 @@ def normalize_email(email: str | None) -> str | None:
     return email.strip().lower()
 
 
+def email_domain(email: str | None) -> str | None:
+    """
+    Domain of an email address, normalized like ``normalize_email``
+    ("Bob@ACME.com " -> "acme.com").
+
+    :param email: Raw or normalized email address.
+    :return: The part after the last "@", or ``None`` if there is none.
+    """
+    normalized = normalize_email(email)
+    if not normalized or "@" not in normalized:
+        return None
+    return normalized.rpartition("@")[2] or None
+
+
 def validate_email(email: str | None) -> tuple[bool, str | None]:
     """
     Validate an email address using a regular expression.
@@ -103,6 +132,6 @@ def validate_email(email: str | None) -> tuple[bool, str | None]:
     if not email:
         return True, None
 
-    if not re.match(EMAIL_REGEX, email):
-        return False, "Email format is invalid (example: name@email.com)"
+    if not EMAIL_PATTERN.match(email):
+        return False, EMAIL_INVALID
     return True, None
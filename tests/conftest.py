@@ -4,7 +4,7 @@ Shared test fixtures for the Contact Book application.
 
 import gc
 import warnings
-from unittest.mock import Mock
+from unittest.mock import MagicMock, Mock
 
 import pytest
 from sqlalchemy import create_engine
@@ -20,7 +20,7 @@ warnings.filterwarnings("ignore", category=ResourceWarning)
 @pytest.fixture(scope="function")
 def mock_db_session():
     """Create a mock database session for unit tests."""
-    mock_session = Mock()
+    mock_session = MagicMock()
 
     # Mock common session methods
     mock_session.query = Mock()
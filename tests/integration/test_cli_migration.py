@@ -0,0 +1,94 @@
+"""
+Integration tests running the CLI and ``init_db`` against a database with
+the schema of the first release.
+"""
+
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# The contacts table as the first release created it
+BASELINE_SCHEMA = """
+CREATE TABLE contacts (
+    id INTEGER NOT NULL PRIMARY KEY,
+    first_name VARCHAR NOT NULL,
+    last_name VARCHAR NOT NULL,
+    email VARCHAR,
+    phone VARCHAR NOT NULL,
+    category VARCHAR,
+    created_at DATETIME,
+    updated_at DATETIME
+);
+CREATE UNIQUE INDEX ix_contacts_email ON contacts (email);
+CREATE UNIQUE INDEX ix_contacts_phone ON contacts (phone);
+CREATE INDEX ix_contacts_category ON contacts (category);
+INSERT INTO contacts (first_name, last_name, email, phone, category) VALUES
+    ('Ann', 'Lee', 'ann@acme.com', '+15550001', 'Work'),
+    ('Anne', 'Lee', NULL, '+15550002', 'Work');
+"""
+
+
+@pytest.fixture(name="baseline_db")
+def fixture_baseline_db(tmp_path):
+    """Path of a database created by the first release."""
+    path = tmp_path / "contacts.db"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(BASELINE_SCHEMA)
+    conn.close()
+    return path
+
+
+def _run(path: Path, module: str, *args: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{path}"}
+    env.pop("ASYNC_DATABASE_URL", None)
+    return subprocess.run(
+        [sys.executable, "-m", module, *args],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+        check=False,
+    )
+
+
+def _user_version(path: Path) -> int:
+    with sqlite3.connect(path) as conn:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+    conn.close()
+    return version
+
+
+def test_cli_migrates_a_baseline_database(baseline_db):
+    """Test that the CLI migrates before reading the new columns."""
+    result = _run(baseline_db, "src.CLI.main", "--changes-since", "0")
+
+    assert result.returncode == 0, result.stderr
+    changes = [
+        json.loads(line) for line in result.stdout.splitlines() if line.startswith("{")
+    ]
+    assert [change["contact"]["first_name"] for change in changes] == ["Ann", "Anne"]
+    assert _user_version(baseline_db) > 0
+
+    result = _run(baseline_db, "src.CLI.main", "--find-duplicates")
+    assert result.returncode == 0, result.stderr
+
+
+def test_init_db_migrates_a_baseline_database(baseline_db):
+    """Test that ``python -m src.init_db`` migrates an existing database."""
+    result = _run(baseline_db, "src.init_db")
+
+    assert result.returncode == 0, result.stderr
+    with sqlite3.connect(baseline_db) as conn:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(contacts)")}
+    conn.close()
+    assert {"category_id", "change_seq", "version"} <= columns
+    assert "category" not in columns
+    assert _user_version(baseline_db) > 0
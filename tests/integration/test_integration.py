@@ -194,3 +194,23 @@ class TestIntegration:
         # Test search with non-matching category
         results = search_contacts(test_db_session, query="smith", categories=["Work"])
         assert len(results) == 0
+
+    def test_search_matches_inside_names(self, test_db_session):
+        """Test that names match by folded substring, not only by prefix."""
+        add_contact(
+            test_db_session,
+            {
+                "first_name": "Christopher",
+                "last_name": "Vanderbilt",
+                "phone": "+1111111111",
+                "category": "Work",
+            },
+        )
+
+        # The CRUD search has no typo fallback to hide a miss
+        for query in ("topher", "ristoph", "derbilt", "VÄNDER", "pher vand"):
+            results = search(test_db_session, query=query, categories=[])
+            assert [c.first_name for c in results] == ["Christopher"], query
+        assert not search(test_db_session, query="topherx", categories=[])
+        structured = search_contacts(test_db_session, query="derbilt cat:Work")
+        assert [c.last_name for c in structured] == ["Vanderbilt"]
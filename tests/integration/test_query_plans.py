@@ -0,0 +1,342 @@
+"""
+Query plan regression tests for the crud and service queries.
+
+Every query is executed against a realistically sized, ANALYZE'd SQLite
+database. The emitted statements are captured and their
+``EXPLAIN QUERY PLAN`` output is checked:
+
+- no full table scan or temporary B-tree where an index is expected
+- the plan matches the golden plan stored in ``query_plans.json``
+
+After an intentional schema or query change, regenerate the golden plans::
+
+    UPDATE_QUERY_PLANS=1 pytest tests/integration/test_query_plans.py
+"""
+
+import json
+import os
+import random
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.crud import changes as change_crud
+from src.crud import contacts as contact_crud
+from src.crud.query_compiler import search_query_records
+from src.database.db import Base
+from src.database.models import Contact
+from src.services import contact_service
+from src.utils.search_query import parse_query
+
+GOLDEN_PATH = Path(__file__).with_name("query_plans.json")
+UPDATE_GOLDEN = os.getenv("UPDATE_QUERY_PLANS") == "1"
+ROW_COUNT = 20_000
+
+FIRST_NAMES = ["Alice", "Bob", "José", "Jürgen", "Li", "Maria", "Noah", "Zoë"]
+LAST_NAMES = ["Müller", "Smith", "García", "Nguyen", "Schmidt", "Doe", "Brown"]
+DOMAINS = ["example.com", "acme.com", "mail.de", "corp.io"]
+CATEGORIES = ["Family", "Friends", "Work", "Other"]
+
+NEW_CONTACT = {
+    "first_name": "Plan",
+    "last_name": "Probe",
+    "phone": "+1 555 000 0001",
+    "email": "plan.probe@example.com",
+    "category": "Work",
+}
+
+
+@dataclass(frozen=True)
+class PlanCase:
+    """
+    A query under test; ``indexed=False`` accepts a full scan.
+
+    ``golden=False`` skips the golden plan comparison for queries where
+    SQLite may pick any of several equivalent covering indexes (count(*)).
+    """
+
+    name: str
+    run: Callable[[Session], object]
+    indexed: bool = True
+    golden: bool = True
+
+
+def _add_and_delete(db: Session) -> None:
+    data = {**NEW_CONTACT, "phone": "+15550002", "email": "plan.delete@example.com"}
+    contact = contact_service.add_contact(db, data)
+    contact_service.delete_contact(db, contact.id)  # type: ignore[arg-type]
+
+
+CASES = [
+    PlanCase("crud.get_all", contact_crud.get_all),
+    PlanCase("crud.list_records", contact_crud.list_records),
+    PlanCase(
+        "crud.list_records_page",
+        lambda db: contact_crud.list_records_page(db, offset=1000, limit=50),
+    ),
+    PlanCase(
+        "crud.get_records_by_ids",
+        lambda db: contact_crud.get_records_by_ids(db, [3, 42, 4711]),
+    ),
+    PlanCase("crud.count", contact_crud.count, golden=False),
+    PlanCase("crud.data_revision", contact_crud.data_revision, golden=False),
+    PlanCase("crud.get_by_id", lambda db: contact_crud.get_by_id(db, 42)),
+    PlanCase(
+        "crud.get_by_phone", lambda db: contact_crud.get_by_phone(db, "+4915100042")
+    ),
+    PlanCase(
+        "crud.get_by_email",
+        lambda db: contact_crud.get_by_email(db, "user42@acme.com"),
+    ),
+    PlanCase(
+        "crud.search.categories",
+        lambda db: contact_crud.search(db, query="", categories=["Work"]),
+    ),
+    # Names, phones and emails by covering index scans
+    PlanCase(
+        "crud.search.query",
+        lambda db: contact_crud.search(db, query="mül", categories=[]),
+    ),
+    PlanCase(
+        "crud.search.query_categories",
+        lambda db: contact_crud.search(db, query="mül", categories=["Work"]),
+    ),
+    PlanCase(
+        "crud.search.phonetic",
+        lambda db: contact_crud.search(
+            db, query="jose smyth", categories=[], phonetic=True
+        ),
+    ),
+    PlanCase(
+        "crud.search_records.categories",
+        lambda db: contact_crud.search_records(db, query="", categories=["Work"]),
+    ),
+    PlanCase(
+        "crud.search_name_records",
+        lambda db: contact_crud.search_name_records(db, "maria smith", ["Work"]),
+    ),
+    # Incremental refresh of the typo-search name index
+    PlanCase(
+        "crud.iter_name_keys.since",
+        lambda db: list(contact_crud.iter_name_keys(db, since=10**9)),
+    ),
+    # Structured queries: every indexed predicate form is a seek, and
+    # negations only filter the rows the indexed terms found
+    PlanCase(
+        "crud.search_query.name_category",
+        lambda db: search_query_records(db, parse_query("name:mar* cat:work"), []),
+    ),
+    PlanCase(
+        "crud.search_query.first",
+        lambda db: search_query_records(db, parse_query("first:li cat:work"), []),
+    ),
+    PlanCase(
+        "crud.search_query.phone_prefix",
+        lambda db: search_query_records(db, parse_query("phone:^+4915100"), []),
+    ),
+    PlanCase(
+        "crud.search_query.email_prefix_exact",
+        lambda db: search_query_records(
+            db, parse_query("email:user4* email:user42@acme.com"), []
+        ),
+    ),
+    PlanCase(
+        "crud.search_query.negated",
+        lambda db: search_query_records(
+            db, parse_query("name:maria -cat:Other -email:@acme.com -last:smith"), []
+        ),
+    ),
+    PlanCase(
+        "crud.search_query.email_domain",
+        lambda db: search_query_records(db, parse_query("email:@acme.com"), []),
+    ),
+    # Contacts by email domain and domain counts (ix_contacts_email_domain)
+    PlanCase(
+        "crud.list_domain_records",
+        lambda db: contact_crud.list_domain_records(db, "acme.com", 1000, 50),
+    ),
+    PlanCase("crud.count_domain", lambda db: contact_crud.count_domain(db, "acme.com")),
+    PlanCase("crud.domain_counts", contact_crud.domain_counts),
+    # Contacts by category and category counts (ix_contacts_category_name_sort)
+    PlanCase(
+        "crud.list_category_records",
+        lambda db: contact_crud.list_category_records(db, 3, 1000, 50),
+    ),
+    PlanCase("crud.count_category", lambda db: contact_crud.count_category(db, 3)),
+    PlanCase("crud.category_counts", contact_crud.category_counts),
+    # Statistics: contacts created per day (ix_contacts_created_day) and
+    # equality counts of the contacts without each optional field
+    PlanCase("crud.created_per_day", contact_crud.created_per_day),
+    PlanCase("crud.missing_field_counts", contact_crud.missing_field_counts),
+    # Recently added/edited and changed since, one range of the timestamp
+    # index per page (keyset pagination)
+    PlanCase(
+        "crud.list_recent_records.created",
+        lambda db: contact_crud.list_recent_records(db, "created", 21),
+    ),
+    PlanCase(
+        "crud.list_recent_records.updated_before",
+        lambda db: contact_crud.list_recent_records(
+            db, "updated", 21, (datetime(2100, 1, 1), 4711)
+        ),
+    ),
+    PlanCase(
+        "crud.list_changed_since",
+        lambda db: contact_crud.list_changed_since(db, (datetime(2000, 1, 1), 0), 501),
+    ),
+    # Change feed: changed contacts and tombstones by their change_seq index
+    PlanCase(
+        "crud.list_changed_records",
+        lambda db: change_crud.list_changed_records(db, 19_000, 500),
+    ),
+    PlanCase("crud.list_deleted", lambda db: change_crud.list_deleted(db, 0, 500)),
+    PlanCase(
+        "service.changes_since",
+        lambda db: contact_service.changes_since(db, 19_000, 500),
+    ),
+    # Loads the whole categories table (a handful of rows) on first use
+    PlanCase("service.list_categories", contact_service.list_categories, indexed=False),
+    PlanCase("service.list_contacts", contact_service.list_contacts),
+    PlanCase("service.get_contact", lambda db: contact_service.get_contact(db, 42)),
+    PlanCase(
+        "service.search_contacts",
+        lambda db: contact_service.search_contacts(db, "smith", ["Family"]),
+    ),
+    PlanCase(
+        "service.add_contact",
+        lambda db: contact_service.add_contact(db, NEW_CONTACT),
+    ),
+    PlanCase(
+        "service.update_contact",
+        lambda db: contact_service.update_contact(db, 42, {"first_name": "Updated"}),
+    ),
+    PlanCase(
+        "service.update_contact.versioned",
+        lambda db: contact_service.update_contact(db, 43, {"first_name": "V"}, 1),
+    ),
+    PlanCase("service.add_delete_contact", _add_and_delete),
+]
+
+
+def _generate_rows(count: int) -> list[dict]:
+    """Generate deterministic, realistically distributed contact rows."""
+    rng = random.Random(42)
+    rows = []
+    for i in range(count):
+        domain = rng.choice(DOMAINS)
+        rows.append(
+            {
+                "first_name": rng.choice(FIRST_NAMES),
+                "last_name": rng.choice(LAST_NAMES),
+                "phone": f"+49151{i:05d}",
+                "email": f"user{i}@{domain}" if rng.random() < 0.8 else None,
+                "category": rng.choices(CATEGORIES, weights=[2, 4, 3, 1])[0],
+            }
+        )
+    return rows
+
+
+@pytest.fixture(scope="module")
+def plan_engine():
+    """Create an ANALYZE'd in-memory database with ``ROW_COUNT`` contacts."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+
+    with engine.begin() as conn:
+        rows = contact_crud.with_category_ids(conn, _generate_rows(ROW_COUNT))
+        conn.execute(insert(Contact), rows)
+        conn.exec_driver_sql("ANALYZE")
+
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def golden_plans():
+    """Load the golden plans, and rewrite them at the end in update mode."""
+    plans = json.loads(GOLDEN_PATH.read_text(encoding="utf-8"))
+    yield plans
+    if UPDATE_GOLDEN:
+        GOLDEN_PATH.write_text(
+            json.dumps(plans, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
+        )
+
+
+def capture_statements(engine: Engine, run: Callable[[Session], object]) -> list:
+    """Run a query function and capture the SELECT/UPDATE/DELETE it emits."""
+    captured = []
+
+    def before_execute(_conn, _cursor, statement, parameters, _context, many):
+        if not many and statement.lstrip().upper().startswith(
+            ("SELECT", "UPDATE", "DELETE")
+        ):
+            captured.append((statement, parameters))
+
+    db = sessionmaker(autoflush=False, bind=engine)()
+    event.listen(engine, "before_cursor_execute", before_execute)
+    try:
+        run(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_execute)
+        db.close()
+    return captured
+
+
+def explain(engine: Engine, statement: str, parameters) -> list[str]:
+    """Return the normalized ``EXPLAIN QUERY PLAN`` lines of a statement."""
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        # Older SQLite versions print "SCAN TABLE x" instead of "SCAN x"
+        return [row[3].replace(" TABLE ", " ") for row in rows]
+
+
+def full_scans(plan: list[str]) -> list[str]:
+    """Plan lines reading a whole table without an index."""
+    return [
+        line
+        for line in plan
+        if line.startswith("SCAN ")
+        and "USING" not in line
+        and line != "SCAN CONSTANT ROW"  # SELECT without FROM
+    ]
+
+
+def temp_btrees(plan: list[str]) -> list[str]:
+    """Plan lines that build a temporary B-tree (sorting, DISTINCT, ...)."""
+    return [line for line in plan if "TEMP B-TREE" in line]
+
+
+@pytest.mark.parametrize("case", CASES, ids=[case.name for case in CASES])
+def test_query_plan(case, plan_engine, golden_plans):
+    """Each query uses its index and keeps its golden plan."""
+    statements = capture_statements(plan_engine, case.run)
+    assert statements, f"{case.name} did not execute any query"
+
+    plans = [explain(plan_engine, stmt, params) for stmt, params in statements]
+
+    for plan in plans:
+        assert not temp_btrees(plan), f"{case.name} sorts in a temp B-tree: {plan}"
+        if case.indexed:
+            assert not full_scans(plan), f"{case.name} scans the table: {plan}"
+
+    if not case.golden:
+        golden_plans.pop(case.name, None)
+        return
+
+    if UPDATE_GOLDEN:
+        golden_plans[case.name] = plans
+        return
+
+    assert (
+        case.name in golden_plans
+    ), f"No golden plan for {case.name}; run with UPDATE_QUERY_PLANS=1"
+    assert plans == golden_plans[case.name], (
+        f"Query plan of {case.name} changed; if intended, "
+        "regenerate with UPDATE_QUERY_PLANS=1"
+    )
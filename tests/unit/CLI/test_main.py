@@ -8,9 +8,13 @@ import unittest
 from io import StringIO
 from unittest.mock import MagicMock, patch
 
+from rich.table import Table
 from sqlalchemy.orm import Session
 
 from src.CLI import main
+from src.database.models import ContactRecord
+from src.services.contact_service import Change
+from src.services.duplicate_service import MergeStrategy
 
 
 class TestMainFunctions(unittest.TestCase):
@@ -350,6 +354,233 @@ class TestMainFunctions(unittest.TestCase):
             mock_db.close.assert_called_once()
 
 
+class TestProfilingMode(unittest.TestCase):
+    """Tests for the --profile flag and per-action profiling."""
+
+    def test_parse_args_default(self):
+        """Test that profiling is off by default."""
+        args = main.parse_args([])
+
+        self.assertFalse(args.profile)
+
+    def test_parse_args_profile(self):
+        """Test the --profile and --profile-dir options."""
+        args = main.parse_args(["--profile", "--profile-dir", "out"])
+
+        self.assertTrue(args.profile)
+        self.assertEqual(args.profile_dir, "out")
+
+    @patch("src.CLI.main.main_menu")
+    @patch("src.CLI.main.SessionLocal")
+    def test_main_tracks_each_action(self, mock_session_local, mock_main_menu):
+        """Test that each menu action is recorded by the profiler."""
+        mock_session_local.return_value = MagicMock()
+        mock_main_menu.side_effect = [1, 3, 6]
+        profiler = MagicMock()
+
+        with patch.object(main, "show_contacts"), patch.object(
+            main, "search_contact"
+        ), patch.object(main.console, "print"):
+            main.main(profiler)
+
+        profiler.action.assert_any_call("List all contacts")
+        profiler.action.assert_any_call("Search contacts")
+        self.assertEqual(profiler.action.call_count, 2)
+
+
+class TestImportMode(unittest.TestCase):
+    """Tests for the --import-csv option."""
+
+    def test_parse_args_import(self):
+        """Test the --import-csv and --workers options."""
+        args = main.parse_args(["--import-csv", "contacts.csv", "--workers", "4"])
+
+        self.assertEqual(args.import_csv, "contacts.csv")
+        self.assertEqual(args.workers, 4)
+        self.assertFalse(args.bloom)
+
+    @patch("src.CLI.main.SessionLocal")
+    @patch("src.CLI.main.import_csv")
+    def test_import_file_prints_summary(self, mock_import_csv, mock_session_local):
+        """Test that the summary reports created and rejected rows by line."""
+        summary = MagicMock(created=1, total=2)
+        summary.rejected = [MagicMock(index=1, errors=["Invalid phone."])]
+        mock_import_csv.return_value = summary
+
+        with patch.object(main.console, "print") as mock_print:
+            main.import_file("contacts.csv", workers=2)
+
+        mock_import_csv.assert_called_once_with(
+            mock_session_local.return_value.__enter__.return_value,
+            "contacts.csv",
+            2,
+            False,
+        )
+        printed = " ".join(str(call.args[0]) for call in mock_print.call_args_list)
+        self.assertIn("Imported 1 of 2", printed)
+        self.assertIn("Line 3: Invalid phone.", printed)
+        self.assertNotIn("Duplicate checks", printed)
+
+    @patch("src.CLI.main.SessionLocal")
+    @patch("src.CLI.main.import_csv")
+    def test_import_file_reports_bloom_probes(self, mock_import_csv, _):
+        """Test that --bloom imports report the skipped duplicate lookups."""
+        mock_import_csv.return_value = MagicMock(
+            created=2,
+            total=2,
+            rejected=[],
+            keys_checked=4,
+            keys_probed=1,
+            probe_reduction=0.75,
+            filter_bytes=2048,
+        )
+
+        with patch.object(main.console, "print") as mock_print:
+            main.import_file("contacts.csv", bloom=True)
+
+        printed = " ".join(str(call.args[0]) for call in mock_print.call_args_list)
+        self.assertIn("1 of 4 key(s) looked up (75% skipped)", printed)
+        self.assertIn("2 KiB", printed)
+
+
+class TestDuplicatesMode(unittest.TestCase):
+    """Tests for the --find-duplicates option."""
+
+    def test_parse_args_duplicates(self):
+        """Test the --find-duplicates and --threshold options."""
+        args = main.parse_args(["--find-duplicates", "--threshold", "0.9"])
+
+        self.assertTrue(args.find_duplicates)
+        self.assertEqual(args.threshold, 0.9)
+        self.assertIsNone(args.merge)
+        args = main.parse_args(["--find-duplicates", "--merge", "most_complete"])
+        self.assertIs(args.merge, MergeStrategy.MOST_COMPLETE)
+
+    @patch("src.CLI.main.SessionLocal")
+    @patch("src.CLI.main.get_contacts")
+    @patch("src.CLI.main.find_duplicates")
+    def test_show_duplicates_prints_clusters(self, mock_find, mock_get, _):
+        """Test that each cluster is printed with its confidence."""
+        mock_find.return_value = [MagicMock(ids=(1, 2), confidence=0.97)]
+        mock_get.return_value = [
+            MagicMock(id=1, first_name="John", last_name="Doe", phone="+1", email=None),
+            MagicMock(id=2, first_name="Jon", last_name="Doe", phone="01", email=None),
+        ]
+
+        with patch.object(main.console, "print") as mock_print:
+            main.show_duplicates(0.9, workers=1)
+
+        mock_find.assert_called_once()
+        self.assertEqual(mock_find.call_args.args[1:], (0.9, 1))
+        tables = [
+            c.args[0] for c in mock_print.call_args_list if isinstance(c.args[0], Table)
+        ]
+        self.assertEqual(len(tables), 1)
+        self.assertIn("97% confidence", tables[0].title)
+        self.assertEqual(tables[0].row_count, 2)
+
+    @patch("src.CLI.main.SessionLocal")
+    @patch("src.CLI.main.Confirm")
+    @patch("src.CLI.main.merge_contacts")
+    @patch("src.CLI.main.get_contacts")
+    @patch("src.CLI.main.find_duplicates")
+    def test_show_duplicates_merges_shown_clusters(
+        self, mock_find, mock_get, mock_merge, mock_confirm, _
+    ):
+        """Test that --merge asks first and only merges the printed clusters."""
+        clusters = [
+            MagicMock(ids=(1, 2, 3), confidence=0.97),
+            MagicMock(ids=(4, 5), confidence=0.9),
+        ]
+        mock_find.return_value = clusters
+        mock_get.return_value = [
+            MagicMock(id=i, first_name="A", last_name="B", phone="+1", email=None)
+            for i in (1, 2, 3)
+        ]
+        mock_confirm.ask.return_value = True
+        mock_merge.return_value = MagicMock(survivors=[1], deleted=2, updated=1)
+
+        with patch.object(main.console, "print") as mock_print:
+            main.show_duplicates(limit=1, merge=MergeStrategy.NEWEST)
+
+        self.assertIn("deleting 2 contact(s)", mock_confirm.ask.call_args.args[0])
+        self.assertEqual(
+            mock_merge.call_args.args[1:], (clusters[:1], MergeStrategy.NEWEST)
+        )
+        self.assertIn("Merged 1 cluster(s)", mock_print.call_args.args[0])
+
+    @patch("src.CLI.main.SessionLocal")
+    @patch("src.CLI.main.Confirm")
+    @patch("src.CLI.main.merge_contacts")
+    @patch("src.CLI.main.get_contacts")
+    @patch("src.CLI.main.find_duplicates")
+    def test_show_duplicates_merge_declined(
+        self, mock_find, mock_get, mock_merge, mock_confirm, _
+    ):
+        """Test that nothing is merged when the confirmation is declined."""
+        mock_find.return_value = [MagicMock(ids=(1, 2), confidence=0.97)]
+        mock_get.return_value = [
+            MagicMock(id=i, first_name="A", last_name="B", phone="+1", email=None)
+            for i in (1, 2)
+        ]
+        mock_confirm.ask.return_value = False
+
+        with patch.object(main.console, "print") as mock_print:
+            main.show_duplicates(merge=MergeStrategy.NEWEST)
+
+        mock_confirm.ask.assert_called_once()
+        mock_merge.assert_not_called()
+        self.assertIn("Nothing merged", mock_print.call_args.args[0])
+
+    @patch("src.CLI.main.SessionLocal")
+    @patch("src.CLI.main.get_contacts", return_value=[])
+    @patch("src.CLI.main.find_duplicates", return_value=[])
+    def test_show_duplicates_none_found(self, *_):
+        """Test the message when there are no duplicates."""
+        with patch.object(main.console, "print") as mock_print:
+            main.show_duplicates()
+
+        self.assertIn("No duplicate", mock_print.call_args.args[0])
+
+
+class TestChangesMode(unittest.TestCase):
+    """Tests for the --changes-since option."""
+
+    def test_parse_args_changes(self):
+        """Test the --changes-since and --limit options."""
+        args = main.parse_args(["--changes-since", "42", "--limit", "10"])
+
+        self.assertEqual((args.changes_since, args.limit), (42, 10))
+        self.assertIsNone(main.parse_args([]).changes_since)
+
+    @patch("src.CLI.main.SessionLocal")
+    @patch("src.CLI.main.iter_changes")
+    @patch("builtins.print")
+    def test_print_changes_as_json_lines(self, mock_print, mock_iter, _):
+        """Test that each change is printed as one JSON object, up to the limit."""
+        record = ContactRecord(7, "Zoë", "Doe", "+1", None, "Work")
+        mock_iter.return_value = iter(
+            [
+                Change(43, "update", 7, record),
+                Change(44, "delete", 8, None),
+                Change(45, "insert", 9, record),
+            ]
+        )
+
+        main.print_changes(42, limit=2)
+
+        self.assertEqual(mock_iter.call_args.args[1], 42)
+        self.assertEqual(
+            [c.args[0] for c in mock_print.call_args_list],
+            [
+                '{"seq": 43, "op": "update", "contact_id": 7, "contact": {"id": 7, '
+                '"first_name": "Zoë", "last_name": "Doe", "phone": "+1", '
+                '"email": null, "category": "Work", "version": 1}}',
+                '{"seq": 44, "op": "delete", "contact_id": 8, "contact": null}',
+            ],
+        )
+
+
 class TestMainEntryPoint(unittest.TestCase):
     """Tests for the main entry point (if __name__ == "__main__")."""
 
@@ -0,0 +1,319 @@
+"""
+Unit tests for the HTTP API.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.api.app import create_app
+from src.database.db import Base
+from src.services.contact_service import EDIT_CONFLICT, PHONE_TAKEN
+from src.services.write_coordinator import WriteCoordinator
+
+CONTACTS = [
+    {
+        "first_name": "Alice",
+        "last_name": "Smith",
+        "phone": "+1000001",
+        "email": "alice@acme.com",
+        "category": "Work",
+    },
+    {"first_name": "Bob", "last_name": "Jones", "phone": "+1000002"},
+    {
+        "first_name": "Carol",
+        "last_name": "Smith",
+        "phone": "+1000003",
+        "email": "Carol@ACME.com",
+        "category": "Clients",
+    },
+]
+
+
+@pytest.fixture
+def client():
+    """API client on a fresh in-memory database with three contacts."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    app = create_app(sessionmaker(autoflush=False, bind=engine))
+
+    with TestClient(app) as test_client:
+        response = test_client.post("/contacts/batch", json={"items": CONTACTS})
+        assert response.json()["errors"] == []
+        yield test_client
+
+    engine.dispose()
+
+
+class TestReadEndpoints:
+    """Test cases for listing, search and batch get."""
+
+    def test_list_is_paginated(self, client):
+        """Test offset/limit pagination ordered by name."""
+        response = client.get("/contacts", params={"offset": 1, "limit": 1})
+
+        body = response.json()
+        assert response.status_code == 200
+        assert body["total"] == 3
+        assert [item["first_name"] for item in body["items"]] == ["Bob"]
+
+    def test_search(self, client):
+        """Test free-text search."""
+        response = client.get("/contacts/search", params={"q": "smith"})
+
+        names = {item["first_name"] for item in response.json()["items"]}
+        assert names == {"Alice", "Carol"}
+
+    def test_domains(self, client):
+        """Test domain counts and the paginated contacts of a domain."""
+        counts = client.get("/domains").json()
+        page = client.get("/domains/ACME.com/contacts", params={"limit": 1}).json()
+
+        assert counts == {"items": [{"domain": "acme.com", "count": 2}]}
+        assert page["total"] == 2
+        assert [item["first_name"] for item in page["items"]] == ["Alice"]
+
+    def test_categories(self, client):
+        """Test counts of every category and the contacts of one."""
+        counts = client.get("/categories").json()
+        page = client.get("/categories/Clients/contacts").json()
+
+        assert [(c["category"], c["count"]) for c in counts["items"]] == [
+            ("Family", 0),
+            ("Friends", 0),
+            ("Work", 1),
+            ("Other", 0),
+            ("Clients", 1),
+        ]
+        assert [item["first_name"] for item in page["items"]] == ["Carol"]
+        assert client.get("/categories/Unknown/contacts").json()["total"] == 0
+
+    def test_changes(self, client):
+        """Test the change feed after a number, chained by next_since."""
+        client.post("/contacts/batch/delete", json={"ids": [2]})
+
+        first = client.get("/changes", params={"since": 1, "limit": 1}).json()
+        rest = client.get("/changes", params={"since": first["next_since"]}).json()
+
+        # Bob, inserted at 2, only appears as deleted
+        assert [(c["seq"], c["op"], c["contact_id"]) for c in first["items"]] == [
+            (3, "insert", 3)
+        ]
+        assert first["items"][0]["contact"]["first_name"] == "Carol"
+        assert rest == {
+            "items": [{"seq": 4, "op": "delete", "contact_id": 2, "contact": None}],
+            "next_since": 4,
+        }
+
+    def test_batch_get_reports_missing(self, client):
+        """Test that batch get keeps the id order and lists unknown ids."""
+        response = client.get("/contacts/batch", params={"ids": [3, 99, 1]})
+
+        body = response.json()
+        assert [item["id"] for item in body["items"]] == [3, 1]
+        assert body["missing"] == [99]
+
+    def test_get_contact_not_found(self, client):
+        """Test that an unknown id returns 404."""
+        assert client.get("/contacts/99").status_code == 404
+
+    def test_response_is_gzipped(self, client):
+        """Test that large responses are compressed."""
+        client.post(
+            "/contacts/batch",
+            json={
+                "items": [
+                    {"first_name": f"Name{i}", "phone": f"+20000{i:02d}"}
+                    for i in range(20)
+                ]
+            },
+        )
+
+        response = client.get("/contacts", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+
+
+class TestConditionalGet:
+    """Test cases for ETags and 304 responses."""
+
+    def test_not_modified(self, client):
+        """Test that a matching If-None-Match returns an empty 304."""
+        etag = client.get("/contacts").headers["etag"]
+
+        response = client.get("/contacts", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    @pytest.mark.parametrize(
+        "write",
+        [
+            lambda c: c.post("/contacts/batch", json={"items": [CONTACTS[0]]}),
+            lambda c: c.post(
+                "/contacts/batch",
+                json={"items": [{"first_name": "Dan", "phone": "+1000004"}]},
+            ),
+            lambda c: c.patch(
+                "/contacts/batch",
+                json={"items": [{"id": 1, "changes": {"first_name": "Ann"}}]},
+            ),
+            lambda c: c.post("/contacts/batch/delete", json={"ids": [2]}),
+        ],
+        ids=["rejected_create", "create", "update", "delete"],
+    )
+    def test_etag_tracks_writes(self, client, write):
+        """Test that successful writes change the ETag and rejected ones do not."""
+        etag = client.get("/contacts").headers["etag"]
+        result = write(client).json()
+
+        response = client.get("/contacts", headers={"If-None-Match": etag})
+
+        changed = bool(result.get("items") or result.get("deleted"))
+        assert response.status_code == (200 if changed else 304)
+
+
+class TestBatchWrites:
+    """Test cases for batch create, update and delete."""
+
+    def test_batch_create_reports_item_errors(self, client):
+        """Test that invalid items are reported by index and valid ones created."""
+        response = client.post(
+            "/contacts/batch",
+            json={
+                "items": [
+                    {"first_name": "Dan", "phone": "+1000004"},
+                    {"first_name": "Eve", "phone": "+1000001"},
+                ]
+            },
+        )
+
+        body = response.json()
+        assert [item["first_name"] for item in body["items"]] == ["Dan"]
+        assert body["errors"][0]["index"] == 1
+        assert "Phone number already exists" in body["errors"][0]["errors"][0]
+
+    def test_batch_create_reports_a_key_taken_concurrently(self, client):
+        """Test that a unique key conflict missed by the check is an item error."""
+        # The phone check runs before another writer's insert commits
+        with patch("src.services.contact_service._find_by_phone", return_value=None):
+            response = client.post(
+                "/contacts/batch",
+                json={
+                    "items": [
+                        {**CONTACTS[1], "email": None},
+                        {"first_name": "Dan", "last_name": "", "phone": "+1000004"},
+                    ]
+                },
+            )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["errors"] == [{"index": 0, "errors": [PHONE_TAKEN]}]
+        assert [item["first_name"] for item in body["items"]] == ["Dan"]
+        assert client.get("/contacts").json()["total"] == 4
+
+    def test_batch_update_isolates_invalid_items(self, client):
+        """Test that a rejected update is not persisted by a later valid one."""
+        response = client.patch(
+            "/contacts/batch",
+            json={
+                "items": [
+                    {"id": 1, "changes": {"first_name": "Ann", "phone": "abc"}},
+                    {"id": 2, "changes": {"category": "Work"}},
+                ]
+            },
+        )
+
+        assert [error["index"] for error in response.json()["errors"]] == [0]
+        assert client.get("/contacts/1").json()["first_name"] == "Alice"
+        assert client.get("/contacts/2").json()["category"] == "Work"
+
+    def test_batch_update_rejects_stale_versions(self, client):
+        """Test that an update made against an old version is not applied."""
+        version = client.get("/contacts/1").json()["version"]
+        client.patch(
+            "/contacts/batch",
+            json={"items": [{"id": 1, "changes": {"last_name": "A"}}]},
+        )
+
+        response = client.patch(
+            "/contacts/batch",
+            json={
+                "items": [
+                    {"id": 1, "changes": {"first_name": "Ann"}, "version": version},
+                    {"id": 2, "changes": {"first_name": "Rob"}, "version": version},
+                ]
+            },
+        )
+
+        assert response.json()["errors"] == [{"index": 0, "errors": [EDIT_CONFLICT]}]
+        assert response.json()["items"][0]["version"] == version + 1
+        assert client.get("/contacts/1").json()["first_name"] == "Alice"
+
+    def test_batch_update_clears_fields_set_to_null(self, client):
+        """Test that an explicit null clears a field and omitted fields stay."""
+        response = client.patch(
+            "/contacts/batch",
+            json={"items": [{"id": 1, "changes": {"email": None, "category": None}}]},
+        )
+
+        item = response.json()["items"][0]
+        assert (item["email"], item["category"]) == (None, None)
+        assert item["first_name"] == "Alice"
+
+    def test_batch_update_reports_taken_phone(self, client):
+        """Test that a phone of another contact is an item error, not a 500."""
+        response = client.patch(
+            "/contacts/batch",
+            json={
+                "items": [
+                    {"id": 1, "changes": {"phone": "+1000002"}},
+                    {"id": 3, "changes": {"first_name": "Caro"}},
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.json()["errors"] == [{"index": 0, "errors": [PHONE_TAKEN]}]
+        assert [item["first_name"] for item in response.json()["items"]] == ["Caro"]
+        assert client.get("/contacts/1").json()["phone"] == "+1000001"
+
+    def test_batch_delete(self, client):
+        """Test deleting existing and unknown ids."""
+        response = client.post("/contacts/batch/delete", json={"ids": [1, 99]})
+
+        assert response.json() == {"deleted": [1], "missing": [99], "conflicts": []}
+        assert client.get("/contacts").json()["total"] == 2
+
+    def test_batch_writes_through_coordinator(self, tmp_path):
+        """Test that batch items are committed by the app's write coordinator."""
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'contacts.db'}",
+            connect_args={"check_same_thread": False},
+        )
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(autoflush=False, bind=engine)
+        coordinator = WriteCoordinator(session_factory)
+        app = create_app(session_factory, write_coordinator=coordinator)
+
+        with TestClient(app) as test_client:
+            response = test_client.post(
+                "/contacts/batch", json={"items": CONTACTS + [CONTACTS[0]]}
+            )
+            total = test_client.get("/contacts").json()["total"]
+        coordinator.close()
+        engine.dispose()
+
+        body = response.json()
+        assert [item["id"] for item in body["items"]] == [1, 2, 3]
+        assert [error["index"] for error in body["errors"]] == [3]
+        assert total == 3
+        assert coordinator.stats().writes == 4
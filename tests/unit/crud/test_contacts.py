@@ -2,21 +2,33 @@
 Unit tests for CRUD operations.
 """
 
-from unittest.mock import MagicMock, Mock
+from datetime import datetime
+from unittest.mock import MagicMock
 
-from sqlalchemy.orm import Query
+import pytest
 
 from src.crud.contacts import (
+    bulk_create,
+    category_counts,
+    count_category,
     create,
+    created_per_day,
     delete,
     get_all,
     get_by_email,
     get_by_id,
     get_by_phone,
+    iter_keys,
+    iter_records,
+    list_category_records,
+    list_records,
+    merge,
+    missing_field_counts,
     search,
+    search_records,
     update,
 )
-from src.database.models import Contact
+from src.database.models import Contact, ContactRecord
 
 
 class TestCRUDOperations:
@@ -39,42 +51,32 @@ class TestCRUDOperations:
     def test_get_all_contacts(self, mock_db_session, sample_contact):
         """Test retrieving all contacts."""
         # Arrange
-        mock_query = Mock(spec=Query)
-        mock_query.order_by.return_value = mock_query
-        mock_query.all.return_value = [sample_contact]
-        mock_db_session.query.return_value = mock_query
+        mock_db_session.scalars.return_value = iter([sample_contact])
 
         # Act
         result = get_all(mock_db_session)
 
         # Assert
-        mock_db_session.query.assert_called_once_with(Contact)
+        mock_db_session.scalars.assert_called_once()
         assert len(result) == 1
         assert result[0] == sample_contact
 
     def test_get_by_id_found(self, mock_db_session, sample_contact):
         """Test getting contact by ID when contact exists."""
         # Arrange
-        mock_query = Mock(spec=Query)
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = sample_contact
-        mock_db_session.query.return_value = mock_query
+        mock_db_session.get.return_value = sample_contact
 
         # Act
         result = get_by_id(mock_db_session, 1)
 
         # Assert
-        mock_db_session.query.assert_called_once_with(Contact)
-        mock_query.filter.assert_called_once()
+        mock_db_session.get.assert_called_once_with(Contact, 1)
         assert result == sample_contact
 
     def test_get_by_id_not_found(self, mock_db_session):
         """Test getting contact by ID when contact doesn't exist."""
         # Arrange
-        mock_query = Mock(spec=Query)
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None
-        mock_db_session.query.return_value = mock_query
+        mock_db_session.get.return_value = None
 
         # Act
         result = get_by_id(mock_db_session, 999)
@@ -85,44 +87,28 @@ class TestCRUDOperations:
     def test_get_by_phone_found(self, mock_db_session, sample_contact):
         """Test getting contact by phone number."""
         # Arrange
-        mock_query = Mock(spec=Query)
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = sample_contact
-        mock_db_session.query.return_value = mock_query
+        mock_db_session.scalars.return_value.first.return_value = sample_contact
 
         # Act
         result = get_by_phone(mock_db_session, "+1234567890")
 
         # Assert
-        mock_db_session.query.assert_called_once_with(Contact)
-        assert mock_query.filter.called
-        assert mock_query.filter.call_count == 1
         assert result == sample_contact
-
-        filter_args = mock_query.filter.call_args[0]
-        assert len(filter_args) == 1
-        print(f"Filter was called with: {filter_args[0]}")
+        _, params = mock_db_session.scalars.call_args[0]
+        assert params == {"phone": "+1234567890"}
 
     def test_get_by_email_found(self, mock_db_session, sample_contact):
         """Test getting contact by email."""
         # Arrange
-        mock_query = Mock(spec=Query)
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = sample_contact
-        mock_db_session.query.return_value = mock_query
+        mock_db_session.scalars.return_value.first.return_value = sample_contact
 
         # Act
         result = get_by_email(mock_db_session, "john.doe@example.com")
 
         # Assert
-        mock_db_session.query.assert_called_once_with(Contact)
-        assert mock_query.filter.called
-        assert mock_query.filter.call_count == 1
         assert result == sample_contact
-
-        filter_args = mock_query.filter.call_args[0]
-        assert len(filter_args) == 1
-        print(f"Filter was called with: {filter_args[0]}")
+        _, params = mock_db_session.scalars.call_args[0]
+        assert params == {"email": "john.doe@example.com"}
 
     def test_update_contact(self, mock_db_session, sample_contact):
         """Test updating a contact."""
@@ -146,59 +132,297 @@ class TestCRUDOperations:
     def test_search_with_query(self, mock_db_session, sample_contact):
         """Test search with query string."""
         # Arrange
-        mock_query = Mock(spec=Query)
-        mock_query.filter.return_value = mock_query
-        mock_query.all.return_value = [sample_contact]
-        mock_db_session.query.return_value = mock_query
+        mock_db_session.scalars.return_value = iter([sample_contact])
 
         # Act
-        result = search(mock_db_session, query="john", categories=[])
+        result = search(mock_db_session, query="Jöhn", categories=[])
 
         # Assert
-        mock_db_session.query.assert_called_once_with(Contact)
+        _, params = mock_db_session.scalars.call_args[0]
+        assert params == {
+            "pattern": "%Jöhn%",
+            "name_pattern": "%john%",
+        }
         assert len(result) == 1
 
     def test_search_with_categories(self, mock_db_session, sample_contact):
         """Test search with categories filter."""
         # Arrange
-        mock_query = Mock(spec=Query)
-        mock_query.filter.return_value = mock_query
-        mock_query.all.return_value = [sample_contact]
-        mock_db_session.query.return_value = mock_query
+        mock_db_session.scalars.return_value = iter([sample_contact])
 
         # Act
         result = search(mock_db_session, query="", categories=["Friends"])
 
         # Assert
-        mock_db_session.query.assert_called_once_with(Contact)
+        _, params = mock_db_session.scalars.call_args[0]
+        assert params == {"categories": ["Friends"]}
         assert len(result) == 1
 
     def test_search_with_both_filters(self, mock_db_session, sample_contact):
         """Test search with both query and categories."""
         # Arrange
-        mock_query = Mock(spec=Query)
-        mock_query.filter.return_value = mock_query
-        mock_query.all.return_value = [sample_contact]
-        mock_db_session.query.return_value = mock_query
+        mock_db_session.scalars.return_value = iter([sample_contact])
 
         # Act
         result = search(mock_db_session, query="doe", categories=["Friends"])
 
         # Assert
-        mock_db_session.query.assert_called_once_with(Contact)
+        _, params = mock_db_session.scalars.call_args[0]
+        assert params == {
+            "pattern": "%doe%",
+            "name_pattern": "%doe%",
+            "categories": ["Friends"],
+        }
         assert len(result) == 1
 
     def test_search_without_filters(self, mock_db_session, sample_contact):
         """Test search without any filters."""
         # Arrange
-        mock_query = Mock(spec=Query)
-        mock_query.all.return_value = [sample_contact]
-        mock_db_session.query.return_value = mock_query
+        mock_db_session.scalars.return_value = iter([sample_contact])
 
         # Act
         result = search(mock_db_session, query="", categories=[])
 
         # Assert
-        mock_db_session.query.assert_called_once_with(Contact)
-        mock_query.all.assert_called_once()
+        _, params = mock_db_session.scalars.call_args[0]
+        assert not params
         assert len(result) == 1
+
+    def test_search_reuses_statements(self, mock_db_session):
+        """Test that repeated searches of one shape use the same statement."""
+        # Act
+        search(mock_db_session, query="a", categories=["Work"])
+        search(mock_db_session, query="b", categories=["Family", "Other"])
+
+        # Assert
+        first, second = mock_db_session.scalars.call_args_list
+        assert first[0][0] is second[0][0]
+
+
+class TestRecordQueries:
+    """Test cases for the read-only record listing paths."""
+
+    @staticmethod
+    def _add(db, first_name, last_name, phone, category):
+        db.add(
+            Contact(
+                first_name=first_name,
+                last_name=last_name,
+                phone=phone,
+                category=category,
+            )
+        )
+        db.commit()
+
+    def test_list_records_ordered_by_name(self, test_db_session):
+        """Test that records are ordered case-insensitively by name."""
+        self._add(test_db_session, "bob", "Smith", "+1000001", "Work")
+        self._add(test_db_session, "Alice", "Jones", "+1000002", "Family")
+
+        result = list_records(test_db_session)
+
+        assert [r.first_name for r in result] == ["Alice", "bob"]
+        assert all(isinstance(r, ContactRecord) for r in result)
+
+    def test_records_are_not_tracked(self, test_db_session):
+        """Test that listing does not add objects to the identity map."""
+        self._add(test_db_session, "Alice", "Jones", "+1000002", "Family")
+        test_db_session.expunge_all()
+
+        list_records(test_db_session)
+
+        assert len(test_db_session.identity_map) == 0
+
+    def test_record_is_slotted_and_immutable(self):
+        """Test that records have no per-instance dict."""
+        record = ContactRecord(1, "A", "B", "+1000001", None, None)
+
+        assert not hasattr(record, "__dict__")
+
+    def test_search_records(self, test_db_session):
+        """Test that search_records applies query and category filters."""
+        self._add(test_db_session, "Alice", "Smith", "+1000001", "Work")
+        self._add(test_db_session, "David", "Smith", "+1000002", "Family")
+        self._add(test_db_session, "Bob", "Jones", "+1000003", "Work")
+
+        assert len(search_records(test_db_session, "smith", [])) == 2
+        assert len(search_records(test_db_session, "", ["Work"])) == 2
+        result = search_records(test_db_session, "smith", ["Work"])
+        assert [r.first_name for r in result] == ["Alice"]
+
+    @pytest.mark.parametrize(
+        "query,expected",
+        [
+            ("müller", ["Jürgen"]),
+            ("MULLER", ["Jürgen"]),
+            ("jose", ["José"]),
+            ("garcia jo", ["José"]),
+            ("josé garcía", ["José"]),
+            ("ose", ["José"]),
+            ("rcía jo", ["José"]),
+            ("xose", []),
+            ("+4915", ["José", "Jürgen"]),
+            ("5550", ["Ann", "Jürgen"]),
+            ("MAIL.DE", ["José"]),
+        ],
+    )
+    def test_search_folds_names_only(self, test_db_session, query, expected):
+        """Test accent-/case-insensitive name and phone/email substrings."""
+        self._add(test_db_session, "José", "García", "+491510001", None)
+        self._add(test_db_session, "Jürgen", "Müller", "+491555501", None)
+        self._add(test_db_session, "Ann", "Lee", "+15550001", None)
+        test_db_session.get(Contact, 1).email = "jg@mail.de"
+        test_db_session.commit()
+
+        result = search_records(test_db_session, query, [])
+
+        assert sorted(r.first_name for r in result) == expected
+
+    @pytest.mark.parametrize(
+        "query,expected",
+        [
+            ("Smyth", ["Ann", "Catherine"]),
+            ("schmitt", ["Ann", "Catherine"]),
+            ("katrin smyth", ["Catherine"]),
+            ("Jonas", ["Lee"]),
+            ("5550001", []),
+        ],
+    )
+    def test_phonetic_search(self, test_db_session, query, expected):
+        """Test that every query word must sound like the first or last name."""
+        self._add(test_db_session, "Ann", "Schmidt", "+15550001", None)
+        self._add(test_db_session, "Bob", "Smith", "+15550002", None)
+        self._add(test_db_session, "Lee", "Jones", "+15550003", None)
+        # The codes follow name changes
+        test_db_session.get(Contact, 2).first_name = "Catherine"
+        test_db_session.commit()
+
+        result = search_records(test_db_session, query, [], phonetic=True)
+
+        assert sorted(r.first_name for r in result) == expected
+
+    def test_search_keys_follow_name_changes(self, test_db_session):
+        """Test that ORM updates and merges keep the search keys current."""
+        self._add(test_db_session, "Ann", "Lee", "+15550001", None)
+        self._add(test_db_session, "Bob", "Ray", "+15550002", None)
+
+        test_db_session.get(Contact, 1).last_name = "Ødegård"
+        test_db_session.commit()
+        merge(test_db_session, [2], [])
+        merge(
+            test_db_session,
+            [],
+            [{"contact_id": 1, "first_name": "Åsa", "last_name": "Ødegård"}],
+        )
+
+        contact = test_db_session.get(Contact, 1)
+        test_db_session.refresh(contact)
+        assert (contact.search_key, contact.search_key_reversed) == (
+            "asa ødegard",
+            "ødegard asa",
+        )
+        assert [r.id for r in search_records(test_db_session, "odegard", [])] == []
+        assert [r.id for r in search_records(test_db_session, "ødeg", [])] == [1]
+
+    def test_email_domain_follows_email_changes(self, test_db_session):
+        """Test that inserts, ORM updates and merges keep email_domain current."""
+        self._add(test_db_session, "Ann", "Lee", "+15550001", None)
+        self._add(test_db_session, "Bob", "Ray", "+15550002", None)
+        first, second = test_db_session.get(Contact, 1), test_db_session.get(Contact, 2)
+        assert first.email_domain is None
+
+        first.email = "ann@acme.com"
+        test_db_session.commit()
+        merge(test_db_session, [], [{"contact_id": 2, "email": "bob@mail.de"}])
+        test_db_session.refresh(second)
+
+        assert (first.email_domain, second.email_domain) == ("acme.com", "mail.de")
+
+    def test_created_per_day_and_missing_fields(self, test_db_session):
+        """Test the day counts and the counts of contacts without a field."""
+        bulk_create(
+            test_db_session,
+            [
+                {
+                    "first_name": first,
+                    "last_name": last,
+                    "phone": f"+{i}",
+                    "email": email,
+                    "category": category,
+                    "created_at": datetime(2024, 5, day, hour),
+                }
+                for i, (first, last, email, category, day, hour) in enumerate(
+                    [
+                        ("Ann", "", "ann@acme.com", "Work", 17, 9),
+                        ("", "Ray", None, None, 17, 23),
+                        ("Cy", "Orr", None, "Work", 2, 0),
+                    ]
+                )
+            ],
+        )
+
+        assert created_per_day(test_db_session) == [
+            ("2024-05-02", 1),
+            ("2024-05-17", 2),
+        ]
+        assert missing_field_counts(test_db_session) == {
+            "email": 2,
+            "first_name": 1,
+            "last_name": 1,
+            "category": 1,
+        }
+
+    def test_core_writes_store_category_ids(self, test_db_session):
+        """Test that bulk inserts and merges translate category names."""
+        bulk_create(
+            test_db_session,
+            [
+                {
+                    "first_name": "Ann",
+                    "last_name": "Lee",
+                    "phone": "+1",
+                    "category": "Work",
+                },
+                {
+                    "first_name": "bob",
+                    "last_name": "Ray",
+                    "phone": "+2",
+                    "category": "Work",
+                },
+                {
+                    "first_name": "Cy",
+                    "last_name": "Orr",
+                    "phone": "+3",
+                    "category": None,
+                },
+            ],
+        )
+        merge(test_db_session, [], [{"contact_id": 3, "category": "Clients"}])
+        work, clients = 3, 5
+
+        page = list_category_records(test_db_session, work, offset=1, limit=5)
+
+        assert [r.first_name for r in page] == ["bob"]
+        assert page[0].category == "Work"
+        assert count_category(test_db_session, work) == 2
+        assert sorted(category_counts(test_db_session)) == [(work, 2), (clients, 1)]
+        assert [
+            r.first_name for r in search_records(test_db_session, "", ["Clients"])
+        ] == ["Cy"]
+
+    def test_iter_records_and_keys_in_batches(self, test_db_session):
+        """Test that the full-table scans stream in batches of batch_size."""
+        for i in range(5):
+            self._add(test_db_session, f"N{i}", "X", f"+100000{i}", None)
+        test_db_session.get(Contact, 1).email = "n0@example.com"
+        test_db_session.commit()
+
+        batches = list(iter_records(test_db_session, batch_size=2))
+        keys = list(iter_keys(test_db_session, batch_size=2))
+
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert sorted(r.phone for batch in batches for r in batch) == [
+            f"+100000{i}" for i in range(5)
+        ]
+        assert [len(phones) for phones, _ in keys] == [2, 2, 1]
+        assert [email for _, emails in keys for email in emails] == ["n0@example.com"]
@@ -0,0 +1,85 @@
+"""
+Unit tests for the structured search query compiler.
+"""
+
+import pytest
+
+from src.crud.query_compiler import compile_query, search_query_records
+from src.database.models import Contact
+from src.utils.search_query import parse_query
+
+
+@pytest.fixture
+def contacts(test_db_session):
+    """Four contacts covering names, emails, phones and categories."""
+    for first, last, phone, email, category in [
+        ("José", "García", "+491510001", "jose@acme.com", "Work"),
+        ("Joan", "Lee", "+15550002", "joan@mail.de", "Family"),
+        ("Ann", "Jones", "+491550003", None, "Other"),
+        ("Bob", "Joyce", "+15550004", "bob@acme.com", None),
+    ]:
+        test_db_session.add(
+            Contact(
+                first_name=first,
+                last_name=last,
+                phone=phone,
+                email=email,
+                category=category,
+            )
+        )
+    test_db_session.commit()
+    return test_db_session
+
+
+class TestSearchQueryRecords:
+    """Test cases for searches with parsed queries."""
+
+    @pytest.mark.parametrize(
+        "query,expected",
+        [
+            ("name:jo*", ["Ann", "Bob", "Joan", "José"]),
+            ("first:jo", ["Joan", "José"]),
+            ("last:JO", ["Ann", "Bob"]),
+            ("cat:work", ["José"]),
+            ("-cat:Other -cat:Work", ["Bob", "Joan"]),
+            ("email:@acme.com", ["Bob", "José"]),
+            ("-email:@acme.com", ["Ann", "Joan"]),
+            ("email:JOAN@mail.de", ["Joan"]),
+            ("email:^jo", ["Joan", "José"]),
+            ("phone:^+49", ["Ann", "José"]),
+            ("phone:555", ["Bob", "Joan"]),
+            ("name:jo* cat:Work email:@acme.com phone:^+49 -cat:Other", ["José"]),
+            ("name:jo -joyce", ["Ann", "Joan", "José"]),
+            ("garcia name:jo", ["José"]),
+        ],
+    )
+    def test_predicates(self, contacts, query, expected):
+        """Test every predicate form, alone and combined."""
+        result = search_query_records(contacts, parse_query(query), [])
+
+        assert sorted(r.first_name for r in result) == expected
+
+    def test_categories_argument_is_combined(self, contacts):
+        """Test that the categories filter joins the cat: terms."""
+        result = search_query_records(contacts, parse_query("name:jo"), ["Family"])
+
+        assert [r.first_name for r in result] == ["Joan"]
+
+
+class TestCompileQuery:
+    """Test cases for the compiled statements."""
+
+    def test_reports_unindexed_terms(self):
+        """Test that only scans and negations are reported as unindexed."""
+        query = parse_query("name:jo* cat:Work email:@acme.com phone:555 -cat:Other")
+
+        compiled = compile_query(query, [])
+
+        assert compiled.unindexed == ["phone:555", "-cat:Other"]
+
+    def test_names_use_ranges(self):
+        """Test that name terms compile to ranges, not LIKE patterns."""
+        sql = str(compile_query(parse_query("name:jo last:lee"), []).statement)
+
+        assert "LIKE" not in sql
+        assert "search_key_reversed >=" in sql
@@ -2,6 +2,7 @@
 Unit tests for database connection module.
 """
 
+import asyncio
 import gc
 import sqlite3
 import warnings
@@ -59,6 +60,18 @@ class TestDatabaseModuleSimple:
             assert engine_url == config_url
             print(f"✓ Engine URL matches config: {engine_url}")
 
+    def test_async_get_db(self):
+        """Test that the async session can query and the engine is disposed."""
+
+        async def query():
+            async with db.async_get_db() as session:
+                value = (await session.execute(text("SELECT 1"))).scalar()
+            await db.dispose_async_engine()
+            return value
+
+        assert asyncio.run(query()) == 1
+        assert db.get_async_engine().url.drivername == "sqlite+aiosqlite"
+
 
 def test_engine_connect_args():
     """Test SQLite connection arguments with proper cleanup."""
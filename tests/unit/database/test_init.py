@@ -0,0 +1,32 @@
+"""
+Tests for the database initialization module.
+"""
+
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, text
+
+from src.database.init import ensure_database_initialized
+
+
+def test_initialization_is_repeatable(tmp_path):
+    """
+    Test that initializing an existing database again does not fail and
+    creates indexes that are missing from it.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'contacts.db'}")
+
+    with patch("src.database.init.engine", engine):
+        ensure_database_initialized()
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX ix_contacts_name_sort"))
+
+        ensure_database_initialized()
+        ensure_database_initialized()
+
+    with engine.connect() as conn:
+        names = conn.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index'")
+        ).scalars()
+        assert "ix_contacts_name_sort" in set(names)
+    engine.dispose()
@@ -0,0 +1,283 @@
+"""
+Tests for the schema migrations.
+"""
+
+from datetime import datetime
+from unittest.mock import patch
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    insert,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.orm import Session
+
+from src.database.db import Base
+from src.database.init import ensure_database_initialized
+from src.database.migrations import (
+    MIGRATIONS,
+    backfill_category_ids,
+    backfill_email_domains,
+    backfill_name_keys,
+    get_version,
+    migrate,
+)
+from src.database.models import (
+    DEFAULT_CATEGORIES,
+    NAME_KEY_COLUMNS,
+    Contact,
+    ContactTombstone,
+)
+
+
+def _old_database(tmp_path):
+    """A database as created before the derived columns and categories existed."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'contacts.db'}")
+    legacy = MetaData()
+    contacts = Table(
+        "contacts",
+        legacy,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("first_name", String, index=True, nullable=False),
+        Column("last_name", String, index=True, nullable=False),
+        Column("email", String, unique=True, index=True, nullable=True),
+        Column("phone", String, unique=True, index=True, nullable=False),
+        Column("category", String, index=True, nullable=True),
+        Column("created_at", DateTime),
+        Column("updated_at", DateTime, index=True),
+    )
+    legacy.create_all(bind=engine)
+    stamp = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(contacts),
+            [
+                {
+                    "first_name": "José",
+                    "last_name": "García",
+                    "phone": "+15550001",
+                    "email": "jose@acme.com",
+                    "category": "Clients",
+                    "updated_at": stamp,
+                },
+                {
+                    "first_name": "Ann",
+                    "last_name": "",
+                    "phone": "+15550002",
+                    "email": None,
+                    "category": "Work",
+                    "updated_at": stamp,
+                },
+                {
+                    "first_name": "Bob",
+                    "last_name": "Ray",
+                    "phone": "+15550003",
+                    "email": None,
+                    "category": None,
+                    "updated_at": stamp,
+                },
+            ],
+        )
+    return engine
+
+
+def test_old_database_is_migrated(tmp_path):
+    """Test that missing columns are added, backfilled and indexed."""
+    # Arrange
+    engine = _old_database(tmp_path)
+
+    # Act
+    with patch("src.database.init.engine", engine):
+        ensure_database_initialized()
+
+    # Assert
+    with engine.connect() as conn:
+        rows = conn.execute(
+            select(
+                Contact.search_key,
+                Contact.last_name_phonetic,
+                Contact.last_name_phonetic_alt,
+                Contact.email_domain,
+                Contact.category,
+                Contact.updated_at,
+            ).order_by(Contact.id)
+        ).all()
+        indexes = set(
+            conn.execute(
+                text("SELECT name FROM sqlite_master WHERE type = 'index'")
+            ).scalars()
+        )
+        columns = {column["name"] for column in inspect(conn).get_columns("contacts")}
+        categories = conn.execute(text("SELECT name FROM categories")).scalars()
+        assert list(categories) == [*DEFAULT_CATEGORIES, "Clients"]
+        assert get_version(conn) == len(MIGRATIONS)
+    assert [row[:5] for row in rows] == [
+        ("jose garcia", "KRS", "KRX", "acme.com", "Clients"),
+        ("ann", "", "", None, "Work"),
+        ("bob ray", "R", "R", None, None),
+    ]
+    assert {row[5] for row in rows} == {datetime(2024, 1, 1)}
+    assert "category" not in columns
+    assert {
+        f"ix_contacts_{column}"
+        for column in (*NAME_KEY_COLUMNS, "email_domain", "category_name_sort")
+    } <= indexes
+    assert "ix_contacts_category" not in indexes
+    engine.dispose()
+
+
+def test_migrated_database_continues_the_change_feed(tmp_path):
+    """Test that existing contacts are numbered by id and writes continue."""
+    # Arrange
+    engine = _old_database(tmp_path)
+    with patch("src.database.init.engine", engine):
+        ensure_database_initialized()
+
+    # Act
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE contacts SET first_name = 'Ann' WHERE id = 1"))
+        conn.execute(text("DELETE FROM contacts WHERE id = 2"))
+
+    # Assert
+    with engine.connect() as conn:
+        seqs = conn.execute(
+            select(Contact.id, Contact.created_seq, Contact.change_seq).order_by(
+                Contact.id
+            )
+        ).all()
+        tombstones = conn.execute(select(ContactTombstone.__table__)).all()
+    assert seqs == [(1, 1, 4), (3, 3, 3)]
+    assert tombstones == [(2, 5)]
+    engine.dispose()
+
+
+def test_migrated_contacts_start_at_version_one(tmp_path):
+    """Test that existing contacts get version 1 and updates increment it."""
+    # Arrange
+    engine = _old_database(tmp_path)
+    with patch("src.database.init.engine", engine):
+        ensure_database_initialized()
+
+    # Act
+    with Session(engine) as db:
+        db.get(Contact, 1).first_name = "Ann"
+        db.commit()
+
+    # Assert
+    with engine.connect() as conn:
+        versions = conn.execute(select(Contact.version).order_by(Contact.id)).scalars()
+        assert list(versions) == [2, 1, 1]
+    engine.dispose()
+
+
+def test_new_database_is_stamped(tmp_path):
+    """Test that a database created from the models needs no migration."""
+    # Arrange
+    engine = create_engine(f"sqlite:///{tmp_path / 'contacts.db'}")
+
+    # Act
+    with patch("src.database.init.engine", engine):
+        ensure_database_initialized()
+
+    # Assert
+    assert not migrate(engine)
+    engine.dispose()
+
+
+def test_backfill_in_batches(tmp_path):
+    """Test that the backfill walks the table in batches of batch_size."""
+    # Arrange
+    engine = create_engine(f"sqlite:///{tmp_path / 'contacts.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Contact),
+            [
+                {"first_name": f"N{i}", "last_name": "", "phone": f"+1{i}"}
+                for i in range(5)
+            ],
+        )
+        conn.execute(text("UPDATE contacts SET search_key = ''"))
+    # Act
+    updated = backfill_name_keys(engine, ("search_key",), batch_size=2)
+
+    # Assert
+    with engine.connect() as conn:
+        keys = conn.execute(select(Contact.search_key)).scalars().all()
+    assert updated == 5
+    assert sorted(keys) == [f"n{i}" for i in range(5)]
+    engine.dispose()
+
+
+def test_backfill_email_domains_in_batches(tmp_path):
+    """Test that contacts without an email keep a NULL domain."""
+    # Arrange
+    engine = create_engine(f"sqlite:///{tmp_path / 'contacts.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Contact),
+            [
+                {
+                    "first_name": f"N{i}",
+                    "last_name": "",
+                    "phone": f"+1{i}",
+                    "email": f"n{i}@Corp{i % 2}.io" if i != 3 else None,
+                }
+                for i in range(5)
+            ],
+        )
+        conn.execute(text("UPDATE contacts SET email_domain = NULL"))
+
+    # Act
+    scanned = backfill_email_domains(engine, batch_size=2)
+
+    # Assert
+    with engine.connect() as conn:
+        domains = conn.execute(
+            select(Contact.email_domain).order_by(Contact.id)
+        ).scalars()
+        assert list(domains) == ["corp0.io", "corp1.io", "corp0.io", None, "corp0.io"]
+    assert scanned == 5
+    engine.dispose()
+
+
+def test_backfill_category_ids_in_batches(tmp_path):
+    """Test that every contact gets the id of its category name."""
+    # Arrange
+    engine = create_engine(f"sqlite:///{tmp_path / 'contacts.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Contact),
+            [
+                {"first_name": f"N{i}", "last_name": "", "phone": f"+1{i}"}
+                for i in range(5)
+            ],
+        )
+        conn.execute(text("ALTER TABLE contacts ADD COLUMN category VARCHAR"))
+        conn.execute(text("UPDATE contacts SET category = 'Work' WHERE id % 2 = 1"))
+
+    # Act
+    scanned = backfill_category_ids(engine, batch_size=2)
+
+    # Assert
+    with engine.connect() as conn:
+        rows = conn.execute(select(Contact.id, Contact.category).order_by(Contact.id))
+        assert [category for _, category in rows] == [
+            "Work",
+            None,
+            "Work",
+            None,
+            "Work",
+        ]
+    assert scanned == 5
+    engine.dispose()
@@ -2,7 +2,16 @@
 Unit tests for database models.
 """
 
-from src.database.models import Contact
+from sqlalchemy import select
+
+from src.database.models import (
+    DEFAULT_CATEGORIES,
+    Category,
+    ChangeSequence,
+    Contact,
+    ContactTombstone,
+    category_ids,
+)
 
 
 class TestContactModel:
@@ -73,3 +82,74 @@ class TestContactModel:
         # Act & Assert
         assert "John" in str(contact)
         assert "Doe" in str(contact)
+
+
+class TestCategories:
+    """Test cases for the categories lookup table."""
+
+    def test_new_database_has_default_categories(self, test_db_session):
+        """Test that creating the tables inserts the default categories."""
+        names = test_db_session.scalars(select(Category.name).order_by(Category.id))
+
+        assert tuple(names) == DEFAULT_CATEGORIES
+
+    def test_category_name_is_stored_as_id(self, test_db_session):
+        """Test that assigning a name sets category_id, adding new names."""
+        contact = Contact(first_name="A", last_name="B", phone="+1", category="Work")
+        test_db_session.add(contact)
+        test_db_session.commit()
+        work_id = contact.category_id
+
+        contact.category = "Clients"
+        test_db_session.commit()
+
+        assert contact.category == "Clients"
+        assert contact.category_id == len(DEFAULT_CATEGORIES) + 1
+        assert work_id == DEFAULT_CATEGORIES.index("Work") + 1
+
+        contact.category = None
+        test_db_session.commit()
+        assert contact.category_id is None
+
+    def test_category_ids_adds_missing_names(self, test_db_session):
+        """Test that category_ids skips empty names and adds new ones once."""
+        first = category_ids(test_db_session, ["Work", "Clients", "", None])
+        second = category_ids(test_db_session, ["Clients"])
+
+        assert first == {"Work": 3, "Clients": 5}
+        assert second == {"Clients": 5}
+
+
+class TestChangeFeedTriggers:
+    """Test cases for the sequence numbers given out by the triggers."""
+
+    def test_writes_take_increasing_numbers(self, test_db_session):
+        """Test that inserts, updates and deletes each take the next number."""
+        ann = Contact(first_name="Ann", last_name="", phone="+1")
+        bob = Contact(first_name="Bob", last_name="", phone="+2")
+        test_db_session.add_all([ann, bob])
+        test_db_session.commit()
+        ann.first_name = "Anna"
+        test_db_session.commit()
+        test_db_session.delete(bob)
+        test_db_session.commit()
+
+        test_db_session.expire(ann)
+        assert (ann.created_seq, ann.change_seq) == (1, 3)
+        assert test_db_session.scalar(select(ChangeSequence.seq)) == 4
+        tombstone = test_db_session.get(ContactTombstone, 2)
+        assert tombstone.change_seq == 4
+
+    def test_reinserted_id_is_no_longer_deleted(self, test_db_session):
+        """Test that reusing the id of a deleted contact drops its tombstone."""
+        contact = Contact(first_name="Ann", last_name="", phone="+1")
+        test_db_session.add(contact)
+        test_db_session.commit()
+        test_db_session.delete(contact)
+        test_db_session.commit()
+
+        test_db_session.add(Contact(id=1, first_name="Bob", last_name="", phone="+2"))
+        test_db_session.commit()
+
+        assert test_db_session.get(ContactTombstone, 1) is None
+        assert test_db_session.scalar(select(Contact.change_seq)) == 3
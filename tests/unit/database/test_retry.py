@@ -0,0 +1,214 @@
+"""
+Unit tests for the lock retry policy.
+"""
+
+import asyncio
+import sqlite3
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from src.database import retry
+from src.database.db import Base
+from src.database.models import Contact
+from src.database.retry import (
+    RetryPolicy,
+    is_lock_error,
+    reset_retry_stats,
+    retry_on_lock,
+    retry_stats,
+    set_retry_policy,
+)
+from src.services import contact_service
+
+
+def lock_error() -> OperationalError:
+    """Build the error SQLAlchemy raises for a locked database."""
+    return OperationalError(
+        "INSERT", {}, sqlite3.OperationalError("database is locked")
+    )
+
+
+class Flaky:
+    """Callable that fails with a lock error a given number of times."""
+
+    def __init__(self, failures: int, error: Exception | None = None):
+        self.failures = failures
+        self.error = error or lock_error()
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return "done"
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    """Skip the backoff sleeps and start every test with fresh counters."""
+    sleeps: list[float] = []
+    monkeypatch.setattr(retry.time, "sleep", sleeps.append)
+    reset_retry_stats()
+    yield sleeps
+    set_retry_policy(RetryPolicy())
+
+
+class TestRetryPolicy:
+    """Test cases for RetryPolicy."""
+
+    def test_is_lock_error(self):
+        """Test that only SQLite lock errors are retried."""
+        assert is_lock_error(lock_error())
+        assert not is_lock_error(
+            OperationalError("SELECT", {}, sqlite3.OperationalError("no such table"))
+        )
+        assert not is_lock_error(ValueError("database is locked"))
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Test that delays stay within the exponential cap."""
+        policy = RetryPolicy(base_delay=0.1, max_delay=0.5)
+
+        delays = [policy.backoff(retry) for retry in range(6) for _ in range(50)]
+
+        assert all(0 <= delay <= 0.5 for delay in delays)
+        assert max(policy.backoff(0) for _ in range(50)) <= 0.1
+        assert len(set(delays)) > 1
+
+    def test_retries_until_success(self, no_sleep):
+        """Test that a call failing twice succeeds on the third attempt."""
+        # Arrange
+        flaky = Flaky(failures=2)
+        on_retry = MagicMock()
+
+        # Act
+        result = RetryPolicy(max_attempts=5).run(flaky, on_retry=on_retry)
+
+        # Assert
+        assert result == "done"
+        assert flaky.calls == 3
+        assert on_retry.call_count == len(no_sleep) == 2
+        stats = retry_stats()
+        assert (stats.calls, stats.retries, stats.failures) == (1, 2, 0)
+        assert stats.wait_seconds == pytest.approx(sum(no_sleep))
+
+    def test_gives_up_after_max_attempts(self):
+        """Test that the lock error is raised once the attempts are used up."""
+        flaky = Flaky(failures=10)
+
+        with pytest.raises(OperationalError):
+            RetryPolicy(max_attempts=3).run(flaky)
+
+        assert flaky.calls == 3
+        assert retry_stats().failures == 1
+
+    def test_gives_up_at_deadline(self):
+        """Test that no retry is scheduled past the deadline."""
+        flaky = Flaky(failures=10)
+
+        with pytest.raises(OperationalError):
+            RetryPolicy(max_attempts=10, base_delay=1, deadline=0).run(flaky)
+
+        assert flaky.calls == 1
+
+    def test_other_errors_are_not_retried(self):
+        """Test that non-lock errors propagate immediately."""
+        flaky = Flaky(
+            failures=1,
+            error=OperationalError("X", {}, sqlite3.OperationalError("disk I/O")),
+        )
+
+        with pytest.raises(OperationalError):
+            RetryPolicy().run(flaky)
+
+        assert flaky.calls == 1
+        assert retry_stats().retries == 0
+
+    def test_run_async(self, monkeypatch):
+        """Test that the async variant retries and awaits on_retry."""
+
+        async def no_async_sleep(_delay):
+            return None
+
+        monkeypatch.setattr(retry.asyncio, "sleep", no_async_sleep)
+        flaky = Flaky(failures=1)
+        rollbacks = []
+
+        async def call():
+            return flaky()
+
+        async def rollback():
+            rollbacks.append(1)
+
+        result = asyncio.run(RetryPolicy().run_async(call, on_retry=rollback))
+
+        assert result == "done"
+        assert rollbacks == [1]
+
+
+class TestRetryOnLock:
+    """Test cases for the retry_on_lock decorator."""
+
+    def test_rolls_back_between_attempts(self, mock_db_session):
+        """Test that the session is rolled back before the call is repeated."""
+        # Arrange
+        flaky = Flaky(failures=1)
+        write = retry_on_lock(lambda db: flaky())
+
+        # Act
+        result = write(mock_db_session)
+
+        # Assert
+        assert result == "done"
+        mock_db_session.rollback.assert_called_once()
+
+    def test_group_commit_sessions_are_not_retried(self, mock_db_session):
+        """Test that a write inside a group-commit batch fails immediately."""
+        mock_db_session.info = {"defer_commit": True}
+        flaky = Flaky(failures=1)
+
+        with pytest.raises(OperationalError):
+            retry_on_lock(lambda db: flaky())(mock_db_session)
+
+        mock_db_session.rollback.assert_not_called()
+
+    def test_service_write_waits_for_locked_database(self, tmp_path, monkeypatch):
+        """Test that add_contact succeeds once another writer releases the lock."""
+        # Arrange
+        url = f"sqlite:///{tmp_path / 'contacts.db'}"
+        holder = create_engine(url)
+        Base.metadata.create_all(bind=holder)
+        # No busy timeout: every locked statement fails at once
+        engine = create_engine(
+            url, connect_args={"check_same_thread": False, "timeout": 0}
+        )
+        set_retry_policy(RetryPolicy(max_attempts=50, base_delay=0.01))
+
+        with holder.connect() as conn:
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+            attempts = []
+
+            def release_after_two(_delay):
+                attempts.append(1)
+                if len(attempts) == 2:
+                    conn.rollback()
+
+            monkeypatch.setattr(retry.time, "sleep", release_after_two)
+
+            # Act
+            with sessionmaker(bind=engine)() as db:
+                contact = contact_service.add_contact(
+                    db, {"first_name": "Ann", "last_name": "Lee", "phone": "+15550001"}
+                )
+
+        # Assert
+        assert len(attempts) == 2
+        assert contact.id == 1
+        assert retry_stats().retries == 2
+        with sessionmaker(bind=engine)() as db:
+            assert db.scalar(select(func.count()).select_from(Contact)) == 1
+        engine.dispose()
+        holder.dispose()
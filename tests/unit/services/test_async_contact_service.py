@@ -0,0 +1,163 @@
+"""
+Unit tests for the async contact service and async CRUD functions.
+
+Each test runs its scenario on a fresh in-memory aiosqlite database
+inside its own event loop.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.database.db import Base
+from src.database.models import ContactRecord
+from src.services import async_contact_service as service
+from src.services.contact_service import ContactConflictError, ContactServiceError
+
+
+def run(scenario: Callable[[AsyncSession], Awaitable[object]]) -> object:
+    """Run a scenario against a fresh in-memory async database."""
+
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_local = async_sessionmaker(
+            autoflush=False, expire_on_commit=False, bind=engine
+        )
+        try:
+            async with session_local() as db:
+                return await scenario(db)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+class TestAsyncContactService:
+    """Test cases for the async service functions."""
+
+    def test_add_and_get_contact(self, sample_contact_data):
+        """Test adding a contact and reading it back."""
+
+        async def scenario(db):
+            contact = await service.add_contact(db, sample_contact_data)
+            return contact, await service.get_contact(db, contact.id)
+
+        contact, record = run(scenario)
+
+        assert record == ContactRecord.from_contact(contact)
+        assert record.email == "john.doe@example.com"
+
+    def test_get_contact_not_found(self):
+        """Test that a missing contact raises ContactServiceError."""
+        with pytest.raises(ContactServiceError) as exc_info:
+            run(lambda db: service.get_contact(db, 999))
+
+        assert "Contact not found" in exc_info.value.errors[0]
+
+    def test_add_contact_duplicates(self, sample_contact_data):
+        """Test that duplicate phone and email are rejected like the sync service."""
+
+        async def scenario(db):
+            await service.add_contact(db, sample_contact_data)
+            await service.add_contact(db, sample_contact_data)
+
+        with pytest.raises(ContactServiceError) as exc_info:
+            run(scenario)
+
+        assert exc_info.value.errors == [
+            "📞 Phone number already exists.",
+            "📧 Email already exists.",
+        ]
+
+    def test_update_contact(self, sample_contact_data):
+        """Test updating a contact."""
+
+        async def scenario(db):
+            contact = await service.add_contact(db, sample_contact_data)
+            await service.update_contact(db, contact.id, {"first_name": "Jane"})
+            return await service.get_contact(db, contact.id)
+
+        assert run(scenario).first_name == "Jane"
+
+    def test_update_contact_invalid_keeps_values(self, sample_contact_data):
+        """Test that a rejected update leaves the contact unchanged."""
+
+        async def scenario(db):
+            contact = await service.add_contact(db, sample_contact_data)
+            with pytest.raises(ContactServiceError):
+                await service.update_contact(
+                    db, contact.id, {"first_name": "Jane", "phone": "abc"}
+                )
+            return await service.get_contact(db, contact.id)
+
+        assert run(scenario).first_name == "John"
+
+    def test_update_contact_against_old_version(self, sample_contact_data):
+        """Test that an update made against an old version conflicts."""
+
+        async def scenario(db):
+            contact_id = (await service.add_contact(db, sample_contact_data)).id
+            await service.update_contact(db, contact_id, {"first_name": "Jane"}, 1)
+            with pytest.raises(ContactConflictError):
+                await service.update_contact(db, contact_id, {"first_name": "Joe"}, 1)
+            return await service.get_contact(db, contact_id)
+
+        record = run(scenario)
+
+        assert (record.first_name, record.version) == ("Jane", 2)
+
+    def test_delete_contact(self, sample_contact_data):
+        """Test deleting a contact."""
+
+        async def scenario(db):
+            contact = await service.add_contact(db, sample_contact_data)
+            await service.delete_contact(db, contact.id)
+            return await service.list_contacts(db)
+
+        assert run(scenario) == []
+
+    def test_list_and_search_contacts(self, sample_contact_data):
+        """Test listing and searching return read-only records."""
+
+        async def scenario(db):
+            await service.add_contact(db, sample_contact_data)
+            await service.add_contact(
+                db,
+                {
+                    "first_name": "Alice",
+                    "last_name": "Smith",
+                    "phone": "+1987654321",
+                    "category": "Work",
+                },
+            )
+            return (
+                await service.list_contacts(db),
+                await service.search_contacts(db, "  smith "),
+                await service.search_contacts(db, "", ["Friends"]),
+            )
+
+        listed, by_query, by_category = run(scenario)
+
+        assert [r.first_name for r in listed] == ["Alice", "John"]
+        assert [r.first_name for r in by_query] == ["Alice"]
+        assert [r.first_name for r in by_category] == ["John"]
+
+    def test_search_falls_back_to_typo_search(self, sample_contact_data):
+        """Test that a text query finding nothing is corrected like the sync one."""
+
+        async def scenario(db):
+            await service.add_contact(db, sample_contact_data)
+            return (
+                await service.search_contacts(db, "Jhon"),
+                await service.search_contacts(db, "Jhon", ["Work"]),
+            )
+
+        corrected, other_category = run(scenario)
+
+        assert [r.first_name for r in corrected] == ["John"]
+        assert not other_category
@@ -0,0 +1,198 @@
+"""
+Unit tests for the autocomplete index.
+"""
+
+import asyncio
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.crud import contacts as contact_crud
+from src.database.db import Base
+from src.services import async_contact_service
+from src.services.autocomplete import Autocomplete, get_autocomplete, prefix_key
+from src.services.contact_service import (
+    add_contact,
+    delete_contact,
+    suggest,
+    update_contact,
+)
+
+
+def add(db, first_name: str, last_name: str, phone: str, email: str = ""):
+    """Add a contact through the service."""
+    return add_contact(
+        db,
+        {
+            "first_name": first_name,
+            "last_name": last_name,
+            "phone": phone,
+            "email": email,
+            "category": "Work",
+        },
+    )
+
+
+class TestPrefixKey:
+    """Test cases for turning typed text into a token prefix."""
+
+    def test_phone_digits(self):
+        """Test that phone-like text is reduced to its digits."""
+        assert prefix_key("+49 (151) 12-3") == "49151123"
+
+    def test_last_folded_word(self):
+        """Test that other text completes its last folded word."""
+        assert prefix_key("Anna  MÜL") == "mul"
+        assert prefix_key("   ") == ""
+
+
+class TestAutocomplete:
+    """Test cases for building, completing and incremental updates."""
+
+    def test_completes_names_emails_and_phones(self, test_db_session):
+        """Test that every kind of token is completed with its contacts."""
+        ann = add(test_db_session, "Ann", "Lee", "+15550001", "ann@x.io")
+        anna = add(test_db_session, "Anna", "Lee", "+15550002")
+        index = Autocomplete()
+        index.refresh(test_db_session)
+
+        # Act
+        names = index.complete("an", 5)
+        lee = index.complete("Anna L", 5)
+        phones = index.complete("+1 555", 5)
+
+        # Assert
+        assert [(c.text, c.contact_ids) for c in names] == [
+            ("ann", (ann.id,)),
+            ("ann@x.io", (ann.id,)),
+            ("anna", (anna.id,)),
+        ]
+        assert lee[0].text == "lee" and lee[0].count == 2
+        assert [c.text for c in phones] == ["15550001", "15550002"]
+
+    def test_most_frequent_first(self, test_db_session):
+        """Test that completions are ranked by count, then alphabetically."""
+        for i, first in enumerate(["Jon", "John", "John", "Joe", "Joe", "Joe"]):
+            add(test_db_session, first, "Doe", f"+1555000{i}")
+        index = Autocomplete()
+        index.refresh(test_db_session)
+
+        assert [c.text for c in index.complete("jo", 2)] == ["joe", "john"]
+
+    def test_bounded_memory(self, test_db_session):
+        """Test that the token and id limits are respected."""
+        for i in range(4):
+            add(test_db_session, "Ann", "Lee", f"+1555000{i}", f"a{i}@x.io")
+        index = Autocomplete(max_tokens=4, max_ids=2)
+
+        index.refresh(test_db_session)
+
+        # Names are kept first, then the emails; the phones are dropped
+        assert index.tokens == ["a0@x.io", "a1@x.io", "ann", "lee"]
+        assert index.counts[2] == 4 and len(index.postings[2]) == 2
+        assert index.dropped == 6
+
+    def test_service_writes_update_in_place(self, test_db_session):
+        """Test that adds, edits and deletes are applied without a rebuild."""
+        ann = add(test_db_session, "Ann", "Lee", "+15550001")
+        suggest(test_db_session, "a")
+        index = get_autocomplete(test_db_session)
+
+        bob = add(test_db_session, "Bob", "Ray", "+15550002")
+        update_contact(test_db_session, ann.id, {"last_name": "Lea"})
+        delete_contact(test_db_session, bob.id)
+
+        assert index.tokens == ["15550001", "ann", "lea"]
+        assert [c.text for c in suggest(test_db_session, "le")] == ["lea"]
+        assert index.rebuilds == 1
+
+    def test_other_writes_rebuild(self, test_db_session):
+        """Test that writes bypassing the service are picked up by a rebuild."""
+        add(test_db_session, "Ann", "Lee", "+15550001")
+        suggest(test_db_session, "a")
+        contact_crud.bulk_create(
+            test_db_session,
+            [
+                {
+                    "first_name": "Amy",
+                    "last_name": "Ray",
+                    "phone": "+15550002",
+                    "email": None,
+                    "category": "Work",
+                }
+            ],
+        )
+
+        # Act
+        completions = suggest(test_db_session, "a")
+
+        # Assert
+        assert [c.text for c in completions] == ["amy", "ann"]
+        assert get_autocomplete(test_db_session).rebuilds == 2
+
+    def test_serves_previous_index_while_rebuilding(self, test_db_session):
+        """Test that a rebuild in progress does not hold up completions."""
+        add(test_db_session, "Ann", "Lee", "+15550001")
+        suggest(test_db_session, "a")
+        index = get_autocomplete(test_db_session)
+        contact_crud.bulk_create(
+            test_db_session,
+            [
+                {
+                    "first_name": "Amy",
+                    "last_name": "Ray",
+                    "phone": "+15550002",
+                    "email": None,
+                    "category": "Work",
+                }
+            ],
+        )
+
+        # Another thread is rebuilding the index
+        with index._build_lock:  # pylint: disable=protected-access
+            stale = suggest(test_db_session, "a")
+
+        assert [c.text for c in stale] == ["ann"]
+        assert index.rebuilds == 1
+        assert [c.text for c in suggest(test_db_session, "a")] == ["amy", "ann"]
+        assert index.rebuilds == 2
+
+    def test_async_writes_update_in_place(self, tmp_path):
+        """Test that the async service maintains the index of the database."""
+        path = tmp_path / "contacts.db"
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(autoflush=False, bind=engine)()
+        add(db, "Ann", "Lee", "+15550001")
+        suggest(db, "a")
+        index = get_autocomplete(db)
+
+        async def scenario():
+            async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+            try:
+                async with async_sessionmaker(
+                    autoflush=False, expire_on_commit=False, bind=async_engine
+                )() as async_db:
+                    assert await async_db.run_sync(get_autocomplete) is index
+                    await async_contact_service.add_contact(
+                        async_db,
+                        {
+                            "first_name": "Amy",
+                            "last_name": "Ray",
+                            "phone": "+15550002",
+                            "email": "",
+                            "category": "Work",
+                        },
+                    )
+            finally:
+                await async_engine.dispose()
+
+        try:
+            asyncio.run(scenario())
+
+            assert [c.text for c in suggest(db, "a")] == ["amy", "ann"]
+            assert index.rebuilds == 1
+        finally:
+            db.close()
+            engine.dispose()
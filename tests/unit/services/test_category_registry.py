@@ -0,0 +1,39 @@
+"""
+Unit tests for the category registry.
+"""
+
+from unittest.mock import patch
+
+from src.crud import categories as category_crud
+from src.database.models import DEFAULT_CATEGORIES, category_ids
+from src.services.category_registry import get_category_registry
+
+
+class TestCategoryRegistry:
+    """Test cases for the cached category names and ids."""
+
+    def test_names_and_ids(self, test_db_session):
+        """Test that the registry maps names and ids both ways."""
+        registry = get_category_registry(test_db_session)
+
+        assert registry.names == DEFAULT_CATEGORIES
+        assert registry.id_of("Work") == 3
+        assert registry.name_of(3) == "Work"
+        assert registry.id_of("Clients") is None
+
+    def test_reloads_only_after_a_category_is_added(self, test_db_session):
+        """Test that an unchanged table is not read again."""
+        get_category_registry(test_db_session)
+
+        with patch.object(
+            category_crud, "list_all", wraps=category_crud.list_all
+        ) as spy:
+            get_category_registry(test_db_session)
+            spy.assert_not_called()
+
+            category_ids(test_db_session, ["Clients"])
+            registry = get_category_registry(test_db_session)
+            spy.assert_called_once()
+
+        assert registry.names == (*DEFAULT_CATEGORIES, "Clients")
+        assert registry.id_of("Clients") == 5
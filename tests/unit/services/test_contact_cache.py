@@ -0,0 +1,197 @@
+"""
+Unit tests for the contact cache.
+"""
+
+import sqlite3
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.database.db import Base
+from src.database.models import ContactRecord
+from src.services.contact_cache import ContactCache, get_contact_cache
+from src.services.contact_service import (
+    add_contact,
+    delete_contact,
+    get_cache_stats,
+    get_contact,
+    update_contact,
+)
+
+
+def make_record(contact_id: int, email: str | None = None) -> ContactRecord:
+    """Build a snapshot with a phone derived from the id."""
+    return ContactRecord(
+        id=contact_id,
+        first_name="First",
+        last_name=f"Last{contact_id}",
+        phone=f"+1000000{contact_id:04d}",
+        email=email,
+        category="Work",
+    )
+
+
+def checked_cache(db, maxsize: int = 10) -> ContactCache:
+    """A cache that has seen the session's connection (see check_data_version)."""
+    cache = ContactCache(maxsize=maxsize)
+    cache.check_data_version(db)
+    return cache
+
+
+class TestContactCache:
+    """Test cases for the LRU cache itself."""
+
+    def test_lookup_by_id_phone_and_email(self, test_db_session):
+        """Test that a snapshot is indexed by id, phone and email."""
+        cache = checked_cache(test_db_session)
+        record = cache.put(make_record(1, "one@example.com"))
+
+        assert cache.get(test_db_session, 1) == record
+        assert cache.get_by_phone(test_db_session, record.phone) == record
+        assert cache.get_by_email(test_db_session, "one@example.com") == record
+        assert cache.get(test_db_session, 2) is None
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.size) == (3, 1, 1)
+        assert stats.hit_ratio == 0.75
+
+    def test_lru_eviction(self, test_db_session):
+        """Test that the least recently used contact is evicted."""
+        cache = checked_cache(test_db_session, maxsize=2)
+        first = cache.put(make_record(1))
+        cache.put(make_record(2))
+
+        cache.get(test_db_session, 1)  # 1 becomes most recently used
+        cache.put(make_record(3))
+
+        assert len(cache) == 2
+        assert cache.get(test_db_session, 2) is None
+        assert cache.get_by_phone(test_db_session, first.phone) == first
+
+    def test_invalidate_drops_all_keys(self, test_db_session):
+        """Test that invalidation removes the id, phone and email entries."""
+        cache = ContactCache()
+        record = cache.put(make_record(1, "one@example.com"))
+
+        cache.invalidate(1)
+
+        assert cache.get(test_db_session, 1) is None
+        assert cache.get_by_phone(test_db_session, record.phone) is None
+        assert cache.get_by_email(test_db_session, "one@example.com") is None
+
+    def test_invalidate_keys(self, test_db_session):
+        """Test invalidation by phone or email key."""
+        cache = checked_cache(test_db_session)
+        cache.put(make_record(1, "one@example.com"))
+        cache.put(make_record(2))
+
+        cache.invalidate_keys(None, "one@example.com")
+
+        assert cache.get(test_db_session, 1) is None
+        assert cache.get(test_db_session, 2) is not None
+
+    def test_separate_cache_per_engine(self, test_db_session, mock_db_session):
+        """Test that sessions on different engines never share a cache."""
+        assert get_contact_cache(test_db_session) is get_contact_cache(test_db_session)
+        assert get_contact_cache(test_db_session) is not get_contact_cache(
+            mock_db_session
+        )
+
+
+class TestServiceCaching:
+    """Test cases for read-through caching in the service layer."""
+
+    def test_get_contact_hits_cache(self, test_db_session, sample_contact_data):
+        """Test that a repeated get is served without querying the database."""
+        contact = add_contact(test_db_session, sample_contact_data)
+        first = get_contact(test_db_session, contact.id)
+
+        with patch("src.services.contact_service.contact_crud") as mock_crud:
+            second = get_contact(test_db_session, contact.id)
+
+        mock_crud.get_by_id.assert_not_called()
+        assert second == first
+        assert get_cache_stats(test_db_session).hits >= 1
+
+    def test_update_invalidates(self, test_db_session, sample_contact_data):
+        """Test that an update is visible through the cache."""
+        contact = add_contact(test_db_session, sample_contact_data)
+        get_contact(test_db_session, contact.id)
+
+        update_contact(test_db_session, contact.id, {"first_name": "Jane"})
+
+        assert get_contact(test_db_session, contact.id).first_name == "Jane"
+
+    def test_delete_invalidates(self, test_db_session, sample_contact_data):
+        """Test that a deleted contact's phone can be reused."""
+        contact = add_contact(test_db_session, sample_contact_data)
+        get_contact(test_db_session, contact.id)
+
+        delete_contact(test_db_session, contact.id)
+        again = add_contact(test_db_session, sample_contact_data)
+
+        assert get_contact(test_db_session, again.id).phone == contact.phone
+
+    def test_cross_connection_commit_flushes(self, tmp_path, sample_contact_data):
+        """Test that commits from another engine are detected."""
+        url = f"sqlite:///{tmp_path / 'contacts.db'}"
+        engine_a = create_engine(url)
+        engine_b = create_engine(url)
+        Base.metadata.create_all(bind=engine_a)
+        db_a = sessionmaker(bind=engine_a)()
+        db_b = sessionmaker(bind=engine_b)()
+
+        try:
+            contact_id = add_contact(db_a, sample_contact_data).id
+            get_contact(db_a, contact_id)
+            db_a.commit()  # end the read transaction
+            flushes = get_cache_stats(db_a).flushes
+
+            update_contact(db_b, contact_id, {"first_name": "Changed"})
+
+            assert get_contact(db_a, contact_id).first_name == "Changed"
+            assert get_cache_stats(db_a).flushes == flushes + 1
+        finally:
+            db_a.close()
+            db_b.close()
+            engine_a.dispose()
+            engine_b.dispose()
+
+    def test_fresh_connection_after_external_commit(self, tmp_path):
+        """Test that a connection seen for the first time flushes the cache."""
+        path = tmp_path / "contacts.db"
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        session_local = sessionmaker(bind=engine)
+        db_a, db_b = session_local(), session_local()
+        try:
+            contact_id = add_contact(
+                db_a, {"first_name": "Ann", "last_name": "Lee", "phone": "+15550001"}
+            ).id
+            get_contact(db_a, contact_id)
+            db_a.commit()
+            db_a.connection()  # keep the connection checked out
+            with sqlite3.connect(path) as external:
+                external.execute("UPDATE contacts SET first_name = 'Anna'")
+            external.close()
+
+            # db_b gets a new connection, never checked by the cache
+            assert get_contact(db_b, contact_id).first_name == "Anna"
+        finally:
+            db_a.close()
+            db_b.close()
+            engine.dispose()
+
+    def test_read_before_an_invalidation_is_not_cached(self, test_db_session):
+        """Test that a put started before an invalidation is dropped."""
+        cache = checked_cache(test_db_session)
+        generation = cache.generation
+        stale = make_record(1)  # read by a reader
+
+        cache.invalidate(1)  # a writer commits and invalidates
+        cache.put(stale, generation)
+
+        assert cache.get(test_db_session, 1) is None
+        cache.put(make_record(1), cache.generation)
+        assert cache.get(test_db_session, 1) is not None
@@ -2,18 +2,39 @@
 Unit tests for contact service layer.
 """
 
+from datetime import datetime
 from unittest.mock import Mock, patch
 
 import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 
-from src.database.models import Contact
+from src.crud import contacts as contact_crud
+from src.database.models import Contact, ContactRecord
 from src.services.contact_service import (
+    ContactConflictError,
     ContactServiceError,
     add_contact,
+    category_counts,
+    changes_since,
+    created_counts,
     delete_contact,
+    get_change_seq,
     get_contact,
+    get_contact_stats,
+    get_contacts,
+    iter_changes,
+    list_categories,
+    list_changed_since,
     list_contacts,
+    list_contacts_by_category,
+    list_contacts_by_domain,
+    list_contacts_page,
+    list_recent_contacts,
+    merge_edits,
+    missing_field_counts,
     search_contacts,
+    top_domains,
     update_contact,
 )
 
@@ -33,7 +54,7 @@ class TestContactService:
 
             # Assert
             mock_crud.get_by_id.assert_called_once_with(mock_db_session, 1)
-            assert result == sample_contact
+            assert result == ContactRecord.from_contact(sample_contact)
 
     def test_get_contact_not_found(self, mock_db_session):
         """Test getting contact when it doesn't exist."""
@@ -138,14 +159,14 @@ class TestContactService:
         """Test listing all contacts."""
         # Arrange
         mock_crud = Mock()
-        mock_crud.get_all.return_value = [sample_contact]
+        mock_crud.list_records.return_value = [sample_contact]
 
         with patch("src.services.contact_service.contact_crud", mock_crud):
             # Act
             result = list_contacts(mock_db_session)
 
             # Assert
-            mock_crud.get_all.assert_called_once_with(mock_db_session)
+            mock_crud.list_records.assert_called_once_with(mock_db_session)
             assert len(result) == 1
             assert result[0] == sample_contact
 
@@ -175,7 +196,9 @@ class TestContactService:
 
             # Assert
             mock_crud.get_by_id.assert_called_once_with(mock_db_session, contact_id)
-            mock_crud.update.assert_called_once_with(mock_db_session, existing_contact)
+            mock_crud.update.assert_called_once_with(
+                mock_db_session, existing_contact, None
+            )
             assert result == existing_contact
 
     def test_update_contact_not_found(self, mock_db_session):
@@ -191,6 +214,40 @@ class TestContactService:
 
             assert "Contact not found" in exc_info.value.errors[0]
 
+    def test_update_contact_invalid_discards_changes(self, mock_db_session):
+        """Test that rejected changes are discarded, not left pending."""
+        # Arrange
+        existing_contact = Mock(spec=Contact)
+        existing_contact.first_name = "Old"
+        existing_contact.last_name = "Name"
+
+        mock_crud = Mock()
+        mock_crud.get_by_id.return_value = existing_contact
+
+        with patch("src.services.contact_service.contact_crud", mock_crud):
+            # Act & Assert
+            with pytest.raises(ContactServiceError):
+                update_contact(mock_db_session, 1, {"phone": "abc"})
+
+            mock_db_session.expire.assert_called_once_with(existing_contact)
+            mock_crud.update.assert_not_called()
+
+    def test_list_contacts_page(self, mock_db_session, sample_contact):
+        """Test that a page is returned with the total count."""
+        # Arrange
+        mock_crud = Mock()
+        mock_crud.list_records_page.return_value = [sample_contact]
+        mock_crud.count.return_value = 7
+
+        with patch("src.services.contact_service.contact_crud", mock_crud):
+            # Act
+            items, total = list_contacts_page(mock_db_session, offset=5, limit=1)
+
+            # Assert
+            mock_crud.list_records_page.assert_called_once_with(mock_db_session, 5, 1)
+            assert items == [sample_contact]
+            assert total == 7
+
     def test_delete_contact_success(self, mock_db_session):
         """Test successfully deleting a contact."""
         # Arrange
@@ -206,7 +263,9 @@ class TestContactService:
 
             # Assert
             mock_crud.get_by_id.assert_called_once_with(mock_db_session, contact_id)
-            mock_crud.delete.assert_called_once_with(mock_db_session, mock_contact)
+            mock_crud.delete.assert_called_once_with(
+                mock_db_session, mock_contact, None
+            )
 
     def test_delete_contact_not_found(self, mock_db_session):
         """Test deleting non-existent contact."""
@@ -225,7 +284,7 @@ class TestContactService:
         """Test searching contacts."""
         # Arrange
         mock_crud = Mock()
-        mock_crud.search.return_value = [sample_contact]
+        mock_crud.search_records.return_value = [sample_contact]
 
         with patch("src.services.contact_service.contact_crud", mock_crud):
             # Act
@@ -234,12 +293,37 @@ class TestContactService:
             )
 
             # Assert
-            mock_crud.search.assert_called_once_with(
-                db=mock_db_session, query="john", categories=["Friends"]
+            mock_crud.search_records.assert_called_once_with(
+                db=mock_db_session,
+                query="john",
+                categories=["Friends"],
+                phonetic=False,
             )
             assert len(result) == 1
             assert result[0] == sample_contact
 
+    def test_search_contacts_structured(self, mock_db_session, sample_contact):
+        """Test that queries with fields go to the query compiler."""
+        # Arrange
+        mock_crud = Mock()
+
+        with (
+            patch("src.services.contact_service.contact_crud", mock_crud),
+            patch(
+                "src.services.contact_service.search_query_records",
+                return_value=[sample_contact],
+            ) as mock_search,
+        ):
+            # Act
+            result = search_contacts(mock_db_session, "name:jo* -cat:Other", ["Work"])
+
+            # Assert
+            query = mock_search.call_args.args[1]
+            assert [t.field for t in query.terms] == ["name", "category"]
+            assert mock_search.call_args.args[2] == ["Work"]
+            mock_crud.search_records.assert_not_called()
+            assert result == [sample_contact]
+
     def test_contact_service_error(self):
         """Test ContactServiceError exception."""
         # Arrange
@@ -251,3 +335,393 @@ class TestContactService:
         # Assert
         assert error.errors == error_messages
         assert str(error) == "Contact service error"
+
+
+class TestBatchGet:
+    """Test cases for getting several contacts at once."""
+
+    def test_get_contacts_loads_misses_in_one_query(
+        self, test_db_session, sample_contact_data
+    ):
+        """Test that cached contacts are reused and misses are batched."""
+        first = add_contact(test_db_session, sample_contact_data)
+        second = add_contact(
+            test_db_session,
+            {"first_name": "Jane", "last_name": "Roe", "phone": "+1987654321"},
+        )
+        get_contact(test_db_session, first.id)
+
+        with patch.object(
+            contact_crud,
+            "get_records_by_ids",
+            wraps=contact_crud.get_records_by_ids,
+        ) as spy:
+            result = get_contacts(test_db_session, [second.id, 999, first.id])
+
+        spy.assert_called_once_with(test_db_session, [second.id, 999])
+        assert [record.id for record in result] == [second.id, first.id]
+
+
+class TestEmailDomains:
+    """Test cases for contacts by domain and domain counts."""
+
+    @staticmethod
+    def _add(db, phone: str, email: str | None):
+        return add_contact(
+            db, {"first_name": "A", "last_name": "B", "phone": phone, "email": email}
+        )
+
+    def test_top_domains(self, test_db_session):
+        """Test that domains are ranked by count, then by name."""
+        for i, email in enumerate(
+            ["a@x.io", "b@X.io", "c@acme.com", "d@acme.com", "e@mail.de", None]
+        ):
+            self._add(test_db_session, f"+1555000{i}", email)
+
+        assert top_domains(test_db_session, 2) == [("acme.com", 2), ("x.io", 2)]
+
+    def test_domain_follows_email_changes(self, test_db_session):
+        """Test that the domain of a contact is kept current on update."""
+        first = self._add(test_db_session, "+15550001", "a@x.io")
+        self._add(test_db_session, "+15550002", "b@x.io")
+
+        update_contact(test_db_session, first.id, {"email": "a@acme.com"})
+        records, total = list_contacts_by_domain(test_db_session, "@X.IO ")
+
+        assert total == 1 and [r.email for r in records] == ["b@x.io"]
+        assert list_contacts_by_domain(test_db_session, "acme.com")[1] == 1
+
+
+class TestCategories:
+    """Test cases for category choices, counts and contacts by category."""
+
+    def test_counts_include_unused_categories(self, test_db_session):
+        """Test that every category is counted, in the order of the choices."""
+        for i, category in enumerate(["Work", "Work", "Clients", None]):
+            add_contact(
+                test_db_session,
+                {
+                    "first_name": f"N{i}",
+                    "last_name": "",
+                    "phone": f"+1555000{i}",
+                    "category": category,
+                },
+            )
+
+        assert list_categories(test_db_session)[-1] == "Clients"
+        assert category_counts(test_db_session) == [
+            ("Family", 0),
+            ("Friends", 0),
+            ("Work", 2),
+            ("Other", 0),
+            ("Clients", 1),
+        ]
+
+    def test_contacts_follow_category_changes(self, test_db_session):
+        """Test paging through a category after contacts move between them."""
+        first = add_contact(
+            test_db_session,
+            {
+                "first_name": "Bo",
+                "last_name": "",
+                "phone": "+15550001",
+                "category": "Work",
+            },
+        )
+        add_contact(
+            test_db_session,
+            {
+                "first_name": "Al",
+                "last_name": "",
+                "phone": "+15550002",
+                "category": "Work",
+            },
+        )
+
+        update_contact(test_db_session, first.id, {"category": "Family"})
+        records, total = list_contacts_by_category(test_db_session, "Work")
+
+        assert total == 1 and [r.first_name for r in records] == ["Al"]
+        assert list_contacts_by_category(test_db_session, "Family")[1] == 1
+        assert list_contacts_by_category(test_db_session, "Nope") == ([], 0)
+
+
+class TestStats:
+    """Test cases for the contact statistics."""
+
+    def test_created_per_month_sums_the_days(self, test_db_session):
+        """Test that month counts add up the day counts of the month."""
+        for i, day in enumerate(["2024-04-30", "2024-05-01", "2024-05-31"]):
+            contact = add_contact(
+                test_db_session,
+                {"first_name": f"N{i}", "last_name": "", "phone": f"+1555000{i}"},
+            )
+            contact.created_at = datetime.fromisoformat(day)
+        test_db_session.commit()
+
+        assert created_counts(test_db_session, "month") == [
+            ("2024-04", 1),
+            ("2024-05", 2),
+        ]
+        assert len(created_counts(test_db_session)) == 3
+        with pytest.raises(ContactServiceError):
+            created_counts(test_db_session, "week")
+
+    def test_stats_are_recomputed_only_after_a_write(self, test_db_session):
+        """Test that the statistics are cached per data revision."""
+        add_contact(
+            test_db_session,
+            {
+                "first_name": "Ann",
+                "last_name": "",
+                "phone": "+15550001",
+                "email": "ann@acme.com",
+                "category": "Work",
+            },
+        )
+        first = get_contact_stats(test_db_session)
+
+        with patch.object(contact_crud, "count", wraps=contact_crud.count) as spy:
+            assert get_contact_stats(test_db_session) is first
+            spy.assert_not_called()
+
+            add_contact(
+                test_db_session,
+                {"first_name": "Bob", "last_name": "Ray", "phone": "+15550002"},
+            )
+            stats = get_contact_stats(test_db_session)
+            spy.assert_called_once()
+
+        assert stats.total == 2
+        assert ("Work", 1) in stats.by_category
+        assert stats.top_domains == [("acme.com", 1)]
+        assert stats.missing == missing_field_counts(test_db_session)
+        assert stats.missing["email"] == 1 and stats.missing["last_name"] == 1
+        assert sum(count for _, count in stats.created_per_month) == 2
+
+
+class TestChangeFeed:
+    """Test cases for the changes since a sequence number."""
+
+    @staticmethod
+    def _add(db, i):
+        return add_contact(
+            db, {"first_name": f"N{i}", "last_name": "", "phone": f"+1555000{i}"}
+        )
+
+    def test_changes_in_sequence_order(self, test_db_session):
+        """Test inserts, updates and deletes after a number, each contact once."""
+        first, second = self._add(test_db_session, 1), self._add(test_db_session, 2)
+        since = get_change_seq(test_db_session)
+        third = self._add(test_db_session, 3)
+        update_contact(test_db_session, first.id, {"first_name": "Ann"})
+        delete_contact(test_db_session, second.id)
+        update_contact(test_db_session, third.id, {"first_name": "Cy"})
+
+        changes = changes_since(test_db_session, since)
+
+        assert [(c.seq, c.op, c.contact_id) for c in changes] == [
+            (4, "update", first.id),
+            (5, "delete", second.id),
+            (6, "insert", third.id),
+        ]
+        assert changes[0].contact.first_name == "Ann"
+        assert changes[1].contact is None
+        assert changes_since(test_db_session, changes[-1].seq) == []
+
+    def test_pages_follow_the_last_seq(self, test_db_session):
+        """Test that limited pages, chained by seq, return every change once."""
+        for i in range(5):
+            self._add(test_db_session, i)
+        delete_contact(test_db_session, 2)
+        delete_contact(test_db_session, 4)
+
+        first_page = changes_since(test_db_session, 0, limit=3)
+        rest = changes_since(test_db_session, first_page[-1].seq, limit=3)
+
+        assert [c.contact_id for c in first_page] == [1, 3, 5]
+        assert [(c.op, c.contact_id) for c in rest] == [("delete", 2), ("delete", 4)]
+        assert list(iter_changes(test_db_session, 0, batch_size=2)) == first_page + rest
+
+
+class TestRecency:
+    """Test cases for recently added/edited contacts and changes since a time."""
+
+    @staticmethod
+    def _add_at(db, i, created_at):
+        contact = add_contact(
+            db, {"first_name": f"N{i}", "last_name": "", "phone": f"+1555000{i}"}
+        )
+        contact.created_at = contact.updated_at = created_at
+        db.commit()
+        return contact
+
+    def test_recent_pages_follow_the_cursor(self, test_db_session):
+        """Test newest-first pages, ties on the timestamp broken by id."""
+        for i, day in enumerate([1, 3, 3, 2, 5]):
+            self._add_at(test_db_session, i, datetime(2024, 5, day))
+
+        first, cursor = list_recent_contacts(test_db_session, "created", limit=2)
+        second, cursor = list_recent_contacts(
+            test_db_session, "created", limit=2, before=cursor
+        )
+        last, end = list_recent_contacts(
+            test_db_session, "created", limit=2, before=cursor
+        )
+
+        assert [c.first_name for c in first + second + last] == [
+            "N4",
+            "N2",
+            "N1",
+            "N3",
+            "N0",
+        ]
+        assert cursor == (datetime(2024, 5, 2), 4) and end is None
+        with pytest.raises(ContactServiceError):
+            list_recent_contacts(test_db_session, "deleted")
+
+    def test_recently_edited_first(self, test_db_session):
+        """Test that an edit moves a contact to the top of the edited order."""
+        first = self._add_at(test_db_session, 1, datetime(2024, 5, 1))
+        self._add_at(test_db_session, 2, datetime(2024, 5, 2))
+
+        update_contact(test_db_session, first.id, {"first_name": "Ann"})
+
+        edited, _ = list_recent_contacts(test_db_session, "updated")
+        added, _ = list_recent_contacts(test_db_session, "created")
+        assert [c.first_name for c in edited] == ["Ann", "N2"]
+        assert [c.first_name for c in added] == ["N2", "Ann"]
+
+    def test_changed_since_oldest_first(self, test_db_session):
+        """Test the contacts changed at or after a time, page by page."""
+        for i, day in enumerate([1, 2, 2, 4]):
+            self._add_at(test_db_session, i, datetime(2024, 5, day))
+
+        page, cursor = list_changed_since(test_db_session, datetime(2024, 5, 2), 2)
+        rest, end = list_changed_since(
+            test_db_session, datetime(2024, 5, 2), 2, after=cursor
+        )
+
+        assert [c.first_name for c in page] == ["N1", "N2"]
+        assert [c.first_name for c in rest] == ["N3"] and end is None
+
+
+class TestOptimisticUpdates:
+    """Test cases for updates against the version an edit was made against."""
+
+    @staticmethod
+    def _add(db):
+        return add_contact(
+            db, {"first_name": "Ann", "last_name": "Lee", "phone": "+15550001"}
+        )
+
+    @staticmethod
+    def _edit_elsewhere(db, contact_id, **values):
+        """Change a contact as another writer would (a Core UPDATE)."""
+        db.execute(contact_crud.CONTACTS_UPDATE, {"contact_id": contact_id, **values})
+        db.commit()
+
+    def test_each_update_increments_the_version(self, test_db_session):
+        """Test that ORM and merge updates both give a contact a new version."""
+        contact = self._add(test_db_session)
+        assert get_contact(test_db_session, contact.id).version == 1
+
+        update_contact(test_db_session, contact.id, {"first_name": "Anna"}, 1)
+        self._edit_elsewhere(test_db_session, contact.id, last_name="Li")
+
+        assert contact_crud.get_by_id(test_db_session, contact.id).version == 3
+
+    def test_update_against_an_old_version_conflicts(self, test_db_session):
+        """Test that a stale edit is rejected and the session stays usable."""
+        contact = self._add(test_db_session)
+        self._edit_elsewhere(test_db_session, contact.id, last_name="Li")
+
+        with pytest.raises(ContactConflictError) as conflict:
+            update_contact(test_db_session, contact.id, {"first_name": "Anna"}, 1)
+
+        assert conflict.value.contact_id == contact.id
+        assert conflict.value.expected_version == 1
+        current = get_contact(test_db_session, contact.id)
+        assert (current.first_name, current.last_name) == ("Ann", "Li")
+        update_contact(test_db_session, contact.id, {"first_name": "Anna"}, 2)
+        assert get_contact(test_db_session, contact.id).first_name == "Anna"
+
+    def test_conflict_in_a_batch_keeps_the_other_writes(self, test_db_session):
+        """Test that a group-commit conflict only rolls back its savepoint."""
+        contact = self._add(test_db_session)
+        self._edit_elsewhere(test_db_session, contact.id, last_name="Li")
+        test_db_session.info["defer_commit"] = True
+
+        with test_db_session.begin_nested():
+            update_contact(test_db_session, contact.id, {"last_name": "Lo"}, 2)
+        with pytest.raises(ContactConflictError):
+            with test_db_session.begin_nested():
+                update_contact(test_db_session, contact.id, {"first_name": "X"}, 2)
+        test_db_session.commit()
+
+        current = contact_crud.get_by_id(test_db_session, contact.id)
+        assert (current.first_name, current.last_name) == ("Ann", "Lo")
+
+    def test_delete_of_a_changed_contact_conflicts(self, test_db_session):
+        """Test that a contact changed since it was loaded is not deleted."""
+        contact_id = self._add(test_db_session).id
+        # Loaded by this session (and kept), then changed by another one
+        loaded = contact_crud.get_by_id(test_db_session, contact_id)
+        assert loaded.version == 1
+        with Session(test_db_session.get_bind()) as other:
+            update_contact(other, contact_id, {"first_name": "Anna"})
+
+        with pytest.raises(ContactConflictError) as conflict:
+            delete_contact(test_db_session, contact_id)
+
+        assert conflict.value.expected_version == 1
+        assert get_contact(test_db_session, contact_id).first_name == "Anna"
+
+    def test_delete_against_an_old_version_conflicts(self, test_db_session):
+        """Test that a deletion confirmed on a listed version is checked."""
+        contact = self._add(test_db_session)
+        self._edit_elsewhere(test_db_session, contact.id, last_name="Li")
+
+        with pytest.raises(ContactConflictError) as conflict:
+            delete_contact(test_db_session, contact.id, 1)
+
+        assert conflict.value.expected_version == 1
+        assert get_contact(test_db_session, contact.id).last_name == "Li"
+        delete_contact(test_db_session, contact.id, 2)
+        assert contact_crud.get_by_id(test_db_session, contact.id) is None
+
+    def test_update_writes_without_reading_the_version(self, test_db_session):
+        """Test that the version check is part of the UPDATE, not a SELECT."""
+        contact = contact_crud.get_by_id(test_db_session, self._add(test_db_session).id)
+        contact.first_name = "Anna"
+        statements = []
+        engine = test_db_session.get_bind()
+
+        def record(_conn, _cursor, statement, *_):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            contact_crud.update(test_db_session, contact, 1)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert statements[0].startswith("UPDATE contacts SET")
+        assert "WHERE contacts.id = ? AND contacts.version = ?" in statements[0]
+
+    def test_merge_edits(self):
+        """Test the three-way merge of an edit with a newer version."""
+        base = ContactRecord(1, "Ann", "Lee", "+1", None, "Work", 1)
+        current = ContactRecord(1, "Ann", "Li", "+2", None, "Work", 2)
+        data = {
+            "first_name": "Anna",
+            "last_name": "Lee",
+            "phone": "+3",
+            "email": "",
+            "category": "Work",
+        }
+
+        changes, conflicts = merge_edits(base, current, data)
+
+        assert changes == {"first_name": "Anna"}
+        assert conflicts == ["phone"]
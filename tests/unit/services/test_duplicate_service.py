@@ -0,0 +1,235 @@
+"""
+Unit tests for the duplicate detection service.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, select
+
+from src.database.models import Contact, ContactRecord
+from src.services import duplicate_service
+from src.services.contact_service import ContactServiceError, get_contact
+from src.services.duplicate_service import (
+    DuplicateCluster,
+    MergeStrategy,
+    blocking_keys,
+    cluster_pairs,
+    find_duplicates,
+    merge_contacts,
+    score_pair,
+)
+
+JOHN = ContactRecord(1, "John", "Doe", "+491511234567", "john.doe@example.com", None)
+JON = ContactRecord(2, "Jon", "Doe", "01511234567", "johndoe+home@mail.de", None)
+JANE = ContactRecord(3, "Jane", "Roe", "+491519999999", None, None)
+
+
+class TestScoring:
+    """Test cases for blocking keys and pair scores."""
+
+    def test_blocking_keys(self):
+        """Test the phone-suffix, email-local-part and name-sound keys."""
+        assert blocking_keys(JOHN) == ["p:1234567", "e:johndoe", "n:J500D000"]
+        assert blocking_keys(JANE) == ["p:9999999", "n:J500R000"]
+        assert set(blocking_keys(JOHN)) == set(blocking_keys(JON))
+
+    def test_near_duplicates_score_high(self):
+        """Test that a reformatted number and a typo still match."""
+        assert score_pair(JOHN, JON) > 0.95
+
+    def test_same_name_alone_is_not_enough(self):
+        """Test that namesakes with different numbers stay apart."""
+        other = ContactRecord(4, "John", "Doe", "+491510000000", None, None)
+
+        assert score_pair(JOHN, other) < 0.85
+
+
+class TestClusters:
+    """Test cases for cluster_pairs."""
+
+    def test_transitive_clusters(self):
+        """Test that chained pairs form one cluster with its weakest score."""
+        pairs = [(1, 2, 0.99), (2, 5, 0.9), (3, 4, 0.95)]
+
+        clusters = cluster_pairs(pairs)
+
+        assert clusters == [
+            DuplicateCluster((3, 4), 0.95),
+            DuplicateCluster((1, 2, 5), 0.9),
+        ]
+
+    def test_no_pairs(self):
+        """Test that no pairs means no clusters."""
+        assert not cluster_pairs([])
+
+
+class TestFindDuplicates:
+    """Test cases for find_duplicates on a database."""
+
+    @staticmethod
+    def _add(db, *records):
+        for r in records:
+            db.add(Contact(first_name=r[0], last_name=r[1], phone=r[2], email=r[3]))
+        db.commit()
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_finds_clusters(self, test_db_session, workers):
+        """Test end to end, with and without the process pool."""
+        # Arrange
+        self._add(
+            test_db_session,
+            ("John", "Doe", "+491511234567", "john.doe@example.com"),
+            ("Alice", "Smith", "+15550001", None),
+            ("Jon", "Doe", "01511234567", "johndoe@mail.de"),
+            ("Alicia", "Smith", "+15559999", None),
+            ("Bob", "Ray", "+15550002", "alice.smith@example.com"),
+        )
+
+        # Act
+        clusters = find_duplicates(test_db_session, workers=workers)
+
+        # Assert
+        assert [cluster.ids for cluster in clusters] == [(1, 3)]
+        assert clusters[0].confidence > 0.95
+
+    def test_large_blocks_use_a_window(self):
+        """Test that oversized blocks only compare name-sorted neighbours."""
+        # pylint: disable=protected-access
+        block = [
+            duplicate_service._Entry(i, name, "", None)
+            for i, name in enumerate(["d", "a", "c", "b", "e"])
+        ]
+
+        small = list(duplicate_service._block_pairs(block, window=2, max_block=5))
+        large = list(duplicate_service._block_pairs(block, window=2, max_block=4))
+
+        assert len(small) == 10
+        assert [(a.name, b.name) for a, b in large] == [
+            ("a", "b"),
+            ("a", "c"),
+            ("b", "c"),
+            ("b", "d"),
+            ("c", "d"),
+            ("c", "e"),
+            ("d", "e"),
+        ]
+
+
+class TestMergeContacts:
+    """Test cases for merge_contacts."""
+
+    @staticmethod
+    def _add(db, first_name, last_name, phone, email=None, category=None, age=0):
+        stamp = datetime(2026, 1, 1) - timedelta(days=age)
+        db.add(
+            Contact(
+                first_name=first_name,
+                last_name=last_name,
+                phone=phone,
+                email=email,
+                category=category,
+                updated_at=stamp,
+            )
+        )
+        db.commit()
+
+    def _contacts(self, db):
+        return db.execute(
+            select(
+                Contact.id,
+                Contact.first_name,
+                Contact.last_name,
+                Contact.phone,
+                Contact.email,
+                Contact.category,
+            ).order_by(Contact.id)
+        ).all()
+
+    @pytest.mark.parametrize(
+        "strategy,survivor",
+        [
+            (MergeStrategy.OLDEST, 1),
+            (MergeStrategy.NEWEST, 2),
+            (MergeStrategy.MOST_COMPLETE, 3),
+        ],
+    )
+    def test_survivorship(self, test_db_session, strategy, survivor):
+        """Test the survivor of each strategy and the filled-in fields."""
+        # Arrange
+        self._add(test_db_session, "John", "", "+15550001", age=5)
+        self._add(test_db_session, "Jon", "", "+15550002", "jon@x.io", age=1)
+        self._add(test_db_session, "J", "Doe", "+15550003", "j@x.io", "Work", age=9)
+
+        # Act
+        summary = merge_contacts(test_db_session, [(1, 2, 3)], strategy)
+
+        # Assert
+        assert (summary.survivors, summary.deleted) == ([survivor], 2)
+        [merged] = self._contacts(test_db_session)
+        assert merged.id == survivor
+        assert merged.last_name == "Doe"
+        assert merged.category == "Work"
+        assert merged.email == {1: "jon@x.io", 2: "jon@x.io", 3: "j@x.io"}[survivor]
+
+    def test_survivor_takes_over_deleted_email(self, test_db_session):
+        """Test that a loser's unique email can move to the survivor."""
+        # Arrange
+        self._add(test_db_session, "Ann", "Lee", "+15550001")
+        self._add(test_db_session, "Ann", "Lee", "+15550002", "ann@x.io")
+        self._add(test_db_session, "Bob", "Ray", "+15550003")
+        self._add(test_db_session, "Bob", "Ray", "+15550004", "bob@x.io")
+
+        # Act
+        summary = merge_contacts(
+            test_db_session, [DuplicateCluster((1, 2), 0.9), [3, 4]]
+        )
+
+        # Assert
+        assert (summary.survivors, summary.deleted, summary.updated) == ([1, 3], 2, 2)
+        assert [(c.id, c.email) for c in self._contacts(test_db_session)] == [
+            (1, "ann@x.io"),
+            (3, "bob@x.io"),
+        ]
+
+    def test_one_transaction(self, test_db_session):
+        """Test that all clusters are merged with a single commit."""
+        for i in range(6):
+            self._add(test_db_session, "N", str(i), f"+1555000{i}")
+        commits = []
+        event.listen(test_db_session, "after_commit", commits.append)
+
+        merge_contacts(test_db_session, [(1, 2), (3, 4), (5, 6)])
+
+        assert len(commits) == 1
+        assert [c.id for c in self._contacts(test_db_session)] == [1, 3, 5]
+
+    def test_missing_ids_and_singletons_are_skipped(self, test_db_session):
+        """Test clusters with fewer than two existing contacts."""
+        self._add(test_db_session, "Ann", "Lee", "+15550001")
+        self._add(test_db_session, "Ann", "Lee", "+15550002")
+
+        summary = merge_contacts(test_db_session, [(1, 99), (2,)])
+
+        assert (summary.survivors, summary.deleted, summary.updated) == ([], 0, 0)
+        assert len(self._contacts(test_db_session)) == 2
+
+    def test_overlapping_clusters_are_rejected(self, test_db_session):
+        """Test that a contact may only be in one cluster."""
+        with pytest.raises(ContactServiceError) as exc:
+            merge_contacts(test_db_session, [(1, 2), (2, 3)])
+
+        assert exc.value.errors == ["Contact 2 is in more than one cluster."]
+
+    def test_cache_is_invalidated(self, test_db_session):
+        """Test that cached survivors and losers are not served stale."""
+        self._add(test_db_session, "Ann", "", "+15550001")
+        self._add(test_db_session, "Ann", "Lee", "+15550002")
+        get_contact(test_db_session, 1)
+        get_contact(test_db_session, 2)
+
+        merge_contacts(test_db_session, [(1, 2)])
+
+        assert get_contact(test_db_session, 1).last_name == "Lee"
+        with pytest.raises(ContactServiceError):
+            get_contact(test_db_session, 2)
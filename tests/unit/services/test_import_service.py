@@ -0,0 +1,217 @@
+"""
+Unit tests for the bulk import service.
+"""
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from src.database.models import Contact
+from src.services import contact_service, import_service
+from src.services.contact_service import check_new_contact
+from src.services.import_service import (
+    KeyFilter,
+    check_rows,
+    import_contacts,
+    import_csv,
+    iter_checked_chunks,
+)
+
+ROWS = [
+    {"first_name": "Ann", "last_name": "Lee", "phone": "+1 555 0001"},
+    {"first_name": "", "last_name": "", "phone": "+15550002"},
+    {"first_name": "Bob", "last_name": "Ray", "phone": "+15550001"},
+    {"first_name": "Cid", "phone": "+15550003", "email": "CID@example.com"},
+    {"first_name": "Dee", "phone": "+15550004", "email": "cid@example.com"},
+    {"first_name": "Eve", "phone": "+15550099"},
+    {"first_name": "Fay", "phone": "abc"},
+]
+
+
+class TestCheckRows:
+    """Test cases for chunked validation."""
+
+    def test_check_rows_matches_single_check(self):
+        """Test that batch validation applies the rules of add_contact."""
+        chunk = check_rows(ROWS)
+
+        for index, row in enumerate(ROWS):
+            check = check_new_contact({"first_name": "", "last_name": "", **row})
+            for taken in [(False, False), (True, True)]:
+                assert chunk.errors(index, *taken) == check.errors(*taken)
+            if not check.errors(False, False):
+                assert chunk.values(index) == check.values()
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_chunks_keep_input_order(self, workers):
+        """Test that chunks come back in input order with or without a pool."""
+        rows = [{"first_name": f"N{i}", "phone": f"+1555{i:04d}"} for i in range(25)]
+
+        chunks = list(iter_checked_chunks(rows, workers=workers, chunk_size=4))
+
+        assert [len(chunk) for chunk in chunks] == [4, 4, 4, 4, 4, 4, 1]
+        phones = [phone for chunk in chunks for phone in chunk.phones.normalized]
+        assert phones == [row["phone"] for row in rows]
+
+
+class TestImportContacts:
+    """Test cases for import_contacts."""
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_import_reports_rejected_rows(self, test_db_session, workers):
+        """Test that invalid and duplicate rows are reported by index."""
+        # Arrange
+        contact_service.add_contact(
+            test_db_session,
+            {"first_name": "Old", "last_name": "", "phone": "+15550099"},
+        )
+
+        # Act
+        summary = import_contacts(test_db_session, ROWS, workers=workers, chunk_size=3)
+
+        # Assert
+        assert summary.created == 2
+        assert summary.total == len(ROWS)
+        rejected = {row.index: row.errors for row in summary.rejected}
+        assert sorted(rejected) == [1, 2, 4, 5, 6]
+        assert "Phone number already exists" in rejected[2][0]
+        assert "Email already exists" in rejected[4][0]
+        assert "Phone number already exists" in rejected[5][0]
+        names = test_db_session.scalars(
+            select(Contact.first_name).order_by(Contact.id)
+        ).all()
+        assert names == ["Old", "Ann", "Cid"]
+
+    @pytest.mark.parametrize("count, pooled", [(3, False), (4, True)])
+    def test_pool_for_unsized_input(self, test_db_session, monkeypatch, count, pooled):
+        """Test that an iterator ending within the first chunk stays in-process."""
+        # Arrange
+        started = []
+
+        def checked_chunks(rows, workers, chunk_size):
+            started.append(workers > 1)
+            return iter_checked_chunks(rows, 1, chunk_size)
+
+        monkeypatch.setattr(import_service, "iter_checked_chunks", checked_chunks)
+        monkeypatch.setattr(import_service, "IMPORT_WORKERS", 2)
+        rows = [{"first_name": f"N{i}", "phone": f"+1555{i:04d}"} for i in range(count)]
+
+        # Act
+        summary = import_contacts(test_db_session, iter(rows), chunk_size=4)
+
+        # Assert
+        assert started == [pooled]
+        assert summary.created == count
+
+    def test_imported_contacts_have_timestamps(self, test_db_session):
+        """Test that bulk inserts apply the column defaults."""
+        import_contacts(test_db_session, ROWS[:1])
+
+        contact = test_db_session.scalars(select(Contact)).one()
+
+        assert contact.created_at is not None
+        assert contact.updated_at is not None
+
+    def test_import_csv(self, test_db_session, tmp_path):
+        """Test reading a CSV file with empty optional cells."""
+        # Arrange
+        path = tmp_path / "contacts.csv"
+        path.write_text(
+            "first_name,last_name,phone,email,category\n"
+            "Ann,Lee,+15550001,,Work\n"
+            "Bob,,+15550002,bob@example.com,\n",
+            encoding="utf-8",
+        )
+
+        # Act
+        summary = import_csv(test_db_session, path)
+
+        # Assert
+        assert (summary.created, summary.rejected) == (2, [])
+        contacts = test_db_session.scalars(select(Contact).order_by(Contact.id)).all()
+        assert [(c.email, c.category) for c in contacts] == [
+            (None, "Work"),
+            ("bob@example.com", None),
+        ]
+
+
+class TestBloomImport:
+    """Test cases for imports with Bloom-filter duplicate pre-checks."""
+
+    def test_bloom_import_matches_plain_import(self, test_db_session):
+        """Test that the filters change the lookups, not the outcome."""
+        # Arrange
+        contact_service.add_contact(
+            test_db_session,
+            {"first_name": "Old", "last_name": "", "phone": "+15550099"},
+        )
+
+        # Act
+        summary = import_contacts(test_db_session, ROWS, chunk_size=3, bloom=True)
+
+        # Assert
+        assert summary.created == 2
+        assert [row.index for row in summary.rejected] == [1, 2, 4, 5, 6]
+        assert summary.keys_checked == 8
+        assert summary.keys_probed < summary.keys_checked
+        assert summary.filter_bytes > 0
+
+    def test_probe_reduction(self, test_db_session):
+        """Test that new keys are not looked up."""
+        # Arrange
+        rows = [{"first_name": f"N{i}", "phone": f"+1555{i:04d}"} for i in range(200)]
+        import_contacts(test_db_session, rows[:100])
+
+        # Act
+        summary = import_contacts(test_db_session, rows, bloom=True)
+
+        # Assert
+        assert (summary.created, len(summary.rejected)) == (100, 100)
+        assert summary.keys_checked == 200
+        assert 100 <= summary.keys_probed < 110
+        assert summary.probe_reduction == pytest.approx(0.5, abs=0.05)
+
+    def test_plain_import_probes_every_key(self, test_db_session):
+        """Test the counts without filters."""
+        summary = import_contacts(test_db_session, ROWS)
+
+        assert summary.keys_checked == summary.keys_probed == 8
+        assert (summary.probe_reduction, summary.filter_bytes) == (0.0, 0)
+
+    def test_key_written_after_filter_build(self, test_db_session, monkeypatch):
+        """Test that a chunk is re-checked exactly if its insert conflicts."""
+        # Arrange: filters built before another session adds +15550099
+        stale = KeyFilter.from_database(test_db_session)
+        monkeypatch.setattr(import_service.KeyFilter, "from_database", lambda db: stale)
+        contact_service.add_contact(
+            test_db_session,
+            {"first_name": "Old", "last_name": "", "phone": "+15550099"},
+        )
+
+        # Act
+        summary = import_contacts(test_db_session, ROWS, bloom=True)
+
+        # Assert
+        rejected = {row.index: row.errors for row in summary.rejected}
+        assert summary.created == 2
+        assert "Phone number already exists" in rejected[5][0]
+        assert summary.keys_checked == summary.keys_probed == 8
+
+    def test_conflicting_insert_rolls_back(self, test_db_session, monkeypatch):
+        """Test that a plain import leaves the session usable after a conflict."""
+        # Arrange: a key written by another session after the lookup
+        contact_service.add_contact(
+            test_db_session,
+            {"first_name": "Old", "last_name": "", "phone": "+15550099"},
+        )
+        monkeypatch.setattr(
+            import_service.contact_crud, "existing_keys", lambda *args: (set(), set())
+        )
+
+        # Act
+        with pytest.raises(IntegrityError):
+            import_contacts(test_db_session, ROWS)
+
+        # Assert
+        names = test_db_session.scalars(select(Contact.first_name)).all()
+        assert names == ["Old"]
@@ -0,0 +1,180 @@
+"""
+Unit tests for the typo-tolerant name index.
+"""
+
+import threading
+from unittest.mock import patch
+
+from sqlalchemy import update
+
+from src.crud import contacts as contact_crud
+from src.database.models import Contact, name_keys
+from src.services.contact_service import (
+    add_contact,
+    delete_contact,
+    search_contacts,
+    update_contact,
+)
+from src.services.name_index import NameIndex, get_name_index
+
+
+def add(db, first_name: str, last_name: str, phone: str):
+    """Add a contact through the service."""
+    return add_contact(
+        db,
+        {
+            "first_name": first_name,
+            "last_name": last_name,
+            "phone": phone,
+            "email": "",
+            "category": "Work",
+        },
+    )
+
+
+class TestNameIndex:
+    """Test cases for building, refreshing and corrections."""
+
+    def test_counts_contacts_per_word(self, test_db_session):
+        """Test that words are folded and counted once per contact."""
+        add(test_db_session, "José", "Smith", "+15550001")
+        add(test_db_session, "Jose", "Jose", "+15550002")
+        index = NameIndex()
+
+        index.refresh(test_db_session)
+
+        assert index.words.counts == {"jose": 2, "smith": 1}
+        assert (index.total, index.stale, index.rebuilds) == (2, 0, 1)
+
+    def test_refresh_adds_changes_incrementally(self, test_db_session):
+        """Test that new and updated names are added without a rebuild."""
+        first = add(test_db_session, "Ann", "Lee", "+15550001")
+        index = NameIndex()
+        index.refresh(test_db_session)
+
+        add(test_db_session, "Bob", "Ray", "+15550002")
+        update_contact(test_db_session, first.id, {"last_name": "Lea"})
+        index.refresh(test_db_session)
+
+        assert {"bob", "ray", "lea", "lee"} <= set(index.words.counts)
+        assert (index.total, index.stale, index.rebuilds) == (2, 1, 1)
+
+    def test_refresh_follows_the_change_sequence(self, test_db_session):
+        """Test that an update keeping ``updated_at`` is still picked up."""
+        ann = add(test_db_session, "Ann", "Lee", "+15550001")
+        index = NameIndex()
+        index.refresh(test_db_session)
+
+        # A Core update that keeps the timestamp, like a migration backfill
+        test_db_session.execute(
+            update(Contact)
+            .where(Contact.id == ann.id)
+            .values(
+                first_name="Margaret",
+                **name_keys("Margaret", "Lee"),
+                updated_at=Contact.updated_at,
+            )
+        )
+        test_db_session.commit()
+        index.refresh(test_db_session)
+
+        assert "margaret" in index.words
+        assert (index.total, index.stale, index.rebuilds) == (1, 1, 1)
+
+    def test_rebuilds_when_stale(self, test_db_session):
+        """Test that a full rebuild drops the words of deleted contacts."""
+        ann = add(test_db_session, "Ann", "Lee", "+15550001")
+        add(test_db_session, "Bob", "Ray", "+15550002")
+        index = NameIndex()
+        index.refresh(test_db_session)
+
+        delete_contact(test_db_session, ann.id)
+        index.refresh(test_db_session)  # Now 1 of 1 contacts is stale
+        assert "ann" in index.words
+        add(test_db_session, "Cid", "Moe", "+15550003")
+        index.refresh(test_db_session)
+
+        assert set(index.words.counts) == {"bob", "ray", "cid", "moe"}
+        assert (index.stale, index.rebuilds) == (0, 2)
+
+    def test_lookups_not_blocked_by_a_rebuild(self, test_db_session):
+        """Test that a rebuild serves lookups from the previous words."""
+        ann = add(test_db_session, "Ann", "Lee", "+15550001")
+        index = NameIndex()
+        index.refresh(test_db_session)
+        delete_contact(test_db_session, ann.id)
+        index.refresh(test_db_session)  # Now 1 of 1 contacts is stale
+        add(test_db_session, "Bob", "Ray", "+15550002")
+        read_names = contact_crud.iter_name_keys
+        found = []
+
+        def slow_read(db, since):
+            # Another thread corrects a word while the rebuild reads the rows
+            lookup = threading.Thread(target=lambda: found.append(index.lookup("ann")))
+            lookup.start()
+            lookup.join(timeout=5)
+            yield from read_names(db, since)
+
+        with patch.object(contact_crud, "iter_name_keys", slow_read):
+            index.refresh(test_db_session)
+
+        assert [s.term for s in found[0]] == ["ann"]
+        assert set(index.words.counts) == {"bob", "ray"}
+        assert index.rebuilds == 2
+
+    def test_refresh_in_progress_is_not_waited_for(self, test_db_session):
+        """Test that a second refresh keeps the current words instead of waiting."""
+        add(test_db_session, "Ann", "Lee", "+15550001")
+        index = NameIndex()
+        index.refresh(test_db_session)
+        add(test_db_session, "Bob", "Ray", "+15550002")
+
+        with index._refresh_lock:  # pylint: disable=protected-access
+            index.refresh(test_db_session)
+            assert "bob" not in index.words
+
+        index.refresh(test_db_session)
+        assert "bob" in index.words
+
+    def test_corrections_ranked(self, test_db_session):
+        """Test that corrected queries come by distance, then frequency."""
+        for i, (first, last) in enumerate(
+            [("John", "Smith"), ("John", "Doe"), ("Jon", "Smyth")]
+        ):
+            add(test_db_session, first, last, f"+1555000{i}")
+        index = NameIndex()
+        index.refresh(test_db_session)
+
+        corrections = index.corrections("Jhon Smtih")
+
+        assert corrections[:2] == ["john smith", "jon smith"]
+        assert index.corrections("john smith")[:2] == ["john smyth", "jon smith"]
+
+
+class TestTypoSearch:
+    """Test cases for the fallback of search_contacts."""
+
+    def test_fallback_when_nothing_found(self, test_db_session):
+        """Test that a typo finds the contact through a correction."""
+        add(test_db_session, "Catherine", "Smith", "+15550001")
+        add(test_db_session, "John", "Doe", "+15550002")
+
+        result = search_contacts(test_db_session, "Cathrine", ["Work"])
+
+        assert [r.first_name for r in result] == ["Catherine"]
+        assert not search_contacts(test_db_session, "Cathrine", ["Family"])
+
+    def test_no_fallback_when_found(self, test_db_session):
+        """Test that the index is not touched when the search finds contacts."""
+        add(test_db_session, "John", "Doe", "+15550001")
+
+        with patch("src.services.contact_service.typo_search") as typo_search:
+            result = search_contacts(test_db_session, "jo")
+            search_contacts(test_db_session, "jhon", phonetic=True)
+
+        assert [r.first_name for r in result] == ["John"]
+        typo_search.assert_not_called()
+
+    def test_one_index_per_engine(self, test_db_session):
+        """Test that sessions of one engine share the index."""
+        assert get_name_index(test_db_session) is get_name_index(test_db_session)
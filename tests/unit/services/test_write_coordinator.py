@@ -0,0 +1,254 @@
+"""
+Unit tests for the single-writer queue with group commit.
+"""
+
+import threading
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import sessionmaker
+
+from src.database.db import Base
+from src.database.models import Contact
+from src.services import contact_service
+from src.services.autocomplete import get_autocomplete
+from src.services.contact_service import ContactServiceError
+from src.services.write_coordinator import WriteCoordinator, submit_write
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Session factory of a fresh file database shared by several threads."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'contacts.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autoflush=False, bind=engine)
+    engine.dispose()
+
+
+def contact_data(i: int) -> dict:
+    """Valid data of a new contact."""
+    return {"first_name": f"Name{i}", "last_name": "Test", "phone": f"+1555000{i:03d}"}
+
+
+def count_commits(session_factory) -> list[int]:
+    """Record every COMMIT issued on the factory's engine."""
+    commits: list[int] = []
+    event.listen(session_factory.kw["bind"], "commit", lambda conn: commits.append(1))
+    return commits
+
+
+def block_writer(coordinator: WriteCoordinator) -> threading.Event:
+    """Occupy the writer thread until the returned event is set."""
+    running, release = threading.Event(), threading.Event()
+
+    def wait(db):
+        running.set()
+        release.wait()
+
+    coordinator.submit(wait)
+    running.wait()
+    return release
+
+
+class TestWriteCoordinator:
+    """Test cases for WriteCoordinator."""
+
+    def test_batch_commits_once(self, session_factory):
+        """Test that writes queued together are committed in one transaction."""
+        # Arrange
+        commits = count_commits(session_factory)
+        coordinator = WriteCoordinator(session_factory)
+        # Block the writer so the following writes pile up in the queue
+        gate = block_writer(coordinator)
+
+        # Act
+        futures = [
+            coordinator.submit(contact_service.add_contact, contact_data(i))
+            for i in range(10)
+        ]
+        gate.set()
+        created = [future.result(timeout=5) for future in futures]
+        coordinator.close()
+
+        # Assert
+        assert [contact.first_name for contact in created] == [
+            f"Name{i}" for i in range(10)
+        ]
+        assert coordinator.stats().writes == 11
+        assert coordinator.stats().batches == len(commits) == 2
+
+    def test_rejected_write_keeps_the_rest_of_the_batch(self, session_factory):
+        """Test that a rejected write only rolls back its own savepoint."""
+        # Arrange
+        coordinator = WriteCoordinator(session_factory)
+        gate = block_writer(coordinator)
+
+        # Act
+        first = coordinator.submit(contact_service.add_contact, contact_data(1))
+        duplicate = coordinator.submit(contact_service.add_contact, contact_data(1))
+        invalid = coordinator.submit(
+            contact_service.add_contact, {**contact_data(2), "phone": "abc"}
+        )
+        last = coordinator.submit(contact_service.add_contact, contact_data(3))
+        gate.set()
+        coordinator.close()
+
+        # Assert
+        with pytest.raises(ContactServiceError) as exc_info:
+            duplicate.result()
+        assert "Phone number already exists" in exc_info.value.errors[0]
+        with pytest.raises(ContactServiceError):
+            invalid.result()
+        assert first.result().id and last.result().id
+        with session_factory() as db:
+            phones = db.scalars(select(Contact.phone).order_by(Contact.phone)).all()
+        assert phones == ["+1555000001", "+1555000003"]
+
+    def test_rejected_update_is_not_persisted(self, session_factory):
+        """Test that a rejected update's changes are discarded in the batch."""
+        # Arrange
+        coordinator = WriteCoordinator(session_factory)
+        contact = coordinator.submit(
+            contact_service.add_contact, contact_data(1)
+        ).result()
+
+        # Act
+        rejected = coordinator.submit(
+            contact_service.update_contact,
+            contact.id,
+            {"first_name": "Changed", "phone": "abc"},
+        )
+        accepted = coordinator.submit(
+            contact_service.update_contact, contact.id, {"last_name": "Other"}
+        )
+        coordinator.close()
+
+        # Assert
+        with pytest.raises(ContactServiceError):
+            rejected.result()
+        assert accepted.result().first_name == "Name1"
+        with session_factory() as db:
+            stored = db.get(Contact, contact.id)
+            assert (stored.first_name, stored.last_name) == ("Name1", "Other")
+
+    def test_close_drains_pending_writes(self, session_factory):
+        """Test that close() finishes the queued writes before stopping."""
+        # Arrange
+        coordinator = WriteCoordinator(session_factory, max_batch=3)
+        futures = [
+            coordinator.submit(contact_service.add_contact, contact_data(i))
+            for i in range(10)
+        ]
+
+        # Act
+        coordinator.close()
+
+        # Assert
+        assert all(future.done() for future in futures)
+        assert coordinator.stats().writes == 10
+        assert coordinator.stats().mean_batch_size <= 3
+
+    def test_failed_commit_fails_the_whole_batch(self, session_factory):
+        """Test that every write of a batch reports a failed commit."""
+        # Arrange
+        coordinator = WriteCoordinator(session_factory)
+        bind = session_factory.kw["bind"]
+
+        def fail(conn):
+            raise RuntimeError("disk I/O error")
+
+        event.listen(bind, "commit", fail)
+
+        # Act
+        future = coordinator.submit(contact_service.add_contact, contact_data(1))
+        coordinator.close()
+        event.remove(bind, "commit", fail)
+
+        # Assert
+        with pytest.raises(RuntimeError, match="disk I/O error"):
+            future.result()
+        with session_factory() as db:
+            assert db.scalars(select(Contact)).all() == []
+
+    def test_submit_after_close_is_refused(self, session_factory):
+        """Test that a write submitted after close() is not silently dropped."""
+        coordinator = WriteCoordinator(session_factory)
+        coordinator.close()
+
+        with pytest.raises(RuntimeError, match="closed"):
+            coordinator.submit(contact_service.add_contact, contact_data(1))
+
+    def test_batch_updates_autocomplete_after_commit(self, session_factory):
+        """Test that the writes of a batch are applied to the index in order."""
+        # Arrange
+        with session_factory() as db:
+            contact_service.add_contact(db, contact_data(1))
+            contact_service.suggest(db, "n")
+            index = get_autocomplete(db)
+        coordinator = WriteCoordinator(session_factory)
+        gate = block_writer(coordinator)
+
+        # Act
+        for i in range(2, 5):
+            coordinator.submit(contact_service.add_contact, contact_data(i))
+        gate.set()
+        coordinator.close()
+
+        # Assert
+        with session_factory() as db:
+            completions = contact_service.suggest(db, "name")
+        assert [c.text for c in completions] == [f"name{i}" for i in range(1, 5)]
+        assert index.rebuilds == 1
+
+    def test_failed_batch_leaves_no_trace_in_memory(self, session_factory):
+        """Test that a rolled-back batch neither updates the index nor the cache."""
+        # Arrange
+        with session_factory() as db:
+            contact = contact_service.add_contact(db, contact_data(1))
+            contact_service.suggest(db, "n")
+            index = get_autocomplete(db)
+        coordinator = WriteCoordinator(session_factory)
+        bind = session_factory.kw["bind"]
+
+        def fail(conn):
+            raise RuntimeError("disk I/O error")
+
+        event.listen(bind, "commit", fail)
+
+        # Act
+        future = coordinator.submit(
+            contact_service.update_contact, contact.id, {"first_name": "Zed"}
+        )
+        coordinator.close()
+        event.remove(bind, "commit", fail)
+
+        # Assert
+        with pytest.raises(RuntimeError):
+            future.result()
+        assert "zed" not in index.tokens
+        assert "name1" in index.tokens
+
+
+class TestSubmitWrite:
+    """Test cases for submit_write without the write queue."""
+
+    def test_direct_write(self, session_factory):
+        """Test that the write runs immediately on the given session."""
+        with session_factory() as db:
+            future = submit_write(db, contact_service.add_contact, contact_data(1))
+
+            assert future.done()
+            assert future.result().first_name == "Name1"
+
+    def test_direct_write_error(self, session_factory):
+        """Test that a rejected write raises from the future."""
+        with session_factory() as db:
+            future = submit_write(
+                db, contact_service.add_contact, {**contact_data(1), "phone": "abc"}
+            )
+
+            with pytest.raises(ContactServiceError):
+                future.result()
@@ -0,0 +1,137 @@
+"""
+Unit and property tests for the column-wise validation functions.
+
+The property tests check that every row of a batch result is identical to
+the scalar functions of ``src.utils.validation``.
+"""
+
+import numpy as np
+import pyarrow as pa
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from src.utils.batch_validation import (
+    EmailError,
+    PhoneError,
+    check_emails,
+    check_phones,
+    normalize_emails,
+    normalize_phones,
+)
+from src.utils.validation import (
+    normalize_email,
+    normalize_phone,
+    validate_email,
+    validate_phone,
+)
+
+# Characters the rules care about, plus non-ASCII digits and spaces
+PHONE_ALPHABET = st.sampled_from(
+    list("0123456789+-() \t\n\x0b\x0c\r\x1c\x1fa.") + ["٣", "²", " ", " ", "é"]
+)
+EMAIL_ALPHABET = st.sampled_from(
+    list("abcXYZ019._%+-@ \t\n\x1c") + ["é", "ß", " ", "İ", "K"]
+)
+
+phones = st.one_of(
+    st.text(PHONE_ALPHABET, max_size=20),
+    st.from_regex(r"\+?[0-9 ()-]{0,20}", fullmatch=True),
+    st.text(max_size=10),
+)
+emails = st.one_of(
+    st.none(),
+    st.text(EMAIL_ALPHABET, max_size=20),
+    st.emails().map(lambda email: f" {email.upper()}\n"),
+    st.text(max_size=10),
+)
+
+# Input types accepted by the batch functions
+CONTAINERS = {
+    "list": list,
+    "numpy": lambda values: np.array(values, dtype=object),
+    "arrow": lambda values: pa.array(values, type=pa.string()),
+    "chunked": lambda values: pa.chunked_array([values], type=pa.string()),
+}
+
+
+class TestBatchMatchesScalar:
+    """Property tests: batch results equal the scalar functions row by row."""
+
+    @settings(max_examples=300, deadline=None)
+    @given(
+        values=st.lists(phones, max_size=30),
+        container=st.sampled_from(list(CONTAINERS)),
+    )
+    def test_phones(self, values, container):
+        """Test check_phones against normalize_phone / validate_phone."""
+        result = check_phones(CONTAINERS[container](values))
+
+        for index, value in enumerate(values):
+            valid, errors = validate_phone(value)
+            assert result.normalized[index] == normalize_phone(value)
+            assert bool(result.valid[index]) is valid
+            assert result.errors(index) == errors
+
+    @settings(max_examples=300, deadline=None)
+    @given(
+        values=st.lists(emails, max_size=30),
+        container=st.sampled_from(list(CONTAINERS)),
+    )
+    def test_emails(self, values, container):
+        """Test check_emails against normalize_email / validate_email."""
+        result = check_emails(CONTAINERS[container](values))
+
+        for index, value in enumerate(values):
+            valid, error = validate_email(value)
+            assert result.normalized[index] == normalize_email(value)
+            assert bool(result.valid[index]) is valid
+            assert result.errors(index) == ([] if valid else [error])
+
+
+class TestColumnCheck:
+    """Test cases for codes, masks and lazy messages."""
+
+    def test_phone_codes(self):
+        """Test one row per phone error code."""
+        result = check_phones(["+1 (555) 000-1234", "", "12a4567", "+12a", "123"])
+
+        assert list(result.codes) == [
+            PhoneError.OK,
+            PhoneError.MISSING,
+            PhoneError.NOT_DIGITS,
+            PhoneError.NOT_DIGITS_AFTER_PLUS,
+            PhoneError.LENGTH,
+        ]
+        assert result.normalized[0] == "+15550001234"
+        assert list(result.valid) == [True, False, False, False, False]
+
+    def test_missing_phone_is_none(self):
+        """Test that None counts as an empty phone."""
+        result = check_phones([None])
+
+        assert result.normalized == [""]
+        assert result.codes[0] == PhoneError.MISSING
+
+    def test_failures_only_lists_invalid_rows(self):
+        """Test that failures() yields the messages of invalid rows only."""
+        result = check_emails(["a@b.io", "bad", None, "  ", "x@y"])
+
+        failures = list(result.failures())
+
+        assert [index for index, _ in failures] == [1, 4]
+        assert result.codes[1] == EmailError.INVALID
+        assert failures[0][1] == [validate_email("bad")[1]]
+
+    def test_normalize_helpers(self):
+        """Test the normalize-only wrappers."""
+        assert normalize_phones(["+1 555", "(0) 1"]) == ["+1555", "01"]
+        assert normalize_emails([" A@B.IO ", "", None]) == ["a@b.io", None, None]
+
+    @pytest.mark.parametrize("container", CONTAINERS.values(), ids=CONTAINERS)
+    def test_empty_column(self, container):
+        """Test that an empty column gives empty results."""
+        result = check_phones(container([]))
+
+        assert result.normalized == []
+        assert len(result.codes) == 0
@@ -0,0 +1,54 @@
+"""
+Unit tests for the Bloom filter.
+"""
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from src.utils.bloom import BloomFilter
+
+
+class TestBloomFilter:
+    """Test cases for membership, error rate and sizing."""
+
+    @settings(max_examples=100, deadline=None)
+    @given(keys=st.lists(st.text(max_size=20), max_size=200))
+    def test_no_false_negatives(self, keys):
+        """Test that every added key is reported as present."""
+        bloom = BloomFilter(len(keys))
+
+        bloom.add_many(keys)
+
+        assert bloom.contains_many(keys).all()
+        assert all(key in bloom for key in keys)
+
+    def test_false_positive_rate(self):
+        """Test that absent keys hit about as often as the target rate."""
+        bloom = BloomFilter(10_000, error_rate=0.01)
+        bloom.add_many([f"+1555{i:07d}" for i in range(10_000)])
+
+        hits = bloom.contains_many([f"+1666{i:07d}" for i in range(20_000)])
+
+        assert hits.mean() < 0.02
+
+    @pytest.mark.parametrize(
+        "error_rate,bits_per_key,hashes", [(0.01, 9.6, 7), (0.001, 14.4, 10)]
+    )
+    def test_sizing(self, error_rate, bits_per_key, hashes):
+        """Test the optimal number of bits and hash functions."""
+        bloom = BloomFilter(100_000, error_rate)
+
+        assert bloom.size / 100_000 == pytest.approx(bits_per_key, rel=0.01)
+        assert bloom.hashes == hashes
+        assert bloom.nbytes == (bloom.size + 7) // 8
+
+    def test_empty(self):
+        """Test an empty filter and empty key lists."""
+        bloom = BloomFilter(0)
+
+        bloom.add_many([])
+
+        assert len(bloom) == 0
+        assert "a" not in bloom
+        assert bloom.contains_many([]).shape == (0,)
@@ -0,0 +1,182 @@
+"""
+Unit tests for profiling utilities.
+"""
+
+import pstats
+import threading
+import time
+
+from sqlalchemy import text
+
+from src.crud.contacts import get_by_phone
+from src.utils.profiling import (
+    Profiler,
+    RerunTimings,
+    StackSampler,
+    StatementCacheStats,
+    install_statement_cache_counter,
+    profile_action,
+    statement_cache_stats,
+    track_data,
+    track_rerun,
+)
+
+
+def busy_wait(seconds: float) -> None:
+    """Burn CPU for the given number of seconds."""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TestProfiler:
+    """Test cases for the session profiler."""
+
+    def test_session_writes_reports(self, tmp_path):
+        """Test that a profiled session writes all three report files."""
+        profiler = Profiler(tmp_path, name="test", interval=0.001)
+
+        with profiler.session():
+            with profiler.action("allocate"):
+                data = [str(i) * 10 for i in range(10_000)]
+            busy_wait(0.05)
+
+        assert data
+        assert profiler.pstats_path.exists()
+        assert profiler.collapsed_path.exists()
+        assert profiler.allocations_path.exists()
+
+        stats = pstats.Stats(str(profiler.pstats_path))
+        assert stats.total_calls > 0  # type: ignore[attr-defined]
+
+        # Collapsed stacks: "frame;frame;frame count"
+        lines = profiler.collapsed_path.read_text(encoding="utf-8").splitlines()
+        assert lines
+        stack, count = lines[0].rsplit(" ", 1)
+        assert ";" in stack or "(" in stack
+        assert int(count) > 0
+
+        report = profiler.allocations_path.read_text(encoding="utf-8")
+        assert "== allocate" in report
+
+    def test_concurrent_sessions_run_one_at_a_time(self, tmp_path):
+        """Test that sessions of profilers in different threads do not overlap."""
+        profilers = [Profiler(tmp_path, name=f"test{i}") for i in range(2)]
+        errors: list[BaseException] = []
+        spans: list[tuple[float, float]] = []
+
+        def rerun(profiler):
+            try:
+                with profiler.session():
+                    start = time.perf_counter()
+                    busy_wait(0.05)
+                    spans.append((start, time.perf_counter()))
+            except BaseException as exc:  # pylint: disable=broad-exception-caught
+                errors.append(exc)
+
+        threads = [threading.Thread(target=rerun, args=(p,)) for p in profilers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not errors
+        first, second = sorted(spans)
+        assert first[1] <= second[0]
+        assert all(profiler.pstats_path.exists() for profiler in profilers)
+
+    def test_reports_are_capped(self, tmp_path):
+        """Test the limits on stacks, actions and dumps."""
+        profiler = Profiler(
+            tmp_path, name="test", max_stacks=1, max_actions=2, dump_interval=60
+        )
+
+        for i in range(3):
+            with profiler.session():
+                with profiler.action(f"action {i}"):
+                    busy_wait(0.02)
+            if i == 0:
+                profiler.pstats_path.unlink()
+
+        assert len(profiler.stacks) <= 1
+        assert [label for label, _ in profiler.allocations] == ["action 1", "action 2"]
+        assert not profiler.pstats_path.exists()  # not dumped again within 60 s
+
+    def test_profile_action_without_profiler(self):
+        """Test that profile_action is a no-op when profiling is disabled."""
+        with profile_action(None, "noop"):
+            value = 1
+        assert value == 1
+
+    def test_stack_sampler_collects_samples(self):
+        """Test that the sampler records stacks of the sampled thread."""
+        sampler = StackSampler(interval=0.001)
+        sampler.start()
+        busy_wait(0.05)
+        sampler.stop()
+
+        assert sum(sampler.stacks.values()) > 0
+        assert any("busy_wait" in stack for stack in sampler.stacks)
+
+
+class TestRerunTimings:
+    """Test cases for the per-rerun timing breakdown."""
+
+    def test_breakdown_properties(self):
+        """Test ORM and render time derivation."""
+        timings = RerunTimings(total=1.0, sql=0.2, data=0.5)
+
+        assert abs(timings.orm - 0.3) < 1e-9
+        assert abs(timings.render - 0.5) < 1e-9
+
+    def test_track_rerun_measures_sql(self, test_db_session):
+        """Test that SQL executed inside a rerun is attributed to it."""
+        with track_rerun() as timings:
+            with track_data():
+                test_db_session.execute(text("SELECT 1")).scalar()
+
+        assert timings.statements == 1
+        assert timings.sql > 0
+        assert timings.data >= timings.sql
+        assert timings.total >= timings.data
+
+    def test_sql_outside_rerun_is_ignored(self, test_db_session):
+        """Test that statements outside a tracked rerun are not recorded."""
+        with track_rerun() as timings:
+            pass
+        test_db_session.execute(text("SELECT 1")).scalar()
+
+        assert timings.statements == 0
+
+
+class TestStatementCacheStats:
+    """Test cases for the compiled statement cache counters."""
+
+    def test_hit_ratio(self):
+        """Test the hit ratio of the counters."""
+        assert StatementCacheStats().hit_ratio == 0.0
+        assert StatementCacheStats(hits=3, misses=1).hit_ratio == 0.75
+
+    def test_prebuilt_query_hits_compiled_cache(self, test_db_session):
+        """Test that repeated crud lookups reuse the compiled statement."""
+        install_statement_cache_counter()
+        engine = test_db_session.get_bind()
+        get_by_phone(test_db_session, "+1000000001")
+        before = statement_cache_stats(engine)
+
+        for i in range(5):
+            get_by_phone(test_db_session, f"+100000000{i}")
+
+        after = statement_cache_stats(engine)
+        assert after.hits - before.hits == 5
+        assert after.misses == before.misses
+
+    def test_driver_sql_is_not_counted(self, test_db_session):
+        """Test that raw driver SQL without a cache key is ignored."""
+        install_statement_cache_counter()
+        engine = test_db_session.get_bind()
+        before = statement_cache_stats(engine)
+
+        test_db_session.connection().exec_driver_sql("SELECT 1")
+
+        assert statement_cache_stats(engine) == before
@@ -0,0 +1,71 @@
+"""
+Unit tests for the search query parser.
+"""
+
+from src.utils.search_query import (
+    DOMAIN,
+    EXACT,
+    PREFIX,
+    SUBSTRING,
+    TEXT,
+    parse_query,
+)
+
+
+class TestParseQuery:
+    """Test cases for ``parse_query``."""
+
+    def test_fields_and_negation(self):
+        """Test that every field form becomes a term."""
+        # Act
+        query = parse_query("name:jo* cat:Work email:@ACME.com phone:^+49 -cat:Other")
+
+        # Assert
+        assert [(t.field, t.value, t.match, t.negated) for t in query.terms] == [
+            ("name", "jo", PREFIX, False),
+            ("category", "Work", EXACT, False),
+            ("email", "acme.com", DOMAIN, False),
+            ("phone", "+49", PREFIX, False),
+            ("category", "Other", EXACT, True),
+        ]
+        assert query.structured and not query.warnings
+
+    def test_email_and_phone_forms(self):
+        """Test exact, prefix and substring matches of emails and phones."""
+        query = parse_query("email:Bob@X.io email:bob* email:bob phone:(555)-01")
+
+        assert [(t.value, t.match) for t in query.terms] == [
+            ("bob@x.io", EXACT),
+            ("bob", PREFIX),
+            ("bob", SUBSTRING),
+            ("55501", SUBSTRING),
+        ]
+
+    def test_quoted_value(self):
+        """Test that a quoted value keeps its spaces."""
+        query = parse_query('last:"de la cruz" -smith')
+
+        assert [(t.field, t.value, t.negated) for t in query.terms] == [
+            ("last", "de la cruz", False),
+            (None, "smith", True),
+        ]
+        assert query.terms[0].text == 'last:"de la cruz"'
+
+    def test_free_text_is_not_structured(self):
+        """Test that plain words and phone fragments stay free text."""
+        query = parse_query("maria 555 -0100")
+
+        assert [(t.value, t.match) for t in query.terms] == [
+            ("maria", TEXT),
+            ("555", TEXT),
+            ("-0100", TEXT),
+        ]
+        assert not query.structured
+
+    def test_unknown_field_and_empty_value(self):
+        """Test that unsupported input degrades to text with a warning."""
+        query = parse_query("foo:bar name: x")
+
+        assert [t.value for t in query.terms] == ["foo:bar", "x"]
+        assert len(query.warnings) == 2
+        assert not query.structured
@@ -0,0 +1,116 @@
+"""
+Unit tests for the string similarity functions.
+"""
+
+import pytest
+
+from src.utils.similarity import (
+    double_metaphone,
+    edit_distance,
+    fold,
+    jaro,
+    jaro_winkler,
+    soundex,
+)
+
+
+class TestSoundex:
+    """Test cases for soundex."""
+
+    @pytest.mark.parametrize(
+        "name,code",
+        [
+            ("Robert", "R163"),
+            ("Rupert", "R163"),
+            ("Rubin", "R150"),
+            ("Ashcraft", "A261"),
+            ("Tymczak", "T522"),
+            ("Pfister", "P236"),
+            ("Lee", "L000"),
+            ("Jürgen", "J625"),
+        ],
+    )
+    def test_codes(self, name, code):
+        """Test the reference codes, including the H/W rule and accents."""
+        assert soundex(name) == code
+
+    def test_no_letters(self):
+        """Test that names without letters have no code."""
+        assert soundex("") == soundex("123") == ""
+
+
+class TestDoubleMetaphone:
+    """Test cases for double_metaphone."""
+
+    @pytest.mark.parametrize(
+        "name,codes",
+        [
+            ("Smith", ("SM0", "XMT")),
+            ("Smyth", ("SM0", "XMT")),
+            ("Schmidt", ("XMT", "SMT")),
+            ("Schneider", ("XNTR", "SNTR")),
+            ("Catherine", ("K0RN", "KTRN")),
+            ("Kathryn", ("K0RN", "KTRN")),
+            ("Michael", ("MKL", "MXL")),
+            ("Xavier", ("SF", "SFR")),
+            ("Knight", ("NT", "NT")),
+            ("Jose", ("HS", "HS")),
+            ("Gallegos", ("KLKS", "KKS")),
+            ("Filipowicz", ("FLPT", "FLPF")),
+            ("McLaughlin", ("MKLF", "MKLF")),
+            ("Caesar", ("SSR", "SSR")),
+            ("Müller", ("MLR", "MLR")),
+        ],
+    )
+    def test_codes(self, name, codes):
+        """Test reference codes of the original algorithm."""
+        assert double_metaphone(name) == codes
+
+    def test_no_letters(self):
+        """Test that names without letters have empty codes."""
+        assert double_metaphone("") == double_metaphone("123") == ("", "")
+
+
+class TestJaroWinkler:
+    """Test cases for jaro and jaro_winkler."""
+
+    @pytest.mark.parametrize(
+        "a,b,expected",
+        [
+            ("MARTHA", "MARHTA", 0.9611),
+            ("DWAYNE", "DUANE", 0.84),
+            ("DIXON", "DICKSONX", 0.8133),
+        ],
+    )
+    def test_reference_values(self, a, b, expected):
+        """Test the published Jaro-Winkler examples."""
+        assert jaro_winkler(a, b) == pytest.approx(expected, abs=1e-4)
+        assert jaro_winkler(b, a) == pytest.approx(expected, abs=1e-4)
+
+    def test_edge_cases(self):
+        """Test equal, empty and disjoint strings."""
+        assert jaro_winkler("abc", "abc") == 1.0
+        assert jaro("", "abc") == jaro("abc", "") == 0.0
+        assert jaro("abc", "xyz") == 0.0
+
+
+@pytest.mark.parametrize(
+    "a,b,max_distance,expected",
+    [
+        ("kitten", "sitting", 3, 3),
+        ("kitten", "sitting", 2, None),
+        ("jhon", "john", 2, 1),
+        ("ca", "abc", 3, 3),
+        ("", "abc", 3, 3),
+        ("abc", "abc", 0, 0),
+    ],
+)
+def test_edit_distance(a, b, max_distance, expected):
+    """Test substitutions, transpositions and the distance bound."""
+    assert edit_distance(a, b, max_distance) == expected
+    assert edit_distance(b, a, max_distance) == expected
+
+
+def test_fold():
+    """Test accent stripping, casefolding and whitespace collapsing."""
+    assert fold("  José  MÜLLER Straße ") == "jose muller strasse"
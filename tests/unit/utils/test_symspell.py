@@ -0,0 +1,71 @@
+"""
+Unit tests for the SymSpell index.
+"""
+
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from src.utils.similarity import edit_distance
+from src.utils.symspell import Suggestion, SymSpell
+
+
+def make_index() -> SymSpell:
+    """Index a few names with frequencies."""
+    index = SymSpell(max_distance=2)
+    for term, count in [("john", 50), ("joan", 10), ("jon", 5), ("smith", 40)]:
+        index.add(term, count)
+    return index
+
+
+class TestSymSpell:
+    """Test cases for lookups, ranking and removal."""
+
+    def test_ranked_by_distance_then_frequency(self):
+        """Test that closer terms come first, then more frequent ones."""
+        index = make_index()
+
+        suggestions = index.lookup("jhon")
+
+        assert suggestions == [
+            Suggestion("john", 1, 50),
+            Suggestion("jon", 1, 5),
+            Suggestion("joan", 2, 10),
+        ]
+
+    def test_max_distance(self):
+        """Test that a smaller distance narrows the suggestions."""
+        index = make_index()
+
+        assert [s.term for s in index.lookup("jhon", max_distance=1)] == [
+            "john",
+            "jon",
+        ]
+        assert index.lookup("john", max_distance=0) == [Suggestion("john", 0, 50)]
+        assert not index.lookup("xavier")
+
+    def test_remove(self):
+        """Test that a term disappears with its last occurrence."""
+        index = make_index()
+
+        index.remove("jon", 4)
+        assert "jon" in index
+        index.remove("jon", 1)
+
+        assert "jon" not in index
+        assert [s.term for s in index.lookup("jn")] == ["john", "joan"]
+        assert all(index.deletes.values())
+
+    @settings(max_examples=100, deadline=None)
+    @given(
+        terms=st.lists(st.text("abcde", min_size=1, max_size=6), max_size=30),
+        word=st.text("abcde", max_size=6),
+    )
+    def test_finds_every_term_within_distance(self, terms, word):
+        """Test the lookup against a brute-force scan (short terms)."""
+        index = SymSpell(max_distance=2)
+        for term in terms:
+            index.add(term)
+
+        found = {s.term for s in index.lookup(word)}
+
+        assert found == {t for t in terms if edit_distance(word, t, 2) is not None}
@@ -5,6 +5,7 @@ Unit tests for validation utilities.
 import pytest
 
 from src.utils.validation import (
+    email_domain,
     normalize_email,
     normalize_phone,
     validate_email,
@@ -109,6 +110,21 @@ class TestValidationUtilities:
         # Assert
         assert result == expected_output
 
+    @pytest.mark.parametrize(
+        "input_email, expected_domain",
+        [
+            ("John.Doe@Example.com ", "example.com"),
+            ('"a@b"@mail.de', "mail.de"),
+            ("no-at-sign", None),
+            ("trailing@", None),
+            ("", None),
+            (None, None),
+        ],
+    )
+    def test_email_domain(self, input_email, expected_domain):
+        """Test that the domain is the normalized part after the last @."""
+        assert email_domain(input_email) == expected_domain
+
     # Test validate_email
     @pytest.mark.parametrize(
         "input_email, expected_valid, expected_error_contains",